@@ -63,6 +63,10 @@ extern INT_HANDLER sark_int_han(void);
 //! send data command ID in SDP
 #define SDP_COMMAND_FOR_SENDING_DATA 100
 
+//! send the data of several reads in one stream command ID in SDP
+//! (this may be split over several SDP messages)
+#define SDP_COMMAND_FOR_SENDING_DATA_FOR_READS 101
+
 //! start missing SDP sequence numbers in SDP
 //! (this includes n SDP packets expected)
 #define SDP_COMMAND_FOR_START_OF_MISSING_SDP_PACKETS 1000
@@ -70,9 +74,33 @@ extern INT_HANDLER sark_int_han(void);
 //! other missing SDP sequence numbers in SDP
 #define SDP_COMMAND_FOR_MORE_MISSING_SDP_PACKETS 1001
 
+//! start of a stream of data to write into SDRAM (data in)
+#define SDP_COMMAND_FOR_START_OF_DATA_IN 200
+
+//! a packet of data to write into SDRAM, with its sequence number
+#define SDP_COMMAND_FOR_DATA_IN 201
+
+//! request for the data in sequence numbers not yet received
+#define SDP_COMMAND_FOR_CHECK_DATA_IN 202
+
+//! reply with the data in sequence numbers not yet received
+#define SDP_COMMAND_FOR_MISSING_DATA_IN 203
+
+//! bytes of data carried by each data in packet (after command and sequence)
+#define DATA_IN_BYTES_PER_PACKET 264
+
+//! bits in a word of the received data in sequence number flags
+#define BITS_PER_WORD 32
+
 //! timeout for trying to end SDP packet
 #define SDP_TIMEOUT 1000
 
+//! the most reads whose data can be sent in one stream
+#define MAX_READS_PER_STREAM 128
+
+//! words in the SDP message of each read whose data is to be sent
+#define WORDS_PER_READ 2
+
 //! extra length adjustment for the SDP header
 #define LENGTH_OF_SDP_HEADER 8
 
@@ -169,6 +197,16 @@ typedef struct {
     uint pld;
 } dumped_packet_t;
 
+//! a block of SDRAM whose data is sent in a stream
+typedef struct stream_read_t {
+    //! where the data starts
+    address_t *address;
+    //! the number of words of data
+    uint32_t n_words;
+    //! the sequence number of the first packet of the data
+    uint32_t first_seq_num;
+} stream_read_t;
+
 //! packet queue type
 typedef struct {
     uint head;
@@ -196,12 +234,29 @@ typedef enum sending_data_sdp_data_positions {
     LENGTH_OF_DATA_READ = 2
 } sending_data_sdp_data_positions;
 
+//! \brief message positions for the SDP messages listing several reads
+typedef enum sending_reads_sdp_data_positions {
+    N_READS_POSITION = 1,
+    FIRST_READ_INDEX_POSITION = 2,
+    START_OF_READS = 3
+} sending_reads_sdp_data_positions;
+
 //! \brief position in SDP message for missing sequence numbers
 typedef enum missing_seq_num_sdp_data_positions {
     POSITION_OF_NO_MISSING_SEQ_SDP_PACKETS = 1,
     START_OF_MISSING_SEQ_NUMS = 2
 } missing_seq_num_sdp_data_positions;
 
+//! \brief message positions for the data in SDP messages
+typedef enum data_in_sdp_data_positions {
+    DATA_IN_ADDRESS_POSITION = 1,
+    DATA_IN_LENGTH_POSITION = 2,
+    DATA_IN_SEQ_NUM_POSITION = 1,
+    DATA_IN_START_OF_DATA = 2,
+    DATA_IN_N_MISSING_POSITION = 1,
+    DATA_IN_START_OF_MISSING_SEQ_NUMS = 2
+} data_in_sdp_data_positions;
+
 
 // Dropped packet re-injection internal control commands (RC of SCP message)
 typedef enum reinjector_command_codes {
@@ -336,6 +391,19 @@ static uint32_t new_sequence_key = 0;
 static uint32_t first_data_key = 0;
 static uint32_t end_flag_key = 0;
 
+//! data in stuff
+static uint8_t *data_in_address = NULL;
+static uint32_t data_in_n_bytes = 0;
+static uint32_t data_in_n_seq_nums = 0;
+static uint32_t *data_in_received_seq_nums = NULL;
+
+//! the reads whose data is sent in the current stream; each read starts at
+//! a new sequence number
+static stream_read_t stream_reads[MAX_READS_PER_STREAM];
+static uint32_t n_stream_reads = 0;
+static uint32_t current_stream_read = 0;
+static bool first_packet_of_read = false;
+
 // ------------------------------------------------------------------------
 // reinjector main functions
 // ------------------------------------------------------------------------
@@ -748,6 +816,88 @@ void read(uint32_t dma_tag, uint32_t offset, uint32_t items_to_read) {
 
 }
 
+//! \brief sets off the DMA of the first packet of data of the current read
+//! of the stream, leaving space for the sequence number or the number of
+//! sequence numbers before it
+void start_stream_read() {
+    stream_read_t *stream_read = &stream_reads[current_stream_read];
+    store_address = stream_read->address;
+    position_in_store = 0;
+    number_of_elements_to_read_from_sdram = stream_read->n_words;
+    first_packet_of_read = true;
+
+    if (number_of_elements_to_read_from_sdram <
+            ITEMS_PER_DATA_PACKET - SEQUENCE_NUMBER_SIZE) {
+        read(DMA_TAG_READ_FOR_TRANSMISSION, 1,
+            number_of_elements_to_read_from_sdram);
+    } else {
+        read(DMA_TAG_READ_FOR_TRANSMISSION, 1,
+            ITEMS_PER_DATA_PACKET - SEQUENCE_NUMBER_SIZE);
+    }
+}
+
+//! \brief starts sending the data of the reads of the stream, whose
+//! sequence numbers follow on from each other
+void start_stream() {
+    max_seq_num = 0;
+    for (uint32_t i = 0; i < n_stream_reads; i++) {
+        stream_reads[i].first_seq_num = max_seq_num;
+        max_seq_num += (stream_reads[i].n_words +
+            ITEMS_PER_DATA_PACKET - SEQUENCE_NUMBER_SIZE - 1) /
+            (ITEMS_PER_DATA_PACKET - SEQUENCE_NUMBER_SIZE);
+    }
+
+    // reset states
+    first_transmission = true;
+    transmit_dma_pointer = 0;
+    current_stream_read = 0;
+    start_stream_read();
+}
+
+//! \brief stores the reads listed in an SDP message, and starts sending
+//! their data once all of the reads of the stream have been received
+//! \param[in] msg: the SDP message listing the reads
+void data_speed_up_receive_reads(sdp_msg_pure_data *msg) {
+    uint32_t n_reads = msg->data[N_READS_POSITION];
+    uint32_t first_read = msg->data[FIRST_READ_INDEX_POSITION];
+    uint32_t n_reads_in_msg = (
+        (msg->length - LENGTH_OF_SDP_HEADER) / WORD_TO_BYTE_MULTIPLIER -
+        START_OF_READS) / WORDS_PER_READ;
+    if (n_reads > MAX_READS_PER_STREAM ||
+            first_read + n_reads_in_msg > n_reads) {
+        io_printf(IO_BUF, "too many reads to stream: %d of %d from %d\n",
+                  n_reads_in_msg, n_reads, first_read);
+        return;
+    }
+
+    for (uint32_t i = 0; i < n_reads_in_msg; i++) {
+        uint32_t position = START_OF_READS + (i * WORDS_PER_READ);
+        stream_reads[first_read + i].address =
+            (address_t *) msg->data[position];
+        stream_reads[first_read + i].n_words =
+            msg->data[position + 1] / WORD_TO_BYTE_MULTIPLIER;
+    }
+
+    // wait for the rest of the reads
+    if (first_read + n_reads_in_msg < n_reads) {
+        return;
+    }
+    n_stream_reads = n_reads;
+    start_stream();
+}
+
+//! \brief finds the read of the stream whose data is sent with a sequence
+//! number
+//! \param[in] seq_num: the sequence number
+//! \return the read
+stream_read_t *find_stream_read(uint32_t seq_num) {
+    uint32_t i = n_stream_reads - 1;
+    while (i > 0 && stream_reads[i].first_seq_num > seq_num) {
+        i--;
+    }
+    return &stream_reads[i];
+}
+
 //! \brief sends a end flag via multicast
 void data_speed_up_send_end_flag() {
     send_fixed_route_packet(end_flag_key, END_FLAG);
@@ -767,6 +917,14 @@ void dma_complete_reading_for_original_transmission(){
         data_to_transmit[current_dma_pointer][0] = max_seq_num;
         key_to_transmit = first_data_key;
         first_transmission = false;
+        first_packet_of_read = false;
+        items_read_this_time += 1;
+    } else if (first_packet_of_read) {
+        // the data of a later read starts at its own sequence number
+        data_to_transmit[current_dma_pointer][0] =
+            stream_reads[current_stream_read].first_seq_num;
+        key_to_transmit = new_sequence_key;
+        first_packet_of_read = false;
         items_read_this_time += 1;
     }
 
@@ -774,7 +932,7 @@ void dma_complete_reading_for_original_transmission(){
     // if a full packet, read another and try again
     //io_printf(IO_BUF, "next position %d, elements %d\n", position_in_store,
     //          number_of_elements_to_read_from_sdram);
-    if (position_in_store < number_of_elements_to_read_from_sdram - 1) {
+    if (position_in_store < number_of_elements_to_read_from_sdram) {
         //io_printf(IO_BUF, "setting off another DMA\n");
         //log_info("setting off another DMA");
         uint32_t num_items_to_read =
@@ -799,6 +957,12 @@ void dma_complete_reading_for_original_transmission(){
         send_data_block(
             current_dma_pointer, items_read_this_time, key_to_transmit);
         //log_info("finished sending data");
+    } else if (current_stream_read + 1 < n_stream_reads) {
+        // move on to the next read, and transmit DMA'ed one
+        current_stream_read += 1;
+        start_stream_read();
+        send_data_block(
+            current_dma_pointer, items_read_this_time, key_to_transmit);
     } else {
         //io_printf(IO_BUF, "sending last data \n");
         send_data_block(
@@ -920,11 +1084,14 @@ void the_dma_complete_read_missing_seqeuence_nums() {
         if (missing_seq_num_being_processed != END_FLAG) {
 
             // regenerate data
-            position_in_store = missing_seq_num_being_processed *
+            stream_read_t *stream_read =
+                find_stream_read(missing_seq_num_being_processed);
+            store_address = stream_read->address;
+            position_in_store = (missing_seq_num_being_processed -
+                stream_read->first_seq_num) *
                 (ITEMS_PER_DATA_PACKET - SEQUENCE_NUMBER_SIZE);
             uint32_t left_over_portion =
-                bytes_to_read_write / WORD_TO_BYTE_MULTIPLIER -
-            position_in_store;
+                stream_read->n_words - position_in_store;
 
             //io_printf(IO_BUF, "for seq %d, pos = %d, left %d\n",
             //missing_seq_num_being_processed, position_in_store,
@@ -978,6 +1145,100 @@ void dma_complete_writing_missing_seq_to_sdram() {
     io_printf(IO_BUF, "Need to figure what to do here\n");
 }
 
+//! \brief sends an SDP message back to where it came from
+//! \param[in] msg: the message to send back, already filled in with the reply
+void reply_to_sdp_message(sdp_msg_t *msg) {
+    uint dest_port = msg->dest_port;
+    uint dest_addr = msg->dest_addr;
+
+    msg->dest_port = msg->srce_port;
+    msg->srce_port = dest_port;
+
+    msg->dest_addr = msg->srce_addr;
+    msg->srce_addr = dest_addr;
+
+    sark_msg_send(msg, 10);
+}
+
+//! \brief replies with how many data in sequence numbers have not been
+//! received, and as many of them as fit in one message. The count is
+//! END_FLAG if there is no stream that can be received.
+//! \param[in] msg: the SDP message to reuse for the reply
+void data_in_send_missing_seq_nums(sdp_msg_pure_data *msg) {
+    uint32_t n_missing = 0;
+    uint32_t position = DATA_IN_START_OF_MISSING_SEQ_NUMS;
+
+    if (data_in_received_seq_nums == NULL) {
+        n_missing = END_FLAG;
+    } else {
+        for (uint32_t seq_num = 0; seq_num < data_in_n_seq_nums; seq_num++) {
+            if ((data_in_received_seq_nums[seq_num / BITS_PER_WORD] &
+                    (1 << (seq_num % BITS_PER_WORD))) == 0) {
+                if (position < ITEMS_PER_DATA_PACKET) {
+                    msg->data[position] = seq_num;
+                    position += 1;
+                }
+                n_missing += 1;
+            }
+        }
+    }
+
+    msg->data[COMMAND_ID_POSITION] = SDP_COMMAND_FOR_MISSING_DATA_IN;
+    msg->data[DATA_IN_N_MISSING_POSITION] = n_missing;
+    msg->length = LENGTH_OF_SDP_HEADER + position * WORD_TO_BYTE_MULTIPLIER;
+    reply_to_sdp_message((sdp_msg_t *) msg);
+}
+
+//! \brief sets up the receiving of a stream of data to write into SDRAM,
+//! and replies with every sequence number as missing
+//! \param[in] msg: the SDP message holding the address and length
+void data_in_start(sdp_msg_pure_data *msg) {
+    data_in_address = (uint8_t *) msg->data[DATA_IN_ADDRESS_POSITION];
+    data_in_n_bytes = msg->data[DATA_IN_LENGTH_POSITION];
+    data_in_n_seq_nums = (data_in_n_bytes + DATA_IN_BYTES_PER_PACKET - 1) /
+        DATA_IN_BYTES_PER_PACKET;
+
+    // one flag per sequence number, to track what has been received
+    if (data_in_received_seq_nums != NULL) {
+        sark_xfree(sark.heap, data_in_received_seq_nums, ALLOC_LOCK);
+    }
+    uint32_t n_words = (data_in_n_seq_nums / BITS_PER_WORD) + 1;
+    data_in_received_seq_nums = (uint32_t *) sark_xalloc(
+        sark.heap, n_words * sizeof(uint32_t), 0, ALLOC_LOCK);
+    if (data_in_received_seq_nums == NULL) {
+        io_printf(IO_BUF, "failed to allocate dtcm for data in flags\n");
+    } else {
+        for (uint32_t i = 0; i < n_words; i++) {
+            data_in_received_seq_nums[i] = 0;
+        }
+    }
+
+    data_in_send_missing_seq_nums(msg);
+}
+
+//! \brief writes the data of a data in packet into SDRAM
+//! \param[in] msg: the SDP message holding the sequence number and data
+void data_in_receive(sdp_msg_pure_data *msg) {
+    uint32_t seq_num = msg->data[DATA_IN_SEQ_NUM_POSITION];
+    if (data_in_received_seq_nums == NULL ||
+            seq_num >= data_in_n_seq_nums) {
+        return;
+    }
+
+    // the last packet may hold less than a full packet of data
+    uint32_t offset = seq_num * DATA_IN_BYTES_PER_PACKET;
+    uint32_t n_bytes = msg->length - LENGTH_OF_SDP_HEADER -
+        (DATA_IN_START_OF_DATA * WORD_TO_BYTE_MULTIPLIER);
+    if (offset + n_bytes > data_in_n_bytes) {
+        n_bytes = data_in_n_bytes - offset;
+    }
+
+    sark_mem_cpy(&data_in_address[offset],
+                 &msg->data[DATA_IN_START_OF_DATA], n_bytes);
+    data_in_received_seq_nums[seq_num / BITS_PER_WORD] |=
+        1 << (seq_num % BITS_PER_WORD);
+}
+
 //! \brief the handler for all messages coming in for data speed up
 //! functionality.
 //! \param[in] msg: the SDP message (without SCP header)
@@ -991,28 +1252,20 @@ void handle_data_speed_up(sdp_msg_pure_data *msg) {
         bytes_to_read_write = msg->data[LENGTH_OF_DATA_READ];
         sark_msg_free((sdp_msg_t *) msg);
 
-        max_seq_num = (float)bytes_to_read_write / (float)(67 * 4);
-        max_seq_num = ceil(max_seq_num);
         //io_printf(IO_BUF, "address %d, bytes to write %d\n", store_address,
         //          bytes_to_read_write);
 
-        // reset states
-        first_transmission = true;
-        transmit_dma_pointer = 0;
-        position_in_store = 0;
-        number_of_elements_to_read_from_sdram =
+        // send as a stream of one read
+        stream_reads[0].address = store_address;
+        stream_reads[0].n_words =
             (uint)(bytes_to_read_write / WORD_TO_BYTE_MULTIPLIER);
-        //io_printf(IO_BUF, "elements to read %d \n",
-        //          number_of_elements_to_read_from_sdram);
-
-        if (number_of_elements_to_read_from_sdram <
-                ITEMS_PER_DATA_PACKET - SEQUENCE_NUMBER_SIZE) {
-            read(DMA_TAG_READ_FOR_TRANSMISSION, 1,
-                number_of_elements_to_read_from_sdram);
-        } else {
-            read(DMA_TAG_READ_FOR_TRANSMISSION, 1,
-                ITEMS_PER_DATA_PACKET - SEQUENCE_NUMBER_SIZE);
-        }
+        n_stream_reads = 1;
+        start_stream();
+    }
+    // start, or continue to list, the reads of a stream
+    else if (msg->data[COMMAND_ID_POSITION] ==
+            SDP_COMMAND_FOR_SENDING_DATA_FOR_READS) {
+        data_speed_up_receive_reads(msg);
     }
     // start or continue to gather missing packet list
     else if (msg->data[COMMAND_ID_POSITION] ==
@@ -1070,6 +1323,16 @@ void handle_data_speed_up(sdp_msg_pure_data *msg) {
                 }
             }
         }
+    }
+    // data to write into SDRAM
+    else if (msg->data[COMMAND_ID_POSITION] == SDP_COMMAND_FOR_DATA_IN) {
+        data_in_receive(msg);
+    } else if (msg->data[COMMAND_ID_POSITION] ==
+            SDP_COMMAND_FOR_START_OF_DATA_IN) {
+        data_in_start(msg);
+    } else if (msg->data[COMMAND_ID_POSITION] ==
+            SDP_COMMAND_FOR_CHECK_DATA_IN) {
+        data_in_send_missing_seq_nums(msg);
     } else {
         io_printf(IO_BUF, "received unknown SDP packet\n");
     }
@@ -1112,23 +1375,10 @@ void __wrap_sark_int(void *pc) {
             sark_msg_cpy(msg, shm_msg);
             sark_shmsg_free(shm_msg);
 
-            io_printf(
-                IO_BUF,
-                "port %d\n", (msg->dest_port & PORT_MASK) >> PORT_SHIFT);
-
             switch ((msg->dest_port & PORT_MASK) >> PORT_SHIFT) {
             case RE_INJECTION_FUNCTIONALITY:
                 msg->length = 12 + handle_reinjection_command(msg);
-                uint dest_port = msg->dest_port;
-                uint dest_addr = msg->dest_addr;
-
-                msg->dest_port = msg->srce_port;
-                msg->srce_port = dest_port;
-
-                msg->dest_addr = msg->srce_addr;
-                msg->srce_addr = dest_addr;
-
-                sark_msg_send(msg, 10);
+                reply_to_sdp_message(msg);
                 break;
             case DATA_SPEED_UP_FUNCTIONALITY:
                 handle_data_speed_up((sdp_msg_pure_data *) msg);
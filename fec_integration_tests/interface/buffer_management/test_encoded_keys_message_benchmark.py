@@ -0,0 +1,124 @@
+""" A benchmark of encoding the messages of a send buffer with\
+    EncodedKeysMessage against encoding them key by key into\
+    EIEIODataMessage, over spike schedules like those of spike source\
+    arrays.  It is skipped unless the FEC_RUN_BENCHMARKS environment\
+    variable is "true", e.g.::
+
+        FEC_RUN_BENCHMARKS=true python -m pytest -s \\
+            fec_integration_tests/interface/buffer_management
+"""
+import os
+import time
+import unittest
+
+import numpy
+
+from spinnman.messages.eieio import EIEIOType
+from spinnman.messages.eieio.data_messages import EIEIODataMessage
+
+from spinn_front_end_common.interface.buffer_management.storage_objects \
+    import BufferedSendingRegion, EncodedKeysMessage
+
+# The most bytes of a message, as the buffer manager sends them
+_MESSAGE_SIZE = 280
+
+# The number of times each encoding is timed; the fastest is reported
+_N_REPEATS = 3
+
+_RUN_BENCHMARKS = os.environ.get(
+    'FEC_RUN_BENCHMARKS', 'false').lower() == 'true'
+
+
+def _poisson_schedule(n_neurons, rate_hz, n_steps, seed):
+    """ Neurons firing independently at a rate, with 1ms time steps
+    """
+    rng = numpy.random.RandomState(seed)
+    counts = rng.poisson(rate_hz * n_steps / 1000.0, n_neurons)
+    timestamps = numpy.concatenate([
+        rng.randint(0, n_steps, count) for count in counts])
+    keys = numpy.repeat(numpy.arange(n_neurons), counts)
+    return timestamps, keys
+
+
+def _synchronous_schedule(n_neurons, period, n_steps):
+    """ All neurons firing together every period time steps, so that the\
+        keys of a time step need several messages
+    """
+    steps = numpy.arange(0, n_steps, period)
+    timestamps = numpy.repeat(steps, n_neurons)
+    keys = numpy.tile(numpy.arange(n_neurons), len(steps))
+    return timestamps, keys
+
+
+def _encode_key_by_key(region):
+    region.rewind()
+    messages = list()
+    while region.is_next_timestamp:
+        timestamp = region.next_timestamp
+        message = EIEIODataMessage.create(
+            EIEIOType.KEY_32_BIT, timestamp=timestamp)
+        space = _MESSAGE_SIZE - message.size
+        while (space >= EncodedKeysMessage.N_BYTES_PER_KEY and
+                region.is_next_key(timestamp)):
+            message.add_key(region.next_key)
+            space -= EncodedKeysMessage.N_BYTES_PER_KEY
+        messages.append(message.bytestring)
+    return b"".join(messages)
+
+
+def _encode_from_arrays(region):
+    region.rewind()
+    data = bytearray(region.total_region_size)
+    offset = 0
+    max_n_keys = EncodedKeysMessage.get_max_n_keys(_MESSAGE_SIZE)
+    while region.is_next_timestamp:
+        offset = EncodedKeysMessage.write(
+            data, offset, *region.get_next_keys(max_n_keys))
+    return bytes(data[:offset])
+
+
+def _fastest(encode, region):
+    best = None
+    for _ in range(_N_REPEATS):
+        start = time.time()
+        data = encode(region)
+        taken = time.time() - start
+        if best is None or taken < best:
+            best = taken
+    return data, best
+
+
+@unittest.skipUnless(_RUN_BENCHMARKS, "FEC_RUN_BENCHMARKS is not true")
+class TestEncodedKeysMessageBenchmark(unittest.TestCase):
+
+    def _benchmark(self, label, timestamps, keys):
+        region = BufferedSendingRegion(_MESSAGE_SIZE)
+        region.add_timestamps_and_keys(timestamps, keys)
+        key_by_key, key_by_key_time = _fastest(_encode_key_by_key, region)
+        from_arrays, from_arrays_time = _fastest(_encode_from_arrays, region)
+        self.assertEqual(from_arrays, key_by_key)
+        print("{}: {} keys in {} time steps; key by key {:.3f}s, "
+              "from arrays {:.3f}s ({:.1f} times faster)".format(
+                  label, len(keys), region.n_timestamps, key_by_key_time,
+                  from_arrays_time,
+                  key_by_key_time / max(from_arrays_time, 1e-9)))
+        self.assertLess(from_arrays_time, key_by_key_time)
+
+    def test_poisson(self):
+        # 1000 neurons at 10Hz for 10s
+        self._benchmark(
+            "poisson", *_poisson_schedule(1000, 10.0, 10000, seed=1))
+
+    def test_sparse_poisson(self):
+        # 100 neurons at 1Hz for 100s, so mostly one key per message
+        self._benchmark(
+            "sparse poisson", *_poisson_schedule(100, 1.0, 100000, seed=2))
+
+    def test_synchronous(self):
+        # 1000 neurons together every 10ms for 2s
+        self._benchmark(
+            "synchronous", *_synchronous_schedule(1000, 10, 2000))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,6 +2,7 @@ from spinn_front_end_common.interface.interface_functions \
     import LoadExecutableImages
 from spinnman.transceiver import Transceiver
 from spinnman.model import ExecutableTargets
+from spinn_machine import CoreSubsets
 from collections import defaultdict
 import unittest
 
@@ -46,6 +47,21 @@ class TestFrontEndCommonLoadExecutableImages(unittest.TestCase):
         targets.add_processor("test2.aplx", 0, 1, 2)
         loader.__call__(targets, 30, transceiver)
 
+    def test_started_cores_are_not_loaded_again(self):
+        transceiver = _MockTransceiver(self)
+        loader = LoadExecutableImages()
+        targets = ExecutableTargets()
+        targets.add_processor("monitor.aplx", 0, 0, 1)
+        targets.add_processor("monitor.aplx", 0, 1, 1)
+        targets.add_processor("test.aplx", 0, 0, 2)
+        targets.add_processor("test.aplx", 0, 1, 2)
+        started_core_subsets = CoreSubsets()
+        started_core_subsets.add_processor(0, 0, 1)
+        started_core_subsets.add_processor(0, 1, 1)
+        loader.__call__(targets, 30, transceiver, started_core_subsets)
+        self.assertEqual(transceiver._executable_on_core, {
+            (0, 0, 2): "test.aplx", (0, 1, 2): "test.aplx"})
+
 
 if __name__ == "__main__":
     unittest.main()
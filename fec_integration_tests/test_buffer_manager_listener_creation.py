@@ -70,6 +70,7 @@ class TestBufferManagerListenerCreation(unittest.TestCase):
                 number_of_listeners += 1
             print(i)
         self.assertEqual(number_of_listeners, 1)
+        bm.close()
 
 
 class _TestVertex(ApplicationVertex):
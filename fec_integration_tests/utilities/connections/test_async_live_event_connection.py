@@ -0,0 +1,157 @@
+import os
+import shutil
+import socket
+import sqlite3
+import tempfile
+import unittest
+
+try:
+    import asyncio
+except ImportError:  # pragma: no cover
+    # Python 2 has no asyncio, so these tests cannot run there
+    asyncio = None
+
+from spinn_utilities.socket_address import SocketAddress
+
+from spinnman.messages.eieio import EIEIOType
+from spinnman.messages.eieio.data_messages import EIEIODataMessage
+
+import spinn_front_end_common.utilities.database as database
+from spinn_front_end_common.utilities.connections \
+    import AsyncLiveEventConnection, AsyncUDPSocket
+from spinn_front_end_common.utilities.connections.live_event_connection \
+    import _decode_eieio_data
+from spinn_front_end_common.utilities.notification_protocol \
+    import AsyncNotificationProtocol
+
+_TIMEOUT = 10
+
+
+def _free_port():
+    s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    s.bind(("127.0.0.1", 0))
+    port = s.getsockname()[1]
+    s.close()
+    return port
+
+
+def _write_database(path, receive_port, injector_port):
+    """ Write a database in which a machine vertex "Source" sends events\
+        with key 0x1000 to "LPG", which sends them to the receive port, and\
+        "Injector" sends events with key 0x2000 received on the injector\
+        port
+    """
+    with sqlite3.connect(path) as db:
+        with open(os.path.join(
+                os.path.dirname(database.__file__), "db.sql")) as f:
+            db.executescript(f.read())
+        db.executemany(
+            "INSERT INTO configuration_parameters(parameter_id, value)"
+            " VALUES (?, ?)", [("runtime", 1000), ("machine_time_step", 1000)])
+        db.executemany(
+            "INSERT INTO Machine_vertices(vertex_id, label) VALUES (?, ?)",
+            [(1, "Source"), (2, "LPG"), (3, "Injector"), (4, "Target")])
+        db.executemany(
+            "INSERT INTO Machine_edges(edge_id, pre_vertex, post_vertex)"
+            " VALUES (?, ?, ?)", [(1, 1, 2), (2, 3, 4)])
+        db.executemany(
+            "INSERT INTO Routing_info(edge_id, \"key\", mask)"
+            " VALUES (?, ?, ?)",
+            [(1, 0x1000, 0xFFFFFFFF), (2, 0x2000, 0xFFFFFFFF)])
+        db.execute(
+            "INSERT INTO IP_tags(vertex_id, tag, board_address, ip_address,"
+            " port, strip_sdp) VALUES (2, 1, '127.0.0.1', '127.0.0.1', ?, 1)",
+            (receive_port, ))
+        db.execute(
+            "INSERT INTO Reverse_IP_tags(vertex_id, tag, board_address, port)"
+            " VALUES (3, 2, '127.0.0.1', ?)", (injector_port, ))
+
+
+@unittest.skipIf(asyncio is None, "asyncio is not available")
+class TestAsyncLiveEventConnection(unittest.TestCase):
+
+    def setUp(self):
+        self._folder = tempfile.mkdtemp()
+        self._loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        self._loop.close()
+        shutil.rmtree(self._folder)
+
+    def _wait(self, future):
+        return self._loop.run_until_complete(
+            asyncio.wait_for(future, _TIMEOUT))
+
+    def test_handshake_and_events(self):
+        loop = self._loop
+        receive_port = _free_port()
+
+        # A stand-in for SpiNNaker, receiving the injected events
+        injected = loop.create_future()
+        injector = AsyncUDPSocket(
+            loop, lambda data, address: injected.set_result(data),
+            local_host="127.0.0.1")
+        database_path = os.path.join(self._folder, "input_output.sqlite3")
+        _write_database(database_path, receive_port, injector.local_port)
+
+        connection = AsyncLiveEventConnection(
+            "LPG", receive_labels=["Source"], send_labels=["Injector"],
+            local_host="127.0.0.1", local_port=None, machine_vertices=True,
+            loop=loop)
+        initialised = list()
+        for label in ("Source", "Injector"):
+            connection.add_init_callback(
+                label, lambda *args: initialised.append(args))
+        received = list()
+        connection.add_receive_callback(
+            "Source", lambda label, atom_ids, payloads: received.append(
+                (label, atom_ids.tolist(), payloads)))
+        connection.add_start_resume_callback(
+            "Injector", lambda label, conn: conn.send_events(
+                label, [0], send_full_keys=True))
+        events = connection.events("Source")
+
+        protocol = AsyncNotificationProtocol(
+            [SocketAddress("127.0.0.1", connection.local_port, None)], True,
+            loop=loop)
+        self.assertEqual(len(self._wait(
+            protocol.send_read_notification(database_path))), 1)
+        self.assertEqual(sorted(initialised), [
+            ("Injector", 1, 1000.0, 1.0), ("Source", 1, 1000.0, 1.0)])
+
+        # Events sent to the receive port reach the callback and iterator
+        message = EIEIODataMessage.create(EIEIOType.KEY_32_BIT)
+        message.add_key(0x1000)
+        sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sender.sendto(message.bytestring, ("127.0.0.1", receive_port))
+        sender.close()
+        atom_ids, payloads = self._wait(events.__anext__())
+        self.assertEqual(atom_ids.tolist(), [0])
+        self.assertIsNone(payloads)
+        self.assertEqual(received, [("Source", [0], None)])
+
+        # Starting sends the events of the start callback
+        protocol.send_start_resume_notification()
+        keys, _, _ = _decode_eieio_data(self._wait(injected))
+        self.assertEqual(keys.tolist(), [0x2000])
+
+        connection.close()
+        protocol.close()
+        injector.close()
+        with self.assertRaises(StopAsyncIteration):
+            self._wait(events.__anext__())
+
+    def test_no_confirmation_needed(self):
+        listener = AsyncUDPSocket(
+            self._loop, lambda data, address: None, local_host="127.0.0.1")
+        protocol = AsyncNotificationProtocol(
+            [SocketAddress("127.0.0.1", listener.local_port, None)], False,
+            loop=self._loop)
+        self.assertEqual(self._wait(protocol.send_read_notification(
+            os.path.join(self._folder, "unused.sqlite3"))), [])
+        protocol.close()
+        listener.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+""" A benchmark of sending live events encoded all at once against\
+    encoding each key into an EIEIODataMessage.  It is skipped unless the\
+    FEC_RUN_BENCHMARKS environment variable is "true", e.g.::
+
+        FEC_RUN_BENCHMARKS=true python -m pytest -s \\
+            fec_integration_tests/utilities/connections
+"""
+import os
+import socket
+import time
+import unittest
+
+from spinnman.messages.eieio import EIEIOType
+from spinnman.messages.eieio.data_messages import EIEIODataMessage
+
+from spinn_front_end_common.utilities.connections.live_event_connection \
+    import _encode_eieio_data
+
+# The number of events sent by each encoding
+_N_EVENTS = 20000
+
+_RUN_BENCHMARKS = os.environ.get(
+    'FEC_RUN_BENCHMARKS', 'false').lower() == 'true'
+
+
+def _encode_by_message(eieio_type, keys, max_keys):
+    """ Encode keys one by one into messages, as events used to be sent
+    """
+    packets = list()
+    for start in range(0, len(keys), max_keys):
+        message = EIEIODataMessage.create(eieio_type)
+        for key in keys[start:start + max_keys]:
+            message.add_key(key)
+        packets.append(message.bytestring)
+    return packets
+
+
+def _benchmark_send(encode, n_events):
+    """ Encode and send events to a local UDP sink, returning the number\
+        of events sent per second
+    """
+    sink = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sink.bind(("127.0.0.1", 0))
+    sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    keys = list(range(n_events))
+    start = time.time()
+    for data in encode(keys):
+        sender.sendto(data, sink.getsockname())
+    taken = time.time() - start
+    sender.close()
+    sink.close()
+    return n_events / taken
+
+
+@unittest.skipUnless(_RUN_BENCHMARKS, "FEC_RUN_BENCHMARKS is not true")
+class TestLiveEventConnectionBenchmark(unittest.TestCase):
+
+    def test_send_throughput(self):
+        by_message = _benchmark_send(lambda keys: _encode_by_message(
+            EIEIOType.KEY_16_BIT, keys, 127), _N_EVENTS)
+        in_bulk = _benchmark_send(lambda keys: _encode_eieio_data(
+            EIEIOType.KEY_16_BIT, keys), _N_EVENTS)
+        print("{} events; by message {:.0f} events/s, in bulk {:.0f} "
+              "events/s".format(_N_EVENTS, by_message, in_bulk))
+        self.assertGreater(in_bulk, by_message)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import time
+import unittest
+
+from spinn_utilities.socket_address import SocketAddress
+
+from spinn_front_end_common.utilities.notification_protocol \
+    import NotificationProtocol
+
+from spinnman.connections.udp_packet_connections import EIEIOConnection
+from spinnman.messages.eieio.command_messages import DatabaseConfirmation
+from spinnman.constants import EIEIO_COMMAND_IDS
+
+
+def _confirm(listener):
+    """ Receive the database notification and confirm it
+    """
+    _, address = listener.receive_with_address(timeout=10)
+    listener.send_to(DatabaseConfirmation().bytestring, address)
+
+
+def _receive_command(listener, timeout=10):
+    return listener.receive_eieio_message(timeout).eieio_header.command
+
+
+class TestConfirmationNotificationProtocol(unittest.TestCase):
+
+    def test_late_listener(self):
+        """ Test that a listener that does not confirm in time neither holds\
+            up the others nor misses the start of the simulation
+        """
+        prompt = EIEIOConnection()
+        late = EIEIOConnection()
+        protocol = NotificationProtocol([
+            SocketAddress("127.0.0.1", prompt.local_port, None),
+            SocketAddress("127.0.0.1", late.local_port, None)],
+            True, confirmation_timeout=0.5)
+        protocol.send_read_notification("database.sqlite3")
+        _confirm(prompt)
+        start = time.time()
+        protocol.wait_for_confirmation()
+        self.assertLess(time.time() - start, 5)
+        self.assertEqual(protocol.late_listeners,
+                         [("127.0.0.1", late.local_port)])
+
+        # Only the listener that confirmed is started
+        protocol.send_start_resume_notification()
+        self.assertEqual(
+            _receive_command(prompt),
+            EIEIO_COMMAND_IDS.START_RESUME_NOTIFICATION.value)
+
+        # The late listener is started when it confirms
+        _confirm(late)
+        self.assertEqual(
+            _receive_command(late),
+            EIEIO_COMMAND_IDS.START_RESUME_NOTIFICATION.value)
+        self.assertEqual(protocol.late_listeners, [])
+
+        protocol.send_stop_pause_notification()
+        for listener in (prompt, late):
+            self.assertEqual(
+                _receive_command(listener),
+                EIEIO_COMMAND_IDS.STOP_PAUSE_NOTIFICATION.value)
+        protocol.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -30,14 +30,15 @@ from spinn_front_end_common.utilities \
     import helpful_functions, globals_variables, SimulatorInterface
 from spinn_front_end_common.utilities import function_list
 from spinn_front_end_common.utilities.utility_objs \
-    import ExecutableType, ProvenanceDataItem
+    import ExecutableType, ProvenanceDataItem, RegionReloadCache, \
+    SegmentPlanner, SegmentTimings
 from spinn_front_end_common.utilities.report_functions import EnergyReport
 from spinn_front_end_common.utility_models import \
     CommandSender, DataSpeedUpPacketGatherMachineVertex
 from spinn_front_end_common.interface.buffer_management.buffer_models \
-    import AbstractReceiveBuffersToHost
+    import AbstractReceiveBuffersToHost, AbstractSupportsExtractionDuringRun
 from spinn_front_end_common.interface.provenance \
-    import PacmanProvenanceExtractor
+    import PacmanProvenanceExtractor, ProvenanceDatabase
 from spinn_front_end_common.interface.simulator_state import Simulator_State
 from spinn_front_end_common.interface.interface_functions \
     import ProvenanceXMLWriter
@@ -245,6 +246,10 @@ class AbstractSpinnakerBase(SimulatorInterface):
         #
         "_has_reset_last",
 
+        # what was written by reloads of data between runs, so that the next
+        # reload need only write what has changed
+        "_region_reload_cache",
+
         #
         "_current_run_timesteps",
 
@@ -254,6 +259,13 @@ class AbstractSpinnakerBase(SimulatorInterface):
         #
         "_minimum_step_generated",
 
+        # Chooses the length of each segment of a run split up by auto pause
+        # and resume while recorded data is read during the run, or None
+        "_segment_planner",
+
+        # The number of segments run so far, to name their provenance
+        "_n_run_segments",
+
         #
         "_no_machine_time_steps",
 
@@ -323,6 +335,10 @@ class AbstractSpinnakerBase(SimulatorInterface):
         #
         "_all_provenance_items",
 
+        # The database that provenance is gathered into when it is kept in
+        # SQLite, shared by all the runs of the simulation
+        "_provenance_database",
+
         #
         "_executable_types",
 
@@ -437,6 +453,7 @@ class AbstractSpinnakerBase(SimulatorInterface):
         self._last_run_tokens = None
         self._pacman_provenance = PacmanProvenanceExtractor()
         self._all_provenance_items = list()
+        self._provenance_database = None
         self._xml_paths = self._create_xml_paths(extra_algorithm_xml_paths)
 
         # extra algorithms and inputs for runs, should disappear in future
@@ -466,10 +483,13 @@ class AbstractSpinnakerBase(SimulatorInterface):
         self._has_ran = False
         self._state = Simulator_State.INIT
         self._has_reset_last = False
+        self._region_reload_cache = None
         self._n_calls_to_run = 1
         self._current_run_timesteps = 0
         self._no_sync_changes = 0
         self._minimum_step_generated = None
+        self._segment_planner = None
+        self._n_run_segments = 0
         self._no_machine_time_steps = None
         self._machine_time_step = None
         self._time_scale_factor = None
@@ -505,7 +525,7 @@ class AbstractSpinnakerBase(SimulatorInterface):
             "Reports", "display_algorithm_timings")
         self._provenance_format = self._config.get(
             "Reports", "provenance_format")
-        if self._provenance_format not in ["xml", "json"]:
+        if self._provenance_format not in ["xml", "json", "sqlite"]:
             raise Exception("Unknown provenance format: {}".format(
                 self._provenance_format))
         self._exec_dse_on_host = self._config.getboolean(
@@ -943,6 +963,8 @@ class AbstractSpinnakerBase(SimulatorInterface):
                 # wipe out stuff associated with a given machine, as these need
                 # to be rebuilt.
                 self._machine = None
+                if self._buffer_manager is not None:
+                    self._buffer_manager.close()
                 self._buffer_manager = None
                 if self._txrx is not None:
                     self._txrx.close()
@@ -964,6 +986,7 @@ class AbstractSpinnakerBase(SimulatorInterface):
                                  "use_auto_pause_and_resume", "False")
 
         # Work out an array of timesteps to perform
+        self._segment_planner = None
         if (not self._config.getboolean("Buffers", "use_auto_pause_and_resume")
                 or not is_buffered_recording):
 
@@ -980,6 +1003,20 @@ class AbstractSpinnakerBase(SimulatorInterface):
 
             steps = [n_machine_time_steps]
             self._minimum_step_generated = steps[0]
+        elif run_time is None and self._config.getboolean(
+                "Buffers", "extract_recording_during_run"):
+
+            # The recording buffers are read and reused while running, so
+            # a run forever need not be split up to empty them, as long as
+            # every vertex that records asks for its buffers to be read
+            not_extracting = self._get_vertices_not_extracting_during_run()
+            if not_extracting:
+                self._state = Simulator_State.FINISHED
+                raise ConfigurationException(
+                    "Cannot use automatic pause and resume with an infinite "
+                    "run time, as the recording of {} is not read while "
+                    "running".format(not_extracting))
+            steps = [n_machine_time_steps]
         else:
             if run_time is None:
                 self._state = Simulator_State.FINISHED
@@ -997,6 +1034,22 @@ class AbstractSpinnakerBase(SimulatorInterface):
                 steps = self._deduce_number_of_iterations(n_machine_time_steps)
                 self._minimum_step_generated = steps[0]
 
+            # If the recording buffers of every vertex that records are
+            # also read while running, the segments can be made longer as
+            # long as the reading keeps up
+            if self._config.getboolean(
+                    "Buffers", "extract_recording_during_run"):
+                not_extracting = \
+                    self._get_vertices_not_extracting_during_run()
+                if not_extracting:
+                    logger.warning(
+                        "The recording of {} is not read while running, so "
+                        "each segment of the run is kept to {} time steps",
+                        not_extracting, self._minimum_step_generated)
+                else:
+                    self._segment_planner = SegmentPlanner(
+                        self._minimum_step_generated)
+
         # Keep track of if loading was done; if loading is done before run,
         # run doesn't need to rewrite data again
         loading_done = False
@@ -1016,11 +1069,15 @@ class AbstractSpinnakerBase(SimulatorInterface):
                 loading_done = True
 
         # Run for each of the given steps
-        logger.info("Running for {} steps for a total of {}ms",
-                    len(steps), run_time)
-        for i, step in enumerate(steps):
-            logger.info("Run {} of {}", i + 1, len(steps))
-            self._do_run(step, loading_done, run_until_complete)
+        if self._segment_planner is None:
+            logger.info("Running for {} steps for a total of {}ms",
+                        len(steps), run_time)
+            for i, step in enumerate(steps):
+                logger.info("Run {} of {}", i + 1, len(steps))
+                self._do_run(step, loading_done, run_until_complete)
+        else:
+            self._run_planned_segments(
+                n_machine_time_steps, loading_done, run_until_complete)
 
         # Indicate that the signal handler needs to act
         self._raise_keyboard_interrupt = False
@@ -1043,6 +1100,25 @@ class AbstractSpinnakerBase(SimulatorInterface):
                 return True
         return False
 
+    def _get_vertices_not_extracting_during_run(self):
+        """ Get the vertices which record into buffers but do not ask for\
+            their recording buffers to be read while the simulation runs
+
+        :rtype: list(:py:class:`pacman.model.graphs.machine.MachineVertex`)
+        """
+        not_extracting = list()
+        for placement in self._placements.placements:
+            vertex = placement.vertex
+            if not isinstance(vertex, AbstractReceiveBuffersToHost):
+                continue
+            if (isinstance(vertex, AbstractRecordable) and
+                    not vertex.is_recording()):
+                continue
+            if (not isinstance(vertex, AbstractSupportsExtractionDuringRun)
+                    or not vertex.is_extracting_during_run):
+                not_extracting.append(vertex)
+        return not_extracting
+
     def _add_commands_to_command_sender(self):
         vertices = self._application_graph.vertices
         graph = self._application_graph
@@ -1559,11 +1635,26 @@ class AbstractSpinnakerBase(SimulatorInterface):
         inputs["ProvenanceFilePath"] = self._provenance_file_path
         inputs["APPID"] = self._app_id
         inputs["ExecDSEOnHostFlag"] = self._exec_dse_on_host
+        inputs["DSGGenerationThreads"] = self._config.getint(
+            "SpecExecution", "n_generation_threads")
+        inputs["DSGMemoryLimit"] = self._config.getint(
+            "SpecExecution", "spec_memory_limit")
+        inputs["DSEHostExecutionProcesses"] = self._config.getint(
+            "SpecExecution", "n_host_execution_processes")
+        inputs["UseFastDataInFlag"] = (
+            self._config.getboolean("SpecExecution", "use_fast_data_in") and
+            self._config.getboolean(
+                "Machine", "enable_advanced_monitor_support"))
         inputs["TimeScaleFactor"] = self._time_scale_factor
         inputs["MachineTimeStep"] = self._machine_time_step
         inputs["DatabaseSocketAddresses"] = self._database_socket_addresses
         inputs["DatabaseWaitOnConfirmationFlag"] = self._config.getboolean(
             "Database", "wait_on_confirmation")
+        confirmation_timeout = self._read_config(
+            "Database", "wait_on_confirmation_timeout")
+        inputs["DatabaseWaitOnConfirmationTimeout"] = (
+            None if confirmation_timeout is None
+            else float(confirmation_timeout))
         inputs["WriteCheckerFlag"] = self._config.getboolean(
             "Mode", "verify_writes")
         inputs["WriteTextSpecsFlag"] = self._config.getboolean(
@@ -1571,6 +1662,8 @@ class AbstractSpinnakerBase(SimulatorInterface):
         inputs["ExecutableFinder"] = self._executable_finder
         inputs["UserCreateDatabaseFlag"] = self._config.get(
             "Database", "create_database")
+        inputs["WriteAtomToEventMappingFlag"] = self._config.getboolean(
+            "Database", "write_atom_to_event_mapping")
         inputs["SendStartNotifications"] = self._config.getboolean(
             "Database", "send_start_notification")
         inputs["SendStopNotifications"] = self._config.getboolean(
@@ -1714,6 +1807,10 @@ class AbstractSpinnakerBase(SimulatorInterface):
             if self._buffer_manager is None:
                 inputs["StoreBufferDataInFile"] = self._config.getboolean(
                     "Buffers", "store_buffer_data_in_file")
+                inputs["MaxConcurrentExtractions"] = self._config.getint(
+                    "Buffers", "max_concurrent_extractions")
+                inputs["MaxConcurrentBufferRequests"] = self._config.getint(
+                    "Buffers", "max_concurrent_buffer_requests")
                 algorithms.append("BufferManagerCreator")
                 outputs.append("BufferManager")
             else:
@@ -1792,6 +1889,16 @@ class AbstractSpinnakerBase(SimulatorInterface):
             inputs["ExecutableTargets"] = self._last_run_outputs[
                 "ExecutableTargets"]
 
+        # Anything reloaded previously is overwritten by loading, and the
+        # regions of the cores are moved
+        region_table_cache = globals_variables.region_table_cache()
+        region_table_cache.clear()
+        self._region_reload_cache = RegionReloadCache(
+            cache_data=self._config.getboolean(
+                "SpecExecution", "reload_only_changed_data"),
+            region_table_cache=region_table_cache)
+        inputs["MemoryRegionReloadCache"] = self._region_reload_cache
+
         algorithms = list()
 
         # add report for extracting routing table from machine report if needed
@@ -1878,6 +1985,94 @@ class AbstractSpinnakerBase(SimulatorInterface):
             helpful_functions.convert_time_diff_to_total_milliseconds(
                 load_timer.take_sample())
 
+    def _run_planned_segments(
+            self, n_machine_time_steps, loading_done, run_until_complete):
+        """ Run in segments whose lengths are chosen by the segment planner\
+            from how the segments before went
+
+        :param n_machine_time_steps: the total run time in machine time steps
+        :type n_machine_time_steps: int
+        """
+        logger.info("Running in segments for a total of {} time steps",
+                    n_machine_time_steps)
+        n_steps_done = 0
+        while n_steps_done < n_machine_time_steps:
+            n_steps_remaining = n_machine_time_steps - n_steps_done
+            step = self._segment_planner.next_segment(n_steps_remaining)
+            logger.info("Running for {} of the {} time steps remaining",
+                        step, n_steps_remaining)
+            self._do_run(step, loading_done, run_until_complete)
+            n_steps_done += step
+
+    def _measure_segment(self, n_machine_time_steps, run_timer):
+        """ Work out where the time of a segment of a run went
+
+        :param n_machine_time_steps: the machine time steps run
+        :type n_machine_time_steps: int
+        :param run_timer: the timer started at the start of the segment
+        :rtype: :py:class:`SegmentTimings`
+        """
+        total_time_ms = \
+            helpful_functions.convert_time_diff_to_total_milliseconds(
+                run_timer.take_sample())
+        run_time_ms = (
+            n_machine_time_steps * self._machine_time_step *
+            self._time_scale_factor / 1000.0)
+        buffer_manager = self._buffer_manager
+        if buffer_manager is None or self._use_virtual_board:
+            return SegmentTimings(
+                n_machine_time_steps, run_time_ms, 0.0,
+                max(0.0, total_time_ms - run_time_ms))
+        return SegmentTimings(
+            n_machine_time_steps, run_time_ms,
+            buffer_manager.extraction_time_ms,
+            max(0.0, total_time_ms - run_time_ms -
+                buffer_manager.extraction_time_ms),
+            buffer_manager.n_bytes_read_during_run,
+            buffer_manager.read_time_during_run_ms,
+            buffer_manager.n_bytes_extracted, buffer_manager.core_bytes_read)
+
+    def _segment_provenance(self, segment):
+        """ Get the provenance of the timings of a segment of a run
+
+        :type segment: :py:class:`SegmentTimings`
+        :rtype: list(:py:class:`ProvenanceDataItem`)
+        """
+        names = ["run_segments", "segment_{}".format(self._n_run_segments)]
+        return [
+            ProvenanceDataItem(names + [name], value)
+            for name, value in (
+                ("n_machine_time_steps", segment.n_steps),
+                ("run_time_ms", segment.run_time_ms),
+                ("extraction_time_ms", segment.extraction_time_ms),
+                ("other_time_ms", segment.other_time_ms),
+                ("bytes_read_during_run", segment.n_bytes_read_during_run),
+                ("read_time_during_run_ms", segment.read_time_during_run_ms),
+                ("bytes_extracted", segment.n_bytes_extracted))]
+
+    def _board_extraction_provenance(self):
+        """ Get the provenance of the extraction of recorded data from each\
+            board in the last segment of a run
+
+        :rtype: list(:py:class:`ProvenanceDataItem`)
+        """
+        if self._buffer_manager is None:
+            return []
+        names = ["run_segments", "segment_{}".format(self._n_run_segments)]
+        items = list()
+        for chip, n_regions, n_bytes, time_ms in \
+                self._buffer_manager.board_extraction_statistics:
+            board_names = names + [
+                "board_unknown" if chip is None else
+                "board_{}_{}".format(*chip)]
+            items.append(ProvenanceDataItem(
+                board_names + ["regions_extracted"], n_regions))
+            items.append(ProvenanceDataItem(
+                board_names + ["bytes_extracted"], n_bytes))
+            items.append(ProvenanceDataItem(
+                board_names + ["extraction_time_ms"], time_ms))
+        return items
+
     def _do_run(self, n_machine_time_steps, loading_done, run_until_complete):
         # start timer
         run_timer = Timer()
@@ -1891,6 +2086,15 @@ class AbstractSpinnakerBase(SimulatorInterface):
             self._pacman_provenance.extract_provenance(executor)
             run_complete = True
 
+            # work out where the time of the segment went
+            segment = None
+            if n_machine_time_steps is not None:
+                segment = self._measure_segment(
+                    n_machine_time_steps, run_timer)
+                logger.debug("Segment {}: {}", self._n_run_segments, segment)
+                if self._segment_planner is not None:
+                    self._segment_planner.add_segment(segment)
+
             # write provenance to file if necessary
             if (self._config.getboolean(
                     "Reports", "write_provenance_data") and
@@ -1898,9 +2102,13 @@ class AbstractSpinnakerBase(SimulatorInterface):
                     n_machine_time_steps is not None):
                 prov_items = executor.get_item("ProvenanceItems")
                 prov_items.extend(self._pacman_provenance.data_items)
+                prov_items.extend(self._segment_provenance(segment))
+                prov_items.extend(self._board_extraction_provenance())
                 self._pacman_provenance.clear()
                 self._write_provenance(prov_items)
                 self._all_provenance_items.append(prov_items)
+            if segment is not None:
+                self._n_run_segments += 1
 
             # move data around
             self._last_run_outputs = executor.get_items()
@@ -1976,6 +2184,12 @@ class AbstractSpinnakerBase(SimulatorInterface):
         inputs["TotalMachineTimeSteps"] = total_run_timesteps
         inputs["RunTime"] = run_time
         inputs["FirstMachineTimeStep"] = self._current_run_timesteps
+        if self._region_reload_cache is not None:
+            inputs["MemoryRegionReloadCache"] = self._region_reload_cache
+        inputs["MaxConcurrentExtractions"] = self._config.getint(
+            "Buffers", "max_concurrent_extractions")
+        inputs["ExtractRecordingDuringRun"] = self._config.getboolean(
+            "Buffers", "extract_recording_during_run")
         if run_until_complete:
             inputs["RunUntilCompleteFlag"] = True
 
@@ -2061,6 +2275,9 @@ class AbstractSpinnakerBase(SimulatorInterface):
             algorithms.append("RouterProvenanceGatherer")
             algorithms.append("ProfileDataGatherer")
             outputs.append("ProvenanceItems")
+            if self._provenance_format == "sqlite":
+                inputs["ProvenanceItems"] = self._get_provenance_database(
+                    inputs.get("ProvenanceItems"))
 
         # Decide what needs done
         required_tokens = []
@@ -2075,15 +2292,39 @@ class AbstractSpinnakerBase(SimulatorInterface):
             provenance_path=self._pacman_executor_provenance_path,
             provenance_name="Execution"), total_run_timesteps
 
+    def _get_provenance_database(self, provenance_data_items=None):
+        """ Get the database in the provenance folder for the provenance\
+            gatherers to write to as they go, creating it the first time
+
+        :param provenance_data_items: any items gathered already, which are\
+            added to the database when it is created
+        :rtype: :py:class:`ProvenanceDatabase`
+        """
+        if self._provenance_database is None:
+            self._provenance_database = ProvenanceDatabase(
+                helpful_functions.generate_unique_folder_name(
+                    self._provenance_file_path, "provenance", ".sqlite3"))
+            if provenance_data_items is not None:
+                self._provenance_database.extend(provenance_data_items)
+        return self._provenance_database
+
     def _write_provenance(self, provenance_data_items):
         """ Write provenance to disk
         """
-        writer = None
         if self._provenance_format == "xml":
-            writer = ProvenanceXMLWriter()
+            ProvenanceXMLWriter()(
+                provenance_data_items, self._provenance_file_path)
         elif self._provenance_format == "json":
-            writer = ProvenanceJSONWriter()
-        writer(provenance_data_items, self._provenance_file_path)
+            ProvenanceJSONWriter()(
+                provenance_data_items, self._provenance_file_path)
+        else:
+            is_new = self._provenance_database is None
+            database = self._get_provenance_database(provenance_data_items)
+            if not is_new and provenance_data_items is not database:
+                database.extend(provenance_data_items)
+
+            # Let go of the file until there is more provenance
+            database.close()
 
     def _recover_from_error(self, exception, exc_info, executable_targets):
         # if exception has an exception, print to system
@@ -2236,6 +2477,18 @@ class AbstractSpinnakerBase(SimulatorInterface):
         # to 0
         self._no_sync_changes = 0
 
+        # the binaries might have changed the reloaded data since it was
+        # written, so it must all be written again, and anything that they
+        # wrote as they started might be different when they start again
+        if self._region_reload_cache is not None:
+            self._region_reload_cache.clear_data()
+        region_table_cache = globals_variables.region_table_cache()
+        logger.debug(
+            "Region addresses found {} times without reading the machine and"
+            " {} times by reading it", region_table_cache.n_hits,
+            region_table_cache.n_misses)
+        region_table_cache.clear_words()
+
         # sets the reset last flag to true, so that when run occurs, the tools
         # know to update the vertices which need to know a reset has occurred
         self._has_reset_last = True
@@ -2609,6 +2862,10 @@ class AbstractSpinnakerBase(SimulatorInterface):
         if self._config.getboolean("Reports", "extract_iobuf"):
             self._extract_iobufs()
 
+        # stop the threads handling buffer requests
+        if self._buffer_manager is not None:
+            self._buffer_manager.close()
+
         # shut down the machine properly
         self._shutdown(turn_off_machine, clear_routing_tables, clear_tags)
 
@@ -2618,6 +2875,8 @@ class AbstractSpinnakerBase(SimulatorInterface):
             if len(self._all_provenance_items) > 1:
                 message = "Provenance from run {}".format(i)
             self._check_provenance(provenance_items, message)
+        if self._provenance_database is not None:
+            self._provenance_database.close()
 
         helpful_functions.write_finished_file(
             self._app_data_top_simulation_folder,
@@ -2648,6 +2907,9 @@ class AbstractSpinnakerBase(SimulatorInterface):
             algorithms.append("RouterProvenanceGatherer")
             algorithms.append("ProfileDataGatherer")
             outputs.append("ProvenanceItems")
+            if self._provenance_format == "sqlite":
+                inputs["ProvenanceItems"] = self._get_provenance_database(
+                    inputs.get("ProvenanceItems"))
 
         # Assemble how to run the algorithms
         return PACMANAlgorithmExecutor(
@@ -2668,17 +2930,21 @@ class AbstractSpinnakerBase(SimulatorInterface):
         # acquire provenance items
         if self._last_run_outputs is not None:
             prov_items = self._last_run_outputs["ProvenanceItems"]
-            pacman_provenance = list()
-            router_provenance = list()
-
-            # group them by name type
-            grouped_items = sorted(
-                prov_items, key=lambda item: item.names[0])
-            for element in grouped_items:
-                if element.names[0] == 'pacman':
-                    pacman_provenance.append(element)
-                if element.names[0] == 'router_provenance':
-                    router_provenance.append(element)
+            if isinstance(prov_items, ProvenanceDatabase):
+                pacman_provenance = prov_items.get_items('pacman')
+                router_provenance = prov_items.get_items('router_provenance')
+            else:
+                pacman_provenance = list()
+                router_provenance = list()
+
+                # group them by name type
+                grouped_items = sorted(
+                    prov_items, key=lambda item: item.names[0])
+                for element in grouped_items:
+                    if element.names[0] == 'pacman':
+                        pacman_provenance.append(element)
+                    if element.names[0] == 'router_provenance':
+                        router_provenance.append(element)
 
             # run energy report
             energy_report(
@@ -2716,6 +2982,8 @@ class AbstractSpinnakerBase(SimulatorInterface):
     def _check_provenance(items, initial_message=None):
         """ Display any errors from provenance data
         """
+        if isinstance(items, ProvenanceDatabase):
+            items = items.get_warnings()
         initial_message_printed = False
         for item in items:
             if item.report:
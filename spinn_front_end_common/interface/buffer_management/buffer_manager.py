@@ -1,5 +1,4 @@
 # spinn_utilites imports
-from spinn_utilities.ordered_set import OrderedSet
 from spinn_utilities.progress_bar import ProgressBar
 
 # spinnman imports
@@ -22,17 +21,23 @@ from spinnman.messages.eieio.data_messages import EIEIODataMessage
 from spinn_front_end_common.utilities import helpful_functions as funs
 from spinn_front_end_common.utilities import exceptions
 from spinn_front_end_common.interface.buffer_management.storage_objects \
-    import BuffersSentDeque, BufferedReceivingData, ChannelBufferState
+    import BuffersSentDeque, BufferedReceivingData, ChannelBufferState, \
+    EncodedKeysMessage
 from spinn_front_end_common.utilities.constants \
     import SDP_PORTS, BUFFERING_OPERATIONS
+from .core_work_queues import CoreWorkQueues
 from .recording_utilities import TRAFFIC_IDENTIFIER, \
     get_last_sequence_number, get_region_pointer
 
 # general imports
 import os
 import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
 from multiprocessing.pool import ThreadPool
 import logging
+from six import iteritems
 from six.moves import xrange
 
 logger = FormatAdapter(logging.getLogger(__name__))
@@ -41,9 +46,6 @@ logger = FormatAdapter(logging.getLogger(__name__))
 _MIN_MESSAGE_SIZE = EIEIODataMessage.min_packet_length(
     eieio_type=EIEIOType.KEY_32_BIT, is_timestamp=True)
 
-# The number of bytes in each key to be sent
-_N_BYTES_PER_KEY = EIEIOType.KEY_32_BIT.key_bytes  # @UndefinedVariable
-
 
 class BufferManager(object):
     """ Manager of send buffers.
@@ -74,12 +76,10 @@ class BufferManager(object):
         # File used to hold received data
         "_received_data_db",
 
-        # Lock to avoid multiple messages being processed at the same time
+        # Lock to avoid extracting recorded data with more than one call at
+        # the same time
         "_thread_lock_buffer_out",
 
-        # Lock to avoid multiple messages being processed at the same time
-        "_thread_lock_buffer_in",
-
         # bool flag
         "_finished",
 
@@ -89,8 +89,9 @@ class BufferManager(object):
         # Store to file flag
         "_store_to_file",
 
-        # Buffering out thread pool
-        "_buffering_out_thread_pool",
+        # The queues of the requests of each core still to be handled, and
+        # the threads that handle them
+        "_request_queues",
 
         # the extra monitor cores which support faster data extraction
         "_extra_monitor_cores",
@@ -108,14 +109,44 @@ class BufferManager(object):
         "_machine",
 
         # flag for what data extraction to use
-        "_uses_advanced_monitors"
+        "_uses_advanced_monitors",
+
+        # the maximum number of boards to extract data from at once
+        "_max_concurrent_extractions",
+
+        # Lock to keep progress updates from extraction workers consistent,
+        # and the count of bytes read by the request workers
+        "_progress_lock",
+
+        # The number of bytes of recorded data read while running
+        "_n_bytes_read_during_run",
+
+        # The seconds spent reading recorded data while running
+        "_read_time_during_run",
+
+        # The number of bytes of recorded data extracted after running
+        "_n_bytes_extracted",
+
+        # The seconds spent extracting recorded data after running
+        "_extraction_time",
+
+        # dict of the (x, y, p) of each core to a list of the number of
+        # bytes of recorded data read from it while running and extracted
+        # from it after running
+        "_core_bytes",
+
+        # dict of the (x, y) of the Ethernet chip of each board to the
+        # number of regions and bytes extracted through it and the seconds
+        # it took
+        "_board_statistics"
     ]
 
     def __init__(self, placements, tags, transceiver, extra_monitor_cores,
                  extra_monitor_cores_to_ethernet_connection_map,
                  extra_monitor_to_chip_mapping, machine, fixed_routes,
                  uses_advanced_monitors, store_to_file=False,
-                 database_file=None):
+                 database_file=None, max_concurrent_extractions=1,
+                 max_concurrent_requests=1):
         """
         :param placements: The placements of the vertices
         :type placements:\
@@ -130,6 +161,15 @@ class BufferManager(object):
         :type store_to_file: bool
         :param database_file: The file to use as an SQL database.
         :type database_file: str
+        :param max_concurrent_extractions: The maximum number of boards\
+            (Ethernet-connected chips) to extract recorded data from at the\
+            same time; 1 means extract everything in sequence
+        :type max_concurrent_extractions: int
+        :param max_concurrent_requests: The maximum number of cores whose\
+            requests for buffers to be sent or read are handled at the same\
+            time while running; the requests of each core are always\
+            handled in the order received
+        :type max_concurrent_requests: int
         """
         # pylint: disable=too-many-arguments
         self._placements = placements
@@ -142,6 +182,8 @@ class BufferManager(object):
         self._fixed_routes = fixed_routes
         self._machine = machine
         self._uses_advanced_monitors = uses_advanced_monitors
+        self._max_concurrent_extractions = max(1, max_concurrent_extractions)
+        self._progress_lock = threading.Lock()
 
         # Set of (ip_address, port) that are being listened to for the tags
         self._seen_tags = set()
@@ -158,13 +200,15 @@ class BufferManager(object):
         self._received_data_db = database_file
         self._store_to_file = store_to_file
 
-        # Lock to avoid multiple messages being processed at the same time
+        # Lock to avoid multiple extractions at the same time; the requests
+        # of each core are kept apart from extracting the data of the core by
+        # the lock of the core in the request queues
         self._thread_lock_buffer_out = threading.RLock()
-        self._thread_lock_buffer_in = threading.RLock()
-        self._buffering_out_thread_pool = ThreadPool(processes=1)
+        self._request_queues = CoreWorkQueues(max_concurrent_requests)
 
         self._finished = False
         self._listener_port = None
+        self._reset_read_statistics()
 
     def _request_data(self, transceiver, placement_x, placement_y, address,
                       length):
@@ -221,13 +265,21 @@ class BufferManager(object):
     # Factored out of receive_buffer_command_message to keep code readable
     def __request_buffers(self, packet):
         if not self._finished:
-            with self._thread_lock_buffer_in:
+            self._request_queues.add_work(
+                (packet.x, packet.y, packet.p),
+                self._process_request_buffers, packet)
+
+    def _process_request_buffers(self, packet):
+        try:
+            if not self._finished:
                 vertex = self._placements.get_vertex_on_processor(
                     packet.x, packet.y, packet.p)
                 if vertex in self._sender_vertices:
                     self._send_messages(
                         packet.space_available, vertex,
                         packet.region_id, packet.sequence_no)
+        except Exception:
+            logger.exception("problem when sending messages")
 
     # Factored out of receive_buffer_command_message to keep code readable
     def __request_read_data(self, packet):
@@ -243,8 +295,9 @@ class BufferManager(object):
             ack_message = SDPMessage(
                 ack_message_header, ack_message_data.bytestring)
             self._transceiver.send_sdp_message(ack_message)
-        self._buffering_out_thread_pool.apply_async(
-            self._process_buffered_in_packet, args=[packet])
+        self._request_queues.add_work(
+            (packet.x, packet.y, packet.p),
+            self._process_buffered_in_packet, packet)
 
     def _create_connection(self, tag):
         connection = self._transceiver.register_udp_listener(
@@ -346,8 +399,18 @@ class BufferManager(object):
 
         # update the received data items
         self._received_data.resume()
+        self._request_queues.reset_statistics()
+        self._reset_read_statistics()
         self._finished = False
 
+    def _reset_read_statistics(self):
+        self._n_bytes_read_during_run = 0
+        self._read_time_during_run = 0.0
+        self._n_bytes_extracted = 0
+        self._extraction_time = 0.0
+        self._core_bytes = dict()
+        self._board_statistics = OrderedDict()
+
     def clear_recorded_data(self, x, y, p, recording_region_id):
         """ Removes the recorded data stored in memory.
 
@@ -368,8 +431,9 @@ class BufferManager(object):
             length=ChannelBufferState.size_of_channel_state())
         return ChannelBufferState.create_from_bytearray(channel_state_data)
 
-    def _create_message_to_send(self, size, vertex, region):
-        """ Creates a single message to send with the given boundaries.
+    def _get_keys_to_send(self, size, vertex, region):
+        """ Get the keys of a single message to send with the given\
+            boundaries.
 
         :param size: The number of bytes available for the whole packet
         :type size: int
@@ -378,34 +442,41 @@ class BufferManager(object):
             :py:class:`spynnaker.pyNN.models.abstract_models.buffer_models.AbstractSendsBuffersFromHost`
         :param region: The region of the vertex to get keys from
         :type region: int
-        :return: A new message, or None if no keys can be added
-        :rtype: None or\
-            :py:class:`spinnman.messages.eieio.data_messages.EIEIODataMessage`
+        :return: The timestamp and keys of a new message, or None if no\
+            keys can be added
+        :rtype: None or tuple(int, iterable(int))
         """
 
         # If there are no more messages to send, return None
         if not vertex.is_next_timestamp(region):
             return None
 
-        # Create a new message
-        next_timestamp = vertex.get_next_timestamp(region)
-        message = EIEIODataMessage.create(
-            EIEIOType.KEY_32_BIT, timestamp=next_timestamp)
-
         # If there is no room for the message, return None
-        if message.size + _N_BYTES_PER_KEY > size:
+        max_n_keys = EncodedKeysMessage.get_max_n_keys(size)
+        if not max_n_keys:
             return None
 
-        # Add keys up to the limit
-        bytes_to_go = size - message.size
-        while (bytes_to_go >= _N_BYTES_PER_KEY and
-                vertex.is_next_key(region, next_timestamp)):
+        # Get keys up to the limit
+        return vertex.get_next_keys(region, max_n_keys)
 
-            key = vertex.get_next_key(region)
-            message.add_key(key)
-            bytes_to_go -= _N_BYTES_PER_KEY
+    def _create_message_to_send(self, size, vertex, region):
+        """ Creates a single message to send with the given boundaries.
 
-        return message
+        :param size: The number of bytes available for the whole packet
+        :type size: int
+        :param vertex: The vertex to get the keys from
+        :type vertex:\
+            :py:class:`spynnaker.pyNN.models.abstract_models.buffer_models.AbstractSendsBuffersFromHost`
+        :param region: The region of the vertex to get keys from
+        :type region: int
+        :return: A new message, or None if no keys can be added
+        :rtype: None or\
+            :py:class:`spinn_front_end_common.interface.buffer_management.storage_objects.EncodedKeysMessage`
+        """
+        timestamp_and_keys = self._get_keys_to_send(size, vertex, region)
+        if timestamp_and_keys is None:
+            return None
+        return EncodedKeysMessage(*timestamp_and_keys)
 
     def _send_initial_messages(self, vertex, region, progress):
         """ Send the initial set of messages
@@ -427,14 +498,16 @@ class BufferManager(object):
             self._transceiver)
         placement = self._placements.get_placement_of_vertex(vertex)
 
-        # Add packets until out of space
+        # Add packets until out of space; they are encoded straight into a
+        # buffer the size of the region
         sent_message = False
         bytes_to_go = vertex.get_region_buffer_size(region)
         if bytes_to_go % 2 != 0:
             raise exceptions.SpinnFrontEndException(
                 "The buffer region of {} must be divisible by 2".format(
                     vertex))
-        all_data = b""
+        all_data = bytearray(bytes_to_go)
+        n_bytes = 0
         if vertex.is_empty(region):
             sent_message = True
         else:
@@ -442,19 +515,20 @@ class BufferManager(object):
             while (vertex.is_next_timestamp(region) and
                     bytes_to_go > min_size_of_packet):
                 space_available = min(bytes_to_go, 280)
-                next_message = self._create_message_to_send(
+                timestamp_and_keys = self._get_keys_to_send(
                     space_available, vertex, region)
-                if next_message is None:
+                if timestamp_and_keys is None:
                     break
 
                 # Write the message to the memory
-                data = next_message.bytestring
-                all_data += data
+                end = EncodedKeysMessage.write(
+                    all_data, n_bytes, *timestamp_and_keys)
                 sent_message = True
 
                 # Update the positions
-                bytes_to_go -= len(data)
-                progress.update(len(data))
+                bytes_to_go -= end - n_bytes
+                progress.update(end - n_bytes)
+                n_bytes = end
 
         if not sent_message:
             raise exceptions.BufferableRegionTooSmall(
@@ -469,7 +543,8 @@ class BufferManager(object):
             #    "Writing stop message of {} bytes to {} on {}, {}, {}".format(
             #         len(data), hex(region_base_address),
             #         placement.x, placement.y, placement.p))
-            all_data += data
+            all_data[n_bytes:n_bytes + len(data)] = data
+            n_bytes += len(data)
             bytes_to_go -= len(data)
             progress.update(len(data))
             self._sent_messages[vertex] = BuffersSentDeque(
@@ -481,11 +556,13 @@ class BufferManager(object):
             n_packets = bytes_to_go // padding_packet.get_min_packet_length()
             data = padding_packet.bytestring
             data *= n_packets
-            all_data += data
+            all_data[n_bytes:n_bytes + len(data)] = data
+            n_bytes += len(data)
 
         # Do the writing all at once for efficiency
         self._transceiver.write_memory(
-            placement.x, placement.y, region_base_address, all_data)
+            placement.x, placement.y, region_base_address, all_data,
+            n_bytes=n_bytes)
 
     def _send_messages(self, size, vertex, region, sequence_no):
         """ Send a set of messages
@@ -503,7 +580,8 @@ class BufferManager(object):
         # Remote the existing packets from the size available
         bytes_to_go = size
         for message in sent_messages.messages:
-            if isinstance(message.eieio_data_message, EIEIODataMessage):
+            if isinstance(message.eieio_data_message,
+                          (EIEIODataMessage, EncodedKeysMessage)):
                 bytes_to_go -= message.eieio_data_message.size
             else:
                 bytes_to_go -= (message.eieio_data_message
@@ -565,48 +643,298 @@ class BufferManager(object):
         """ Indicates that the simulation has finished, so no further\
             outstanding requests need to be processed
         """
-        with self._thread_lock_buffer_in:
-            with self._thread_lock_buffer_out:
-                self._finished = True
+        with self._thread_lock_buffer_out:
+            self._finished = True
+
+            # Any requests still queued are dropped as they are reached
+            self._request_queues.wait_until_idle()
+        logger.debug(
+            "Handled {} buffer requests, with at most {} waiting, reading {} "
+            "bytes of recorded data; latencies (ms bound, count): {}",
+            self._request_queues.n_done,
+            self._request_queues.max_queue_depth,
+            self._n_bytes_read_during_run,
+            self._request_queues.latency_histogram)
+
+    def close(self):
+        """ Stop the threads which handle the buffer requests, once any\
+            requests received have been handled; the buffer manager cannot\
+            be used for another run afterwards
+        """
+        self._request_queues.close()
+
+    @property
+    def request_latency_histogram(self):
+        """ The number of buffer requests handled during the run which\
+            took each length of time from being received to being handled
+
+        :return: list of (upper bound in milliseconds, or None for no\
+            bound, number of requests)
+        :rtype: list(tuple(float or None, int))
+        """
+        return self._request_queues.latency_histogram
+
+    @property
+    def request_queue_depth(self):
+        """ The number of buffer requests received but not yet handled
+
+        :rtype: int
+        """
+        return self._request_queues.queue_depth
+
+    @property
+    def max_request_queue_depth(self):
+        """ The largest number of buffer requests waiting to be handled at\
+            any one time during the run
+
+        :rtype: int
+        """
+        return self._request_queues.max_queue_depth
+
+    @property
+    def n_bytes_read_during_run(self):
+        """ The number of bytes of recorded data read in answer to requests\
+            from the cores while the simulation was running
+
+        :rtype: int
+        """
+        return self._n_bytes_read_during_run
+
+    @property
+    def read_time_during_run_ms(self):
+        """ The time in milliseconds spent reading recorded data in answer\
+            to requests from the cores while the simulation was running,\
+            added up over the cores
+
+        :rtype: float
+        """
+        return self._read_time_during_run * 1000.0
+
+    @property
+    def n_bytes_extracted(self):
+        """ The number of bytes of recorded data extracted since the\
+            simulation was last started
+
+        :rtype: int
+        """
+        return self._n_bytes_extracted
+
+    @property
+    def extraction_time_ms(self):
+        """ The time in milliseconds spent extracting recorded data since\
+            the simulation was last started
+
+        :rtype: float
+        """
+        return self._extraction_time * 1000.0
+
+    @property
+    def core_bytes_read(self):
+        """ The recorded data read from each core since the simulation was\
+            last started
+
+        :return: dict of (x, y, p) of the core to the number of bytes read\
+            from it while running and the number of bytes extracted from\
+            it after running
+        :rtype: dict(tuple(int, int, int), tuple(int, int))
+        """
+        with self._progress_lock:
+            return {
+                core: tuple(n_bytes)
+                for core, n_bytes in iteritems(self._core_bytes)}
+
+    @property
+    def board_extraction_statistics(self):
+        """ How the extraction of recorded data went on each board since\
+            the simulation was last started
+
+        :return: list of ((x, y) of the Ethernet chip of the board, or None\
+            if not known, number of regions extracted, number of bytes\
+            extracted, time in milliseconds taken)
+        :rtype: list(tuple(tuple(int, int), int, int, float))
+        """
+        with self._progress_lock:
+            return [
+                (chip, n_regions, n_bytes, seconds * 1000.0)
+                for chip, (n_regions, n_bytes, seconds) in iteritems(
+                    self._board_statistics)]
+
+    @contextmanager
+    def _cores_locked(self, placements):
+        """ Keep the requests of the cores of some placements from being\
+            handled while their data is extracted
+        """
+        locks = [self._request_queues.core_lock((
+            placement.x, placement.y, placement.p))
+            for placement in placements]
+        for lock in locks:
+            lock.acquire()
+        try:
+            yield
+        finally:
+            for lock in reversed(locks):
+                lock.release()
 
     def get_data_for_vertices(self, vertices, progress=None):
         with self._thread_lock_buffer_out:
-            self._get_data_for_vertices_locked(vertices, progress)
+            start_time = time.time()
+            try:
+                self._get_data_for_vertices_locked(vertices, progress)
+            finally:
+                self._extraction_time += time.time() - start_time
 
     def _get_data_for_vertices_locked(self, vertices, progress=None):
-        receivers = OrderedSet()
+        # locate receivers (or boards when not using them)
+        boards = self._group_vertices_by_board(vertices)
         if self._uses_advanced_monitors:
 
-            # locate receivers
-            for vertex in vertices:
-                placement = self._placements.get_placement_of_vertex(vertex)
-                receivers.add(funs.locate_extra_monitor_mc_receiver(
-                    self._machine, placement.x, placement.y,
-                    self._extra_monitor_cores_to_ethernet_connection_map))
-
             # set time out
-            for receiver in receivers:
+            for receiver in boards:
                 receiver.set_cores_for_data_extraction(
                     transceiver=self._transceiver, placements=self._placements,
                     extra_monitor_cores_for_router_timeout=(
                         self._extra_monitor_cores))
 
-        # get data
-        for vertex in vertices:
-            placement = self._placements.get_placement_of_vertex(vertex)
-            for recording_region_id in vertex.get_recorded_region_ids():
-                self.get_data_for_vertex(placement, recording_region_id)
-                if progress is not None:
-                    progress.update()
+        # get data; the database connection can only be used by the thread
+        # that created it, so only go concurrent when it isn't in use
+        n_workers = min(self._max_concurrent_extractions, len(boards))
+        if n_workers > 1 and self._received_data_db is None:
+            pool = ThreadPool(processes=n_workers)
+            try:
+                results = [
+                    pool.apply_async(
+                        self._get_data_for_board,
+                        args=[board, placements, progress])
+                    for board, placements in boards.items()]
+                for result in results:
+                    result.get()
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            for board, placements in boards.items():
+                self._get_data_for_board(board, placements, progress)
 
         # revert time out
         if self._uses_advanced_monitors:
-            for receiver in receivers:
+            for receiver in boards:
                 receiver.unset_cores_for_data_extraction(
                     transceiver=self._transceiver, placements=self._placements,
                     extra_monitor_cores_for_router_timeout=(
                         self._extra_monitor_cores))
 
+    def _group_vertices_by_board(self, vertices):
+        """ Group the placements of the vertices by the board that their\
+            data will be extracted through; this is the data speed up\
+            gatherer when advanced monitors are in use, or the nearest\
+            Ethernet-connected chip otherwise.
+
+        :param vertices: the vertices to group
+        :return: dict of board identifier to list of placements, in the\
+            order the vertices were given
+        :rtype: dict(object, list(pacman.model.placements.Placement))
+        """
+        boards = OrderedDict()
+        for vertex in vertices:
+            placement = self._placements.get_placement_of_vertex(vertex)
+            if self._uses_advanced_monitors:
+                board = funs.locate_extra_monitor_mc_receiver(
+                    self._machine, placement.x, placement.y,
+                    self._extra_monitor_cores_to_ethernet_connection_map)
+            elif self._machine is not None:
+                chip = self._machine.get_chip_at(placement.x, placement.y)
+                board = (chip.nearest_ethernet_x, chip.nearest_ethernet_y)
+            else:
+                board = None
+            boards.setdefault(board, list()).append(placement)
+        return boards
+
+    def _get_data_for_board(self, board, placements, progress):
+        """ Extract all the recorded data of the placements on one board.\
+            Each board is only ever handled by one thread at a time, so the\
+            speed up gatherer of the board does not need to be shared.
+
+        :param board: the board identifier; the data speed up gatherer when\
+            advanced monitors are in use
+        :param placements: the placements on the board
+        :param progress: the progress bar to update, or None
+        """
+        start_time = time.time()
+        with self._cores_locked(placements):
+            n_regions, n_bytes = self._get_data_for_board_locked(
+                board, placements, progress)
+        seconds = time.time() - start_time
+        chip = self._board_chip(board)
+        logger.debug(
+            "Extracted {} regions ({} bytes) from {} cores of board {} in "
+            "{}s", n_regions, n_bytes, len(placements), chip, seconds)
+        with self._progress_lock:
+            old_regions, old_bytes, old_seconds = \
+                self._board_statistics.get(chip, (0, 0, 0.0))
+            self._board_statistics[chip] = (
+                old_regions + n_regions, old_bytes + n_bytes,
+                old_seconds + seconds)
+
+    def _board_chip(self, board):
+        """ Get the (x, y) of the Ethernet chip of a board, as grouped by\
+            :py:meth:`_group_vertices_by_board`, or None if not known
+        """
+        if self._uses_advanced_monitors:
+            placement = self._placements.get_placement_of_vertex(board)
+            return placement.x, placement.y
+        return board
+
+    def _get_data_for_board_locked(self, board, placements, progress):
+        """ Extract all the recorded data of the placements on one board;\
+            the cores of the placements must be locked first
+
+        :return: the number of regions and the number of bytes extracted
+        :rtype: tuple(int, int)
+        """
+        n_regions = 0
+        n_bytes = 0
+        if self._uses_advanced_monitors:
+            # locate everything to be read, then read it all in one batch
+            regions = list()
+            reads = list()
+            for placement in placements:
+                sender = self._placements.get_placement_of_vertex(
+                    self._extra_monitor_cores_by_chip[
+                        placement.x, placement.y])
+                for recording_region_id in \
+                        placement.vertex.get_recorded_region_ids():
+                    n_regions += 1
+                    region_reads = self._locate_region_data_to_read(
+                        placement, recording_region_id)
+                    if region_reads is not None:
+                        regions.append((
+                            placement, recording_region_id,
+                            len(reads), len(region_reads)))
+                        reads.extend(
+                            (sender, address, length)
+                            for address, length in region_reads)
+            data = board.get_data_for_reads(
+                self._transceiver, reads, self._fixed_routes)
+            n_bytes = sum(len(block) for block in data)
+            for placement, recording_region_id, first, n_reads in regions:
+                self._store_region_data(
+                    placement, recording_region_id,
+                    data[first:first + n_reads])
+            if progress is not None:
+                with self._progress_lock:
+                    progress.update(n_regions)
+        else:
+            for placement in placements:
+                for recording_region_id in \
+                        placement.vertex.get_recorded_region_ids():
+                    n_bytes += self._read_region_locked(
+                        placement, recording_region_id)
+                    n_regions += 1
+                    if progress is not None:
+                        with self._progress_lock:
+                            progress.update()
+        return n_regions, n_bytes
+
     def get_data_for_vertex(self, placement, recording_region_id):
         """ Get a handle to the data container for all the data retrieved\
             during the simulation from a specific region area of a core
@@ -622,8 +950,9 @@ class BufferManager(object):
 
         # Ensure that any transfers in progress are complete first
         with self._thread_lock_buffer_out:
-            return self._get_data_for_vertex_locked(
-                placement, recording_region_id)
+            with self._cores_locked([placement]):
+                return self._get_data_for_vertex_locked(
+                    placement, recording_region_id)
 
     def _get_data_for_vertex_locked(self, placement, recording_region_id):
         """ Get the data for a vertex; must be locked first
@@ -636,6 +965,47 @@ class BufferManager(object):
         :rtype:\
             :py:class:`spinn_front_end_common.interface.buffer_management.buffer_models.AbstractBufferedDataStorage`
         """
+        self._read_region_locked(placement, recording_region_id)
+
+        # data flush has been completed - return appropriate data
+        # the two returns can be exchanged - one returns data and the other
+        # returns a pointer to the structure holding the data
+        data = self._received_data.get_region_data_pointer(
+            placement.x, placement.y, placement.p, recording_region_id)
+        return data
+
+    def _read_region_locked(self, placement, recording_region_id):
+        """ Read whatever has not yet been read of a recording region of a\
+            core, one read at a time; must be locked first
+
+        :return: the number of bytes read
+        :rtype: int
+        """
+        reads = self._locate_region_data_to_read(
+            placement, recording_region_id)
+        if reads is None:
+            return 0
+        data = [
+            self._request_data(
+                transceiver=self._transceiver,
+                placement_x=placement.x, placement_y=placement.y,
+                address=address, length=length)
+            for address, length in reads]
+        self._store_region_data(placement, recording_region_id, data)
+        return sum(len(block) for block in data)
+
+    def _locate_region_data_to_read(self, placement, recording_region_id):
+        """ Work out which blocks of memory still have to be read to flush a\
+            recording region; must be locked first
+
+        :param placement: the placement to get the data from
+        :type placement: pacman.model.placements.Placement
+        :param recording_region_id: desired recording data region
+        :type recording_region_id: int
+        :return: list of (address, length) to read in order, or None if the\
+            region has already been flushed
+        :rtype: list(tuple(int, int)) or None
+        """
         recording_data_address = \
             placement.vertex.get_recording_region_base_address(
                 self._transceiver, placement)
@@ -648,136 +1018,102 @@ class BufferManager(object):
                 get_last_sequence_number(
                     placement, self._transceiver, recording_data_address))
 
-        # Read the data if not already received
-        if not self._received_data.is_data_from_region_flushed(
-                placement.x, placement.y, placement.p,
-                recording_region_id):
-
-            # Read the end state of the recording for this region
-            if not self._received_data.is_end_buffering_state_recovered(
-                    placement.x, placement.y, placement.p,
-                    recording_region_id):
-                end_state = self._generate_end_buffering_state_from_machine(
-                    placement, get_region_pointer(
-                        placement, self._transceiver, recording_data_address,
-                        recording_region_id))
-                self._received_data.store_end_buffering_state(
-                    placement.x, placement.y, placement.p, recording_region_id,
-                    end_state)
-            else:
-                end_state = self._received_data.get_end_buffering_state(
-                    placement.x, placement.y, placement.p, recording_region_id)
-
-            # current read needs to be adjusted in case the last portion of the
-            # memory has already been read, but the HostDataRead packet has not
-            # been processed by the chip before simulation finished.
-            # This situation is identified by the sequence number of the last
-            # packet sent to this core and the core internal state of the
-            # output buffering finite state machine
-            seq_no_last_ack_packet = \
-                self._received_data.last_sequence_no_for_core(
-                    placement.x, placement.y, placement.p)
-
-            # get the sequence number the core was expecting to see next
-            core_next_sequence_number = \
-                self._received_data.get_end_buffering_sequence_number(
-                    placement.x, placement.y, placement.p)
-
-            # if the core was expecting to see our last sent sequence,
-            # it must not have received it
-            if core_next_sequence_number == seq_no_last_ack_packet:
-                self._process_last_ack(placement, recording_region_id,
-                                       end_state)
-
-            # now state is updated, read back values for read pointer and
-            # last operation performed
-            last_operation = end_state.last_buffer_operation
-            start_ptr = end_state.start_address
-            end_ptr = end_state.end_address
-            write_ptr = end_state.current_write
-            read_ptr = end_state.current_read
-
-            # now read_ptr is updated, check memory to read
-            if read_ptr < write_ptr:
-                length = write_ptr - read_ptr
-                logger.debug(
-                    "< Reading {} bytes from {}, {}, {}: {} for region {}",
-                    length, placement.x, placement.y, placement.p,
-                    hex(read_ptr), recording_region_id)
-                data = self._request_data(
-                    transceiver=self._transceiver, placement_x=placement.x,
-                    address=read_ptr, length=length, placement_y=placement.y)
-                self._received_data.flushing_data_from_region(
-                    placement.x, placement.y, placement.p, recording_region_id,
-                    data)
-
-            elif read_ptr > write_ptr:
-                length = end_ptr - read_ptr
-                if length < 0:
-                    raise exceptions.ConfigurationException(
-                        "The amount of data to read is negative!")
-                logger.debug(
-                    "> Reading {} bytes from {}, {}, {}: {} for region {}",
-                    length, placement.x, placement.y, placement.p,
-                    hex(read_ptr), recording_region_id)
-                data = self._request_data(
-                    transceiver=self._transceiver, placement_x=placement.x,
-                    address=read_ptr, length=length, placement_y=placement.y)
-                self._received_data.store_data_in_region_buffer(
-                    placement.x, placement.y, placement.p, recording_region_id,
-                    data)
-                read_ptr = start_ptr
-                length = write_ptr - read_ptr
-                logger.debug(
-                    "Reading {} bytes from {}, {}, {}: {} for region {}",
-                    length, placement.x, placement.y, placement.p,
-                    hex(read_ptr), recording_region_id)
-                data = self._request_data(
-                    transceiver=self._transceiver, placement_x=placement.x,
-                    address=read_ptr, length=length, placement_y=placement.y)
-                self._received_data.flushing_data_from_region(
-                    placement.x, placement.y, placement.p, recording_region_id,
-                    data)
-
-            elif (read_ptr == write_ptr and
-                    last_operation == BUFFERING_OPERATIONS.BUFFER_WRITE.value):
-                length = end_ptr - read_ptr
-                logger.debug(
-                    "= Reading {} bytes from {}, {}, {}: {} for region {}",
-                    length, placement.x, placement.y, placement.p,
-                    hex(read_ptr), recording_region_id)
-                data = self._request_data(
-                    transceiver=self._transceiver, placement_x=placement.x,
-                    address=read_ptr, length=length, placement_y=placement.y)
-                self._received_data.store_data_in_region_buffer(
-                    placement.x, placement.y, placement.p, recording_region_id,
-                    data)
-                read_ptr = start_ptr
-                length = write_ptr - read_ptr
-                logger.debug(
-                    "Reading {} bytes from {}, {}, {}: {} for region {}",
-                    length, placement.x, placement.y, placement.p,
-                    hex(read_ptr), recording_region_id)
-                data = self._request_data(
-                    transceiver=self._transceiver, placement_x=placement.x,
-                    address=read_ptr, length=length, placement_y=placement.y)
-                self._received_data.flushing_data_from_region(
-                    placement.x, placement.y, placement.p, recording_region_id,
-                    data)
-
-            elif (read_ptr == write_ptr and
-                    last_operation == BUFFERING_OPERATIONS.BUFFER_READ.value):
-                data = bytearray()
-                self._received_data.flushing_data_from_region(
-                    placement.x, placement.y, placement.p, recording_region_id,
-                    data)
+        # Nothing to read if already received
+        if self._received_data.is_data_from_region_flushed(
+                placement.x, placement.y, placement.p, recording_region_id):
+            return None
 
-        # data flush has been completed - return appropriate data
-        # the two returns can be exchanged - one returns data and the other
-        # returns a pointer to the structure holding the data
-        data = self._received_data.get_region_data_pointer(
-            placement.x, placement.y, placement.p, recording_region_id)
-        return data
+        # Read the end state of the recording for this region
+        if not self._received_data.is_end_buffering_state_recovered(
+                placement.x, placement.y, placement.p, recording_region_id):
+            end_state = self._generate_end_buffering_state_from_machine(
+                placement, get_region_pointer(
+                    placement, self._transceiver, recording_data_address,
+                    recording_region_id))
+            self._received_data.store_end_buffering_state(
+                placement.x, placement.y, placement.p, recording_region_id,
+                end_state)
+        else:
+            end_state = self._received_data.get_end_buffering_state(
+                placement.x, placement.y, placement.p, recording_region_id)
+
+        # current read needs to be adjusted in case the last portion of the
+        # memory has already been read, but the HostDataRead packet has not
+        # been processed by the chip before simulation finished.
+        # This situation is identified by the sequence number of the last
+        # packet sent to this core and the core internal state of the
+        # output buffering finite state machine
+        seq_no_last_ack_packet = \
+            self._received_data.last_sequence_no_for_core(
+                placement.x, placement.y, placement.p)
+
+        # get the sequence number the core was expecting to see next
+        core_next_sequence_number = \
+            self._received_data.get_end_buffering_sequence_number(
+                placement.x, placement.y, placement.p)
+
+        # if the core was expecting to see our last sent sequence,
+        # it must not have received it
+        if core_next_sequence_number == seq_no_last_ack_packet:
+            self._process_last_ack(placement, recording_region_id,
+                                   end_state)
+
+        # now state is updated, read back values for read pointer and
+        # last operation performed
+        last_operation = end_state.last_buffer_operation
+        start_ptr = end_state.start_address
+        end_ptr = end_state.end_address
+        write_ptr = end_state.current_write
+        read_ptr = end_state.current_read
+
+        # now read_ptr is updated, check memory to read
+        if read_ptr < write_ptr:
+            reads = [(read_ptr, write_ptr - read_ptr)]
+        elif read_ptr > write_ptr:
+            length = end_ptr - read_ptr
+            if length < 0:
+                raise exceptions.ConfigurationException(
+                    "The amount of data to read is negative!")
+            reads = [(read_ptr, length), (start_ptr, write_ptr - start_ptr)]
+        elif last_operation == BUFFERING_OPERATIONS.BUFFER_WRITE.value:
+            reads = [(read_ptr, end_ptr - read_ptr),
+                     (start_ptr, write_ptr - start_ptr)]
+        else:
+            # read_ptr == write_ptr and the last operation was a read
+            reads = []
+
+        for address, length in reads:
+            logger.debug(
+                "Reading {} bytes from {}, {}, {}: {} for region {}",
+                length, placement.x, placement.y, placement.p,
+                hex(address), recording_region_id)
+        return reads
+
+    def _store_region_data(self, placement, recording_region_id, data):
+        """ Store the data read from a recording region and mark it as\
+            flushed; must be locked first
+
+        :param placement: the placement the data came from
+        :type placement: pacman.model.placements.Placement
+        :param recording_region_id: the recording region the data came from
+        :type recording_region_id: int
+        :param data: the blocks of data read, in the order they were located
+        :type data: list(bytearray)
+        """
+        if not data:
+            data = [bytearray()]
+        n_bytes = sum(len(block) for block in data)
+        with self._progress_lock:
+            self._n_bytes_extracted += n_bytes
+            self._core_bytes.setdefault(
+                (placement.x, placement.y, placement.p), [0, 0])[1] += n_bytes
+        for block in data[:-1]:
+            self._received_data.store_data_in_region_buffer(
+                placement.x, placement.y, placement.p, recording_region_id,
+                block)
+        self._received_data.flushing_data_from_region(
+            placement.x, placement.y, placement.p, recording_region_id,
+            data[-1])
 
     def _process_last_ack(self, placement, region_id, end_state):
         # if the last ACK packet has not been processed on the chip,
@@ -820,9 +1156,8 @@ class BufferManager(object):
             packet.n_requests, packet.sequence_no,
             packet.x, packet.y, packet.p)
         try:
-            with self._thread_lock_buffer_out:
-                if not self._finished:
-                    self._retrieve_and_store_data(packet)
+            if not self._finished:
+                self._retrieve_and_store_data(packet)
         except Exception:
             logger.warning("problem when handling data", exc_info=True)
 
@@ -900,12 +1235,18 @@ class BufferManager(object):
 
             # Note this *always* uses the transceiver, as fast data transfer
             # isn't guaranteed to work whilst a simulation is running!
+            start_time = time.time()
+            data = self._transceiver.read_memory(x, y, start_address, length)
+            read_time = time.time() - start_time
             self._received_data.store_data_in_region_buffer(
-                x, y, p, region_id, self._transceiver.read_memory(
-                    x, y, start_address, length))
+                x, y, p, region_id, data)
             channels.append(channel)
             region_ids.append(region_id)
             space_read.append(length)
+            with self._progress_lock:
+                self._n_bytes_read_during_run += length
+                self._read_time_during_run += read_time
+                self._core_bytes.setdefault((x, y, p), [0, 0])[0] += length
 
         # create return acknowledge packet with data stored
         return HostDataRead(
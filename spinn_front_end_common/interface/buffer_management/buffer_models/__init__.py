@@ -1,7 +1,10 @@
 from .abstract_receive_buffers_to_host import AbstractReceiveBuffersToHost
 from .abstract_sends_buffers_from_host import AbstractSendsBuffersFromHost
+from .abstract_supports_extraction_during_run \
+    import AbstractSupportsExtractionDuringRun
 from .sends_buffers_from_host_pre_buffered_impl \
     import SendsBuffersFromHostPreBufferedImpl
 
 __all__ = ["AbstractReceiveBuffersToHost", "AbstractSendsBuffersFromHost",
+           "AbstractSupportsExtractionDuringRun",
            "SendsBuffersFromHostPreBufferedImpl"]
@@ -93,6 +93,24 @@ class AbstractSendsBuffersFromHost(object):
         :rtype: int
         """
 
+    def get_next_keys(self, region, max_n_keys):
+        """ Get the next keys in the given region, all of which are to be\
+            sent at the next timestamp
+
+        :param region: The region to get the next keys from
+        :type region: int
+        :param max_n_keys: The most keys to get
+        :type max_n_keys: int
+        :return: The timestamp of the keys, and the keys
+        :rtype: tuple(int, iterable(int))
+        """
+        timestamp = self.get_next_timestamp(region)
+        keys = list()
+        while (len(keys) < max_n_keys and
+                self.is_next_key(region, timestamp)):
+            keys.append(self.get_next_key(region))
+        return timestamp, keys
+
     @abstractmethod
     def is_empty(self, region):
         """ Return true if there are no spikes to be buffered for the\
@@ -0,0 +1,19 @@
+from six import add_metaclass
+
+from spinn_utilities.abstract_base import AbstractBase, abstractproperty
+
+
+@add_metaclass(AbstractBase)
+class AbstractSupportsExtractionDuringRun(object):
+    """ Marks a vertex which receives buffers to host as able to ask for its\
+        recording buffers to be read while the simulation runs, once they\
+        have filled past a threshold.
+    """
+
+    __slots__ = ()
+
+    @abstractproperty
+    def is_extracting_during_run(self):
+        """ Whether the recording header of this vertex has a threshold at\
+            which it asks for its recording buffers to be read.
+        """
@@ -85,6 +85,14 @@ class SendsBuffersFromHostPreBufferedImpl(AbstractSendsBuffersFromHost):
         """
         return self.send_buffers[region].next_key
 
+    def get_next_keys(self, region, max_n_keys):
+        """ Get the next keys for a given region, without copying them
+
+        :param region: the region to get the next keys from
+        :param max_n_keys: the most keys to get
+        """
+        return self.send_buffers[region].get_next_keys(max_n_keys)
+
     def is_empty(self, region):
         """ Check if a region is empty
 
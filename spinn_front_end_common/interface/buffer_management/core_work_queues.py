@@ -0,0 +1,208 @@
+from bisect import bisect_left
+from collections import deque
+from multiprocessing.pool import ThreadPool
+import logging
+import threading
+import time
+
+from spinn_utilities.log import FormatAdapter
+
+logger = FormatAdapter(logging.getLogger(__name__))
+
+#: The upper bounds in milliseconds of the buckets of the histogram of the\
+#: latencies of the work; the last bucket holds anything slower
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+
+class CoreWorkQueues(object):
+    """ Queues of work to be done for each core, such as handling the\
+        buffer requests the core has sent.  The work of each core is done in\
+        the order it was added, one item at a time; the work of different\
+        cores is done at the same time by a pool of threads, taking turns\
+        so that a busy core does not hold up the others.  The time from\
+        adding each item of work to finishing it is recorded.
+    """
+
+    __slots__ = [
+        # The threads that do the work
+        "_pool",
+
+        # dict of core to the deque of (time added, function, args) still to
+        # be done; a core is only in here while a thread is due to do its
+        # work
+        "_queues",
+
+        # dict of core to the lock held while doing the work of the core
+        "_core_locks",
+
+        # Condition guarding everything else, notified when all work is done
+        "_condition",
+
+        # The number of items of work added but not yet finished
+        "_n_outstanding",
+
+        # The largest number of items waiting at any one time
+        "_max_queue_depth",
+
+        # The number of items of work that took as long as each bucket
+        "_latency_counts",
+
+        # The number of items of work finished
+        "_n_done",
+
+        # True once no more work is to be done
+        "_closed"
+    ]
+
+    def __init__(self, n_threads):
+        """
+        :param n_threads: The number of threads to do the work with, and so\
+            the most cores whose work is done at the same time
+        :type n_threads: int
+        """
+        self._pool = ThreadPool(processes=max(1, n_threads))
+        self._queues = dict()
+        self._core_locks = dict()
+        self._condition = threading.Condition()
+        self._n_outstanding = 0
+        self._closed = False
+        self.reset_statistics()
+
+    def add_work(self, core, function, *args):
+        """ Add an item of work for a core, to be done after any work\
+            already added for the core; work added once the queues are\
+            closed is ignored
+
+        :param core: The (x, y, p) of the core
+        :type core: tuple(int, int, int)
+        :param function: The function to call to do the work
+        :param args: The arguments of the function
+        """
+        with self._condition:
+            if self._closed:
+                return
+            self._n_outstanding += 1
+            self._max_queue_depth = max(
+                self._max_queue_depth, self._n_outstanding)
+            if core in self._queues:
+                self._queues[core].append((time.time(), function, args))
+                return
+            self._queues[core] = deque([(time.time(), function, args)])
+        self._pool.apply_async(self._do_work, args=[core])
+
+    def core_lock(self, core):
+        """ Get the lock which is held while the work of a core is being\
+            done, so that other operations on the core can be kept apart\
+            from it
+
+        :param core: The (x, y, p) of the core
+        :type core: tuple(int, int, int)
+        :rtype: :py:class:`threading.RLock`
+        """
+        with self._condition:
+            if core not in self._core_locks:
+                self._core_locks[core] = threading.RLock()
+            return self._core_locks[core]
+
+    def _do_work(self, core):
+        """ Do the next item of work of a core, and then let the next core\
+            have a turn
+        """
+        with self._condition:
+            added, function, args = self._queues[core].popleft()
+        try:
+            with self.core_lock(core):
+                function(*args)
+        except Exception:
+            logger.exception("problem when working for core {}", core)
+        latency_ms = (time.time() - added) * 1000.0
+
+        with self._condition:
+            self._latency_counts[
+                bisect_left(LATENCY_BUCKETS_MS, latency_ms)] += 1
+            self._n_done += 1
+            self._n_outstanding -= 1
+            if not self._queues[core]:
+                del self._queues[core]
+                if not self._n_outstanding:
+                    self._condition.notify_all()
+                return
+        self._pool.apply_async(self._do_work, args=[core])
+
+    def wait_until_idle(self, timeout=None):
+        """ Wait until all the work added has been done
+
+        :param timeout: The most seconds to wait, or None to wait for ever
+        :type timeout: float
+        :return: True if all the work was done, False if timed out
+        :rtype: bool
+        """
+        deadline = None
+        if timeout is not None:
+            deadline = time.time() + timeout
+        with self._condition:
+            while self._n_outstanding:
+                remaining = None
+                if deadline is not None:
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        return False
+                self._condition.wait(remaining)
+        return True
+
+    @property
+    def queue_depth(self):
+        """ The number of items of work added but not yet finished
+
+        :rtype: int
+        """
+        return self._n_outstanding
+
+    @property
+    def max_queue_depth(self):
+        """ The largest number of items of work waiting at any one time\
+            since the statistics were last reset
+
+        :rtype: int
+        """
+        return self._max_queue_depth
+
+    @property
+    def n_done(self):
+        """ The number of items of work finished since the statistics were\
+            last reset
+
+        :rtype: int
+        """
+        return self._n_done
+
+    @property
+    def latency_histogram(self):
+        """ The number of items of work which took each length of time\
+            from being added to being finished, since the statistics were\
+            last reset
+
+        :return: list of (upper bound in milliseconds, or None for no\
+            bound, number of items)
+        :rtype: list(tuple(float or None, int))
+        """
+        with self._condition:
+            return list(zip(
+                LATENCY_BUCKETS_MS + (None, ), self._latency_counts))
+
+    def reset_statistics(self):
+        """ Forget the latencies and the largest queue depth recorded so far
+        """
+        with self._condition:
+            self._max_queue_depth = self._n_outstanding
+            self._latency_counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+            self._n_done = 0
+
+    def close(self):
+        """ Stop the threads once the work added has been done
+        """
+        with self._condition:
+            self._closed = True
+        self.wait_until_idle()
+        self._pool.close()
+        self._pool.join()
@@ -1,5 +1,6 @@
 from spinn_front_end_common.interface.buffer_management.storage_objects\
     import ChannelBufferState
+from spinn_front_end_common.utilities import globals_variables
 from spinn_front_end_common.utilities.constants \
     import SARK_PER_MALLOC_SDRAM_USAGE, SDP_PORTS
 
@@ -26,6 +27,10 @@ TRAFFIC_IDENTIFIER = "BufferTraffic"
 _ONE_WORD = struct.Struct("<I")
 _TWO_SHORTS = struct.Struct("<HH")
 
+#: The fraction of a recording buffer filled before a read of it is requested\
+#: when recording is extracted during the run
+DEFAULT_FILL_BEFORE_REQUEST = 0.5
+
 
 def get_recording_header_size(n_recorded_regions):
     """ Get the size of the data to be written for the recording header
@@ -178,6 +183,35 @@ def get_recorded_region_sizes(
     ]
 
 
+def get_buffer_size_before_request(
+        recorded_region_sizes, fill_fraction=DEFAULT_FILL_BEFORE_REQUEST):
+    """ Get the amount of each recording buffer to fill before the core asks\
+        for the buffer to be read while the simulation is running, to be\
+        passed in to :py:func:`get_recording_header_array` when recording is\
+        to be extracted during the run
+
+    :param recorded_region_sizes:\
+        A list of sizes of each region to be recorded.\
+        A size of 0 is acceptable.
+    :type recorded_region_sizes: list(int)
+    :param fill_fraction:\
+        The fraction of the smallest recorded region to fill before a read\
+        is requested
+    :type fill_fraction: float
+    :return: The number of bytes, or None if nothing is recorded
+    :rtype: int or None
+    """
+    sizes = [size for size in recorded_region_sizes if size > 0]
+    if not sizes:
+        return None
+
+    # The request is made when any region holds this much, so the smallest
+    # region decides; whole words are recorded, so round down to a word
+    fill_fraction = min(max(fill_fraction, 0.0), 1.0)
+    n_bytes = int(min(sizes) * fill_fraction) & ~(_ONE_WORD.size - 1)
+    return max(n_bytes, _ONE_WORD.size)
+
+
 def get_recording_header_array(
         recorded_region_sizes,
         time_between_triggers=0, buffer_size_before_request=None, ip_tags=None,
@@ -269,11 +303,11 @@ def get_region_pointer(placement, transceiver, recording_data_address, region):
     :param region: The index of the region to get the pointer of
     :rtype: int
     """
-    data = transceiver.read_memory(
-        placement.x, placement.y,
-        recording_data_address + _FIRST_REGION_ADDRESS_OFFSET + (region * 4),
-        4)
-    return _ONE_WORD.unpack_from(data)[0]
+    # The pointers are written once when the core starts, so need only be
+    # read once until the machine is reset
+    return globals_variables.region_table_cache().read_word(
+        transceiver, placement.x, placement.y,
+        recording_data_address + _FIRST_REGION_ADDRESS_OFFSET + (region * 4))
 
 
 def get_n_timesteps_in_buffer_space(buffer_space, buffered_sdram_per_timestep):
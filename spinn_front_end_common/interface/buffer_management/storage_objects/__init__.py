@@ -2,7 +2,9 @@ from .buffered_receiving_data import BufferedReceivingData
 from .buffered_sending_region import BufferedSendingRegion
 from .buffers_sent_deque import BuffersSentDeque
 from .channel_buffer_state import ChannelBufferState
+from .encoded_keys_message import EncodedKeysMessage
 from .end_buffering_state import EndBufferingState
 
 __all__ = ["BufferedReceivingData", "BufferedSendingRegion",
-           "BuffersSentDeque", "ChannelBufferState", "EndBufferingState"]
+           "BuffersSentDeque", "ChannelBufferState", "EncodedKeysMessage",
+           "EndBufferingState"]
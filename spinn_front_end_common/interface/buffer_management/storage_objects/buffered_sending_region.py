@@ -5,14 +5,18 @@ from spinnman.messages.eieio.data_messages import EIEIODataHeader
 from spinnman.messages.eieio import EIEIOType
 from spinnman.constants import UDP_MESSAGE_MAX_SIZE
 
-import bisect
-import math
+import numpy
+
+_EMPTY = numpy.zeros(0, dtype="int64")
 
 
 class BufferedSendingRegion(object):
     """ A set of keys to be sent at given timestamps for a given region of\
-        data.  Note that keys must be added in timestamp order or else an\
-        exception will be raised
+        data.  The keys are held in columns of timestamps and keys sorted by\
+        timestamp, so that they can be sent again after a rewind, and so\
+        that the keys of only a window of the timestamps can be sent\
+        without copying them.  Keys may be added in any order; keys with\
+        the same timestamp are sent in the order they were added.
     """
 
     __slots__ = [
@@ -20,23 +24,45 @@ class BufferedSendingRegion(object):
         # The maximum size of any buffer
         "_max_size_of_buffer",
 
-        # A dictionary of timestamp -> list of keys
-        "_buffer",
+        # Arrays of timestamps and keys added but not yet sorted into the
+        # columns
+        "_pending",
 
-        # A list of timestamps
+        # The sorted unique timestamps for which there are keys
         "_timestamps",
 
+        # The keys, sorted by timestamp
+        "_keys",
+
+        # The index into _keys of the first key of each timestamp, with an
+        # extra entry for the end of the keys of the last timestamp
+        "_offsets",
+
+        # The first time step of the window of timestamps to be sent, or None
+        # if there is no limit
+        "_first_time_step",
+
+        # The time step after the last of the window of timestamps to be sent,
+        # or None if there is no limit
+        "_end_time_step",
+
+        # The index into _timestamps of the first timestamp in the window
+        "_first_timestamp_pos",
+
+        # The index into _timestamps after the last timestamp in the window
+        "_end_timestamp_pos",
+
         # The current position in the list of timestamps
         "_current_timestamp_pos",
 
+        # The current position in the keys
+        "_current_key_pos",
+
         # int stating the size of the buffer
         "_buffer_size",
 
         # int stating the total size of the buffered region
-        "_total_region_size",
-
-        # The maximum number of packets in any timestamp
-        "_max_packets_in_timestamp"
+        "_total_region_size"
     ]
 
     _HEADER_SIZE = EIEIODataHeader.get_header_size(
@@ -53,19 +79,9 @@ class BufferedSendingRegion(object):
 
     def __init__(self, max_buffer_size):
         self._max_size_of_buffer = max_buffer_size
-
-        # A dictionary of timestamp -> list of keys
-        self._buffer = dict()
-
-        # A list of timestamps
-        self._timestamps = list()
-
-        # The current position in the list of timestamps
-        self._current_timestamp_pos = 0
-
-        self._buffer_size = None
-        self._total_region_size = None
-        self._max_packets_in_timestamp = 0
+        self._first_time_step = None
+        self._end_time_step = None
+        self.clear()
 
     @property
     def buffer_size(self):
@@ -92,10 +108,10 @@ class BufferedSendingRegion(object):
     def _calculate_sizes(self):
         """ Deduce how big the buffer and the region needs to be
         """
-        size = 0
-        for timestamp in self._timestamps:
-            n_keys = self.get_n_keys(timestamp)
-            size += self.get_n_bytes(n_keys)
+        self._sort_pending()
+        n_keys = numpy.diff(self._offsets[
+            self._first_timestamp_pos:self._end_timestamp_pos + 1])
+        size = int(numpy.sum(self.get_n_bytes(n_keys)))
         size += EventStopRequest.get_min_packet_length()
         if size > self._max_size_of_buffer:
             self._buffer_size = self._max_size_of_buffer
@@ -106,12 +122,12 @@ class BufferedSendingRegion(object):
     def get_n_bytes(self, n_keys):
         """ Get the number of bytes used by a given number of keys
 
-        :param n_keys: The number of keys
-        :type n_keys: int
+        :param n_keys: The number of keys, or an array of numbers of keys
+        :type n_keys: int or numpy.ndarray
         """
 
         # Get the total number of messages
-        n_messages = int(math.ceil(float(n_keys) / self._N_KEYS_PER_MESSAGE))
+        n_messages = -(-n_keys // self._N_KEYS_PER_MESSAGE)
 
         # Add up the bytes
         return ((self._HEADER_SIZE * n_messages) +
@@ -125,14 +141,7 @@ class BufferedSendingRegion(object):
         :param key: The key to send
         :type key: int
         """
-        if timestamp not in self._buffer:
-            bisect.insort(self._timestamps, timestamp)
-            self._buffer[timestamp] = list()
-        self._buffer[timestamp].append(key)
-        self._total_region_size = None
-        self._buffer_size = None
-        if len(self._buffer[timestamp]) > self._max_packets_in_timestamp:
-            self._max_packets_in_timestamp = len(self._buffer[timestamp])
+        self.add_timestamps_and_keys([timestamp], [key])
 
     def add_keys(self, timestamp, keys):
         """ Add a set of keys to be sent at the given time
@@ -142,8 +151,78 @@ class BufferedSendingRegion(object):
         :param keys: The keys to send
         :type keys: iterable(int)
         """
-        for key in keys:
-            self.add_key(timestamp, key)
+        keys = numpy.fromiter(keys, dtype="int64")
+        self.add_timestamps_and_keys(
+            numpy.full(len(keys), timestamp, dtype="int64"), keys)
+
+    def add_timestamps_and_keys(self, timestamps, keys):
+        """ Add keys to be sent, each at its own time; the region is rewound
+
+        :param timestamps: The time at which each key is to be sent
+        :type timestamps: numpy.ndarray(int)
+        :param keys: The keys to send
+        :type keys: numpy.ndarray(int)
+        """
+        timestamps = numpy.asarray(timestamps, dtype="int64")
+        keys = numpy.asarray(keys, dtype="int64")
+        if len(timestamps) != len(keys):
+            raise ValueError(
+                "There are {} timestamps for {} keys".format(
+                    len(timestamps), len(keys)))
+        if len(keys):
+            self._pending.append((timestamps, keys))
+            self._total_region_size = None
+            self._buffer_size = None
+
+    def _sort_pending(self):
+        """ Merge any keys added since last time into the sorted columns
+        """
+        if not self._pending:
+            return
+        timestamps = numpy.concatenate(
+            [self._timestamps.repeat(numpy.diff(self._offsets))] +
+            [timestamps for timestamps, _ in self._pending])
+        keys = numpy.concatenate(
+            [self._keys] + [keys for _, keys in self._pending])
+        self._pending = list()
+
+        # A stable sort keeps the keys of each timestamp in the order added
+        order = numpy.argsort(timestamps, kind="mergesort")
+        self._keys = keys[order]
+        self._timestamps, starts = numpy.unique(
+            timestamps[order], return_index=True)
+        self._offsets = numpy.append(starts, len(keys))
+        self._update_window()
+
+    def set_window(self, first_time_step, end_time_step):
+        """ Limit the keys to be sent to those with timestamps in a window,\
+            and rewind the region to the start of the window
+
+        :param first_time_step: The first timestamp of the window, or None\
+            for no limit
+        :type first_time_step: int or None
+        :param end_time_step: The timestamp after the last of the window,\
+            or None for no limit
+        :type end_time_step: int or None
+        """
+        self._first_time_step = first_time_step
+        self._end_time_step = end_time_step
+        self._update_window()
+
+    def _update_window(self):
+        if self._first_time_step is None:
+            self._first_timestamp_pos = 0
+        else:
+            self._first_timestamp_pos = int(numpy.searchsorted(
+                self._timestamps, self._first_time_step))
+        if self._end_time_step is None:
+            self._end_timestamp_pos = len(self._timestamps)
+        else:
+            self._end_timestamp_pos = max(self._first_timestamp_pos, int(
+                numpy.searchsorted(self._timestamps, self._end_time_step)))
+        self._total_region_size = None
+        self._buffer_size = None
+        self.rewind()
 
     @property
     def n_timestamps(self):
@@ -151,7 +230,8 @@ class BufferedSendingRegion(object):
 
         :rtype: int
         """
-        return len(self._timestamps)
+        self._sort_pending()
+        return self._end_timestamp_pos - self._first_timestamp_pos
 
     @property
     def timestamps(self):
@@ -159,7 +239,20 @@ class BufferedSendingRegion(object):
 
         :rtype: iterable(int)
         """
-        return self._timestamps
+        self._sort_pending()
+        return self._timestamps[
+            self._first_timestamp_pos:self._end_timestamp_pos]
+
+    @property
+    def keys(self):
+        """ The keys to be sent, sorted by timestamp
+
+        :rtype: iterable(int)
+        """
+        self._sort_pending()
+        return self._keys[
+            self._offsets[self._first_timestamp_pos]:
+            self._offsets[self._end_timestamp_pos]]
 
     def get_n_keys(self, timestamp):
         """ Get the number of keys for a given timestamp
@@ -167,8 +260,11 @@ class BufferedSendingRegion(object):
         :param timestamp: \
             the time stamp to check if there's still keys to transmit
         """
-        if timestamp in self._buffer:
-            return len(self._buffer[timestamp])
+        self._sort_pending()
+        pos = int(numpy.searchsorted(self._timestamps, timestamp))
+        if (self._first_timestamp_pos <= pos < self._end_timestamp_pos and
+                self._timestamps[pos] == timestamp):
+            return int(self._offsets[pos + 1] - self._offsets[pos])
         return 0
 
     @property
@@ -178,7 +274,8 @@ class BufferedSendingRegion(object):
         :return: True if the region is empty, false otherwise
         :rtype: bool
         """
-        return self._current_timestamp_pos < len(self._timestamps)
+        self._sort_pending()
+        return self._current_timestamp_pos < self._end_timestamp_pos
 
     @property
     def next_timestamp(self):
@@ -187,7 +284,7 @@ class BufferedSendingRegion(object):
         :rtype: int or None
         """
         if self.is_next_timestamp:
-            return self._timestamps[self._current_timestamp_pos]
+            return int(self._timestamps[self._current_timestamp_pos])
         return None
 
     def is_next_key(self, timestamp):
@@ -197,9 +294,10 @@ class BufferedSendingRegion(object):
             the time stamp to check if there's still keys to transmit
         :rtype: bool
         """
-        if timestamp in self._buffer:
-            return bool(self._buffer[timestamp])
-        return False
+        next_timestamp = self.next_timestamp
+        if next_timestamp is None or timestamp < next_timestamp:
+            return False
+        return self.get_n_keys(timestamp) > 0
 
     @property
     def next_key(self):
@@ -207,44 +305,58 @@ class BufferedSendingRegion(object):
 
         :rtype: int
         """
-        next_timestamp = self.next_timestamp
-        keys = self._buffer[next_timestamp]
-        key = keys.pop()
-        if not keys:
-            del self._buffer[next_timestamp]
+        self._sort_pending()
+        key = int(self._keys[self._current_key_pos])
+        self._current_key_pos += 1
+        if self._current_key_pos == \
+                self._offsets[self._current_timestamp_pos + 1]:
             self._current_timestamp_pos += 1
         return key
 
+    def get_next_keys(self, max_n_keys):
+        """ Get the next keys to be sent, all of which have the next\
+            timestamp
+
+        :param max_n_keys: The most keys to get
+        :type max_n_keys: int
+        :return: The timestamp of the keys, and a view of the keys
+        :rtype: tuple(int, numpy.ndarray)
+        """
+        timestamp = self.next_timestamp
+        timestamp_end = self._offsets[self._current_timestamp_pos + 1]
+        end = min(self._current_key_pos + max_n_keys, timestamp_end)
+        keys = self._keys[self._current_key_pos:end]
+        self._current_key_pos = end
+        if end == timestamp_end:
+            self._current_timestamp_pos += 1
+        return timestamp, keys
+
     @property
     def current_timestamp(self):
         """ The current timestamp in the iterator
         """
-        return self._current_timestamp_pos
+        return self._current_timestamp_pos - self._first_timestamp_pos
 
     def rewind(self):
         """ Rewind the buffer to initial position.
         """
-        self._current_timestamp_pos = 0
+        self._current_timestamp_pos = self._first_timestamp_pos
+        self._current_key_pos = int(self._offsets[self._first_timestamp_pos])
 
     def clear(self):
         """ Clears the buffer
         """
-
-        # A dictionary of timestamp -> list of keys
-        self._buffer = dict()
-
-        # A list of timestamps
-        self._timestamps = list()
-
-        # The current position in the list of timestamps
-        self._current_timestamp_pos = 0
-
-        self._buffer_size = None
-
-        self._total_region_size = None
+        self._pending = list()
+        self._timestamps = _EMPTY
+        self._keys = _EMPTY
+        self._offsets = numpy.zeros(1, dtype="int64")
+        self._update_window()
 
     @property
     def max_packets_in_timestamp(self):
         """ The maximum number of packets in any timestamp
         """
-        return self._max_packets_in_timestamp
+        self._sort_pending()
+        if not len(self._timestamps):
+            return 0
+        return int(numpy.max(numpy.diff(self._offsets)))
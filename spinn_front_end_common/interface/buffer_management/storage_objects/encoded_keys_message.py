@@ -0,0 +1,122 @@
+from spinnman.messages.eieio.data_messages import EIEIODataHeader
+from spinnman.messages.eieio import EIEIOType
+
+import numpy
+import struct
+
+# The count, flags and timestamp at the start of a message
+_HEADER = struct.Struct("<BBI")
+
+# The most keys that the count of a message can hold
+_MAX_N_KEYS = 255
+
+# The flags of a message of 32-bit keys with a timestamp, as spinnman would
+# write them
+_FLAGS = bytearray(EIEIODataHeader(
+    EIEIOType.KEY_32_BIT, payload_base=0, is_time=True).bytestring)[1]
+
+
+class EncodedKeysMessage(object):
+    """ An EIEIO data message of 32-bit keys to be sent at a timestamp,\
+        encoded straight from an array of keys rather than key by key.\
+        The encoding is the same as that of an\
+        :py:class:`EIEIODataMessage` with the same keys and timestamp, and\
+        the static methods can be used to encode messages into a buffer\
+        which holds several of them.
+    """
+
+    __slots__ = [
+        # The encoded message
+        "_data"
+    ]
+
+    #: The number of bytes in the header of a message
+    HEADER_SIZE = EIEIODataHeader.get_header_size(
+        EIEIOType.KEY_32_BIT, is_payload_base=True)
+
+    #: The number of bytes in each key
+    N_BYTES_PER_KEY = EIEIOType.KEY_32_BIT.key_bytes  # @UndefinedVariable
+
+    def __init__(self, timestamp, keys):
+        """
+        :param timestamp: The timestamp at which the keys are to be sent
+        :type timestamp: int
+        :param keys: The keys to send
+        :type keys: numpy.ndarray(int) or list(int)
+        """
+        self._data = bytearray(self.get_n_bytes(len(keys)))
+        self.write(self._data, 0, timestamp, keys)
+
+    @staticmethod
+    def get_n_bytes(n_keys):
+        """ Get the size of a message of a number of keys
+
+        :param n_keys: The number of keys in the message
+        :type n_keys: int
+        :rtype: int
+        """
+        return EncodedKeysMessage.HEADER_SIZE + (
+            n_keys * EncodedKeysMessage.N_BYTES_PER_KEY)
+
+    @staticmethod
+    def get_max_n_keys(n_bytes):
+        """ Get the most keys that can be sent in a message of at most a\
+            number of bytes
+
+        :param n_bytes: The space available for the message
+        :type n_bytes: int
+        :rtype: int
+        """
+        return max(0, min(_MAX_N_KEYS, (
+            n_bytes - EncodedKeysMessage.HEADER_SIZE) //
+            EncodedKeysMessage.N_BYTES_PER_KEY))
+
+    @staticmethod
+    def write(buffer, offset, timestamp, keys):
+        """ Encode a message into a buffer
+
+        :param buffer: The buffer to write the message into
+        :type buffer: bytearray
+        :param offset: Where in the buffer to write the message
+        :type offset: int
+        :param timestamp: The timestamp at which the keys are to be sent
+        :type timestamp: int
+        :param keys: The keys to send
+        :type keys: numpy.ndarray(int) or list(int)
+        :return: The offset in the buffer after the message
+        :rtype: int
+        """
+        n_keys = len(keys)
+        _HEADER.pack_into(buffer, offset, n_keys, _FLAGS, timestamp)
+        offset += EncodedKeysMessage.HEADER_SIZE
+        numpy.frombuffer(
+            buffer, dtype="<u4", count=n_keys, offset=offset)[:] = keys
+        return offset + n_keys * EncodedKeysMessage.N_BYTES_PER_KEY
+
+    @property
+    def n_keys(self):
+        """ The number of keys in the message
+
+        :rtype: int
+        """
+        return self._data[0]
+
+    @property
+    def size(self):
+        """ The size of the message in bytes
+
+        :rtype: int
+        """
+        return len(self._data)
+
+    @property
+    def bytestring(self):
+        """ The encoded message
+
+        :rtype: bytearray
+        """
+        return self._data
+
+    def __repr__(self):
+        return "EncodedKeysMessage:{}:{}".format(
+            _HEADER.unpack_from(self._data)[2], self.n_keys)
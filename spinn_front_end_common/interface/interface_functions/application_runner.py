@@ -9,6 +9,14 @@ from spinn_utilities.log import FormatAdapter
 
 logger = FormatAdapter(logging.getLogger(__name__))
 
+# How often, in seconds, to check on the reading of recorded data while the
+# application runs, when it is read during the run
+_EXTRACTION_CHECK_INTERVAL = 1.0
+
+# The number of checks in a row in which the buffer requests waiting to be
+# handled grow before a warning that the host is falling behind is given
+_N_GROWING_CHECKS_BEFORE_WARNING = 5
+
 
 class _NotificationWrapper(object):
     def __init__(self, notification_interface, wait_on_confirmation,
@@ -44,7 +52,7 @@ class ApplicationRunner(object):
             send_start_notification, notification_interface,
             executable_targets, executable_types, app_id, txrx, runtime,
             time_scale_factor, no_sync_changes, time_threshold,
-            run_until_complete=False):
+            run_until_complete=False, extract_during_run=False):
         # pylint: disable=too-many-arguments, too-many-locals
         logger.info("*** Running simulation... *** ")
 
@@ -56,13 +64,14 @@ class ApplicationRunner(object):
         return self.run_application(
             buffer_manager, notifier, executable_targets, executable_types,
             app_id, txrx, runtime, time_scale_factor, no_sync_changes,
-            time_threshold, run_until_complete)
+            time_threshold, run_until_complete, extract_during_run)
 
     # The actual runner
     def run_application(
             self, buffer_manager, notifier, executable_targets,
             executable_types, app_id, txrx, runtime, time_scale_factor,
-            no_sync_changes, time_threshold, run_until_complete):
+            no_sync_changes, time_threshold, run_until_complete,
+            extract_during_run=False):
         # pylint: disable=too-many-arguments
 
         # wait for all cores to be ready
@@ -101,7 +110,12 @@ class ApplicationRunner(object):
             try:
                 self._run_wait(
                     txrx, app_id, executable_types, run_until_complete,
-                    runtime, time_scale_factor, time_threshold)
+                    runtime, time_scale_factor, time_threshold,
+                    buffer_manager if extract_during_run else None)
+                if extract_during_run:
+                    logger.info(
+                        "Read {} bytes of recorded data while running",
+                        buffer_manager.n_bytes_read_during_run)
             finally:
                 # Stop the buffer manager after run
                 buffer_manager.stop()
@@ -113,20 +127,60 @@ class ApplicationRunner(object):
         return no_sync_changes
 
     def _run_wait(self, txrx, app_id, executable_types, run_until_complete,
-                  runtime, time_scale_factor, time_threshold):
+                  runtime, time_scale_factor, time_threshold,
+                  extracting_buffer_manager=None):
         # pylint: disable=too-many-arguments
         if not run_until_complete:
             time_to_wait = runtime * time_scale_factor / 1000.0 + 0.1
             logger.info(
                 "Application started; waiting {}s for it to stop",
                 time_to_wait)
-            time.sleep(time_to_wait)
+            if extracting_buffer_manager is None:
+                time.sleep(time_to_wait)
+            else:
+                self._wait_while_extracting(
+                    extracting_buffer_manager, time_to_wait)
             self._wait_for_end(txrx, app_id, executable_types,
                                timeout=time_threshold)
         else:
             logger.info("Application started; waiting until finished")
             self._wait_for_end(txrx, app_id, executable_types)
 
+    @staticmethod
+    def _wait_while_extracting(buffer_manager, time_to_wait):
+        """ Wait for a time while the buffer manager reads the recorded data\
+            that the cores ask it to read, warning if the requests are\
+            arriving faster than they are handled
+
+        :param buffer_manager: The buffer manager handling the requests
+        :param time_to_wait: The number of seconds to wait
+        :type time_to_wait: float
+        """
+        end_time = time.time() + time_to_wait
+        last_queue_depth = 0
+        n_growing = 0
+        warned = False
+        remaining = time_to_wait
+        while remaining > 0:
+            time.sleep(min(remaining, _EXTRACTION_CHECK_INTERVAL))
+            queue_depth = buffer_manager.request_queue_depth
+            if queue_depth > last_queue_depth:
+                n_growing += 1
+            else:
+                n_growing = 0
+            last_queue_depth = queue_depth
+            if n_growing >= _N_GROWING_CHECKS_BEFORE_WARNING and not warned:
+                logger.warning(
+                    "Recorded data is being read more slowly than it is "
+                    "recorded, with {} buffer requests waiting; recorded "
+                    "data may be lost", queue_depth)
+                warned = True
+            logger.debug(
+                "Read {} bytes of recorded data so far; {} buffer requests "
+                "waiting", buffer_manager.n_bytes_read_during_run,
+                queue_depth)
+            remaining = end_time - time.time()
+
     @staticmethod
     def _wait_for_start(txrx, app_id, executable_types, timeout=None):
         for executable_type in executable_types:
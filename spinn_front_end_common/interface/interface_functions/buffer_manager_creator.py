@@ -13,7 +13,8 @@ class BufferManagerCreator(object):
             uses_advanced_monitors, extra_monitor_cores=None,
             extra_monitor_to_chip_mapping=None,
             extra_monitor_cores_to_ethernet_connection_map=None, machine=None,
-            fixed_routes=None):
+            fixed_routes=None, max_concurrent_extractions=1,
+            max_concurrent_requests=1):
         # pylint: disable=too-many-arguments
         progress = ProgressBar(placements.placements, "Initialising buffers")
 
@@ -26,7 +27,9 @@ class BufferManagerCreator(object):
                 extra_monitor_cores_to_ethernet_connection_map),
             extra_monitor_to_chip_mapping=extra_monitor_to_chip_mapping,
             machine=machine, uses_advanced_monitors=uses_advanced_monitors,
-            fixed_routes=fixed_routes)
+            fixed_routes=fixed_routes,
+            max_concurrent_extractions=max_concurrent_extractions,
+            max_concurrent_requests=max_concurrent_requests)
 
         for placement in progress.over(placements.placements):
             if isinstance(placement.vertex, AbstractSendsBuffersFromHost):
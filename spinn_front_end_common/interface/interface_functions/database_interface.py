@@ -30,10 +30,11 @@ class DatabaseInterface(object):
             runtime, machine, time_scale_factor, machine_time_step,
             placements, routing_infos, router_tables, database_directory,
             create_atom_to_event_id_mapping=False, application_graph=None,
-            graph_mapper=None):
+            graph_mapper=None, write_atom_to_event_mapping=False):
         # pylint: disable=too-many-arguments
 
-        self._writer = DatabaseWriter(database_directory)
+        self._writer = DatabaseWriter(
+            database_directory, write_atom_to_event_mapping)
         self._user_create_database = user_create_database
         # add database generation if requested
         self._needs_db = self._writer.auto_detect_database(machine_graph)
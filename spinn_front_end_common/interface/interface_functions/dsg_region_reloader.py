@@ -3,16 +3,14 @@ from spinn_machine import SDRAM
 
 from data_specification import DataSpecificationExecutor
 from data_specification import utility_calls
-from data_specification.constants import MAX_MEM_REGIONS
 
 from spinn_front_end_common.abstract_models \
     import AbstractRewritesDataSpecification
 from spinn_front_end_common.utilities import helpful_functions
-
-from spinn_storage_handlers import FileDataReader
+from spinn_front_end_common.utilities.utility_objs \
+    import DataSpecificationTargets, RegionReloadCache
 
 import os
-import struct
 
 
 class DSGRegionReloader(object):
@@ -21,7 +19,8 @@ class DSGRegionReloader(object):
 
     def __call__(
             self, transceiver, placements, hostname, report_directory,
-            write_text_specs, application_data_file_path, graph_mapper=None):
+            write_text_specs, application_data_file_path, graph_mapper=None,
+            region_reload_cache=None, processor_to_app_data_base_address=None):
         """
         :param transceiver: SpiNNMan transceiver for communication
         :param placements: the list of placements of the machine graph to cores
@@ -33,6 +32,13 @@ class DSGRegionReloader(object):
             Folder where data specifications should be written to
         :param graph_mapper:\
             the mapping between application and machine graph
+        :param region_reload_cache:\
+            what was written by previous reloads, kept between runs so that\
+            only changed data is written and region tables are not read again
+        :type region_reload_cache: RegionReloadCache
+        :param processor_to_app_data_base_address:\
+            the data of each core as loaded, from which the address of its\
+            region table is taken if known
         """
         # pylint: disable=too-many-arguments, too-many-locals
 
@@ -50,6 +56,17 @@ class DSGRegionReloader(object):
         if not os.path.exists(reloaded_dsg_report_files_file_path):
             os.makedirs(reloaded_dsg_report_files_file_path)
 
+        # storage for the regenerated data specs, which are only needed
+        # until they have been executed
+        dsg_targets = DataSpecificationTargets(
+            reloaded_dsg_data_files_file_path)
+
+        # without a cache kept between runs, only cache for this reload
+        if region_reload_cache is None:
+            region_reload_cache = RegionReloadCache(cache_data=False)
+        if processor_to_app_data_base_address is None:
+            processor_to_app_data_base_address = dict()
+
         application_vertices_to_reset = set()
 
         progress = ProgressBar(placements.n_placements, "Reloading data")
@@ -59,7 +76,8 @@ class DSGRegionReloader(object):
             generated = self._regenerate_data_spec_for_vertices(
                 transceiver, placement, placement.vertex, hostname,
                 reloaded_dsg_report_files_file_path, write_text_specs,
-                reloaded_dsg_data_files_file_path)
+                dsg_targets, region_reload_cache,
+                processor_to_app_data_base_address)
 
             # If the region was regenerated, mark it reloaded
             if generated:
@@ -73,7 +91,8 @@ class DSGRegionReloader(object):
                 generated = self._regenerate_data_spec_for_vertices(
                     transceiver, placement, associated_vertex, hostname,
                     reloaded_dsg_report_files_file_path, write_text_specs,
-                    reloaded_dsg_data_files_file_path)
+                    dsg_targets, region_reload_cache,
+                    processor_to_app_data_base_address)
 
                 # If the region was regenerated, remember the application
                 # vertex for resetting later
@@ -84,12 +103,14 @@ class DSGRegionReloader(object):
         # machine vertices data will be updated
         for vertex in application_vertices_to_reset:
             vertex.mark_regions_reloaded()
+        dsg_targets.close()
 
     @staticmethod
     def _regenerate_data_spec_for_vertices(
             transceiver, placement, vertex, hostname,
             reloaded_dsg_report_files_file_path, write_text_specs,
-            reloaded_dsg_data_files_file_path):
+            dsg_targets, region_reload_cache,
+            processor_to_app_data_base_address):
         # pylint: disable=too-many-arguments, too-many-locals
 
         # If the vertex doesn't regenerate, skip
@@ -101,37 +122,52 @@ class DSGRegionReloader(object):
             return True
 
         # build the writers for the reports and data
-        spec_file, spec = utility_calls.get_data_spec_and_file_writer_filename(
-            placement.x, placement.y, placement.p, hostname,
-            reloaded_dsg_report_files_file_path,
-            write_text_specs, reloaded_dsg_data_files_file_path)
+        core = (placement.x, placement.y, placement.p)
+        spec = dsg_targets.create_data_spec(
+            placement.x, placement.y, placement.p,
+            utility_calls.get_report_writer(
+                placement.x, placement.y, placement.p, hostname,
+                reloaded_dsg_report_files_file_path, write_text_specs))
 
         # Execute the regeneration
         vertex.regenerate_data_specification(spec, placement)
 
         # execute the spec
-        spec_reader = FileDataReader(spec_file)
+        spec_reader = dsg_targets.get_reader(core)
         data_spec_executor = DataSpecificationExecutor(
             spec_reader, SDRAM.DEFAULT_SDRAM_BYTES)
         data_spec_executor.execute()
+        del dsg_targets[core]
 
-        # Read the region table for the placement
-        regions_base_address = transceiver.get_cpu_information_from_core(
-            placement.x, placement.y, placement.p).user[0]
-        start_region = utility_calls.get_region_base_address_offset(
-            regions_base_address, 0)
-        table_size = utility_calls.get_region_base_address_offset(
-            regions_base_address, MAX_MEM_REGIONS) - start_region
-        offsets = struct.unpack_from(
-            "<{}I".format(MAX_MEM_REGIONS),
-            transceiver.read_memory(
-                placement.x, placement.y, start_region, table_size))
-
-        # Write the regions to the machine
+        # Write the regions to the machine, writing only what has changed
+        # since the last reload if that is known
+        addresses = DSGRegionReloader._get_region_addresses(
+            transceiver, placement, region_reload_cache,
+            processor_to_app_data_base_address)
         for i, region in enumerate(data_spec_executor.dsef.mem_regions):
             if region is not None and not region.unfilled:
-                transceiver.write_memory(
-                    placement.x, placement.y, offsets[i],
+                spans = region_reload_cache.get_changed_spans(
+                    placement.x, placement.y, placement.p, i,
                     region.region_data[:region.max_write_pointer])
+                for offset, data in spans:
+                    transceiver.write_memory(
+                        placement.x, placement.y, addresses[i] + offset, data)
 
         return True
+
+    @staticmethod
+    def _get_region_addresses(
+            transceiver, placement, region_reload_cache,
+            processor_to_app_data_base_address):
+        """ Get the addresses of the regions of a placement, reading its\
+            region table only if they are not already cached
+        """
+        # The region table is found from user 0 if not known from loading
+        core = (placement.x, placement.y, placement.p)
+        regions_base_address = None
+        if core in processor_to_app_data_base_address:
+            regions_base_address = \
+                processor_to_app_data_base_address[core]["start_address"]
+        return region_reload_cache.region_table_cache.read_region_addresses(
+            transceiver, placement.x, placement.y, placement.p,
+            regions_base_address)
@@ -1,15 +1,17 @@
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
+from multiprocessing.pool import ThreadPool
 
 from spinn_utilities.progress_bar import ProgressBar
 from spinn_front_end_common.abstract_models \
     import AbstractRewritesDataSpecification
 
-from data_specification.utility_calls \
-    import get_data_spec_and_file_writer_filename
+from data_specification.utility_calls import get_report_writer
 
 from spinn_front_end_common.abstract_models import \
     AbstractGeneratesDataSpecification
 from spinn_front_end_common.utilities.exceptions import ConfigurationException
+from spinn_front_end_common.utilities.utility_objs \
+    import DataSpecificationTargets
 
 
 class GraphDataSpecificationWriter(object):
@@ -34,7 +36,7 @@ class GraphDataSpecificationWriter(object):
             self, placements, hostname,
             report_default_directory, write_text_specs,
             app_data_runtime_folder, machine, graph_mapper=None,
-            placement_order=None):
+            placement_order=None, n_threads=1, memory_limit=None):
         """
         :param placements: placements of machine graph to cores
         :param hostname: SpiNNaker machine name
@@ -48,44 +50,60 @@ class GraphDataSpecificationWriter(object):
             the mapping between application and machine graph
         :param placement:\
             the optional order in which placements should be examined
-
-        :return: DSG targets (map of placement tuple and filename)
+        :param n_threads: the number of threads to generate specifications\
+            in; if more than 1, the specifications of different vertices\
+            are generated at the same time, and the results are then\
+            checked in placement order
+        :param memory_limit: the number of bytes of data specifications to\
+            hold in memory before the rest are written to a file, or None\
+            for the default
+
+        :return: DSG targets (storage of the data spec of each placement)
+        :rtype: \
+            :py:class:`spinn_front_end_common.utilities.utility_objs.DataSpecificationTargets`
         """
         # pylint: disable=too-many-arguments
 
         # iterate though vertices and call generate_data_spec for each
         # vertex
-        dsg_targets = dict()
+        if memory_limit is None:
+            dsg_targets = DataSpecificationTargets(app_data_runtime_folder)
+        else:
+            dsg_targets = DataSpecificationTargets(
+                app_data_runtime_folder, memory_limit)
 
         if placement_order is None:
             placement_order = placements.placements
 
+        def generate(placement):
+            return self._generate_data_spec_for_placement(
+                placement, graph_mapper, dsg_targets, hostname,
+                report_default_directory, write_text_specs)
+
         progress = ProgressBar(
             placements.n_placements, "Generating data specifications")
+        if n_threads > 1:
+            placement_order = list(placement_order)
+            generated = self._generate_in_parallel(
+                placement_order, graph_mapper, generate, n_threads, progress)
+            results = (
+                (placement, generated.get(placement))
+                for placement in placement_order)
+        else:
+            results = (
+                (placement, generate(placement))
+                for placement in progress.over(placement_order))
+
         vertices_to_reset = list()
-        for placement in progress.over(placement_order):
-            # Try to generate the data spec for the placement
-            generated = self._generate_data_spec_for_vertices(
-                placement, placement.vertex, dsg_targets, hostname,
-                report_default_directory, write_text_specs,
-                app_data_runtime_folder, machine)
-
-            if generated and isinstance(
-                    placement.vertex, AbstractRewritesDataSpecification):
-                vertices_to_reset.append(placement.vertex)
-
-            # If the spec wasn't generated directly, and there is an
-            # application vertex, try with that
-            if not generated and graph_mapper is not None:
-                associated_vertex = graph_mapper.get_application_vertex(
-                    placement.vertex)
-                generated = self._generate_data_spec_for_vertices(
-                    placement, associated_vertex, dsg_targets, hostname,
-                    report_default_directory, write_text_specs,
-                    app_data_runtime_folder, machine)
-                if generated and isinstance(
-                        associated_vertex, AbstractRewritesDataSpecification):
-                    vertices_to_reset.append(associated_vertex)
+        for placement, result in results:
+            if result is None:
+                continue
+            vertex, region_sizes = result
+            self._check_sdram_usage(placement, region_sizes, machine)
+            if isinstance(vertex, AbstractRewritesDataSpecification):
+                vertices_to_reset.append(vertex)
+        if n_threads > 1:
+            progress.end()
 
         # Ensure that the vertices know their regions have been reloaded
         for vertex in vertices_to_reset:
@@ -93,51 +111,110 @@ class GraphDataSpecificationWriter(object):
 
         return dsg_targets
 
-    def _generate_data_spec_for_vertices(
-            self, placement, vertex, dsg_targets, hostname,
-            report_default_directory, write_text_specs,
-            app_data_runtime_folder, machine):
+    @staticmethod
+    def _get_generating_vertex(placement, graph_mapper):
+        """ Get the vertex that generates the data spec for a placement;\
+            this is the machine vertex if it can, or otherwise the\
+            application vertex if there is one
+
+        :return: the vertex, or None if no vertex can generate a data spec
+        """
+        if isinstance(placement.vertex, AbstractGeneratesDataSpecification):
+            return placement.vertex
+        if graph_mapper is not None:
+            associated_vertex = graph_mapper.get_application_vertex(
+                placement.vertex)
+            if isinstance(
+                    associated_vertex, AbstractGeneratesDataSpecification):
+                return associated_vertex
+        return None
+
+    def _generate_in_parallel(
+            self, placement_order, graph_mapper, generate, n_threads,
+            progress):
+        """ Generate the data specs in a pool of threads. The placements of\
+            each vertex are kept together and done in order by one thread,\
+            so that no vertex generates more than one data spec at a time.
+
+        :return: dict of placement to result of generate
+        """
+        # pylint: disable=too-many-arguments
+        placements_by_vertex = OrderedDict()
+        for placement in placement_order:
+            vertex = self._get_generating_vertex(placement, graph_mapper)
+            if vertex is not None:
+                placements_by_vertex.setdefault(vertex, list()).append(
+                    placement)
+            else:
+                progress.update()
+
+        def generate_all(vertex_placements):
+            return [(placement, generate(placement))
+                    for placement in vertex_placements]
+
+        generated = dict()
+        pool = ThreadPool(processes=n_threads)
+        try:
+            for results in pool.imap_unordered(
+                    generate_all, placements_by_vertex.values()):
+                generated.update(results)
+                progress.update(len(results))
+        finally:
+            pool.close()
+            pool.join()
+        return generated
+
+    def _generate_data_spec_for_placement(
+            self, placement, graph_mapper, dsg_targets, hostname,
+            report_default_directory, write_text_specs):
         """
         :param placement: placement of machine graph to cores
-        :param vertex: the specific vertex to write DSG for.
+        :param graph_mapper:\
+            the mapping between application and machine graph
+        :param dsg_targets: where to store the data spec
         :param hostname: SpiNNaker machine name
         :param report_default_directory: the location where reports are stored
         :param write_text_specs:\
             True if the textual version of the specification is to be written
-        :param app_data_runtime_folder: \
-            Folder where data specifications should be written to
-        :param machine: the python representation of the SpiNNaker machine
-        :return: True if the vertex was data spec-able, False otherwise
-        :rtype: bool
+        :return: the vertex that generated the data spec and the sizes of\
+            its regions, or None if no vertex is data spec-able
+        :rtype: tuple(AbstractGeneratesDataSpecification, list(int))
         """
         # pylint: disable=too-many-arguments
 
-        # if the vertex can generate a DSG, call it
-        if not isinstance(vertex, AbstractGeneratesDataSpecification):
-            return False
+        # if a vertex can generate a DSG, call it
+        vertex = self._get_generating_vertex(placement, graph_mapper)
+        if vertex is None:
+            return None
 
         # build the writers for the reports and data
-        data_writer_filename, spec = get_data_spec_and_file_writer_filename(
-            placement.x, placement.y, placement.p, hostname,
-            report_default_directory,
-            write_text_specs, app_data_runtime_folder)
-
-        # link DSG file to vertex
-        dsg_targets[placement.x, placement.y, placement.p] = \
-            data_writer_filename
+        spec = dsg_targets.create_data_spec(
+            placement.x, placement.y, placement.p, get_report_writer(
+                placement.x, placement.y, placement.p, hostname,
+                report_default_directory, write_text_specs))
 
-        # generate the DSG file
+        # generate the DSG, which is stored when it ends
         vertex.generate_data_specification(spec, placement)
+        return vertex, spec.region_sizes
 
+    def _check_sdram_usage(self, placement, region_sizes, machine):
+        """ Record the region sizes of a generated data spec, and check\
+            that the chip it is on still has enough SDRAM
+
+        :param placement: placement of machine graph to cores
+        :param region_sizes: the sizes of the regions of the data spec
+        :param machine: the python representation of the SpiNNaker machine
+        :rtype: None
+        :raise ConfigurationException: if the chip has too little SDRAM
+        """
         # Check the memory usage
-        self._region_sizes[placement.vertex] = spec.region_sizes
+        self._region_sizes[placement.vertex] = region_sizes
         self._vertices_by_chip[placement.x, placement.y].append(
             placement.vertex)
-        self._sdram_usage[placement.x, placement.y] += sum(
-            spec.region_sizes)
+        self._sdram_usage[placement.x, placement.y] += sum(region_sizes)
         if (self._sdram_usage[placement.x, placement.y] <=
                 machine.get_chip_at(placement.x, placement.y).sdram.size):
-            return True
+            return
 
         # creating the error message which contains the memory usage of
         #  what each core within the chip uses and its original
@@ -6,21 +6,80 @@ from data_specification import DataSpecificationExecutor
 from data_specification.constants import MAX_MEM_REGIONS
 from data_specification.exceptions import DataSpecificationException
 
-# spinn_storage_handlers import
-from spinn_storage_handlers import FileDataReader
-
+from collections import OrderedDict
+import io
 import logging
 import struct
+import threading
+from multiprocessing import Pool
+from multiprocessing.pool import ThreadPool
 import numpy
-from six import iteritems
 
+from spinn_machine import CoreSubsets
+
+from spinnman.model.enums import CPUState
+
+from spinn_front_end_common.utilities import globals_variables
 from spinn_front_end_common.utilities.helpful_functions \
-    import write_address_to_user0
+    import convert_vertices_to_core_subset, write_address_to_user0
+from spinn_front_end_common.utility_models \
+    import ExtraMonitorSupportMachineVertex
 
 logger = FormatAdapter(logging.getLogger(__name__))
 _ONE_WORD = struct.Struct("<I")
 _MEM_REGIONS = range(MAX_MEM_REGIONS)
 
+# The largest gap between two blocks of data for which it is cheaper to write
+# padding in between than to do a separate write; a write of up to this size
+# fits in a few SCP packets, which is less than the cost of a new transaction
+_MAX_WRITE_GAP = 1024
+
+
+def _execute_spec(target):
+    """ Execute a data specification without touching the machine. This is\
+        a module function so that it can be run in a worker process.
+
+    :param target: tuple of (x, y, p, data spec, SDRAM size of chip)
+    :return: tuple of ((x, y, p), bytes used, header, pointer table\
+        relative to a start address of 0, list of (region ID, data))
+    """
+    x, y, p, data_spec, sdram_size = target
+
+    # build specification reader
+    reader = io.BytesIO(data_spec)
+
+    # maximum available memory
+    # however system updates the memory available
+    # independently, so the check on the space available actually
+    # happens when memory is allocated
+
+    # generate data spec executor
+    executor = DataSpecificationExecutor(reader, sdram_size)
+
+    # run data spec executor
+    try:
+        # bytes_used_by_spec, bytes_written_by_spec = \
+        executor.execute()
+    except DataSpecificationException:
+        logger.error("Error executing data specification for {}, {}, {}",
+                     x, y, p)
+        raise
+    finally:
+        reader.close()
+
+    # Get the data up to what has been written in each region
+    regions = list()
+    for region_id in _MEM_REGIONS:
+        region = executor.get_region(region_id)
+        if region is not None:
+            max_pointer = region.max_write_pointer
+            if not region.unfilled and max_pointer > 0:
+                regions.append(
+                    (region_id, region.region_data[:max_pointer]))
+
+    return ((x, y, p), executor.get_constructed_data_size(),
+            executor.get_header(), executor.get_pointer_table(0), regions)
+
 
 class HostExecuteDataSpecification(object):
     """ Executes the host based data specification.
@@ -30,14 +89,31 @@ class HostExecuteDataSpecification(object):
 
     def __call__(
             self, transceiver, machine, app_id, dsg_targets,
-            processor_to_app_data_base_address=None):
+            processor_to_app_data_base_address=None, n_processes=1,
+            use_fast_data_in=False, placements=None,
+            extra_monitor_to_chip_mapping=None,
+            extra_monitor_cores_to_ethernet_connection_map=None,
+            executable_finder=None):
         """
         :param machine: the python representation of the SpiNNaker machine
         :param transceiver: the spinnman instance
         :param app_id: the application ID of the simulation
-        :param dsg_targets: map of placement to file path
+        :param dsg_targets: map of placement to data spec
+        :param n_processes: the number of processes to execute data\
+            specifications in; if more than 1, the specifications are\
+            executed in parallel while the data of those already executed\
+            is written, with the boards being written to concurrently
+        :param use_fast_data_in: whether to write the data through the\
+            extra monitors; if so, the extra monitors are loaded and started\
+            first, and the other mappings must be given
+        :param placements: the placements of the vertices
+        :param extra_monitor_to_chip_mapping: map of chip to extra monitor
+        :param extra_monitor_cores_to_ethernet_connection_map: map of\
+            Ethernet-connected chip to data speed up packet gatherer
+        :param executable_finder: finder of the extra monitor binary
 
-        :return: map of placement and DSG data, and loaded data flag.
+        :return: map of placement and DSG data, and the cores which have\
+            been loaded with their binaries and started
         """
         # pylint: disable=too-many-arguments
         if processor_to_app_data_base_address is None:
@@ -47,69 +123,250 @@ class HostExecuteDataSpecification(object):
         progress = ProgressBar(
             dsg_targets, "Executing data specifications and loading data")
 
-        for (x, y, p), data_spec_file_path in \
-                progress.over(iteritems(dsg_targets)):
+        # The extra monitors must be loaded over SCP and running before
+        # they can be used to write the data of everything else
+        write_memory = None
+        cores = list(dsg_targets)
+        started_core_subsets = CoreSubsets()
+        if use_fast_data_in:
+            monitor_cores, cores = self._split_extra_monitor_cores(
+                cores, placements, extra_monitor_to_chip_mapping)
+            self._execute_serially(
+                transceiver, machine, app_id, dsg_targets, monitor_cores,
+                processor_to_app_data_base_address, progress, None)
+            started_core_subsets = self._start_extra_monitors(
+                transceiver, app_id, placements,
+                extra_monitor_to_chip_mapping, executable_finder)
+            write_memory = self._fast_data_in_writer(
+                transceiver, machine, placements,
+                extra_monitor_to_chip_mapping,
+                extra_monitor_cores_to_ethernet_connection_map)
+
+        if n_processes > 1 and len(cores) > 1:
+            self._execute_pipelined(
+                transceiver, machine, app_id, dsg_targets, cores,
+                processor_to_app_data_base_address, n_processes, progress,
+                write_memory)
+        else:
+            self._execute_serially(
+                transceiver, machine, app_id, dsg_targets, cores,
+                processor_to_app_data_base_address, progress, write_memory)
+        progress.end()
+
+        self._log_writes(processor_to_app_data_base_address, dsg_targets)
+        return processor_to_app_data_base_address, started_core_subsets
+
+    def _execute_serially(
+            self, transceiver, machine, app_id, dsg_targets, cores,
+            processor_to_app_data_base_address, progress, write_memory):
+        """ Execute the data specifications of some cores and write the\
+            results one at a time
+        """
+        # pylint: disable=too-many-arguments
+        for x, y, p in cores:
             # write information for the memory map report
             processor_to_app_data_base_address[x, y, p] = self._execute(
-                transceiver, machine, app_id, x, y, p, data_spec_file_path)
+                transceiver, machine, app_id, x, y, p, dsg_targets[x, y, p],
+                write_memory)
+            progress.update()
+
+    @staticmethod
+    def _split_extra_monitor_cores(
+            cores, placements, extra_monitor_to_chip_mapping):
+        """ Separate the cores of the extra monitors from the others
 
-        return processor_to_app_data_base_address
+        :return: the cores of the extra monitors, and the other cores
+        :rtype: tuple(list, list)
+        """
+        monitor_cores = set()
+        for vertex in extra_monitor_to_chip_mapping.values():
+            placement = placements.get_placement_of_vertex(vertex)
+            monitor_cores.add((placement.x, placement.y, placement.p))
+        return ([core for core in cores if core in monitor_cores],
+                [core for core in cores if core not in monitor_cores])
 
     @staticmethod
-    def _execute(txrx, machine, app_id, x, y, p, data_spec_path):
-        # pylint: disable=too-many-arguments, too-many-locals
+    def _start_extra_monitors(
+            transceiver, app_id, placements, extra_monitor_to_chip_mapping,
+            executable_finder):
+        """ Load the extra monitors and wait for them to be running.  They\
+            are left running, so are not loaded again with the other binaries
 
-        # build specification reader
-        reader = FileDataReader(data_spec_path)
+        :return: the cores of the extra monitors
+        :rtype: :py:class:`spinn_machine.CoreSubsets`
+        """
+        core_subsets = convert_vertices_to_core_subset(
+            extra_monitor_to_chip_mapping.values(), placements)
+        binary = executable_finder.get_executable_path(
+            ExtraMonitorSupportMachineVertex.static_get_binary_file_name())
+        transceiver.execute_flood(
+            core_subsets, binary, app_id, wait=False, is_filename=True)
+        transceiver.wait_for_cores_to_be_in_state(
+            core_subsets, app_id, [CPUState.RUNNING])
+        return core_subsets
 
-        # maximum available memory
-        # however system updates the memory available
-        # independently, so the check on the space available actually
-        # happens when memory is allocated
+    @staticmethod
+    def _fast_data_in_writer(
+            transceiver, machine, placements, extra_monitor_to_chip_mapping,
+            extra_monitor_cores_to_ethernet_connection_map):
+        """ Get a function which writes memory through the extra monitor on\
+            the chip and the data speed up packet gatherer of its board
 
-        # generate data spec executor
-        executor = DataSpecificationExecutor(
-            reader, machine.get_chip_at(x, y).sdram.size)
+        :return: function of (x, y, base_address, data)
+        """
+        def write_memory(x, y, base_address, data):
+            chip = machine.get_chip_at(x, y)
+            gatherer = extra_monitor_cores_to_ethernet_connection_map[
+                chip.nearest_ethernet_x, chip.nearest_ethernet_y]
+            gatherer.send_data_into_spinnaker(
+                transceiver, placements.get_placement_of_vertex(
+                    extra_monitor_to_chip_mapping[x, y]),
+                base_address, data)
+        return write_memory
+
+    @staticmethod
+    def _log_writes(processor_to_app_data_base_address, dsg_targets):
+        """ Report how much was written and how many writes were saved by\
+            writing the regions of each core together
+        """
+        n_bytes = 0
+        n_writes = 0
+        n_writes_saved = 0
+        for core in dsg_targets:
+            data = processor_to_app_data_base_address[core]
+            n_bytes += data['memory_written']
+            n_writes += data['n_writes']
+            n_writes_saved += data['n_writes_saved']
+        logger.info(
+            "Loaded {} bytes of application data in {} writes, saving {}"
+            " writes", n_bytes, n_writes, n_writes_saved)
+
+    def _execute_pipelined(
+            self, transceiver, machine, app_id, dsg_targets, cores,
+            processor_to_app_data_base_address, n_processes, progress,
+            write_memory):
+        """ Execute the data specifications in a pool of processes, and\
+            write the results with one writer per board as they arrive
+        """
+        # pylint: disable=too-many-arguments
+
+        # Group the cores by board, so each board has its own writer
+        boards = OrderedDict()
+        for x, y, p in cores:
+            chip = machine.get_chip_at(x, y)
+            boards.setdefault(
+                (chip.nearest_ethernet_x, chip.nearest_ethernet_y),
+                list()).append((x, y, p, chip.sdram.size))
+
+        progress_lock = threading.Lock()
 
-        # run data spec executor
+        def write_board(board_cores):
+            # The data specs are only read from storage as they are needed
+            targets = (
+                (x, y, p, dsg_targets[x, y, p], sdram_size)
+                for x, y, p, sdram_size in board_cores)
+            for executed in process_pool.imap(_execute_spec, targets):
+                (x, y, p) = executed[0]
+                data = self._write_executed_spec(
+                    transceiver, app_id, executed, write_memory)
+                with progress_lock:
+                    processor_to_app_data_base_address[x, y, p] = data
+                    progress.update()
+
+        process_pool = Pool(processes=n_processes)
+        writer_pool = ThreadPool(processes=min(n_processes, len(boards)))
         try:
-            # bytes_used_by_spec, bytes_written_by_spec = \
-            executor.execute()
-        except DataSpecificationException:
-            logger.error("Error executing data specification for {}, {}, {}",
-                         x, y, p)
-            raise
+            results = [
+                writer_pool.apply_async(write_board, args=[board_cores])
+                for board_cores in boards.values()]
+            for result in results:
+                result.get()
+        finally:
+            writer_pool.close()
+            writer_pool.join()
+            process_pool.close()
+            process_pool.join()
 
-        bytes_used_by_spec = executor.get_constructed_data_size()
+    @staticmethod
+    def _execute(
+            txrx, machine, app_id, x, y, p, data_spec,
+            write_memory=None):
+        # pylint: disable=too-many-arguments
+        return HostExecuteDataSpecification._write_executed_spec(
+            txrx, app_id, _execute_spec(
+                (x, y, p, data_spec,
+                 machine.get_chip_at(x, y).sdram.size)),
+            write_memory)
+
+    @staticmethod
+    def _write_executed_spec(txrx, app_id, executed, write_memory=None):
+        """ Write the results of executing a data specification to the\
+            machine
+
+        :param executed: the result of executing the specification
+        :param write_memory: function of (x, y, base_address, data) to\
+            write the data with, or None to write with SCP
+        :return: dict of start address, memory used and memory written
+        """
+        if write_memory is None:
+            write_memory = txrx.write_memory
+        (x, y, p), bytes_used_by_spec, header, pointer_offsets, regions = \
+            executed
 
         # allocate memory where the app data is going to be written; this
         # raises an exception in case there is not enough SDRAM to allocate
         start_address = txrx.malloc_sdram(x, y, bytes_used_by_spec, app_id)
 
-        # Write the header and pointer table and load it
-        header = executor.get_header()
-        pointer_table = executor.get_pointer_table(start_address)
-        data_to_write = numpy.concatenate((header, pointer_table)).tostring()
-        txrx.write_memory(x, y, start_address, data_to_write)
-        bytes_written_by_spec = len(data_to_write)
-
-        # Write each region
-        for region_id in _MEM_REGIONS:
-            region = executor.get_region(region_id)
-            if region is not None:
-                max_pointer = region.max_write_pointer
-                if not region.unfilled and max_pointer > 0:
-                    # Get the data up to what has been written
-                    data = region.region_data[:max_pointer]
-
-                    # Write the data to the position
-                    txrx.write_memory(x, y, pointer_table[region_id], data)
-                    bytes_written_by_spec += len(data)
+        # Relocate the pointer table, in which missing regions are 0
+        pointer_table = numpy.where(
+            pointer_offsets != 0, pointer_offsets + start_address,
+            0).astype(pointer_offsets.dtype)
+
+        # Gather the header and pointer table and each region to write
+        blocks = [(0, numpy.concatenate((header, pointer_table)).tostring())]
+        blocks.extend(
+            (int(pointer_offsets[region_id]), data)
+            for region_id, data in regions)
+
+        # Write the blocks, coalesced where the gaps are small
+        writes = HostExecuteDataSpecification._coalesce_writes(blocks)
+        bytes_written_by_spec = 0
+        for offset, data in writes:
+            write_memory(x, y, start_address + offset, data)
+            bytes_written_by_spec += len(data)
 
         # set user 0 register appropriately to the application data
         write_address_to_user0(txrx, x, y, p, start_address)
+
+        # the region table is now known, so need not be read to find regions
+        globals_variables.region_table_cache().set_region_addresses(
+            x, y, p, pointer_table)
         return {
             'start_address': start_address,
             'memory_used': bytes_used_by_spec,
-            'memory_written': bytes_written_by_spec
+            'memory_written': bytes_written_by_spec,
+            'n_writes': len(writes),
+            'n_writes_saved': len(blocks) - len(writes)
         }
+
+    @staticmethod
+    def _coalesce_writes(blocks):
+        """ Merge blocks of data to be written into as few contiguous writes\
+            as possible, padding any gap of up to _MAX_WRITE_GAP bytes\
+            between blocks with zeros
+
+        :param blocks: list of (offset, data) in order of offset
+        :return: list of (offset, data) to write
+        :rtype: list(tuple(int, bytearray))
+        """
+        writes = list()
+        for offset, data in blocks:
+            if writes:
+                last_offset, last_data = writes[-1]
+                gap = offset - (last_offset + len(last_data))
+                if 0 <= gap <= _MAX_WRITE_GAP:
+                    last_data.extend(bytearray(gap))
+                    last_data.extend(data)
+                    continue
+            writes.append((offset, bytearray(data)))
+        return writes
@@ -1,5 +1,7 @@
 from spinn_utilities.progress_bar import ProgressBar
 
+from spinn_machine import CoreSubsets
+
 from spinnman.messages.scp.enums import Signal
 from spinnman.model.enums import CPUState
 
@@ -16,26 +18,56 @@ class LoadExecutableImages(object):
 
     __slots__ = []
 
-    def __call__(self, executable_targets, app_id, transceiver):
+    def __call__(self, executable_targets, app_id, transceiver,
+                 started_core_subsets=None):
+        """
+        :param started_core_subsets: cores which have already been loaded\
+            with their binary and started, such as the extra monitors when\
+            they are used to load the data; these are left running
+        """
         progress = ProgressBar(
             executable_targets.total_processors + 1,
             "Loading executables onto the machine")
 
         for binary in executable_targets.binaries:
             progress.update(self._launch_binary(
-                executable_targets, binary, transceiver, app_id))
+                executable_targets, binary, transceiver, app_id,
+                started_core_subsets))
 
-        self._start_simulation(executable_targets, transceiver, app_id)
+        self._start_simulation(
+            executable_targets, transceiver, app_id, started_core_subsets)
         progress.update()
         progress.end()
 
-    def _launch_binary(self, executable_targets, binary, txrx, app_id):
+    def _launch_binary(
+            self, executable_targets, binary, txrx, app_id,
+            started_core_subsets):
         core_subset = executable_targets.get_cores_for_binary(binary)
-        txrx.execute_flood(
-            core_subset, binary, app_id, wait=True, is_filename=True)
-        return len(core_subset)
+        n_cores = len(core_subset)
+        core_subset = self._not_started(core_subset, started_core_subsets)
+        if len(core_subset):
+            txrx.execute_flood(
+                core_subset, binary, app_id, wait=True, is_filename=True)
+        return n_cores
 
-    def _start_simulation(self, executable_targets, txrx, app_id):
+    def _start_simulation(
+            self, executable_targets, txrx, app_id, started_core_subsets):
         txrx.wait_for_cores_to_be_in_state(
-            executable_targets.all_core_subsets, app_id, [CPUState.READY])
+            self._not_started(
+                executable_targets.all_core_subsets, started_core_subsets),
+            app_id, [CPUState.READY])
         txrx.send_signal(app_id, Signal.START)
+
+    @staticmethod
+    def _not_started(core_subsets, started_core_subsets):
+        """ Get the cores of some core subsets which have not been started
+        """
+        if not started_core_subsets:
+            return core_subsets
+        not_started = CoreSubsets()
+        for core_subset in core_subsets:
+            for p in core_subset.processor_ids:
+                if not started_core_subsets.is_core(
+                        core_subset.x, core_subset.y, p):
+                    not_started.add_processor(core_subset.x, core_subset.y, p)
+        return not_started
@@ -11,7 +11,6 @@ from spinn_front_end_common.utilities.constants import DSE_DATA_STRUCT_SIZE
 from spinn_front_end_common.utilities.helpful_functions \
     import write_address_to_user0
 
-import os
 import logging
 import struct
 
@@ -63,10 +62,10 @@ class MachineExecuteDataSpecification(object):
         dse_app_id = txrx.app_id_tracker.get_new_id()
         core_subset = CoreSubsets()
 
-        for (x, y, p, label) in progress.over(dsg_targets):
+        for (x, y, p) in progress.over(dsg_targets):
             core_subset.add_processor(x, y, p)
-            file_path = dsg_targets[x, y, p, label]
-            file_size = os.path.getsize(file_path)
+            data_spec = dsg_targets[x, y, p]
+            file_size = len(data_spec)
 
             # data spec file is written at specific address (file_data_addr);
             # this is encapsulated in a structure with four fields:
@@ -85,8 +84,7 @@ class MachineExecuteDataSpecification(object):
 
             txrx.write_memory(x, y, dse_data_struct, _FOUR_WORDS.pack(
                 file_data_addr, file_size, app_id, write_report))
-            txrx.write_memory(x, y, file_data_addr, file_path,
-                              is_filename=True)
+            txrx.write_memory(x, y, file_data_addr, data_spec)
             write_address_to_user0(txrx, x, y, p, dse_data_struct)
 
         return dse_app_id, core_subset
@@ -18,11 +18,12 @@ class NotificationProtocol(object):
 
     def __call__(
             self, wait_for_read_confirmation,
-            socket_addresses, database_file_path):
+            socket_addresses, database_file_path, confirmation_timeout=None):
 
         # notification protocol
         self._notification_protocol = Notification(
-            socket_addresses, wait_for_read_confirmation)
+            socket_addresses, wait_for_read_confirmation,
+            confirmation_timeout)
         self.send_read_notification(database_file_path)
 
         return self
@@ -35,6 +36,15 @@ class NotificationProtocol(object):
         """
         self._notification_protocol.wait_for_confirmation()
 
+    @property
+    def late_listeners(self):
+        """ The external devices that did not confirm in time that they had\
+            read the database, and have not confirmed since
+
+        :rtype: list(tuple(str, int))
+        """
+        return self._notification_protocol.late_listeners
+
     def send_read_notification(self, database_directory):
         """ Send the read notifications via the notification protocol
 
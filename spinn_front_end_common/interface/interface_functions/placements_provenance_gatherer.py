@@ -1,38 +1,243 @@
+from collections import OrderedDict, defaultdict
+from multiprocessing.pool import ThreadPool
+from threading import Lock
+import logging
+
 from spinn_utilities.progress_bar import ProgressBar
 
 # front end common imports
 from spinn_front_end_common.interface.provenance \
-    import AbstractProvidesProvenanceDataFromMachine
-import logging
+    import AbstractProvidesProvenanceDataFromMachine, \
+    ProvidesProvenanceDataFromMachineImpl
+from spinn_front_end_common.utilities import \
+    globals_variables, helpful_functions
 
 logger = logging.getLogger(__name__)
 
+# the largest gap between two blocks of provenance data on a chip for which
+# it is cheaper to read the bytes in between than to make another read
+_MAX_GAP_TO_MERGE_READS_IN_BYTES = 256
+
+
+class _PrefetchedMemoryTransceiver(object):
+    """ Wraps a transceiver, answering reads of memory that has already\
+        been fetched in bulk, and passing everything else on
+    """
+
+    __slots__ = [
+        # the transceiver to pass other requests on to
+        "_transceiver",
+
+        # dict of (x, y) to list of (address, data) already fetched
+        "_blocks"
+    ]
+
+    def __init__(self, transceiver):
+        self._transceiver = transceiver
+        self._blocks = defaultdict(list)
+
+    def add_block(self, x, y, address, data):
+        """ Add memory that has been fetched from a chip
+        """
+        self._blocks[x, y].append((address, data))
+
+    def read_memory(self, x, y, base_address, length, cpu=0):
+        for address, data in self._blocks.get((x, y), ()):
+            offset = base_address - address
+            if offset >= 0 and offset + length <= len(data):
+                return bytearray(data[offset:offset + length])
+        return self._transceiver.read_memory(
+            x, y, base_address, length, cpu)
+
+    def __getattr__(self, name):
+        return getattr(self._transceiver, name)
+
 
 class PlacementsProvenanceGatherer(object):
+    """ Reads the provenance data of the placements from the machine.\
+        Where vertices read their provenance from a region, the regions are\
+        located without reading the machine when their addresses are known\
+        already, and the regions of each chip are read together, with\
+        the boards being read in parallel.
+    """
+
     __slots__ = []
 
     def __call__(
-            self, transceiver, placements, provenance_data_objects=None):
+            self, transceiver, placements, provenance_data_objects=None,
+            processor_to_app_data_base_address=None, machine=None,
+            max_concurrent_extractions=1, uses_advanced_monitors=False,
+            extra_monitor_cores=None, extra_monitor_to_chip_mapping=None,
+            extra_monitor_cores_to_ethernet_connection_map=None,
+            fixed_routes=None):
         """
         :param transceiver: the SpiNNMan interface object
         :param placements: The placements of the vertices
+        :param processor_to_app_data_base_address: the addresses of the\
+            region tables of the cores, as loaded
+        :param machine: the machine, used to group the chips by board
+        :param max_concurrent_extractions: the number of boards to read at\
+            the same time
+        :param uses_advanced_monitors: True if the data speed up gatherers\
+            are to be used to read the data where it is faster
         """
-
+        # pylint: disable=too-many-arguments, too-many-locals
         if provenance_data_objects is not None:
             prov_items = provenance_data_objects
         else:
             prov_items = list()
+        if processor_to_app_data_base_address is None:
+            processor_to_app_data_base_address = dict()
+
+        # the speed up gatherers can only be used if it is known where they
+        # and the extra monitors are
+        uses_advanced_monitors = (
+            uses_advanced_monitors and machine is not None and
+            extra_monitor_cores_to_ethernet_connection_map is not None and
+            extra_monitor_to_chip_mapping is not None)
 
         progress = ProgressBar(
             placements.n_placements, "Getting provenance data")
+        progress_lock = Lock()
 
-        # retrieve provenance data from any cores that provide data
-        for placement in progress.over(placements.placements):
+        # group the placements that provide data by the board they are on
+        boards = OrderedDict()
+        for placement in placements.placements:
             if isinstance(placement.vertex,
                           AbstractProvidesProvenanceDataFromMachine):
-                # get data
-                prov_items.extend(
-                    placement.vertex.get_provenance_data_from_machine(
-                        transceiver, placement))
+                boards.setdefault(self._get_board(
+                    machine, placement, uses_advanced_monitors,
+                    extra_monitor_cores_to_ethernet_connection_map),
+                    list()).append(placement)
+            else:
+                progress.update()
+
+        if uses_advanced_monitors:
+            for receiver in boards:
+                receiver.set_cores_for_data_extraction(
+                    transceiver=transceiver, placements=placements,
+                    extra_monitor_cores_for_router_timeout=(
+                        extra_monitor_cores))
+
+        def get_board_provenance(board, board_placements):
+            items = self._get_board_provenance(
+                transceiver, board if uses_advanced_monitors else None,
+                board_placements, placements,
+                processor_to_app_data_base_address,
+                extra_monitor_to_chip_mapping, fixed_routes)
+            with progress_lock:
+                progress.update(len(board_placements))
+            return items
+
+        # read the boards, in parallel if allowed
+        try:
+            n_workers = min(max_concurrent_extractions, len(boards))
+            if n_workers > 1:
+                pool = ThreadPool(processes=n_workers)
+                try:
+                    results = [
+                        pool.apply_async(
+                            get_board_provenance,
+                            args=[board, board_placements])
+                        for board, board_placements in boards.items()]
+                    for result in results:
+                        prov_items.extend(result.get())
+                finally:
+                    pool.close()
+                    pool.join()
+            else:
+                for board, board_placements in boards.items():
+                    prov_items.extend(
+                        get_board_provenance(board, board_placements))
+        finally:
+            if uses_advanced_monitors:
+                for receiver in boards:
+                    receiver.unset_cores_for_data_extraction(
+                        transceiver=transceiver, placements=placements,
+                        extra_monitor_cores_for_router_timeout=(
+                            extra_monitor_cores))
+        progress.end()
 
         return prov_items
+
+    @staticmethod
+    def _get_board(machine, placement, uses_advanced_monitors,
+                   extra_monitor_cores_to_ethernet_connection_map):
+        if machine is None:
+            return None
+        if uses_advanced_monitors:
+            return helpful_functions.locate_extra_monitor_mc_receiver(
+                machine, placement.x, placement.y,
+                extra_monitor_cores_to_ethernet_connection_map)
+        chip = machine.get_chip_at(placement.x, placement.y)
+        return (chip.nearest_ethernet_x, chip.nearest_ethernet_y)
+
+    def _get_board_provenance(
+            self, transceiver, receiver, board_placements, placements,
+            processor_to_app_data_base_address,
+            extra_monitor_to_chip_mapping, fixed_routes):
+        """ Get the provenance data of the placements on a board, having\
+            first fetched the provenance regions of the board in bulk
+        """
+        # pylint: disable=too-many-arguments
+        prefetched = _PrefetchedMemoryTransceiver(transceiver)
+
+        # locate the provenance regions of the cores on the board; the
+        # region tables are shared with the vertices, which find their
+        # regions again when reading their provenance
+        region_table_cache = globals_variables.region_table_cache()
+        reads_by_chip = defaultdict(list)
+        for placement in board_placements:
+            if isinstance(placement.vertex,
+                          ProvidesProvenanceDataFromMachineImpl):
+                region_id, size = placement.vertex.get_provenance_data_region()
+                core = (placement.x, placement.y, placement.p)
+                base_address = None
+                if core in processor_to_app_data_base_address:
+                    base_address = processor_to_app_data_base_address[
+                        core]["start_address"]
+                address = region_table_cache.read_region_addresses(
+                    transceiver, placement.x, placement.y, placement.p,
+                    base_address)[region_id]
+                reads_by_chip[placement.x, placement.y].append(
+                    (address, size))
+
+        # read the regions of each chip together
+        reads = list()
+        for (x, y), chip_reads in reads_by_chip.items():
+            reads.extend(
+                (x, y, start, end - start)
+                for start, end in self._merge_reads(sorted(chip_reads)))
+        if receiver is not None:
+            data = receiver.get_data_for_reads(transceiver, [
+                (placements.get_placement_of_vertex(
+                    extra_monitor_to_chip_mapping[x, y]), address, length)
+                for x, y, address, length in reads], fixed_routes)
+        else:
+            data = [transceiver.read_memory(x, y, address, length)
+                    for x, y, address, length in reads]
+        for (x, y, address, _), block in zip(reads, data):
+            prefetched.add_block(x, y, address, block)
+
+        items = list()
+        for placement in board_placements:
+            items.extend(placement.vertex.get_provenance_data_from_machine(
+                prefetched, placement))
+        return items
+
+    @staticmethod
+    def _merge_reads(sorted_reads):
+        """ Merge reads which overlap or have only small gaps between them
+
+        :param sorted_reads: list of (address, length) sorted by address
+        :return: list of (start address, end address)
+        """
+        merged = list()
+        for address, length in sorted_reads:
+            if merged and address - merged[-1][1] <= \
+                    _MAX_GAP_TO_MERGE_READS_IN_BYTES:
+                merged[-1] = (
+                    merged[-1][0], max(merged[-1][1], address + length))
+            else:
+                merged.append((address, address + length))
+        return merged
@@ -1,13 +1,16 @@
 from spinn_utilities.progress_bar import ProgressBar
 
 # front end common imports
-from spinn_front_end_common.interface.profiling import AbstractHasProfileData
+from spinn_front_end_common.interface.profiling \
+    import AbstractHasProfileData, ProfileData
 
 import os
 import logging
 
 logger = logging.getLogger(__name__)
 
+_SUMMARY_FILENAME = "profile_summary.txt"
+
 
 class ProfileDataGatherer(object):
     __slots__ = []
@@ -30,6 +33,7 @@ class ProfileDataGatherer(object):
             placements.n_placements, "Getting profile data")
 
         # retrieve provenance data from any cores that provide data
+        profiles = dict()
         for placement in progress.over(placements.placements):
             if isinstance(placement.vertex, AbstractHasProfileData):
                 # get data
@@ -38,6 +42,13 @@ class ProfileDataGatherer(object):
                 if profile_data.tags:
                     self._write(placement, profile_data, run_time_ms,
                                 machine_time_step_ms, provenance_file_path)
+                    profiles[placement] = profile_data
+
+        # summarise where the time is spent across the whole machine
+        if profiles:
+            self._write_summary(
+                ProfileData.summarise(profiles, machine_time_step_ms),
+                provenance_file_path)
 
     def _write(self, p, profile_data, run_time_ms,
                machine_time_step_ms, directory):
@@ -70,3 +81,33 @@ class ProfileDataGatherer(object):
                                 tag, run_time_ms, machine_time_step_ms),
                             profile_data.get_mean_ms_per_ts(
                                 tag, run_time_ms, machine_time_step_ms)))
+
+    @staticmethod
+    def _write_summary(summary, directory):
+        # Write the tags in order of the time spent per time step by the
+        # median core, so that the hot spots come first
+        tags = sorted(
+            summary, key=lambda tag: summary[tag]["ms_per_ts_percentiles"][50],
+            reverse=True)
+        max_tag_len = max(len("tag"), max(len(tag) for tag in tags))
+        file_name = os.path.join(directory, _SUMMARY_FILENAME)
+        mode = "w"
+        if os.path.exists(file_name):
+            mode = "a"
+        with open(file_name, mode) as f:
+            f.write(
+                "{: <{}s} {: <7s} {: <9s} {: <14s} {: <14s} {: <14s} {: <14s}"
+                " {}\n".format(
+                    "tag", max_tag_len, "n_cores", "n_calls", "mean_ms",
+                    "median_ms_ts", "90%_ms_ts", "max_ms_ts", "hottest_core"))
+            for tag in tags:
+                tag_summary = summary[tag]
+                ms_per_ts = tag_summary["ms_per_ts_percentiles"]
+                hottest = tag_summary["hottest"]
+                f.write(
+                    "{: <{}s} {: >7d} {: >9d} {: >14.6f} {: >14.6f} {: >14.6f}"
+                    " {: >14.6f} {}, {}, {}\n".format(
+                        tag, max_tag_len, tag_summary["n_cores"],
+                        tag_summary["n_calls"], tag_summary["mean_ms"],
+                        ms_per_ts[50], ms_per_ts[90], ms_per_ts[100],
+                        hottest.x, hottest.y, hottest.p))
@@ -1,52 +1,89 @@
+from spinn_front_end_common.interface.provenance import ProvenanceDatabase
 from spinn_front_end_common.utilities.helpful_functions \
     import generate_unique_folder_name
 
 # general imports
+from six import text_type
+import io
 import itertools
 import json
 import string
 
 _VALID_CHARS = frozenset(
     "-_.() {}{}".format(string.ascii_letters, string.digits))
+_INDENT = u"    "
+
+
+def _sort_key(item):
+    return [text_type(name) for name in item.names[:-1]]
 
 
 class ProvenanceJSONWriter(object):
-    """ Write provenance data into JSON
+    """ Write provenance data into JSON, one file per top-level name, each\
+        in a single pass over the items
     """
 
     __slots__ = []
 
     def __call__(self, provenance_data_items, provenance_data_path):
 
+        # The items of each name and of each category within it must come
+        # together, so that the objects can be written as they are reached
+        if isinstance(provenance_data_items, ProvenanceDatabase):
+            items = provenance_data_items.iter_sorted_items()
+        else:
+            items = sorted(provenance_data_items, key=_sort_key)
+
         # Group data by the first name
-        items = sorted(provenance_data_items, key=lambda item: item.names[0])
         for name, group in itertools.groupby(
                 items, lambda item: item.names[0]):
-            # Create a root node
-            root = dict()
-
-            # Go through the items and add them
-            for item in group:
-                # Add the "categories" for the item (any name between the first
-                # and last)
-                parent = self._build_path(root, item)
-                # Add the item
-                parent[item.names[-1]] = str(item.value)
-
             # write json form into file provided
-            with open(self._get_file(provenance_data_path, name), "w") as f:
-                json.dump(root, f, indent=4, separators=(',', ': '))
+            with io.open(self._get_file(provenance_data_path, name), "w",
+                         encoding="ascii") as f:
+                self._write_items(f, group)
 
     @staticmethod
-    def _build_path(root, item):
-        parent = root
-        for name in item.names[1:-1]:
-            if not (name in parent and isinstance(parent[name], dict)):
-                # If there isn't already a category of this name under the
-                # super element, create a new category under the parent
-                parent[name] = dict()
-            parent = parent[name]
-        return parent
+    def _write_key(f, is_first, depth, key):
+        f.write(u"{}\n{}{}: ".format(
+            u"" if is_first else u",", _INDENT * depth,
+            text_type(json.dumps(text_type(key)))))
+
+    def _write_items(self, f, items):
+        # Create a root node; for it and each open "category" (any name
+        # between the first and last of an item), whether nothing has yet
+        # been written in it
+        f.write(u"{")
+        is_empty = [True]
+        categories = list()
+        for item in items:
+            path = [text_type(name) for name in item.names[1:-1]]
+
+            # Close the categories that this item is not in, and open those
+            # that it is in that are not already open
+            n_common = 0
+            for open_name, name in zip(categories, path):
+                if open_name != name:
+                    break
+                n_common += 1
+            while len(categories) > n_common:
+                categories.pop()
+                is_empty.pop()
+                f.write(u"\n{}}}".format(_INDENT * len(is_empty)))
+            for name in path[n_common:]:
+                self._write_key(f, is_empty[-1], len(is_empty), name)
+                is_empty[-1] = False
+                f.write(u"{")
+                categories.append(name)
+                is_empty.append(True)
+
+            # Add the item
+            self._write_key(f, is_empty[-1], len(is_empty), item.names[-1])
+            is_empty[-1] = False
+            f.write(text_type(json.dumps(text_type(item.value))))
+
+        while is_empty:
+            is_empty.pop()
+            f.write(u"\n{}}}".format(_INDENT * len(is_empty)))
 
     @staticmethod
     def _get_file(path, name):
@@ -1,8 +1,11 @@
+from spinn_front_end_common.interface.provenance import ProvenanceDatabase
 from spinn_front_end_common.utilities.helpful_functions \
     import generate_unique_folder_name
 
 # general imports
-from lxml import etree
+from six import text_type
+from xml.sax.saxutils import escape
+import io
 import itertools
 import string
 
@@ -10,10 +13,18 @@ _VALID_CHARS = frozenset(
     "-_.() {}{}".format(string.ascii_letters, string.digits))
 _XML_BRANCH_NAME = "provenance_data_items"
 _XML_LEAF_NAME = "provenance_data_item"
+_INDENT = u"  "
+_ATTRIBUTE_ENTITIES = {
+    u'"': u"&quot;", u"\n": u"&#10;", u"\r": u"&#13;", u"\t": u"&#9;"}
+
+
+def _sort_key(item):
+    return [text_type(name) for name in item.names[:-1]]
 
 
 class ProvenanceXMLWriter(object):
-    """ Write provenance data into XML
+    """ Write provenance data into XML, one file per top-level name, each\
+        in a single pass over the items
     """
 
     __slots__ = []
@@ -26,29 +37,20 @@ class ProvenanceXMLWriter(object):
         :return: None
         """
 
+        # The items of each name and of each category within it must come
+        # together, so that the elements can be written as they are reached
+        if isinstance(provenance_data_items, ProvenanceDatabase):
+            items = provenance_data_items.iter_sorted_items()
+        else:
+            items = sorted(provenance_data_items, key=_sort_key)
+
         # Group data by the first name
-        items = sorted(provenance_data_items, key=lambda item: item.names[0])
         for name, group in itertools.groupby(
                 items, lambda item: item.names[0]):
-            # Create a root node
-            root = etree.Element(_XML_BRANCH_NAME, name=name)
-            # Keep track of sub-categories
-            categories = {root: dict()}
-
-            # Go through the items and add them
-            for item in group:
-                # Add the "categories" for the item (any name between the first
-                # and last)
-                parent = self._build_path(root, categories, item)
-
-                # Add the item
-                element = etree.SubElement(
-                    parent, _XML_LEAF_NAME, name=item.names[-1])
-                element.text = str(item.value)
-
             # write xml form into file provided
-            with open(self._get_file(provenance_data_path, name), "wb") as f:
-                f.write(etree.tostring(root, pretty_print=True))
+            with io.open(self._get_file(provenance_data_path, name), "w",
+                         encoding="ascii", errors="xmlcharrefreplace") as f:
+                self._write_items(f, text_type(name), group)
 
     @staticmethod
     def _get_file(path, name):
@@ -56,18 +58,46 @@ class ProvenanceXMLWriter(object):
         return generate_unique_folder_name(path, remapped, ".xml")
 
     @staticmethod
-    def _build_path(root, categories, item):
-        parent = root
-        cats = categories[root]
-        for cat_name in item.names[1:-1]:
-            if cat_name not in cats:
-                # If there is not a category of this name under the parent
-                # element, create a new category
-                parent = etree.SubElement(
-                    parent, _XML_BRANCH_NAME, name=cat_name)
-                cats[cat_name] = parent
-                categories[parent] = dict()
-            # Update our state variables for the next run of the loop
-            parent = cats[cat_name]
-            cats = categories[parent]
-        return parent
+    def _start_branch(f, depth, name):
+        f.write(u"{}<{} name=\"{}\">\n".format(
+            _INDENT * depth, _XML_BRANCH_NAME,
+            escape(name, _ATTRIBUTE_ENTITIES)))
+
+    @staticmethod
+    def _end_branch(f, depth):
+        f.write(u"{}</{}>\n".format(_INDENT * depth, _XML_BRANCH_NAME))
+
+    def _write_items(self, f, name, items):
+        # Create a root node
+        self._start_branch(f, 0, name)
+
+        # The "categories" currently open, which are any names between the
+        # first and last of an item
+        categories = list()
+        for item in items:
+            path = [text_type(cat_name) for cat_name in item.names[1:-1]]
+
+            # Close the categories that this item is not in, and open those
+            # that it is in that are not already open
+            n_common = 0
+            for open_name, cat_name in zip(categories, path):
+                if open_name != cat_name:
+                    break
+                n_common += 1
+            while len(categories) > n_common:
+                categories.pop()
+                self._end_branch(f, len(categories) + 1)
+            for cat_name in path[n_common:]:
+                self._start_branch(f, len(categories) + 1, cat_name)
+                categories.append(cat_name)
+
+            # Add the item
+            f.write(u"{}<{} name=\"{}\">{}</{}>\n".format(
+                _INDENT * (len(categories) + 1), _XML_LEAF_NAME,
+                escape(text_type(item.names[-1]), _ATTRIBUTE_ENTITIES),
+                escape(text_type(item.value)), _XML_LEAF_NAME))
+
+        while categories:
+            categories.pop()
+            self._end_branch(f, len(categories) + 1)
+        self._end_branch(f, 0)
@@ -1,7 +1,6 @@
 import numpy
 import logging
 
-import scipy.stats
 from spinn_utilities.log import FormatAdapter
 
 logger = FormatAdapter(logging.getLogger(__name__))
@@ -13,23 +12,73 @@ _MS_SCALE = (1.0 / 200000.0)
 _START_TIME = 0
 _DURATION = 1
 
+# The number of samples of a tag for which space is first made
+_INITIAL_CAPACITY = 64
+
+#: The percentiles of the time spent per time step across cores which are\
+#: summarised by default
+DEFAULT_PERCENTILES = (50, 90, 100)
+
+
+class _TagSamples(object):
+    """ The start times and durations of the calls of a tag, in arrays which\
+        grow as more are added
+    """
+
+    __slots__ = (
+        # array of start times and durations, with a row for each of
+        # _START_TIME and _DURATION, and space for more columns than used
+        "_samples",
+
+        # The number of columns of _samples used
+        "_n_samples"
+    )
+
+    def __init__(self):
+        self._samples = numpy.zeros((2, _INITIAL_CAPACITY))
+        self._n_samples = 0
+
+    def add(self, start_times, durations):
+        n_samples = self._n_samples + len(start_times)
+        capacity = self._samples.shape[1]
+        if n_samples > capacity:
+            while n_samples > capacity:
+                capacity *= 2
+            samples = numpy.zeros((2, capacity))
+            samples[:, :self._n_samples] = self.samples
+            self._samples = samples
+        self._samples[_START_TIME, self._n_samples:n_samples] = start_times
+        self._samples[_DURATION, self._n_samples:n_samples] = durations
+        self._n_samples = n_samples
+
+    @property
+    def samples(self):
+        """ The start times and durations, in rows _START_TIME and _DURATION
+        """
+        return self._samples[:, :self._n_samples]
+
 
 class ProfileData(object):
-    """ A container for profile data
+    """ A container for profile data, which can be added to from several\
+        reads of the profile section, such as from each segment of a run
     """
 
     START_TIME = _START_TIME
     DURATION = _DURATION
 
     __slots__ = (
-        # A dictionary of tag label to numpy array of start times and durations
+        # A dictionary of tag label to _TagSamples
         "_tags",
 
         # A list of tag labels indexed by the tag ID
         "_tag_labels",
 
         # The maximum time recorded
-        "_max_time"
+        "_max_time",
+
+        # dict of (tag label, time step) to the number of calls and the time
+        # spent in them in each time step, worked out when first needed
+        "_per_ts"
     )
 
     def __init__(self, tag_labels):
@@ -40,14 +89,23 @@ class ProfileData(object):
         self._tag_labels = tag_labels
         self._tags = dict()
         self._max_time = None
+        self._per_ts = dict()
 
-    def add_data(self, data):
+    def add_data(self, data, start_time_ms=None):
         """ Add profiling data read from the profile section
 
         :param data: Data read from the profile section on the machine
         :type data: bytearray
+        :param start_time_ms: The time of the first sample of the data\
+            relative to the first sample of the first data added, or None to\
+            continue from the end of the data already added
+        :type start_time_ms: float
         """
         samples = numpy.asarray(data, dtype="uint8").view(dtype="<u4")
+        if not len(samples):
+            return
+        if start_time_ms is None:
+            start_time_ms = self._max_time or 0.0
 
         # Slice data to separate times, tags and flags
         sample_times = samples[::2]
@@ -65,7 +123,7 @@ class ProfileData(object):
         # Convert count-down times to count up times from 1st sample
         sample_times_ms = numpy.multiply(
             numpy.subtract(sample_times[0], sample_times),
-            _MS_SCALE, dtype=numpy.float)
+            _MS_SCALE, dtype=float)
 
         # Slice tags and times into entry and exits
         entry_tags = sample_tags[sample_entry_indices]
@@ -76,10 +134,15 @@ class ProfileData(object):
         # Loop through unique tags
         for tag in numpy.unique(sample_tags):
             self._add_tag_data(
-                entry_tags, entry_times_ms, exit_tags, exit_times_ms, tag)
+                entry_tags, entry_times_ms, exit_tags, exit_times_ms, tag,
+                start_time_ms)
+
+        # Anything worked out from the data before must be worked out again
+        self._per_ts = dict()
 
     def _add_tag_data(
-            self, entry_tags, entry_times, exit_tags, exit_times, tag):
+            self, entry_tags, entry_times, exit_tags, exit_times, tag,
+            start_time_ms):
         # pylint: disable=too-many-arguments
         tag_label = self._tag_labels.get(tag, None)
         if tag_label is None:
@@ -93,10 +156,13 @@ class ProfileData(object):
         # Use these to get subset for this tag
         tag_entry_times = entry_times[tag_entry_indices]
         tag_exit_times = exit_times[tag_exit_indices]
+        if not len(tag_exit_times):
+            logger.warning("profile finishes mid-tag")
+            return
 
         # If the first exit is before the first
         # Entry, add a dummy entry at beginning
-        if tag_exit_times[0] < tag_entry_times[0]:
+        if not len(tag_entry_times) or tag_exit_times[0] < tag_entry_times[0]:
             logger.warning("Profile starts mid-tag")
             tag_entry_times = numpy.append(0.0, tag_entry_times)
 
@@ -109,11 +175,16 @@ class ProfileData(object):
         # call in ms
         tag_durations = numpy.subtract(tag_exit_times, tag_entry_times)
 
-        # Add entry times and durations to dictionary
-        self._tags[tag_label] = (tag_entry_times, tag_durations)
+        # Add entry times and durations to those of the tag
+        tag_start_times = tag_entry_times + start_time_ms
+        if tag_label not in self._tags:
+            self._tags[tag_label] = _TagSamples()
+        self._tags[tag_label].add(tag_start_times, tag_durations)
 
         # Keep track of the maximum time
-        self._max_time = numpy.max(tag_entry_times + tag_durations)
+        max_time = numpy.max(tag_start_times + tag_durations)
+        if self._max_time is None or max_time > self._max_time:
+            self._max_time = max_time
 
     @property
     def tags(self):
@@ -123,6 +194,17 @@ class ProfileData(object):
         """
         return self._tags.keys()
 
+    def get_samples(self, tag):
+        """ Get the start times and durations of the calls of a tag
+
+        :param tag: The tag to get the samples of
+        :type tag: str
+        :return: array with the start times in milliseconds in row\
+            START_TIME and the durations in milliseconds in row DURATION
+        :rtype: numpy.ndarray
+        """
+        return self._tags[tag].samples
+
     def get_mean_ms(self, tag):
         """ Get the mean time in milliseconds spent on operations with the\
             given tag
@@ -131,7 +213,7 @@ class ProfileData(object):
         :type tag: str
         :rtype: float
         """
-        return numpy.average(self._tags[tag][_DURATION])
+        return numpy.average(self._tags[tag].samples[_DURATION])
 
     def get_n_calls(self, tag):
         """ Get the number of times the given tag was recorded
@@ -140,7 +222,33 @@ class ProfileData(object):
         :type tag: str
         :rtype: int
         """
-        return self._tags[tag][_DURATION].size
+        return self._tags[tag].samples[_DURATION].size
+
+    def _get_per_ts(self, tag, machine_time_step_ms):
+        """ Get the number of calls of a tag and the time spent in them in\
+            each time step, working them out only if not already known
+
+        :return: array of number of calls and array of time spent in ms
+        :rtype: tuple(numpy.ndarray, numpy.ndarray)
+        """
+        key = (tag, machine_time_step_ms)
+        if key not in self._per_ts:
+            bins = numpy.arange(
+                0, self._max_time + machine_time_step_ms,
+                machine_time_step_ms)
+            n_bins = max(len(bins) - 1, 0)
+
+            # Each time is in the bin whose lower edge it is at or after,
+            # except that the last bin includes its upper edge
+            samples = self._tags[tag].samples
+            indices = numpy.minimum(
+                numpy.searchsorted(bins, samples[_START_TIME], "right") - 1,
+                n_bins - 1)
+            self._per_ts[key] = (
+                numpy.bincount(indices, minlength=n_bins)[:n_bins],
+                numpy.bincount(indices, weights=samples[_DURATION],
+                               minlength=n_bins)[:n_bins])
+        return self._per_ts[key]
 
     def get_mean_n_calls_per_ts(self, tag, run_time_ms, machine_time_step_ms):
         """ Get the mean number of times the given tag was recorded per\
@@ -155,10 +263,8 @@ class ProfileData(object):
         :type run_time_ms: float
         :rtype: float
         """
-        bins = numpy.arange(
-            0, self._max_time + machine_time_step_ms, machine_time_step_ms)
-        return numpy.average(numpy.histogram(
-            self._tags[tag][_START_TIME], bins)[0])
+        n_calls, _ = self._get_per_ts(tag, machine_time_step_ms)
+        return numpy.average(n_calls)
 
     def get_mean_ms_per_ts(self, tag, run_time_ms, machine_time_step_ms):
         """ Get the mean time in milliseconds spent on operations with the\
@@ -173,11 +279,58 @@ class ProfileData(object):
         :type run_time_ms: float
         :rtype: float
         """
-        bins = numpy.arange(
-            0, self._max_time + machine_time_step_ms, machine_time_step_ms)
-        mean_per_ts = scipy.stats.binned_statistic(
-            self._tags[tag][_START_TIME], self._tags[tag][_DURATION],
-            "mean", bins).statistic
-        mean_per_ts[numpy.isnan(mean_per_ts)] = 0
-        return numpy.average(
-            mean_per_ts[numpy.logical_not(numpy.isnan(mean_per_ts))])
+        # The mean of the time of each call in each time step, where time
+        # steps without calls count as 0
+        n_calls, total_ms = self._get_per_ts(tag, machine_time_step_ms)
+        mean_per_ts = numpy.zeros(len(n_calls))
+        numpy.divide(total_ms, n_calls, out=mean_per_ts, where=n_calls > 0)
+        return numpy.average(mean_per_ts)
+
+    @staticmethod
+    def summarise(profiles, machine_time_step_ms,
+                  percentiles=DEFAULT_PERCENTILES):
+        """ Summarise the profiles of several cores, tag by tag, to find\
+            where the time is spent across the machine
+
+        :param profiles: dict of a key for each core, such as its\
+            placement, to its profile data
+        :type profiles: dict(object, ProfileData)
+        :param machine_time_step_ms: The time step of the simulation in\
+            milliseconds
+        :type machine_time_step_ms: int
+        :param percentiles: The percentiles of the time spent per time step\
+            across the cores to find
+        :type percentiles: iterable(float)
+        :return: dict of tag to dict with "n_cores", the number of cores\
+            that recorded the tag; "n_calls", the number of calls recorded\
+            by all cores; "mean_ms", the mean time of a call;\
+            "ms_per_ts_percentiles", the percentiles across the cores of\
+            the mean time spent in the tag per time step; and "hottest",\
+            the key of the core which spent most time in the tag per time\
+            step
+        :rtype: dict(str, dict)
+        """
+        keys_by_tag = dict()
+        samples_by_tag = dict()
+        ms_per_ts_by_tag = dict()
+        for key, profile in profiles.items():
+            for tag in profile.tags:
+                _, total_ms = profile._get_per_ts(tag, machine_time_step_ms)
+                keys_by_tag.setdefault(tag, list()).append(key)
+                samples_by_tag.setdefault(tag, list()).append(
+                    profile.get_samples(tag)[_DURATION])
+                ms_per_ts_by_tag.setdefault(tag, list()).append(
+                    numpy.average(total_ms) if len(total_ms) else 0.0)
+
+        summary = dict()
+        for tag, keys in keys_by_tag.items():
+            durations = numpy.concatenate(samples_by_tag[tag])
+            ms_per_ts = numpy.array(ms_per_ts_by_tag[tag])
+            summary[tag] = {
+                "n_cores": len(keys),
+                "n_calls": durations.size,
+                "mean_ms": numpy.average(durations),
+                "ms_per_ts_percentiles": dict(zip(
+                    percentiles, numpy.percentile(ms_per_ts, percentiles))),
+                "hottest": keys[int(numpy.argmax(ms_per_ts))]}
+        return summary
@@ -51,17 +51,24 @@ def write_profile_region_data(spec, region, n_samples):
     spec.write_value(n_samples)
 
 
-def get_profiling_data(profile_region, tag_labels, txrx, placement):
+def get_profiling_data(profile_region, tag_labels, txrx, placement,
+                       profile_data=None, start_time_ms=None):
     """ Utility function to get profile data from a profile region
 
     :param profile_region: DSG region to get profiling data out of SDRAM
     :param tag_labels: labels for the profiling data
     :param txrx: SpiNNMan transceiver
     :param placement: placement
+    :param profile_data: profile data to add the data read to, such as that\
+        of earlier segments of a run, or None to create new profile data
+    :param start_time_ms: the time of the start of the data read relative\
+        to the start of the data already in profile_data, or None to follow\
+        on from the data already there
     :return: ProfileData
     """
-
-    profile_data = ProfileData(tag_labels)
+    # pylint: disable=too-many-arguments
+    if profile_data is None:
+        profile_data = ProfileData(tag_labels)
 
     profiling_region_base_address = locate_memory_region_for_placement(
         placement=placement, region=profile_region, transceiver=txrx)
@@ -76,6 +83,6 @@ def get_profiling_data(profile_region, tag_labels, txrx, placement):
             placement.x, placement.y,
             profiling_region_base_address +
             BYTE_OFFSET_OF_PROFILE_DATA_IN_PROFILE_REGION,
-            words_written * 4))
+            words_written * 4), start_time_ms)
 
     return profile_data
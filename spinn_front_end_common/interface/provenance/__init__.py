@@ -4,10 +4,11 @@ from .abstract_provides_provenance_data_from_machine \
     import AbstractProvidesProvenanceDataFromMachine
 from .pacman_provenance_extractor \
     import PacmanProvenanceExtractor
+from .provenance_database import ProvenanceDatabase
 from .provides_provenance_data_from_machine_impl \
     import ProvidesProvenanceDataFromMachineImpl
 
 __all__ = ["AbstractProvidesLocalProvenanceData",
            "AbstractProvidesProvenanceDataFromMachine",
-           "PacmanProvenanceExtractor",
+           "PacmanProvenanceExtractor", "ProvenanceDatabase",
            "ProvidesProvenanceDataFromMachineImpl"]
@@ -0,0 +1,210 @@
+from six import text_type
+import numbers
+import sqlite3
+
+from spinn_front_end_common.utilities.utility_objs import ProvenanceDataItem
+
+#: the number of items held before they are written to the database together
+DEFAULT_BATCH_SIZE = 10000
+
+# separates the names of the categories of an item in the database; this
+# sorts before any printable character, so the items of a category and its
+# sub-categories sort together
+_PATH_SEPARATOR = u"\x1f"
+
+_CREATE_TABLE = (
+    "CREATE TABLE IF NOT EXISTS provenance("
+    " item_id INTEGER PRIMARY KEY AUTOINCREMENT,"
+    " top_name TEXT NOT NULL,"
+    " path TEXT NOT NULL,"
+    " name TEXT NOT NULL,"
+    " value,"
+    " report INTEGER NOT NULL,"
+    " message TEXT)")
+_INSERT = (
+    "INSERT INTO provenance("
+    " top_name, path, name, value, report, message)"
+    " VALUES(?, ?, ?, ?, ?, ?)")
+_COLUMNS = "top_name, path, name, value, report, message"
+
+
+class ProvenanceDatabase(object):
+    """ A store of provenance data items in an SQLite database, which can be\
+        given to the provenance gatherers in place of a list of items.\
+        Items are written in batches as they are added, so the items need\
+        not all be held in memory, and can be queried without reading the\
+        files that they are written to.
+    """
+
+    __slots__ = [
+        # the path of the database
+        "_database_path",
+
+        # the connection to the database, or None while it is closed
+        "_connection",
+
+        # the rows of the items added but not yet written
+        "_pending",
+
+        # the number of rows to hold before writing them
+        "_batch_size"
+    ]
+
+    def __init__(self, database_path, batch_size=DEFAULT_BATCH_SIZE):
+        """
+        :param database_path: the path of the database file to write
+        :type database_path: str
+        :param batch_size: the number of items to hold before they are\
+            written to the database together
+        :type batch_size: int
+        """
+        self._database_path = database_path
+        self._connection = sqlite3.connect(database_path)
+        self._connection.execute(_CREATE_TABLE)
+        self._pending = list()
+        self._batch_size = batch_size
+
+    @property
+    def database_path(self):
+        """ The path of the database file
+
+        :rtype: str
+        """
+        return self._database_path
+
+    @staticmethod
+    def _to_row(item):
+        names = [text_type(name) for name in item.names]
+        # Numbers are kept as numbers so that they can be totalled, and
+        # anything else as it would be written to a file
+        value = item.value
+        if isinstance(value, bool) or not isinstance(value, numbers.Real):
+            if value is not None:
+                value = text_type(value)
+        elif isinstance(value, numbers.Integral):
+            value = int(value)
+        else:
+            value = float(value)
+        return (names[0], _PATH_SEPARATOR.join(names[1:-1]), names[-1],
+                value, bool(item.report), item.message)
+
+    @staticmethod
+    def _from_row(row):
+        top_name, path, name, value, report, message = row
+        names = [top_name]
+        if path:
+            names.extend(path.split(_PATH_SEPARATOR))
+        names.append(name)
+        return ProvenanceDataItem(names, value, bool(report), message)
+
+    def append(self, item):
+        """ Add an item
+
+        :type item: :py:class:`ProvenanceDataItem`
+        """
+        self._pending.append(self._to_row(item))
+        if len(self._pending) >= self._batch_size:
+            self.flush()
+
+    def extend(self, items):
+        """ Add some items
+
+        :type items: iterable(:py:class:`ProvenanceDataItem`)
+        """
+        for item in items:
+            self.append(item)
+
+    def _connect(self):
+        if self._connection is None:
+            self._connection = sqlite3.connect(self._database_path)
+        return self._connection
+
+    def flush(self):
+        """ Write any items not yet written to the database
+        """
+        if self._pending:
+            with self._connect() as connection:
+                connection.executemany(_INSERT, self._pending)
+            self._pending = list()
+
+    def _query(self, sql, args=()):
+        self.flush()
+        return self._connect().execute(sql, args)
+
+    def __len__(self):
+        return self._query("SELECT COUNT(*) FROM provenance").fetchone()[0]
+
+    def __iter__(self):
+        """ Iterate over the items in the order that they were added
+        """
+        for row in self._query(
+                "SELECT " + _COLUMNS + " FROM provenance ORDER BY item_id"):
+            yield self._from_row(row)
+
+    def iter_sorted_items(self):
+        """ Iterate over the items sorted by their names other than the\
+            last, so that the items of each top-level name, and of each\
+            category within it, come together
+
+        :rtype: iterable(:py:class:`ProvenanceDataItem`)
+        """
+        for row in self._query(
+                "SELECT " + _COLUMNS + " FROM provenance"
+                " ORDER BY top_name, path, item_id"):
+            yield self._from_row(row)
+
+    def get_items(self, top_name):
+        """ Get the items with a given top-level name
+
+        :param top_name: the first of the names of the items
+        :type top_name: str
+        :rtype: list(:py:class:`ProvenanceDataItem`)
+        """
+        return [self._from_row(row) for row in self._query(
+            "SELECT " + _COLUMNS + " FROM provenance WHERE top_name = ?"
+            " ORDER BY item_id", (top_name, ))]
+
+    def get_warnings(self):
+        """ Iterate over the items which are to be reported to the user
+
+        :rtype: iterable(:py:class:`ProvenanceDataItem`)
+        """
+        for row in self._query(
+                "SELECT " + _COLUMNS + " FROM provenance WHERE report != 0"
+                " ORDER BY item_id"):
+            yield self._from_row(row)
+
+    def get_totals(self, top_name=None):
+        """ Get the totals of the numeric values of the items, by the last\
+            of their names, e.g. the total number of times that the timer\
+            tick overran across all cores
+
+        :param top_name: the first of the names of the items to total, or\
+            None to total all items
+        :type top_name: str
+        :return: dict of last name to total
+        :rtype: dict(str, int or float)
+        """
+        sql = ("SELECT name, SUM(value) FROM provenance"
+               " WHERE typeof(value) IN ('integer', 'real')")
+        args = ()
+        if top_name is not None:
+            sql += " AND top_name = ?"
+            args = (top_name, )
+        return dict(self._query(sql + " GROUP BY name", args).fetchall())
+
+    def close(self):
+        """ Write any items not yet written and close the database.  Adding\
+            to or querying the database afterwards opens it again.
+        """
+        if self._connection is not None:
+            self.flush()
+            self._connection.close()
+            self._connection = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
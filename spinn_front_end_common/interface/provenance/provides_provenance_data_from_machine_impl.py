@@ -4,15 +4,13 @@ from spinn_utilities.abstract_base import AbstractBase, abstractproperty
 
 from .abstract_provides_provenance_data_from_machine \
     import AbstractProvidesProvenanceDataFromMachine
+from spinn_front_end_common.utilities.helpful_functions \
+    import locate_memory_region_for_placement
 from spinn_front_end_common.utilities.utility_objs import ProvenanceDataItem
 
-from data_specification.utility_calls import get_region_base_address_offset
-
 import struct
 from enum import Enum
 
-_ONE_WORD = struct.Struct("<I")
-
 
 @add_metaclass(AbstractBase)
 class ProvidesProvenanceDataFromMachineImpl(
@@ -59,18 +57,18 @@ class ProvidesProvenanceDataFromMachineImpl(
             (ProvidesProvenanceDataFromMachineImpl.NUM_PROVENANCE_DATA_ENTRIES
              + n_additional_data_items) * 4)
 
-    def _get_provenance_region_address(self, transceiver, placement):
+    def get_provenance_data_region(self):
+        """ Get the region that the provenance data is read from
 
-        # Get the App Data for the core
-        app_data_base_address = transceiver.get_cpu_information_from_core(
-            placement.x, placement.y, placement.p).user[0]
+        :return: the ID and the size in bytes of the region
+        :rtype: (int, int)
+        """
+        return (self._provenance_region_id, self.get_provenance_data_size(
+            self._n_additional_data_items))
 
-        # Get the provenance region base address
-        base_address_offset = get_region_base_address_offset(
-            app_data_base_address, self._provenance_region_id)
-        base_address = transceiver.read_memory(
-            placement.x, placement.y, base_address_offset, 4)
-        return _ONE_WORD.unpack(base_address)[0]
+    def _get_provenance_region_address(self, transceiver, placement):
+        return locate_memory_region_for_placement(
+            placement, self._provenance_region_id, transceiver)
 
     def _read_provenance_data(self, transceiver, placement):
         provenance_address = self._get_provenance_region_address(
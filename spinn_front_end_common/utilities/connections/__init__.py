@@ -1,3 +1,6 @@
+from .async_live_event_connection import AsyncLiveEventConnection
+from .async_udp_socket import AsyncUDPSocket
 from .live_event_connection import LiveEventConnection
 
-__all__ = ["LiveEventConnection"]
+__all__ = ["AsyncLiveEventConnection", "AsyncUDPSocket",
+           "LiveEventConnection"]
@@ -0,0 +1,455 @@
+from collections import OrderedDict, deque
+from six import iteritems
+from six.moves import builtins
+import logging
+import numpy
+import struct
+
+try:
+    import asyncio
+except ImportError:  # pragma: no cover
+    # Python 2 has no asyncio, so this connection cannot be used there
+    asyncio = None
+
+from spinn_front_end_common.utilities.constants import NOTIFY_PORT
+from spinn_front_end_common.utilities.database \
+    import AtomKeyRanges, DatabaseReader
+
+from spinnman.constants import EIEIO_COMMAND_IDS as CMDS
+from spinnman.messages.eieio import EIEIOType
+from spinnman.messages.eieio.command_messages import EIEIOCommandHeader
+from spinnman.utilities.utility_functions import send_port_trigger_message
+
+from spinn_utilities.log import FormatAdapter
+
+from .async_udp_socket import AsyncUDPSocket
+from .live_event_connection import \
+    _COMMAND_FLAGS, _COMMAND_MASK, _decode_eieio_data, _encode_eieio_data, \
+    _KeyToAtomLookup
+
+logger = FormatAdapter(logging.getLogger(__name__))
+
+# Python 2 has no StopAsyncIteration either; it is never raised there
+StopAsyncIteration = getattr(builtins, "StopAsyncIteration", StopIteration)
+
+
+class _EventIterator(object):
+    """ An asynchronous iterator over the batches of events received from a\
+        vertex, as (atom IDs, payloads) pairs
+    """
+
+    __slots__ = [
+        # the event loop of the connection
+        "_loop",
+
+        # the batches received and not yet taken
+        "_batches",
+
+        # the future given to the consumer waiting for a batch, if any
+        "_waiter",
+
+        # True once no more batches will arrive
+        "_closed"
+    ]
+
+    def __init__(self, loop):
+        self._loop = loop
+        self._batches = deque()
+        self._waiter = None
+        self._closed = False
+
+    def put(self, batch):
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(batch)
+        else:
+            self._batches.append(batch)
+        self._waiter = None
+
+    def close(self):
+        self._closed = True
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_exception(StopAsyncIteration())
+        self._waiter = None
+
+    def __aiter__(self):
+        return self
+
+    def __anext__(self):
+        future = self._loop.create_future()
+        if self._batches:
+            future.set_result(self._batches.popleft())
+        elif self._closed:
+            future.set_exception(StopAsyncIteration())
+        else:
+            self._waiter = future
+        return future
+
+
+class AsyncLiveEventConnection(object):
+    """ A connection for receiving and sending live events from and to\
+        SpiNNaker, in which the notification from the toolchain and all the\
+        sockets that events are received on are served by one asyncio\
+        event loop rather than by a thread each.
+
+    All the methods of this class must be called from the thread running\
+    the event loop. Callbacks may be plain functions or coroutine\
+    functions; coroutines are run as tasks on the event loop.
+    """
+
+    __slots__ = [
+        # the event loop that the sockets are served by
+        "_loop",
+
+        # the socket that the toolchain notifies about the database on
+        "_notification_socket",
+
+        # the label of the LivePacketGather vertex that events are sent by
+        "_live_packet_gather_label",
+
+        # True if the labels are of machine vertices
+        "_machine_vertices",
+
+        # the labels of the vertices that events are received from
+        "_receive_labels",
+
+        # the labels of the vertices that events are sent to
+        "_send_labels",
+
+        # dict of port to the socket receiving events on that port
+        "_receivers",
+
+        # the socket that events are sent from
+        "_sender",
+
+        # dict of label to the address that events to the vertex are sent to
+        "_send_address_details",
+
+        # dict of label to the AtomKeyRanges of the vertex sent to
+        "_atom_id_to_key",
+
+        # finds the atoms and labels that sent the keys received
+        "_key_lookup",
+
+        # dict of label to list of init callbacks
+        "_init_callbacks",
+
+        # list by receive label ID of lists of receive callbacks
+        "_receive_callbacks",
+
+        # list by receive label ID of lists of iterators of received events
+        "_event_iterators",
+
+        # dict of label to list of start or resume callbacks
+        "_start_resume_callbacks",
+
+        # dict of label to list of pause or stop callbacks
+        "_pause_stop_callbacks"
+    ]
+
+    def __init__(self, live_packet_gather_label, receive_labels=None,
+                 send_labels=None, local_host=None, local_port=NOTIFY_PORT,
+                 machine_vertices=False, loop=None):
+        """
+        :param live_packet_gather_label: The label of the LivePacketGather\
+            vertex to which received events are being sent
+        :param receive_labels: \
+            Labels of vertices from which live events will be received.
+        :type receive_labels: iterable of str
+        :param send_labels: \
+            Labels of vertices to which live events will be sent
+        :type send_labels: iterable of str
+        :param local_host: Optional specification of the local hostname or\
+            IP address of the interface to listen on
+        :type local_host: str
+        :param local_port: Optional specification of the local port to listen\
+            on. Must match the port that the toolchain will send the\
+            notification on (19999 by default)
+        :type local_port: int
+        :param loop: The event loop to serve the connection with, or None\
+            for the current event loop
+        :type loop: :py:class:`asyncio.AbstractEventLoop`
+        """
+        # pylint: disable=too-many-arguments
+        if loop is None:
+            loop = asyncio.get_event_loop()
+        self._loop = loop
+        self._live_packet_gather_label = live_packet_gather_label
+        self._receive_labels = list(receive_labels or [])
+        self._send_labels = list(send_labels or [])
+        self._machine_vertices = machine_vertices
+        self._receivers = dict()
+        self._sender = None
+        self._send_address_details = dict()
+        self._atom_id_to_key = dict()
+        self._key_lookup = _KeyToAtomLookup([])
+        self._receive_callbacks = [list() for _ in self._receive_labels]
+        self._event_iterators = [list() for _ in self._receive_labels]
+        self._init_callbacks = dict()
+        self._start_resume_callbacks = dict()
+        self._pause_stop_callbacks = dict()
+        for label in self._receive_labels + self._send_labels:
+            self._init_callbacks[label] = list()
+            self._start_resume_callbacks[label] = list()
+            self._pause_stop_callbacks[label] = list()
+        self._notification_socket = AsyncUDPSocket(
+            loop, self._receive_notification, local_host=local_host,
+            local_port=local_port)
+        logger.info(
+            "{}:{} Waiting for message to indicate that the database is "
+            "ready", self._notification_socket.local_ip_address,
+            self._notification_socket.local_port)
+
+    @property
+    def local_port(self):
+        """ The port that the notification from the toolchain is received on
+
+        :rtype: int
+        """
+        return self._notification_socket.local_port
+
+    def add_init_callback(self, label, init_callback):
+        """ Add a callback to be called to initialise a vertex
+
+        :param label: The label of the vertex to be notified about. Must\
+            be one of the vertices listed in the constructor
+        :type label: str
+        :param init_callback: A function to be called to initialise the\
+            vertex. This should take as parameters the label of the vertex,\
+            the number of neurons in the population, the run time of the\
+            simulation in milliseconds, and the simulation timestep in\
+            milliseconds
+        :type init_callback: function(str, int, float, float) -> None
+        """
+        self._init_callbacks[label].append(init_callback)
+
+    def add_receive_callback(self, label, receive_callback):
+        """ Add a callback for the reception of live events from a vertex,\
+            called once for each packet with all the events in the packet\
+            from the vertex
+
+        :param label: The label of the vertex to be notified about. Must be\
+            one of the vertices listed in the constructor
+        :type label: str
+        :param receive_callback: A function to be called when events are\
+            received. This should take as parameters the label of the\
+            vertex, a NumPy array of the atom IDs of the events, and a NumPy\
+            array of the payloads of the events, which are the time steps\
+            when the events occurred if the packet is timed, or None if the\
+            events have no payloads.
+        :type receive_callback: \
+            function(str, numpy.ndarray, numpy.ndarray or None) -> None
+        """
+        label_id = self._receive_labels.index(label)
+        self._receive_callbacks[label_id].append(receive_callback)
+
+    def events(self, label):
+        """ Get an asynchronous iterator over the live events received from\
+            a vertex from now on, as one (atom IDs, payloads) pair of NumPy\
+            arrays per packet, as given to receive callbacks. The iteration\
+            ends when the connection is closed.
+
+        :param label: The label of the vertex. Must be one of the vertices\
+            listed in the constructor
+        :type label: str
+        """
+        label_id = self._receive_labels.index(label)
+        iterator = _EventIterator(self._loop)
+        self._event_iterators[label_id].append(iterator)
+        return iterator
+
+    def add_start_resume_callback(self, label, start_resume_callback):
+        """ Add a callback for the start and resume state of the simulation
+
+        :param label: the label of the vertex the callback is for
+        :type label: str
+        :param start_resume_callback: A function to be called when the\
+            start or resume message has been received. This function should\
+            take the label of the referenced vertex, and an instance of this\
+            class, which can be used to send events.
+        :type start_resume_callback: function(str, \
+            :py:class:`AsyncLiveEventConnection`) -> None
+        """
+        self._start_resume_callbacks[label].append(start_resume_callback)
+
+    def add_pause_stop_callback(self, label, pause_stop_callback):
+        """ Add a callback for the pause and stop state of the simulation
+
+        :param label: the label of the vertex the callback is for
+        :type label: str
+        :param pause_stop_callback: A function to be called when the pause\
+            or stop message has been received. This function should take the\
+            label of the referenced vertex, and an instance of this class,\
+            which can be used to send events.
+        :type pause_stop_callback: function(str, \
+            :py:class:`AsyncLiveEventConnection`) -> None
+        """
+        self._pause_stop_callbacks[label].append(pause_stop_callback)
+
+    def _call(self, callback, *args):
+        """ Call a callback, running it as a task if it is a coroutine
+        """
+        try:
+            result = callback(*args)
+            if asyncio.iscoroutine(result):
+                self._loop.create_task(result)
+        except Exception:
+            logger.warning("problem in callback", exc_info=True)
+
+    def _receive_notification(self, data, address):
+        command = EIEIOCommandHeader.from_bytestring(data, 0).command
+        if command == CMDS.DATABASE_CONFIRMATION.value:
+            database_path = data[2:].decode()
+            logger.info("{}:{} Reading database",
+                        self._notification_socket.local_ip_address,
+                        self._notification_socket.local_port)
+            database_reader = DatabaseReader(database_path)
+            try:
+                self._read_database(database_reader)
+            finally:
+                database_reader.close()
+            logger.info(
+                "Notifying the toolchain that the database has been read")
+            self._notification_socket.send_to(
+                EIEIOCommandHeader(
+                    CMDS.DATABASE_CONFIRMATION.value).bytestring, address)
+        elif command == CMDS.START_RESUME_NOTIFICATION.value:
+            self.__call_state_callbacks(self._start_resume_callbacks)
+        elif command == CMDS.STOP_PAUSE_NOTIFICATION.value:
+            self.__call_state_callbacks(self._pause_stop_callbacks)
+
+    def __call_state_callbacks(self, callbacks_by_label):
+        for label, callbacks in iteritems(callbacks_by_label):
+            for callback in callbacks:
+                self._loop.call_soon(self._call, callback, label, self)
+
+    def _read_database(self, db_reader):
+        self._close_event_sockets()
+
+        vertex_sizes = OrderedDict()
+        run_time_ms = db_reader.get_configuration_parameter_value(
+            "runtime")
+        machine_timestep_ms = db_reader.get_configuration_parameter_value(
+            "machine_time_step") / 1000.0
+
+        if self._send_labels:
+            self._init_sender(db_reader, vertex_sizes)
+
+        if self._receive_labels:
+            self._init_receivers(db_reader, vertex_sizes)
+
+        for label, vertex_size in iteritems(vertex_sizes):
+            for init_callback in self._init_callbacks[label]:
+                self._call(init_callback, label, vertex_size, run_time_ms,
+                           machine_timestep_ms)
+
+    def _init_sender(self, db, vertex_sizes):
+        self._sender = AsyncUDPSocket(self._loop, self._ignore_packet)
+        for label in self._send_labels:
+            if self._machine_vertices:
+                self._send_address_details[label] = \
+                    db.get_machine_live_input_details(label)
+                key, _ = db.get_machine_live_input_key(label)
+                self._atom_id_to_key[label] = AtomKeyRanges([(key, 0, 1)])
+            else:
+                self._send_address_details[label] = \
+                    db.get_live_input_details(label)
+                self._atom_id_to_key[label] = db.get_atom_key_ranges(label)
+            vertex_sizes[label] = self._atom_id_to_key[label].n_atoms
+
+    def _init_receivers(self, db, vertex_sizes):
+        key_ranges_and_label_ids = list()
+        for label_id, label in enumerate(self._receive_labels):
+            if self._machine_vertices:
+                host, port, strip_sdp, board_address = \
+                    db.get_machine_live_output_details(
+                        label, self._live_packet_gather_label)
+                key, _ = db.get_machine_live_output_key(
+                    label, self._live_packet_gather_label)
+                key_ranges = AtomKeyRanges([(key, 0, 1)])
+            else:
+                host, port, strip_sdp, board_address = \
+                    db.get_live_output_details(
+                        label, self._live_packet_gather_label)
+                key_ranges = db.get_atom_key_ranges(label)
+            if not strip_sdp:
+                raise Exception("Currently, only IP tags which strip the SDP "
+                                "headers are supported")
+            if port not in self._receivers:
+                self._receivers[port] = AsyncUDPSocket(
+                    self._loop, self._receive_packet, local_port=port)
+            send_port_trigger_message(self._receivers[port], board_address)
+            logger.info(
+                "Listening for traffic from {} on {}:{}", label, host, port)
+            key_ranges_and_label_ids.append((key_ranges, label_id))
+            vertex_sizes[label] = key_ranges.n_atoms
+        self._key_lookup = _KeyToAtomLookup(key_ranges_and_label_ids)
+
+    def _ignore_packet(self, data, address):
+        pass
+
+    def _receive_packet(self, data, address):
+        header = struct.unpack_from("<H", data)[0]
+        if header & _COMMAND_MASK == _COMMAND_FLAGS:
+            return
+        keys, payloads, _ = _decode_eieio_data(data)
+        atom_ids, label_ids, found = self._key_lookup.lookup(keys)
+        for label_id in numpy.unique(label_ids[found]):
+            in_label = found & (label_ids == label_id)
+            batch = (atom_ids[in_label],
+                     None if payloads is None else payloads[in_label])
+            label = self._receive_labels[label_id]
+            for callback in self._receive_callbacks[label_id]:
+                self._call(callback, label, *batch)
+            for iterator in self._event_iterators[label_id]:
+                iterator.put(batch)
+
+    def send_events(self, label, atom_ids, send_full_keys=False,
+                    payloads=None):
+        """ Send a number of events
+
+        :param label: \
+            The label of the vertex from which the events will originate
+        :type label: str
+        :param atom_ids: array-like of atom IDs sending events
+        :type atom_ids: [int] or numpy.ndarray
+        :param send_full_keys: Determines whether to send full 32-bit keys,\
+            getting the key for each atom from the database, or whether to\
+            send 16-bit atom IDs directly
+        :type send_full_keys: bool
+        :param payloads: array-like of the payload of each event, or None\
+            to send events without payloads; payloads are 32-bit if full\
+            keys are sent and 16-bit otherwise
+        :type payloads: [int] or numpy.ndarray
+        """
+        if send_full_keys:
+            keys = self._atom_id_to_key[label].get_keys(atom_ids)
+            msg_type = EIEIOType.KEY_32_BIT
+            if payloads is not None:
+                msg_type = EIEIOType.KEY_PAYLOAD_32_BIT
+        else:
+            keys = atom_ids
+            msg_type = EIEIOType.KEY_16_BIT
+            if payloads is not None:
+                msg_type = EIEIOType.KEY_PAYLOAD_16_BIT
+
+        ip_address, port = self._send_address_details[label]
+        for data in _encode_eieio_data(msg_type, keys, payloads):
+            self._sender.send_to(data, (ip_address, port))
+
+    def _close_event_sockets(self):
+        if self._sender is not None:
+            self._sender.close()
+            self._sender = None
+        for receiver in self._receivers.values():
+            receiver.close()
+        self._receivers = dict()
+
+    def close(self):
+        """ Close all the sockets of the connection and end the iterations\
+            over received events
+        """
+        self._close_event_sockets()
+        self._notification_socket.close()
+        for iterators in self._event_iterators:
+            for iterator in iterators:
+                iterator.close()
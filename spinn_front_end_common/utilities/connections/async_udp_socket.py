@@ -0,0 +1,115 @@
+import errno
+import logging
+import socket
+
+from spinn_utilities.log import FormatAdapter
+
+logger = FormatAdapter(logging.getLogger(__name__))
+
+# The largest UDP packet that will be received
+_MAX_PACKET_SIZE = 300
+
+# The errors that mean that there is nothing more to receive for now
+_WOULD_BLOCK = (errno.EAGAIN, errno.EWOULDBLOCK)
+
+
+class AsyncUDPSocket(object):
+    """ A non-blocking UDP socket watched by an asyncio event loop, which\
+        calls a function with each packet received, so that any number of\
+        sockets can be served by a single thread
+    """
+
+    __slots__ = [
+        # the socket
+        "_socket",
+
+        # the event loop watching the socket
+        "_loop",
+
+        # the function called with the data and address of each packet
+        "_receive_callback"
+    ]
+
+    def __init__(self, loop, receive_callback, local_host=None,
+                 local_port=None, remote_host=None, remote_port=None):
+        """
+        :param loop: the event loop to watch the socket with
+        :type loop: :py:class:`asyncio.AbstractEventLoop`
+        :param receive_callback: the function to call with the data and the\
+            address of the sender of each packet received
+        :type receive_callback: function(bytes, (str, int)) -> None
+        :param local_host: the host name or IP address to listen on, or\
+            None for all interfaces
+        :type local_host: str
+        :param local_port: the port to listen on, or None for any port
+        :type local_port: int
+        :param remote_host: the host to send to by default, if any
+        :type remote_host: str
+        :param remote_port: the port to send to by default, if any
+        :type remote_port: int
+        """
+        # pylint: disable=too-many-arguments
+        self._loop = loop
+        self._receive_callback = receive_callback
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._socket.bind((local_host or "0.0.0.0", local_port or 0))
+        if remote_host is not None:
+            self._socket.connect((remote_host, remote_port))
+        self._socket.setblocking(False)
+        loop.add_reader(self._socket.fileno(), self._read)
+
+    def _read(self):
+        while True:
+            try:
+                data, address = self._socket.recvfrom(_MAX_PACKET_SIZE)
+            except socket.error as e:
+                if e.errno in _WOULD_BLOCK:
+                    return
+                logger.warning("Error receiving on port {}: {}",
+                               self.local_port, e)
+                return
+            try:
+                self._receive_callback(data, address)
+            except Exception:
+                logger.warning("problem handling received packet",
+                               exc_info=True)
+
+    @property
+    def local_ip_address(self):
+        """ The IP address that the socket is listening on
+
+        :rtype: str
+        """
+        return self._socket.getsockname()[0]
+
+    @property
+    def local_port(self):
+        """ The port that the socket is listening on
+
+        :rtype: int
+        """
+        return self._socket.getsockname()[1]
+
+    def send(self, data):
+        """ Send data to the remote host and port given when created
+
+        :param data: the data to send
+        :type data: bytes
+        """
+        self._socket.send(data)
+
+    def send_to(self, data, address):
+        """ Send data to an address
+
+        :param data: the data to send
+        :type data: bytes
+        :param address: the IP address and port to send to
+        :type address: (str, int)
+        """
+        self._socket.sendto(data, address)
+
+    def close(self):
+        """ Stop watching the socket and close it
+        """
+        self._loop.remove_reader(self._socket.fileno())
+        self._socket.close()
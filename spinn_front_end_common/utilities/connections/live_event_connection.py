@@ -2,13 +2,16 @@ from threading import Thread
 from collections import OrderedDict
 from six import iterkeys, iteritems
 import logging
+import numpy
+import struct
 
 from spinn_front_end_common.utilities.constants import NOTIFY_PORT
-from spinn_front_end_common.utilities.database import DatabaseConnection
+from spinn_front_end_common.utilities.database \
+    import AtomKeyRanges, DatabaseConnection
 
 from spinnman.utilities.utility_functions import send_port_trigger_message
-from spinnman.messages.eieio.data_messages import EIEIODataMessage
-from spinnman.messages.eieio import EIEIOType
+from spinnman.messages.eieio.data_messages import EIEIODataHeader
+from spinnman.messages.eieio import EIEIOType, EIEIOPrefix
 from spinnman.connections import ConnectionListener
 from spinnman.connections.udp_packet_connections import EIEIOConnection
 from spinnman.messages.eieio.data_messages import KeyPayloadDataElement
@@ -18,11 +21,189 @@ from spinn_utilities.log import FormatAdapter
 logger = FormatAdapter(logging.getLogger(__name__))
 
 
-# The maximum number of 32-bit keys that will fit in a packet
-_MAX_FULL_KEYS_PER_PACKET = 63
+# The maximum number of events that will fit in a packet of each type
+_MAX_EVENTS_PER_PACKET = {
+    EIEIOType.KEY_16_BIT: 127,
+    EIEIOType.KEY_32_BIT: 63,
+    EIEIOType.KEY_PAYLOAD_16_BIT: 63,
+    EIEIOType.KEY_PAYLOAD_32_BIT: 31}
 
-# The maximum number of 16-bit keys that will fit in a packet
-_MAX_HALF_KEYS_PER_PACKET = 127
+# The bits of the first half-word of an EIEIO command packet
+_COMMAND_MASK = 0xC000
+_COMMAND_FLAGS = 0x4000
+
+# The NumPy type of keys and payloads by their size in bytes
+_DTYPE_BY_BYTES = {2: numpy.dtype("<u2"), 4: numpy.dtype("<u4")}
+
+
+class _RawEIEIOConnection(EIEIOConnection):
+    """ An EIEIO connection whose listeners are given the raw data of each\
+        packet received, so that the data can be decoded all at once
+    """
+
+    def get_receive_method(self):
+        return self.receive
+
+
+def _decode_eieio_data(data):
+    """ Decode the keys and payloads of an EIEIO data packet into arrays
+
+    :param data: the raw data of the packet
+    :type data: bytes
+    :return: the keys, the payloads (or None if there are none), and\
+        whether the payloads are time stamps
+    :rtype: (numpy.ndarray, numpy.ndarray or None, bool)
+    """
+    header = EIEIODataHeader.from_bytestring(data, 0)
+    eieio_type = header.eieio_type
+    has_payload = eieio_type.payload_bytes > 0
+    values = numpy.frombuffer(
+        data, dtype=_DTYPE_BY_BYTES[eieio_type.key_bytes],
+        count=header.count * (2 if has_payload else 1), offset=header.size)
+    keys = values[::2] if has_payload else values
+    keys = keys.astype("uint32")
+    payloads = values[1::2].astype("uint32") if has_payload else None
+
+    if header.prefix is not None:
+        if header.prefix_type == EIEIOPrefix.UPPER_HALF_WORD:
+            keys |= header.prefix << 16
+        else:
+            keys |= header.prefix
+    if header.payload_base is not None:
+        if payloads is None:
+            payloads = numpy.full(
+                len(keys), header.payload_base, dtype="uint32")
+        else:
+            payloads |= header.payload_base
+    return keys, payloads, header.is_time
+
+
+def _encode_eieio_data(eieio_type, keys, payloads=None):
+    """ Encode keys, and payloads if any, into as few EIEIO data packets\
+        as possible, all packed into a single buffer
+
+    :param eieio_type: the type of the packets, which must have payloads\
+        if and only if payloads are given
+    :type eieio_type: :py:class:`EIEIOType`
+    :param keys: the keys
+    :type keys: array-like of int
+    :param payloads: the payload of each key, or None if none
+    :type payloads: array-like of int
+    :return: the data of each packet
+    :rtype: list(memoryview)
+    :raise ValueError: if a key or payload does not fit in the packet type
+    """
+    n_values = 2 if payloads is not None else 1
+    value_type = _DTYPE_BY_BYTES[eieio_type.key_bytes]
+    values = numpy.asarray(keys, dtype="int64")
+    if payloads is not None:
+        values = numpy.column_stack(
+            (values, numpy.asarray(payloads, dtype="int64")))
+    n_events = len(values)
+    if not n_events:
+        return []
+    if values.min() < 0 or values.max() > numpy.iinfo(value_type).max:
+        raise ValueError("Keys and payloads must fit in {} bytes".format(
+            eieio_type.key_bytes))
+
+    # Each packet is a header followed by the values of its events; only
+    # the last packet is not full
+    max_events = _MAX_EVENTS_PER_PACKET[eieio_type]
+    n_packets = -(-n_events // max_events)
+    packet_type = numpy.dtype([
+        ("header", "<u2"), ("values", value_type, (max_events, n_values))])
+    packets = numpy.zeros(n_packets, dtype=packet_type)
+    padded = numpy.zeros((n_packets * max_events, n_values), dtype="int64")
+    padded[:n_events] = values.reshape(n_events, n_values)
+    packets["values"] = padded.reshape(n_packets, max_events, n_values)
+    counts = numpy.full(n_packets, max_events, dtype="uint16")
+    counts[-1] = n_events - (n_packets - 1) * max_events
+    packets["header"] = counts | (eieio_type.value << 10)
+
+    data = memoryview(packets.tobytes())
+    packet_bytes = packet_type.itemsize
+    event_bytes = value_type.itemsize * n_values
+    return [
+        data[start:start + 2 + count * event_bytes]
+        for start, count in zip(
+            range(0, n_packets * packet_bytes, packet_bytes),
+            counts.tolist())]
+
+
+class _KeyToAtomLookup(object):
+    """ Finds the atoms, and the vertices they are in, that sent keys, from\
+        the sorted key ranges of all the vertices being received from
+    """
+
+    __slots__ = [
+        # the first key of each range, sorted
+        "_first_keys",
+
+        # the first atom ID of each range
+        "_first_atom_ids",
+
+        # the number of atoms in each range
+        "_n_atoms",
+
+        # the ID of the label of the vertex of each range
+        "_label_ids"
+    ]
+
+    def __init__(self, key_ranges_and_label_ids):
+        """
+        :param key_ranges_and_label_ids: the key ranges of each vertex with\
+            the ID of its label
+        :type key_ranges_and_label_ids: \
+            iterable of (:py:class:`AtomKeyRanges`, int)
+        """
+        ranges = sorted(
+            (first_key, first_atom_id, n_atoms, label_id)
+            for key_ranges, label_id in key_ranges_and_label_ids
+            for first_key, first_atom_id, n_atoms in key_ranges)
+        self._first_keys = numpy.array(
+            [key_range[0] for key_range in ranges], dtype="int64")
+        self._first_atom_ids = numpy.array(
+            [key_range[1] for key_range in ranges], dtype="int64")
+        self._n_atoms = numpy.array(
+            [key_range[2] for key_range in ranges], dtype="int64")
+        self._label_ids = numpy.array(
+            [key_range[3] for key_range in ranges], dtype="int64")
+
+    def get(self, key):
+        """ Get the atom that sent a key and the ID of the label of its\
+            vertex
+
+        :rtype: (int, int) or None
+        """
+        index = int(numpy.searchsorted(self._first_keys, key, "right")) - 1
+        if index < 0:
+            return None
+        offset = key - int(self._first_keys[index])
+        if offset >= self._n_atoms[index]:
+            return None
+        return (int(self._first_atom_ids[index]) + offset,
+                int(self._label_ids[index]))
+
+    def lookup(self, keys):
+        """ Get the atoms that sent an array of keys and the IDs of the\
+            labels of their vertices
+
+        :param keys: the keys
+        :type keys: numpy.ndarray
+        :return: the atom IDs, the label IDs, and which keys were found;\
+            the atom and label IDs of keys not found are meaningless
+        :rtype: (numpy.ndarray, numpy.ndarray, numpy.ndarray)
+        """
+        keys = keys.astype("int64")
+        if not len(self._first_keys):
+            return keys, keys, numpy.zeros(len(keys), dtype=bool)
+        indices = numpy.searchsorted(self._first_keys, keys, "right") - 1
+        found = indices >= 0
+        indices[~found] = 0
+        offsets = keys - self._first_keys[indices]
+        found &= offsets < self._n_atoms[indices]
+        return (self._first_atom_ids[indices] + offsets,
+                self._label_ids[indices], found)
 
 
 class LiveEventConnection(DatabaseConnection):
@@ -32,7 +213,8 @@ class LiveEventConnection(DatabaseConnection):
     __slots__ = [
         "_atom_id_to_key",
         "_init_callbacks",
-        "_key_to_atom_id_and_label",
+        "_key_lookup",
+        "_batch_callbacks",
         "_listeners",
         "_live_event_callbacks",
         "_live_packet_gather_label",
@@ -79,7 +261,8 @@ class LiveEventConnection(DatabaseConnection):
         self._sender_connection = None
         self._send_address_details = dict()
         self._atom_id_to_key = dict()
-        self._key_to_atom_id_and_label = dict()
+        self._key_lookup = _KeyToAtomLookup([])
+        self._batch_callbacks = list()
         self._live_event_callbacks = list()
         self._start_resume_callbacks = dict()
         self._pause_stop_callbacks = dict()
@@ -87,6 +270,7 @@ class LiveEventConnection(DatabaseConnection):
         if receive_labels is not None:
             for label in receive_labels:
                 self._live_event_callbacks.append(list())
+                self._batch_callbacks.append(list())
                 self._start_resume_callbacks[label] = list()
                 self._pause_stop_callbacks[label] = list()
                 self._init_callbacks[label] = list()
@@ -128,6 +312,28 @@ class LiveEventConnection(DatabaseConnection):
         label_id = self._receive_labels.index(label)
         self._live_event_callbacks[label_id].append(live_event_callback)
 
+    def add_receive_batch_callback(self, label, batch_callback):
+        """ Add a callback for the reception of live events from a vertex,\
+            called once for each packet with all the events in the packet\
+            from the vertex. Adding any such callback makes received packets\
+            be decoded all at once rather than event by event, and must be\
+            done before the database is read.
+
+        :param label: The label of the vertex to be notified about. Must be\
+            one of the vertices listed in the constructor
+        :type label: str
+        :param batch_callback: A function to be called when events are\
+            received. This should take as parameters the label of the\
+            vertex, a NumPy array of the atom IDs of the events, and a NumPy\
+            array of the payloads of the events, which are the time steps\
+            when the events occurred if the packet is timed, or None if the\
+            events have no payloads.
+        :type batch_callback: \
+            function(str, numpy.ndarray, numpy.ndarray or None) -> None
+        """
+        label_id = self._receive_labels.index(label)
+        self._batch_callbacks[label_id].append(batch_callback)
+
     def add_start_callback(self, label, start_callback):
         """ Add a callback for the start of the simulation
 
@@ -192,21 +398,28 @@ class LiveEventConnection(DatabaseConnection):
                 db, label)
             if self._machine_vertices:
                 key, _ = db.get_machine_live_input_key(label)
-                self._atom_id_to_key[label] = {0: key}
-                vertex_sizes[label] = 1
+                self._atom_id_to_key[label] = AtomKeyRanges([(key, 0, 1)])
             else:
-                self._atom_id_to_key[label] = db.get_atom_id_to_key_mapping(
-                    label)
-                vertex_sizes[label] = len(self._atom_id_to_key[label])
+                self._atom_id_to_key[label] = db.get_atom_key_ranges(label)
+            vertex_sizes[label] = self._atom_id_to_key[label].n_atoms
 
     def _init_receivers(self, db, vertex_sizes):
+        # Decode whole packets at once if anything wants batches of events
+        if any(self._batch_callbacks):
+            connection_class = _RawEIEIOConnection
+            packet_callback = self._receive_raw_packet_callback
+        else:
+            connection_class = EIEIOConnection
+            packet_callback = self._receive_packet_callback
+
+        key_ranges_and_label_ids = list()
         for label_id, label in enumerate(self._receive_labels):
             host, port, board_address = self.__get_live_output_details(
                 db, label)
             if port not in self._receivers:
-                receiver = EIEIOConnection(local_port=port)
+                receiver = connection_class(local_port=port)
                 listener = ConnectionListener(receiver)
-                listener.add_callback(self._receive_packet_callback)
+                listener.add_callback(packet_callback)
                 listener.start()
                 self._receivers[port] = receiver
                 self._listeners[port] = listener
@@ -219,13 +432,12 @@ class LiveEventConnection(DatabaseConnection):
             if self._machine_vertices:
                 key, _ = db.get_machine_live_output_key(
                     label, self._live_packet_gather_label)
-                self._key_to_atom_id_and_label[key] = (0, label_id)
-                vertex_sizes[label] = 1
+                key_ranges = AtomKeyRanges([(key, 0, 1)])
             else:
-                key_to_atom_id = db.get_key_to_atom_id_mapping(label)
-                for key, atom_id in iteritems(key_to_atom_id):
-                    self._key_to_atom_id_and_label[key] = (atom_id, label_id)
-                vertex_sizes[label] = len(key_to_atom_id)
+                key_ranges = db.get_atom_key_ranges(label)
+            key_ranges_and_label_ids.append((key_ranges, label_id))
+            vertex_sizes[label] = key_ranges.n_atoms
+        self._key_lookup = _KeyToAtomLookup(key_ranges_and_label_ids)
 
     def __get_live_input_details(self, db_reader, send_label):
         if self._machine_vertices:
@@ -248,6 +460,7 @@ class LiveEventConnection(DatabaseConnection):
 
     def _handle_possible_rerun_state(self):
         # reset from possible previous calls
+        self._key_lookup = _KeyToAtomLookup([])
         if self._sender_connection is not None:
             self._sender_connection.close()
             self._sender_connection = None
@@ -284,14 +497,57 @@ class LiveEventConnection(DatabaseConnection):
         except Exception:
             logger.warning("problem handling received packet", exc_info=True)
 
+    def _receive_raw_packet_callback(self, data):
+        try:
+            header = struct.unpack_from("<H", data)[0]
+            if header & _COMMAND_MASK != _COMMAND_FLAGS:
+                self.__handle_raw_data_packet(data)
+        except Exception:
+            logger.warning("problem handling received packet", exc_info=True)
+
+    def __handle_raw_data_packet(self, data):
+        keys, payloads, is_time = _decode_eieio_data(data)
+        atom_ids, label_ids, found = self._key_lookup.lookup(keys)
+        for label_id in numpy.unique(label_ids[found]):
+            in_label = found & (label_ids == label_id)
+            label_atom_ids = atom_ids[in_label]
+            label_payloads = None
+            if payloads is not None:
+                label_payloads = payloads[in_label]
+            label = self._receive_labels[label_id]
+            for callback in self._batch_callbacks[label_id]:
+                callback(label, label_atom_ids, label_payloads)
+
+            # Any callbacks for single events are still called as normal
+            if self._live_event_callbacks[label_id]:
+                self.__call_event_callbacks(
+                    label_id, label_atom_ids, label_payloads, is_time)
+
+    def __call_event_callbacks(self, label_id, atom_ids, payloads, is_time):
+        label = self._receive_labels[label_id]
+        callbacks = self._live_event_callbacks[label_id]
+        if is_time:
+            for time in numpy.unique(payloads):
+                time_atom_ids = atom_ids[payloads == time].tolist()
+                for callback in callbacks:
+                    callback(label, int(time), time_atom_ids)
+        elif payloads is not None:
+            for atom_id, payload in zip(atom_ids.tolist(), payloads.tolist()):
+                for callback in callbacks:
+                    callback(label, atom_id, payload)
+        else:
+            for atom_id in atom_ids.tolist():
+                for callback in callbacks:
+                    callback(label, atom_id)
+
     def __handle_time_packet(self, packet):
         key_times_labels = OrderedDict()
         while packet.is_next_element:
             element = packet.next_element
             time = element.payload
-            key = element.key
-            if key in self._key_to_atom_id_and_label:
-                atom_id, label_id = self._key_to_atom_id_and_label[key]
+            atom_id_and_label_id = self._key_lookup.get(element.key)
+            if atom_id_and_label_id is not None:
+                atom_id, label_id = atom_id_and_label_id
                 if time not in key_times_labels:
                     key_times_labels[time] = dict()
                 if label_id not in key_times_labels[time]:
@@ -307,9 +563,9 @@ class LiveEventConnection(DatabaseConnection):
     def __handle_no_time_packet(self, packet):
         while packet.is_next_element:
             element = packet.next_element
-            key = element.key
-            if key in self._key_to_atom_id_and_label:
-                atom_id, label_id = self._key_to_atom_id_and_label[key]
+            atom_id_and_label_id = self._key_lookup.get(element.key)
+            if atom_id_and_label_id is not None:
+                atom_id, label_id = atom_id_and_label_id
                 for callback in self._live_event_callbacks[label_id]:
                     if isinstance(element, KeyPayloadDataElement):
                         callback(self._receive_labels[label_id], atom_id,
@@ -332,39 +588,38 @@ class LiveEventConnection(DatabaseConnection):
         """
         self.send_events(label, [atom_id], send_full_keys)
 
-    def send_events(self, label, atom_ids, send_full_keys=False):
+    def send_events(self, label, atom_ids, send_full_keys=False,
+                    payloads=None):
         """ Send a number of events
 
         :param label: \
             The label of the vertex from which the events will originate
         :type label: str
         :param atom_ids: array-like of atom IDs sending events
-        :type atom_ids: [int]
+        :type atom_ids: [int] or numpy.ndarray
         :param send_full_keys: Determines whether to send full 32-bit keys,\
             getting the key for each atom from the database, or whether to\
             send 16-bit atom IDs directly
         :type send_full_keys: bool
+        :param payloads: array-like of the payload of each event, or None\
+            to send events without payloads; payloads are 32-bit if full\
+            keys are sent and 16-bit otherwise
+        :type payloads: [int] or numpy.ndarray
         """
-        max_keys = _MAX_HALF_KEYS_PER_PACKET
-        msg_type = EIEIOType.KEY_16_BIT
         if send_full_keys:
-            max_keys = _MAX_FULL_KEYS_PER_PACKET
+            keys = self._atom_id_to_key[label].get_keys(atom_ids)
             msg_type = EIEIOType.KEY_32_BIT
-
-        pos = 0
-        while pos < len(atom_ids):
-            message = EIEIODataMessage.create(msg_type)
-            events_in_packet = 0
-            while pos < len(atom_ids) and events_in_packet < max_keys:
-                key = atom_ids[pos]
-                if send_full_keys:
-                    key = self._atom_id_to_key[label][key]
-                message.add_key(key)
-                pos += 1
-                events_in_packet += 1
-            ip_address, port = self._send_address_details[label]
-            self._sender_connection.send_eieio_message_to(
-                message, ip_address, port)
+            if payloads is not None:
+                msg_type = EIEIOType.KEY_PAYLOAD_32_BIT
+        else:
+            keys = atom_ids
+            msg_type = EIEIOType.KEY_16_BIT
+            if payloads is not None:
+                msg_type = EIEIOType.KEY_PAYLOAD_16_BIT
+
+        ip_address, port = self._send_address_details[label]
+        for data in _encode_eieio_data(msg_type, keys, payloads):
+            self._sender_connection.send_to(data, (ip_address, port))
 
     def close(self):
         DatabaseConnection.close(self)
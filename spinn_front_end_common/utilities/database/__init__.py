@@ -1,5 +1,7 @@
+from .atom_key_ranges import AtomKeyRanges
 from .database_connection import DatabaseConnection
 from .database_reader import DatabaseReader
 from .database_writer import DatabaseWriter
 
-__all__ = ["DatabaseConnection", "DatabaseReader", "DatabaseWriter"]
+__all__ = ["AtomKeyRanges", "DatabaseConnection", "DatabaseReader",
+           "DatabaseWriter"]
@@ -0,0 +1,162 @@
+from bisect import bisect_right
+import numpy
+
+
+class AtomKeyRanges(object):
+    """ A mapping between the atoms of a vertex and the keys of the events\
+        they send, held as ranges in which consecutive atoms have\
+        consecutive keys, so that keys and atoms are found by binary search\
+        rather than from a table of every atom
+    """
+
+    __slots__ = [
+        # the first key of each range, sorted
+        "_first_keys",
+
+        # the first atom ID of each range, in the order of _first_keys
+        "_first_atom_ids",
+
+        # the number of atoms in each range, in the order of _first_keys
+        "_n_atoms",
+
+        # the indices of the ranges, sorted by their first atom ID
+        "_by_atom_id",
+
+        # the first atom ID of each range, in the order of _by_atom_id
+        "_sorted_first_atom_ids",
+
+        # arrays of the first atom ID, first key and number of atoms of each
+        # range, in the order of _by_atom_id, for looking up many atoms
+        "_atom_id_arrays"
+    ]
+
+    def __init__(self, ranges):
+        """
+        :param ranges: the ranges of the mapping, which must not overlap
+        :type ranges: iterable of (first key, first atom ID, number of atoms)
+        """
+        ranges = sorted(
+            (int(first_key), int(first_atom_id), int(n_atoms))
+            for first_key, first_atom_id, n_atoms in ranges)
+        self._first_keys = [key_range[0] for key_range in ranges]
+        self._first_atom_ids = [key_range[1] for key_range in ranges]
+        self._n_atoms = [key_range[2] for key_range in ranges]
+        self._by_atom_id = sorted(
+            range(len(ranges)), key=self._first_atom_ids.__getitem__)
+        self._sorted_first_atom_ids = [
+            self._first_atom_ids[i] for i in self._by_atom_id]
+        self._atom_id_arrays = tuple(
+            numpy.array([values[i] for i in self._by_atom_id], dtype="int64")
+            for values in (
+                self._first_atom_ids, self._first_keys, self._n_atoms))
+
+    @staticmethod
+    def compress(atom_ids_and_keys):
+        """ Find the ranges of a mapping given atom by atom
+
+        :param atom_ids_and_keys: the atom ID and key of each atom
+        :type atom_ids_and_keys: iterable of (int, int)
+        :return: the ranges of consecutive atoms with consecutive keys
+        :rtype: iterable of (first key, first atom ID, number of atoms)
+        """
+        first_key = first_atom_id = None
+        n_atoms = 0
+        for atom_id, key in atom_ids_and_keys:
+            if (first_key is not None and key == first_key + n_atoms and
+                    atom_id == first_atom_id + n_atoms):
+                n_atoms += 1
+                continue
+            if first_key is not None:
+                yield first_key, first_atom_id, n_atoms
+            first_key, first_atom_id, n_atoms = key, atom_id, 1
+        if first_key is not None:
+            yield first_key, first_atom_id, n_atoms
+
+    def get_atom_id(self, key):
+        """ Get the atom ID that sends a key
+
+        :param key: the key
+        :type key: int
+        :return: the atom ID, or None if the key is not sent by any atom
+        :rtype: int or None
+        """
+        index = bisect_right(self._first_keys, key) - 1
+        if index < 0:
+            return None
+        offset = key - self._first_keys[index]
+        if offset >= self._n_atoms[index]:
+            return None
+        return self._first_atom_ids[index] + offset
+
+    def get_key(self, atom_id):
+        """ Get the key sent by an atom
+
+        :param atom_id: the ID of the atom
+        :type atom_id: int
+        :return: the key
+        :rtype: int
+        :raise KeyError: if the atom is not in the mapping
+        """
+        position = bisect_right(self._sorted_first_atom_ids, atom_id) - 1
+        if position >= 0:
+            index = self._by_atom_id[position]
+            offset = atom_id - self._first_atom_ids[index]
+            if offset < self._n_atoms[index]:
+                return self._first_keys[index] + offset
+        raise KeyError(atom_id)
+
+    def get_keys(self, atom_ids):
+        """ Get the keys sent by many atoms at once
+
+        :param atom_ids: the IDs of the atoms
+        :type atom_ids: array-like of int
+        :return: the key of each atom, in the same order
+        :rtype: numpy.ndarray
+        :raise KeyError: if any atom is not in the mapping
+        """
+        atom_ids = numpy.asarray(atom_ids, dtype="int64")
+        first_atom_ids, first_keys, n_atoms = self._atom_id_arrays
+        if not len(first_atom_ids):
+            if len(atom_ids):
+                raise KeyError(int(atom_ids[0]))
+            return atom_ids
+        positions = numpy.searchsorted(first_atom_ids, atom_ids, "right") - 1
+        found = positions >= 0
+        positions[~found] = 0
+        offsets = atom_ids - first_atom_ids[positions]
+        found &= offsets < n_atoms[positions]
+        if not found.all():
+            raise KeyError(int(atom_ids[~found][0]))
+        return first_keys[positions] + offsets
+
+    @property
+    def n_atoms(self):
+        """ The number of atoms in the mapping
+
+        :rtype: int
+        """
+        return sum(self._n_atoms)
+
+    @property
+    def n_ranges(self):
+        """ The number of ranges the mapping is held as
+
+        :rtype: int
+        """
+        return len(self._first_keys)
+
+    def __iter__(self):
+        """ Iterate over the ranges of the mapping, in order of key
+
+        :rtype: iterable of (first key, first atom ID, number of atoms)
+        """
+        return iter(zip(self._first_keys, self._first_atom_ids, self._n_atoms))
+
+    def iter_atom_ids_and_keys(self):
+        """ Iterate over the mapping atom by atom, in order of key
+
+        :rtype: iterable of (atom ID, key)
+        """
+        for first_key, first_atom_id, n_atoms in self:
+            for offset in range(n_atoms):
+                yield first_atom_id + offset, first_key + offset
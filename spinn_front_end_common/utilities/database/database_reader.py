@@ -1,3 +1,5 @@
+from .atom_key_ranges import AtomKeyRanges
+
 import sqlite3
 
 
@@ -30,6 +32,22 @@ class DatabaseReader(object):
         """
         return self._cursor
 
+    def get_atom_key_ranges(self, label):
+        """ Get the mapping between the atoms of a given vertex and the keys\
+            of the events they send, as ranges of atoms with consecutive keys
+
+        :param label: The label of the vertex
+        :type label: str
+        :rtype: :py:class:`AtomKeyRanges`
+        """
+        return AtomKeyRanges(
+            (row["first_event_id"], row["first_atom_id"], row["n_atoms"])
+            for row in self._cursor.execute(
+                "SELECT r.first_event_id, r.first_atom_id, r.n_atoms"
+                " FROM event_to_atom_ranges AS r"
+                " JOIN Application_vertices AS p ON r.vertex_id = p.vertex_id"
+                " WHERE p.vertex_label = ?", (label, )))
+
     def get_key_to_atom_id_mapping(self, label):
         """ Get a mapping of event key to atom ID for a given vertex
 
@@ -38,14 +56,9 @@ class DatabaseReader(object):
         :return: dictionary of atom IDs indexed by event key
         :rtype: dict
         """
-        event_id_to_atom_id_mapping = dict()
-        for row in self._cursor.execute(
-                "SELECT n.atom_id AS a_id, n.event_id AS event"
-                " FROM event_to_atom_mapping AS n"
-                " JOIN Application_vertices AS p ON n.vertex_id = p.vertex_id"
-                " WHERE p.vertex_label = ?", (label, )):
-            event_id_to_atom_id_mapping[row["event"]] = row["a_id"]
-        return event_id_to_atom_id_mapping
+        return {
+            key: atom_id for atom_id, key in
+            self.get_atom_key_ranges(label).iter_atom_ids_and_keys()}
 
     def get_atom_id_to_key_mapping(self, label):
         """ Get a mapping of atom ID to event key for a given vertex
@@ -54,15 +67,7 @@ class DatabaseReader(object):
         :type label: str
         :return: dictionary of event keys indexed by atom ID
         """
-        atom_to_event_id_mapping = dict()
-        for row in self._cursor.execute(
-                "SELECT n.atom_id AS a_id, n.event_id AS event"
-                " FROM event_to_atom_mapping AS n"
-                " JOIN Application_vertices AS p"
-                "   ON n.vertex_id = p.vertex_id"
-                " WHERE p.vertex_label = ?", (label, )):
-            atom_to_event_id_mapping[row["a_id"]] = row["event"]
-        return atom_to_event_id_mapping
+        return dict(self.get_atom_key_ranges(label).iter_atom_ids_and_keys())
 
     def get_live_output_details(self, label, receiver_label):
         """ Get the IP address, port and whether the SDP headers are to be\
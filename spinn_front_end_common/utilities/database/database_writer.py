@@ -5,15 +5,20 @@ from spinn_utilities.log import FormatAdapter
 from spinn_front_end_common.abstract_models \
     import AbstractProvidesKeyToAtomMapping, AbstractRecordable, \
     AbstractSupportsDatabaseInjection
+from .atom_key_ranges import AtomKeyRanges
 
 # general imports
 import logging
 import os
+import re
 import sqlite3
 import sys
+import time
 
 logger = FormatAdapter(logging.getLogger(__name__))
 
+_TABLE_NAME = re.compile(r"INSERT\s+INTO\s+(\w+)", re.IGNORECASE)
+
 
 def _extract_int(x):
     return None if x is None else int(x)
@@ -38,6 +43,13 @@ class DatabaseWriter(object):
         # the path of the initialisation SQL
         "_init_sql_path",
 
+        # the path of the SQL creating the indexes, which are created once
+        # everything has been inserted
+        "_index_sql_path",
+
+        # dict of table name to [number of rows inserted, time taken]
+        "_table_statistics",
+
         # the identifier for the SpiNNaker machine
         "_machine_id",
 
@@ -45,16 +57,34 @@ class DatabaseWriter(object):
         "_connection",
 
         # Mappings used to accelerate inserts
-        "_machine_to_id", "_vertex_to_id", "_edge_to_id"
+        "_machine_to_id", "_vertex_to_id", "_edge_to_id",
+
+        # True if the key of every atom is to be written, not just those
+        # of vertices whose mapping does not compress into ranges
+        "_write_atom_to_event_mapping"
     ]
 
-    def __init__(self, database_directory):
+    def __init__(self, database_directory,
+                 write_atom_to_event_mapping=False):
+        """
+        :param database_directory: where the database is to be written
+        :type database_directory: str
+        :param write_atom_to_event_mapping: whether to write the key of\
+            every atom to event_to_atom_mapping, as well as the ranges to\
+            event_to_atom_ranges, rather than only the keys of vertices\
+            whose mapping does not compress into ranges
+        :type write_atom_to_event_mapping: bool
+        """
         self._done = False
+        self._write_atom_to_event_mapping = write_atom_to_event_mapping
         self._database_directory = database_directory
         self._database_path = os.path.join(
             self._database_directory, "input_output_database.db")
         self._init_sql_path = os.path.join(
             os.path.dirname(__file__), "db.sql")
+        self._index_sql_path = os.path.join(
+            os.path.dirname(__file__), "db_indexes.sql")
+        self._table_statistics = dict()
         self._connection = None
         self._machine_to_id = dict()
         self._vertex_to_id = dict()
@@ -69,12 +99,22 @@ class DatabaseWriter(object):
 
     def __enter__(self):
         self._connection = sqlite3.connect(self._database_path)
+
+        # The database is rebuilt from scratch if anything goes wrong, so
+        # there is no need to make it safe against crashes while writing
+        self._connection.execute("PRAGMA journal_mode = MEMORY")
+        self._connection.execute("PRAGMA synchronous = OFF")
         self.create_schema()
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):  # @UnusedVariable
-        self._connection.close()
-        self._connection = None
+        try:
+            if exc_type is None:
+                self.create_indexes()
+                self.__log_statistics()
+        finally:
+            self._connection.close()
+            self._connection = None
         return False
 
     @staticmethod
@@ -93,21 +133,70 @@ class DatabaseWriter(object):
     def database_path(self):
         return self._database_path
 
+    @property
+    def table_statistics(self):
+        """ The number of rows inserted into each table, and how long that\
+            took
+
+        :return: dict of table name to (number of rows, time in seconds)
+        :rtype: dict(str, (int, float))
+        """
+        return {table: tuple(stats)
+                for table, stats in self._table_statistics.items()}
+
+    def __record(self, sql, n_rows, start_time):
+        stats = self._table_statistics.setdefault(
+            _TABLE_NAME.match(sql).group(1), [0, 0.0])
+        stats[0] += n_rows
+        stats[1] += time.time() - start_time
+
     def __insert(self, sql, *args):
+        start_time = time.time()
         c = self._connection.cursor()
         try:
             c.execute(sql, args)
+            self.__record(sql, 1, start_time)
             return c.lastrowid
         except Exception:
             logger.exception("problem with insertion; argument types are {}",
                              str(map(type, args)))
             raise
 
+    def __insert_many(self, sql, rows):
+        """ Insert rows with a single statement, reading the rows from an\
+            iterable only as they are inserted
+        """
+        start_time = time.time()
+        c = self._connection.cursor()
+        try:
+            c.executemany(sql, rows)
+            self.__record(sql, c.rowcount, start_time)
+        except Exception:
+            logger.exception("problem with insertion of many rows with {}",
+                             sql)
+            raise
+
+    def __log_statistics(self):
+        for table, (n_rows, seconds) in sorted(
+                self._table_statistics.items()):
+            logger.debug(
+                "Inserted {} rows into {} in {:.3f}s ({:.0f} rows/s)",
+                n_rows, table, seconds, n_rows / max(seconds, 1e-6))
+
     def create_schema(self):
         with self._connection, open(self._init_sql_path) as f:
             sql = f.read()
             self._connection.executescript(sql)
 
+    def create_indexes(self):
+        """ Create the indexes used to read the database; this is only done\
+            once everything has been inserted, as it is faster to index\
+            everything at once than to update the indexes on every insert
+        """
+        with self._connection, open(self._index_sql_path) as f:
+            sql = f.read()
+            self._connection.executescript(sql)
+
     def __insert_machine_layout(self, x_dimension, y_dimension):
         return self.__insert(
             "INSERT INTO Machine_layout("
@@ -115,23 +204,26 @@ class DatabaseWriter(object):
             "VALUES(?, ?)",
             int(x_dimension), int(y_dimension))
 
-    def __insert_machine_chip(self, no_processors, chip, machine_id):
-        return self.__insert(
+    def __insert_machine_chips(self, machine, machine_id):
+        self.__insert_many(
             "INSERT INTO Machine_chip("
             "  no_processors, chip_x, chip_y, machine_id) "
             "VALUES (?, ?, ?, ?)",
-            int(no_processors), int(chip.x), int(chip.y), int(machine_id))
+            ((len(list(chip.processors)), int(chip.x), int(chip.y),
+              int(machine_id))
+             for chip in machine.chips))
 
-    def __insert_processor(self, chip, machine_id, available_DTCM,
-                           available_CPU, physical_id):
-        # pylint: disable=too-many-arguments
-        return self.__insert(
+    def __insert_processors(self, machine, machine_id):
+        self.__insert_many(
             "INSERT INTO Processor("
             "  chip_x, chip_y, machine_id, available_DTCM, "
             "  available_CPU, physical_id) "
             "VALUES(?, ?, ?, ?, ?, ?)",
-            int(chip.x), int(chip.y), int(machine_id),
-            int(available_DTCM), int(available_CPU), int(physical_id))
+            ((int(chip.x), int(chip.y), int(machine_id),
+              int(processor.dtcm_available),
+              int(processor.cpu_cycles_available),
+              int(processor.processor_id))
+             for chip in machine.chips for processor in chip.processors))
 
     def __insert_app_vertex(self, vertex, max_atoms, is_recording):
         v_id = self.__insert(
@@ -154,13 +246,15 @@ class DatabaseWriter(object):
         self._edge_to_id[edge] = e_id
         return e_id
 
-    def __insert_app_graph_element(self, vertex, edge):
-        return self.__insert(
+    def __insert_app_graph_elements(self, application_graph):
+        self.__insert_many(
             "INSERT INTO Application_graph ("
             "  vertex_id, edge_id) "
             "VALUES(?, ?)",
-            int(self._vertex_to_id[vertex]),
-            int(self._edge_to_id[edge]))
+            ((int(self._vertex_to_id[vertex]), int(self._edge_to_id[edge]))
+             for vertex in application_graph.vertices
+             for edge in application_graph.get_edges_starting_at_vertex(
+                 vertex)))
 
     def __insert_cfg(self, parameter_id, value):
         # NB: No type constraints on value; this is SQLite (not Sparta!)
@@ -192,87 +286,149 @@ class DatabaseWriter(object):
         self._edge_to_id[edge] = e_id
         return e_id
 
-    def __insert_machine_graph_element(self, vertex, edge):
-        return self.__insert(
+    def __insert_machine_graph_elements(self, machine_graph):
+        self.__insert_many(
             "INSERT INTO Machine_graph ("
             "  vertex_id, edge_id) "
             "VALUES(?, ?)",
-            int(self._vertex_to_id[vertex]), int(self._edge_to_id[edge]))
+            ((int(self._vertex_to_id[vertex]), int(self._edge_to_id[edge]))
+             for vertex in machine_graph.vertices
+             for edge in machine_graph.get_edges_starting_at_vertex(vertex)))
 
-    def __insert_graph_mapper_vertex(
-            self, app_vertex, machine_vertex, vertex_slice):
-        return self.__insert(
+    def __insert_graph_mapper_vertices(self, machine_graph, graph_mapper):
+        self.__insert_many(
             "INSERT INTO graph_mapper_vertex ("
             "  application_vertex_id, machine_vertex_id, "
             "  lo_atom, hi_atom) "
             "VALUES(?, ?, ?, ?)",
-            int(self._vertex_to_id[app_vertex]),
-            int(self._vertex_to_id[machine_vertex]),
-            int(vertex_slice.lo_atom), int(vertex_slice.hi_atom))
-
-    def __insert_graph_mapper_edge(self, app_edge, machine_edge):
-        return self.__insert(
+            self.__graph_mapper_vertex_rows(machine_graph, graph_mapper))
+
+    def __graph_mapper_vertex_rows(self, machine_graph, graph_mapper):
+        for machine_vertex in machine_graph.vertices:
+            app_vertex = graph_mapper.get_application_vertex(machine_vertex)
+            vertex_slice = graph_mapper.get_slice(machine_vertex)
+            yield (int(self._vertex_to_id[app_vertex]),
+                   int(self._vertex_to_id[machine_vertex]),
+                   int(vertex_slice.lo_atom), int(vertex_slice.hi_atom))
+
+    def __insert_graph_mapper_edges(self, machine_graph, graph_mapper):
+        self.__insert_many(
             "INSERT INTO graph_mapper_edges ("
             "  application_edge_id, machine_edge_id) "
             "VALUES(?, ?)",
-            int(self._edge_to_id[app_edge]),
-            int(self._edge_to_id[machine_edge]))
+            ((int(self._edge_to_id[graph_mapper.get_application_edge(edge)]),
+              int(self._edge_to_id[edge]))
+             for edge in machine_graph.edges))
 
-    def __insert_placement(self, placement, machine_id):
-        return self.__insert(
+    def __insert_placements(self, placements, machine_id):
+        self.__insert_many(
             "INSERT INTO Placements("
             "  vertex_id, chip_x, chip_y, chip_p, machine_id) "
             "VALUES(?, ?, ?, ?, ?)",
-            int(self._vertex_to_id[placement.vertex]),
-            int(placement.x), int(placement.y), int(placement.p),
-            int(machine_id))
+            ((int(self._vertex_to_id[placement.vertex]),
+              int(placement.x), int(placement.y), int(placement.p),
+              int(machine_id))
+             for placement in placements.placements))
 
-    def __insert_routing_info(self, edge, key_mask):
-        return self.__insert(
+    def __insert_routing_infos(self, routing_infos, machine_graph):
+        self.__insert_many(
             "INSERT INTO Routing_info("
             "  edge_id, \"key\", mask) "
             "VALUES(?, ?, ?)",
-            int(self._edge_to_id[edge]), int(key_mask.key), int(key_mask.mask))
-
-    def __insert_routing_entry(self, routing_table, counter, entry, route):
-        return self.__insert(
+            self.__routing_info_rows(routing_infos, machine_graph))
+
+    def __routing_info_rows(self, routing_infos, machine_graph):
+        for partition in machine_graph.outgoing_edge_partitions:
+            if partition.traffic_type == EdgeTrafficType.MULTICAST:
+                rinfo = routing_infos.get_routing_info_from_partition(
+                    partition)
+                for edge in partition.edges:
+                    for key_mask in rinfo.keys_and_masks:
+                        yield (int(self._edge_to_id[edge]),
+                               int(key_mask.key), int(key_mask.mask))
+
+    def __insert_routing_entries(self, routing_tables):
+        self.__insert_many(
             "INSERT INTO Routing_table("
             "  chip_x, chip_y, position, key_combo, mask, route) "
             "VALUES(?, ?, ?, ?, ?, ?)",
-            int(routing_table.x), int(routing_table.y), int(counter),
-            int(entry.routing_entry_key), int(entry.mask), int(route))
+            self.__routing_entry_rows(routing_tables))
 
-    def __insert_ip_tag(self, vertex, ip_tag):
-        port = ip_tag.port
-        if port is None:
-            port = 0
-        return self.__insert(
+    @staticmethod
+    def __routing_entry_rows(routing_tables):
+        for routing_table in routing_tables.routing_tables:
+            for counter, entry in \
+                    enumerate(routing_table.multicast_routing_entries):
+                route_entry = 0
+                for processor_id in entry.processor_ids:
+                    route_entry |= 1 << (6 + processor_id)
+                for link_id in entry.link_ids:
+                    route_entry |= 1 << link_id
+                yield (int(routing_table.x), int(routing_table.y),
+                       int(counter), int(entry.routing_entry_key),
+                       int(entry.mask), int(route_entry))
+
+    def __insert_ip_tags(self, machine_graph, tags):
+        self.__insert_many(
             "INSERT INTO IP_tags("
             "  vertex_id, tag, board_address, ip_address,"
             "  port, strip_sdp) "
             "VALUES (?, ?, ?, ?, ?, ?)",
-            int(self._vertex_to_id[vertex]),
-            int(ip_tag.tag), str(ip_tag.board_address),
-            str(ip_tag.ip_address), int(port),
-            1 if ip_tag.strip_sdp else 0)
-
-    def __insert_reverse_ip_tag(self, vertex, reverse_ip_tag):
-        port = reverse_ip_tag.port
-        if port is None:
-            port = 0
-        return self.__insert(
+            self.__ip_tag_rows(machine_graph, tags))
+
+    def __ip_tag_rows(self, machine_graph, tags):
+        for vertex in machine_graph.vertices:
+            ip_tags = tags.get_ip_tags_for_vertex(vertex)
+            if ip_tags is not None:
+                for ip_tag in ip_tags:
+                    port = ip_tag.port
+                    if port is None:
+                        port = 0
+                    yield (int(self._vertex_to_id[vertex]),
+                           int(ip_tag.tag), str(ip_tag.board_address),
+                           str(ip_tag.ip_address), int(port),
+                           1 if ip_tag.strip_sdp else 0)
+
+    def __insert_reverse_ip_tags(self, machine_graph, tags):
+        self.__insert_many(
             "INSERT INTO Reverse_IP_tags("
             "  vertex_id, tag, board_address, port) "
             "VALUES (?, ?, ?, ?)",
-            int(self._vertex_to_id[vertex]), int(reverse_ip_tag.tag),
-            str(reverse_ip_tag.board_address), int(port))
-
-    def __insert_event_atom_mapping(self, vertex, event_id, atom_id):
-        return self.__insert(
-            "INSERT INTO event_to_atom_mapping("
-            "  vertex_id, event_id, atom_id) "
-            "VALUES (?, ?, ?)",
-            int(self._vertex_to_id[vertex]), int(event_id), int(atom_id))
+            self.__reverse_ip_tag_rows(machine_graph, tags))
+
+    def __reverse_ip_tag_rows(self, machine_graph, tags):
+        for vertex in machine_graph.vertices:
+            reverse_ip_tags = tags.get_reverse_ip_tags_for_vertex(vertex)
+            if reverse_ip_tags is not None:
+                for reverse_ip_tag in reverse_ip_tags:
+                    port = reverse_ip_tag.port
+                    if port is None:
+                        port = 0
+                    yield (int(self._vertex_to_id[vertex]),
+                           int(reverse_ip_tag.tag),
+                           str(reverse_ip_tag.board_address), int(port))
+
+    def __insert_event_atom_ranges(self, vertex, atom_ids_and_keys):
+        vertex_id = int(self._vertex_to_id[vertex])
+        atom_ids_and_keys = list(atom_ids_and_keys)
+        ranges = list(AtomKeyRanges.compress(atom_ids_and_keys))
+        self.__insert_many(
+            "INSERT INTO event_to_atom_ranges("
+            "  vertex_id, first_event_id, first_atom_id, n_atoms) "
+            "VALUES (?, ?, ?, ?)",
+            ((vertex_id, int(first_key), int(first_atom_id), int(n_atoms))
+             for first_key, first_atom_id, n_atoms in ranges))
+
+        # A mapping that does not compress is also written atom by atom,
+        # which is no bigger
+        if (self._write_atom_to_event_mapping or
+                len(ranges) == len(atom_ids_and_keys)):
+            self.__insert_many(
+                "INSERT INTO event_to_atom_mapping("
+                "  vertex_id, event_id, atom_id) "
+                "VALUES (?, ?, ?)",
+                ((vertex_id, int(event_id), int(atom_id))
+                 for atom_id, event_id in atom_ids_and_keys))
 
     def add_machine_objects(self, machine):
         """ Store the machine object into the database
@@ -284,15 +440,8 @@ class DatabaseWriter(object):
             self._machine_to_id[machine] = self.__insert_machine_layout(
                 machine.max_chip_x + 1, machine.max_chip_y + 1)
             self._machine_id += 1
-            for chip in machine.chips:
-                self.__insert_machine_chip(
-                    len(list(chip.processors)), chip, self._machine_id)
-                for processor in chip.processors:
-                    self.__insert_processor(
-                        chip, self._machine_id,
-                        processor.dtcm_available,
-                        processor.cpu_cycles_available,
-                        processor.processor_id)
+            self.__insert_machine_chips(machine, self._machine_id)
+            self.__insert_processors(machine, self._machine_id)
 
     def add_application_vertices(self, application_graph):
         """
@@ -320,10 +469,7 @@ class DatabaseWriter(object):
                     self.__insert_app_edge(edge)
 
             # update graph
-            for vertex in application_graph.vertices:
-                for edge in application_graph.\
-                        get_edges_starting_at_vertex(vertex):
-                    self.__insert_app_graph_element(vertex, edge)
+            self.__insert_app_graph_elements(application_graph)
 
     def add_system_params(self, time_scale_factor, machine_time_step, runtime):
         """ Write system params into the database
@@ -362,22 +508,14 @@ class DatabaseWriter(object):
                 self.__insert_machine_edge(edge)
 
             # add to machine graph
-            for vertex in machine_graph.vertices:
-                for edge in machine_graph.get_edges_starting_at_vertex(vertex):
-                    self.__insert_machine_graph_element(vertex, edge)
+            self.__insert_machine_graph_elements(machine_graph)
 
             if application_graph is not None:
-                for machine_vertex in machine_graph.vertices:
-                    app_vertex = graph_mapper.get_application_vertex(
-                        machine_vertex)
-                    self.__insert_graph_mapper_vertex(
-                        app_vertex, machine_vertex,
-                        graph_mapper.get_slice(machine_vertex))
+                self.__insert_graph_mapper_vertices(
+                    machine_graph, graph_mapper)
 
                 # add graph_mapper edges
-                for edge in machine_graph.edges:
-                    self.__insert_graph_mapper_edge(
-                        graph_mapper.get_application_edge(edge), edge)
+                self.__insert_graph_mapper_edges(machine_graph, graph_mapper)
 
     def add_placements(self, placements):
         """ Adds the placements objects into the database
@@ -388,8 +526,7 @@ class DatabaseWriter(object):
         """
         with self._connection:
             # add records
-            for placement in placements.placements:
-                self.__insert_placement(placement, self._machine_id)
+            self.__insert_placements(placements, self._machine_id)
 
     def add_routing_infos(self, routing_infos, machine_graph):
         """ Adds the routing information (key masks etc) into the database
@@ -399,13 +536,7 @@ class DatabaseWriter(object):
         :rtype: None:
         """
         with self._connection:
-            for partition in machine_graph.outgoing_edge_partitions:
-                if partition.traffic_type == EdgeTrafficType.MULTICAST:
-                    rinfo = routing_infos.get_routing_info_from_partition(
-                        partition)
-                    for edge in partition.edges:
-                        for key_mask in rinfo.keys_and_masks:
-                            self.__insert_routing_info(edge, key_mask)
+            self.__insert_routing_infos(routing_infos, machine_graph)
 
     def add_routing_tables(self, routing_tables):
         """ Adds the routing tables into the database
@@ -414,16 +545,7 @@ class DatabaseWriter(object):
         :rtype: None
         """
         with self._connection:
-            for routing_table in routing_tables.routing_tables:
-                for counter, entry in \
-                        enumerate(routing_table.multicast_routing_entries):
-                    route_entry = 0
-                    for processor_id in entry.processor_ids:
-                        route_entry |= 1 << (6 + processor_id)
-                    for link_id in entry.link_ids:
-                        route_entry |= 1 << link_id
-                    self.__insert_routing_entry(
-                        routing_table, counter, entry, route_entry)
+            self.__insert_routing_entries(routing_tables)
 
     def add_tags(self, machine_graph, tags):
         """ Adds the tags into the database
@@ -433,16 +555,8 @@ class DatabaseWriter(object):
         :rtype: None
         """
         with self._connection:
-            for vertex in machine_graph.vertices:
-                ip_tags = tags.get_ip_tags_for_vertex(vertex)
-                if ip_tags is not None:
-                    for ip_tag in ip_tags:
-                        self.__insert_ip_tag(vertex, ip_tag)
-                reverse_ip_tags = tags.get_reverse_ip_tags_for_vertex(
-                    vertex)
-                if reverse_ip_tags is not None:
-                    for reverse_ip_tag in reverse_ip_tags:
-                        self.__insert_reverse_ip_tag(vertex, reverse_ip_tag)
+            self.__insert_ip_tags(machine_graph, tags)
+            self.__insert_reverse_ip_tags(machine_graph, tags)
 
     def create_atom_to_event_id_mapping(
             self, application_graph, machine_graph, routing_infos,
@@ -482,6 +596,6 @@ class DatabaseWriter(object):
         if isinstance(vertex, AbstractProvidesKeyToAtomMapping):
             routing_info = routing_infos.get_routing_info_from_partition(
                 partition)
-            for atom_id, key in vertex.routing_key_partition_atom_mapping(
-                    routing_info, partition):
-                self.__insert_event_atom_mapping(vertex, key, atom_id)
+            self.__insert_event_atom_ranges(
+                vertex, vertex.routing_key_partition_atom_mapping(
+                    routing_info, partition))
@@ -169,6 +169,20 @@ CREATE TABLE IF NOT EXISTS Reverse_IP_tags(
 	FOREIGN KEY (vertex_id)
 		REFERENCES Machine_vertices(vertex_id));
 
+-- The mapping of the atoms of vertices to the keys of the events they send,
+-- as ranges in which consecutive atoms send consecutive keys; an irregular
+-- mapping has ranges of a single atom.
+CREATE TABLE IF NOT EXISTS event_to_atom_ranges(
+	vertex_id INTEGER,
+	first_atom_id INTEGER,
+	first_event_id INTEGER PRIMARY KEY,
+	n_atoms INTEGER,
+	FOREIGN KEY (vertex_id)
+		REFERENCES Machine_vertices(vertex_id));
+
+-- The mapping of each atom to the key of the events it sends; only written
+-- for vertices whose mapping does not compress into ranges, unless every
+-- vertex is asked for.
 CREATE TABLE IF NOT EXISTS event_to_atom_mapping(
 	vertex_id INTEGER,
 	atom_id INTEGER,
@@ -0,0 +1,27 @@
+-- Indexes for the lookups done when reading the database. These are created
+-- only once everything has been inserted, as building each index in one go
+-- is much faster than updating it on every insert.
+
+CREATE INDEX IF NOT EXISTS application_vertex_label
+	ON Application_vertices(vertex_label);
+
+CREATE INDEX IF NOT EXISTS application_edge_post_vertex
+	ON Application_edges(post_vertex);
+
+CREATE INDEX IF NOT EXISTS machine_vertex_label
+	ON Machine_vertices(label);
+
+CREATE INDEX IF NOT EXISTS machine_edge_pre_vertex
+	ON Machine_edges(pre_vertex);
+
+CREATE INDEX IF NOT EXISTS machine_edge_post_vertex
+	ON Machine_edges(post_vertex);
+
+CREATE INDEX IF NOT EXISTS graph_mapper_machine_vertex
+	ON graph_mapper_vertex(machine_vertex_id);
+
+CREATE INDEX IF NOT EXISTS event_to_atom_ranges_vertex
+	ON event_to_atom_ranges(vertex_id);
+
+CREATE INDEX IF NOT EXISTS event_to_atom_mapping_vertex
+	ON event_to_atom_mapping(vertex_id);
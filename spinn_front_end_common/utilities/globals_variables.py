@@ -1,6 +1,9 @@
 
+from spinn_front_end_common.utilities.utility_objs import RegionTableCache
+
 _failed_state = None
 _simulator = None
+_region_table_cache = RegionTableCache()
 
 
 def get_simulator():
@@ -49,3 +52,12 @@ def set_failed_state(new_failed_state):
         _failed_state = new_failed_state
     elif type(new_failed_state) != type(_failed_state):
         raise ValueError("You may only setup/init one type of simulator")
+
+
+def region_table_cache():
+    """ Get the cache of the region addresses of the cores of the machine,\
+        shared by everything that needs to locate a region
+
+    :rtype: :py:class:`RegionTableCache`
+    """
+    return _region_table_cache
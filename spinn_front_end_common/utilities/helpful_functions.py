@@ -1,7 +1,6 @@
-# dsg imports
-from data_specification import utility_calls
 
 # front end common imports
+from spinn_front_end_common.utilities import globals_variables
 from spinn_front_end_common.utilities.exceptions import ConfigurationException
 
 # SpiNMachine imports
@@ -73,17 +72,9 @@ def locate_memory_region_for_placement(placement, region, transceiver):
     :param transceiver: the python interface to the SpiNNaker machine
     :type transceiver: spiNNMan.transciever.Transciever
     """
-    regions_base_address = transceiver.get_cpu_information_from_core(
-        placement.x, placement.y, placement.p).user[0]
-
-    # Get the position of the region in the pointer table
-    region_offset = utility_calls.get_region_base_address_offset(
-        regions_base_address, region)
-
-    # Get the actual address of the region
-    region_address = transceiver.read_memory(
-        placement.x, placement.y, region_offset, 4)
-    return _ONE_WORD.unpack_from(region_address)[0]
+    # The region table is read only if it is not already known
+    return globals_variables.region_table_cache().read_region_address(
+        transceiver, placement.x, placement.y, placement.p, region)
 
 
 def child_folder(parent, child_name):
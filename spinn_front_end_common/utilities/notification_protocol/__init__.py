@@ -1,4 +1,6 @@
+from .async_notification_protocol import AsyncNotificationProtocol
 from .notification_protocol import NotificationProtocol
 from .socket_address import SocketAddress
 
-__all__ = ["NotificationProtocol", "SocketAddress"]
+__all__ = ["AsyncNotificationProtocol", "NotificationProtocol",
+           "SocketAddress"]
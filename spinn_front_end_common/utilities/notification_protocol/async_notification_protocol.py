@@ -0,0 +1,162 @@
+import logging
+
+try:
+    import asyncio
+except ImportError:  # pragma: no cover
+    # Python 2 has no asyncio, so this protocol cannot be used there
+    asyncio = None
+
+from spinnman.messages.eieio.command_messages import DatabaseConfirmation
+from spinnman.messages.eieio.command_messages \
+    import NotificationProtocolPauseStop, NotificationProtocolStartResume
+from spinn_utilities.log import FormatAdapter
+
+from spinn_front_end_common.utilities.connections import AsyncUDPSocket
+from spinn_front_end_common.utilities.constants \
+    import MAX_DATABASE_PATH_LENGTH
+from spinn_front_end_common.utilities.exceptions import ConfigurationException
+
+logger = FormatAdapter(logging.getLogger(__name__))
+
+
+class AsyncNotificationProtocol(object):
+    """ The protocol which hand shakes with external devices about the\
+        database and starting execution, with the sockets of all the\
+        devices served by one asyncio event loop, so that the confirmations\
+        of the devices are awaited together rather than in turn.
+
+    All the methods of this class must be called from the thread running\
+    the event loop.
+    """
+
+    __slots__ = [
+        # the event loop that the sockets are served by
+        "_loop",
+
+        # the socket of each external device, in the order of the addresses
+        "_sockets",
+
+        # True if the database must be confirmed as read before starting
+        "_wait_for_read_confirmation",
+
+        # list by socket of the future of the confirmation from the device,
+        # or None if not waiting for one
+        "_confirmations"
+    ]
+
+    def __init__(self, socket_addresses, wait_for_read_confirmation,
+                 loop=None):
+        """
+        :param socket_addresses: Where to notify the external devices
+        :type socket_addresses: iterable of :py:class:`SocketAddress`
+        :param wait_for_read_confirmation: True if the devices are to be\
+            waited for to confirm that they have read the database
+        :type wait_for_read_confirmation: bool
+        :param loop: The event loop to serve the sockets with, or None for\
+            the current event loop
+        :type loop: :py:class:`asyncio.AbstractEventLoop`
+        """
+        if loop is None:
+            loop = asyncio.get_event_loop()
+        self._loop = loop
+        self._wait_for_read_confirmation = wait_for_read_confirmation
+        self._sockets = list()
+        self._confirmations = list()
+        for index, socket_address in enumerate(socket_addresses):
+            self._sockets.append(AsyncUDPSocket(
+                loop, self.__confirmation_callback(index),
+                local_port=socket_address.listen_port,
+                remote_host=socket_address.notify_host_name,
+                remote_port=socket_address.notify_port_no))
+            self._confirmations.append(None)
+
+    def __confirmation_callback(self, index):
+        def receive_confirmation(data, address):
+            confirmation = self._confirmations[index]
+            if confirmation is not None and not confirmation.done():
+                logger.info(
+                    "** Confirmation from {}:{} received, continuing **",
+                    *address)
+                confirmation.set_result(address)
+        return receive_confirmation
+
+    def __send(self, message, description):
+        data = message.bytestring
+        for index, socket in enumerate(self._sockets):
+            try:
+                socket.send(data)
+            except Exception:
+                logger.warning(
+                    "*** Failed to send {} to external application on "
+                    "socket {} about the simulation ***",
+                    description, index, exc_info=True)
+                if self._confirmations[index] is not None:
+                    self._confirmations[index].cancel()
+
+    def send_read_notification(self, database_path):
+        """ Sends notifications to all devices which have expressed an\
+            interest in when the database has been written
+
+        :param database_path: the path to the database file
+        :type database_path: str
+        :return: a future that is done when every device has confirmed\
+            that it has read the database, if they are waited for
+        :rtype: :py:class:`asyncio.Future`
+        """
+        if database_path is not None:
+            if len(database_path) > MAX_DATABASE_PATH_LENGTH:
+                raise ConfigurationException(
+                    "The file path to the database is too large to be "
+                    "transmitted via the command packet, please set the file "
+                    "path manually and set the .cfg parameter [Database] "
+                    "send_file_path to False")
+            if self._wait_for_read_confirmation:
+                self._confirmations = [
+                    self._loop.create_future() for _ in self._sockets]
+            logger.info(
+                "** Notifying external sources that the database is ready "
+                "for reading **")
+            self.__send(DatabaseConfirmation(database_path), "the database")
+        return self.wait_for_confirmation()
+
+    def wait_for_confirmation(self):
+        """ Get a future that is done when all the external devices being\
+            waited for have confirmed that they have read the database;\
+            devices that could not be notified are not waited for
+
+        :rtype: :py:class:`asyncio.Future`
+        """
+        confirmations = [c for c in self._confirmations if c is not None]
+        if not confirmations:
+            done = self._loop.create_future()
+            done.set_result([])
+            return done
+        return asyncio.gather(*confirmations, return_exceptions=True)
+
+    def send_start_resume_notification(self):
+        """ Sends the start notification to all the external devices
+
+        :rtype: None
+        """
+        logger.info("** Sending start / resume message to external sources "
+                    "to state the simulation has started or resumed. **")
+        self.__send(NotificationProtocolStartResume(), "start/resume")
+
+    def send_stop_pause_notification(self):
+        """ Sends the pause / stop notification to all the external devices
+
+        :rtype: None
+        """
+        logger.info("** Sending pause / stop message to external sources "
+                    "to state the simulation has been paused or stopped. **")
+        self.__send(NotificationProtocolPauseStop(), "stop/pause")
+
+    def close(self):
+        """ Closes the sockets, giving up on any confirmations not yet\
+            received
+        """
+        for confirmation in self._confirmations:
+            if confirmation is not None:
+                confirmation.cancel()
+        for socket in self._sockets:
+            socket.close()
@@ -1,6 +1,7 @@
 # spinnman imports
 from multiprocessing.pool import ThreadPool
 from spinnman.connections.udp_packet_connections import EIEIOConnection
+from spinnman.exceptions import SpinnmanTimeoutException
 from spinnman.messages.eieio.command_messages import DatabaseConfirmation
 from spinn_utilities.log import FormatAdapter
 from spinnman.messages.eieio.command_messages \
@@ -11,7 +12,9 @@ from spinn_front_end_common.utilities.constants \
     import MAX_DATABASE_PATH_LENGTH
 from spinn_front_end_common.utilities.exceptions import ConfigurationException
 
+from threading import Lock, Thread
 import logging
+import time
 
 
 logger = FormatAdapter(logging.getLogger(__name__))
@@ -22,12 +25,27 @@ class NotificationProtocol(object):
         database and starting execution
     """
 
-    def __init__(self, socket_addresses, wait_for_read_confirmation):
+    def __init__(self, socket_addresses, wait_for_read_confirmation,
+                 confirmation_timeout=None):
+        """
+        :param socket_addresses: Where to notify the external devices
+        :type socket_addresses: iterable of :py:class:`SocketAddress`
+        :param wait_for_read_confirmation: True if the devices are to be\
+            waited for to confirm that they have read the database
+        :type wait_for_read_confirmation: bool
+        :param confirmation_timeout: How long in seconds to wait for the\
+            devices to confirm, or None to wait for as long as it takes.\
+            Devices that confirm later are sent the start notification when\
+            they confirm, if the simulation is running; a timeout of 0\
+            therefore starts the simulation without waiting for anyone.
+        :type confirmation_timeout: float or None
+        """
         self._socket_addresses = socket_addresses
 
         # Determines whether to wait for confirmation that the database
         # has been read before starting the simulation
         self._wait_for_read_confirmation = wait_for_read_confirmation
+        self._confirmation_timeout = confirmation_timeout
         self._wait_pool = ThreadPool(processes=1)
         self._data_base_message_connections = list()
         for socket_address in socket_addresses:
@@ -36,6 +54,24 @@ class NotificationProtocol(object):
                 remote_host=socket_address.notify_host_name,
                 remote_port=socket_address.notify_port_no))
 
+        # The connections that have not confirmed in time, and whether the
+        # simulation is running, which decides what late devices are sent
+        self._state_lock = Lock()
+        self._late_connections = list()
+        self._running = False
+        self._closed = False
+
+    @property
+    def late_listeners(self):
+        """ The external devices that did not confirm that they had read\
+            the database in time and have not confirmed since
+
+        :rtype: list(tuple(str, int))
+        """
+        with self._state_lock:
+            return [(c.remote_ip_address, c.remote_port)
+                    for c in self._late_connections]
+
     def wait_for_confirmation(self):
         """ If asked to wait for confirmation, waits for all external systems\
             to confirm that they are configured and have read the database
@@ -59,14 +95,10 @@ class NotificationProtocol(object):
         if self._wait_for_read_confirmation:
             self.wait_for_confirmation()
         eieio_command_message = NotificationProtocolStartResume()
-        for c in self._data_base_message_connections:
-            try:
-                c.send_eieio_message(eieio_command_message)
-            except Exception:
-                logger.warning(
-                    "*** Failed to send start/resume notification to external "
-                    "application on {}:{} about the simulation ***",
-                    c.remote_ip_address, c.remote_port, exc_info=True)
+        with self._state_lock:
+            self._running = True
+            self.__send_to_confirmed(
+                eieio_command_message, "start/resume notification")
 
     def send_stop_pause_notification(self):
         """ Sends the pause / stop notifications when the script has either\
@@ -77,14 +109,29 @@ class NotificationProtocol(object):
         logger.info("** Sending pause / stop message to external sources "
                     "to state the simulation has been paused or stopped. **")
         eieio_command_message = NotificationProtocolPauseStop()
+        with self._state_lock:
+            self._running = False
+            self.__send_to_confirmed(
+                eieio_command_message, "stop/pause notification")
+
+    def __send_to_confirmed(self, message, description):
+        """ Send a message to the devices that are not late in confirming\
+            that they have read the database; must hold the state lock
+        """
         for c in self._data_base_message_connections:
-            try:
-                c.send_eieio_message(eieio_command_message)
-            except Exception:
-                logger.warning(
-                    "*** Failed to send stop/pause notification to external "
-                    "application on {}:{} about the simulation ***",
-                    c.remote_ip_address, c.remote_port, exc_info=True)
+            if c not in self._late_connections:
+                self.__send(c, message, description)
+
+    @staticmethod
+    def __send(connection, message, description):
+        try:
+            connection.send_eieio_message(message)
+        except Exception:
+            logger.warning(
+                "*** Failed to send {} to external application on {}:{} "
+                "about the simulation ***", description,
+                connection.remote_ip_address, connection.remote_port,
+                exc_info=True)
 
     # noinspection PyPep8
     def send_read_notification(self, database_path):
@@ -143,21 +190,86 @@ class NotificationProtocol(object):
                     "about the database ***",
                     c.remote_ip_address, c.remote_port, exc_info=True)
 
-        # if the system needs to wait, try receiving a packet back
-        for c in self._data_base_message_connections:
-            try:
-                if self._wait_for_read_confirmation:
-                    c.receive_eieio_message()
+        # if the system needs to wait, receive the replies, which arrive
+        # while waiting for any of them, until the deadline
+        if self._wait_for_read_confirmation:
+            deadline = None
+            if self._confirmation_timeout is not None:
+                deadline = time.time() + self._confirmation_timeout
+            late = [c for c in self._data_base_message_connections
+                    if not self.__receive_confirmation(c, deadline)]
+            if late:
+                self.__wait_for_late_listeners(late)
+
+    @staticmethod
+    def __receive_confirmation(connection, deadline):
+        """ Wait for a device to confirm that it has read the database
+
+        :return: True if confirmed, False if the deadline passed first
+        """
+        try:
+            timeout = None
+            if deadline is not None:
+                timeout = max(0.0, deadline - time.time())
+                if not connection.is_ready_to_receive(timeout):
+                    return False
+            connection.receive_eieio_message(timeout)
+            logger.info(
+                "** Confirmation from {}:{} received, continuing **",
+                connection.remote_ip_address, connection.remote_port)
+            return True
+        except SpinnmanTimeoutException:
+            return False
+        except Exception:
+            logger.warning(
+                "*** Failed to receive notification from external "
+                "application on {}:{} about the database ***",
+                connection.remote_ip_address, connection.remote_port,
+                exc_info=True)
+            return True
+
+    def __wait_for_late_listeners(self, late):
+        with self._state_lock:
+            self._late_connections = late
+        logger.warning(
+            "*** No confirmation in {} seconds from external applications "
+            "on {}; starting without them, and they will be started when "
+            "they confirm ***", self._confirmation_timeout, ", ".join(
+                "{}:{}".format(c.remote_ip_address, c.remote_port)
+                for c in late))
+        thread = Thread(name="NotificationProtocol late listeners",
+                        target=self.__receive_late_confirmations)
+        thread.daemon = True
+        thread.start()
+
+    def __receive_late_confirmations(self):
+        while True:
+            with self._state_lock:
+                if self._closed or not self._late_connections:
+                    return
+                late = list(self._late_connections)
+            for c in late:
+                if not c.is_ready_to_receive(0.1):
+                    continue
+                try:
+                    c.receive_eieio_message(0)
+                except Exception:
+                    logger.warning(
+                        "*** Failed to receive notification from external "
+                        "application on {}:{} about the database ***",
+                        c.remote_ip_address, c.remote_port, exc_info=True)
+                with self._state_lock:
+                    self._late_connections.remove(c)
                     logger.info(
-                        "** Confirmation from {}:{} received, continuing **",
+                        "** Late confirmation from {}:{} received **",
                         c.remote_ip_address, c.remote_port)
-            except Exception:
-                logger.warning(
-                    "*** Failed to receive notification from external "
-                    "application on {}:{} about the database ***",
-                    c.remote_ip_address, c.remote_port, exc_info=True)
+                    if self._running:
+                        self.__send(c, NotificationProtocolStartResume(),
+                                    "start/resume notification")
 
     def close(self):
-        """ Closes the thread pool
+        """ Closes the thread pool, and stops waiting for late confirmations
         """
+        with self._state_lock:
+            self._closed = True
         self._wait_pool.close()
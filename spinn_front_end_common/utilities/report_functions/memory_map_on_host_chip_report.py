@@ -1,13 +1,12 @@
 from spinn_utilities.progress_bar import ProgressBar
-from data_specification.constants import MAX_MEM_REGIONS
 
 import logging
 import os
-import struct
 from spinn_utilities.log import FormatAdapter
 
+from spinn_front_end_common.utilities import globals_variables
+
 logger = FormatAdapter(logging.getLogger(__name__))
-_ONE_WORD = struct.Struct("<I")
 MEM_MAP_SUBDIR_NAME = "memory_map_reports"
 MEM_MAP_FILENAME = "memory_map_from_processor_{0:d}_{1:d}_{2:d}.txt"
 
@@ -44,20 +43,13 @@ class MemoryMapOnHostChipReport(object):
 
     def _describe_mem_map(self, f, txrx, x, y, p):
         # pylint: disable=too-many-arguments
-        # Read the memory map data from the given core
-        user_0_addr = txrx.get_user_0_register_address_from_core(p)
-        pointer_table_addr = self._get_app_pointer_table(
-            txrx, x, y, user_0_addr)
-        memmap_data = txrx.read_memory(
-            x, y, pointer_table_addr, 4 * MAX_MEM_REGIONS)
+        # Get the memory map of the given core, reading it only if it is not
+        # already known
+        region_addresses = globals_variables.region_table_cache()\
+            .read_region_addresses(txrx, x, y, p)
 
         # Convert the map to a human-readable description
         f.write("On chip data specification executor\n\n")
-        for i in range(MAX_MEM_REGIONS):
-            region_address, = _ONE_WORD.unpack_from(memmap_data, i * 4)
+        for i, region_address in enumerate(region_addresses):
             f.write("Region {0:d}:\n\t start address: 0x{1:x}\n\n".format(
                 i, region_address))
-
-    def _get_app_pointer_table(self, txrx, x, y, table_pointer):
-        encoded_address = txrx.read_memory(x, y, table_pointer, 4)
-        return _ONE_WORD.unpack_from(encoded_address)[0] + 8
@@ -1,10 +1,21 @@
+from .abstract_extraction_path_policy import AbstractExtractionPathPolicy
+from .adaptive_extraction_path_policy import AdaptiveExtractionPathPolicy
+from .data_specification_targets import DataSpecificationTargets
 from .dpri_flags import DPRIFlags
 from .executable_finder import ExecutableFinder
 from .executable_type import ExecutableType
+from .fixed_threshold_extraction_path_policy import \
+    FixedThresholdExtractionPathPolicy
 from .live_packet_gather_parameters import LivePacketGatherParameters
 from .provenance_data_item import ProvenanceDataItem
+from .region_reload_cache import RegionReloadCache
+from .region_table_cache import RegionTableCache
 from .reinjection_status import ReInjectionStatus
+from .segment_planner import SegmentPlanner, SegmentTimings
 
-__all__ = ["DPRIFlags", "ExecutableFinder", "ExecutableType",
+__all__ = ["AbstractExtractionPathPolicy", "AdaptiveExtractionPathPolicy",
+           "DataSpecificationTargets", "DPRIFlags", "ExecutableFinder",
+           "ExecutableType", "FixedThresholdExtractionPathPolicy",
            "LivePacketGatherParameters", "ProvenanceDataItem",
-           "ReInjectionStatus"]
+           "RegionReloadCache", "RegionTableCache", "ReInjectionStatus",
+           "SegmentPlanner", "SegmentTimings"]
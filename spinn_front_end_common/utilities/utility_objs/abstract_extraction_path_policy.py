@@ -0,0 +1,41 @@
+from six import add_metaclass
+
+from spinn_utilities.abstract_base import AbstractBase, abstractmethod
+
+
+@add_metaclass(AbstractBase)
+class AbstractExtractionPathPolicy(object):
+    """ Decides whether a read of memory should use the data speed up\
+        (fast) path or plain SCP, given how far the data has to travel
+    """
+
+    __slots__ = ()
+
+    @abstractmethod
+    def use_fast_path(self, length_in_bytes, n_hops):
+        """ Determine which path should be used to read some memory
+
+        :param length_in_bytes: the number of bytes to be read
+        :type length_in_bytes: int
+        :param n_hops: the number of routers between the chip being read\
+            and the Ethernet-connected chip
+        :type n_hops: int
+        :return: True if the data speed up path should be used, False if\
+            SCP should be used
+        :rtype: bool
+        """
+
+    @abstractmethod
+    def record(self, used_fast_path, length_in_bytes, n_hops, time_taken):
+        """ Record how long a read took, so that the policy can learn from it
+
+        :param used_fast_path: whether the data speed up path was used
+        :type used_fast_path: bool
+        :param length_in_bytes: the number of bytes read
+        :type length_in_bytes: int
+        :param n_hops: the number of routers between the chip read and the\
+            Ethernet-connected chip
+        :type n_hops: int
+        :param time_taken: the time the read took in seconds
+        :type time_taken: float
+        """
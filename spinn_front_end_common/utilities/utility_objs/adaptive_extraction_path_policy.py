@@ -0,0 +1,296 @@
+from spinn_utilities.overrides import overrides
+
+from .abstract_extraction_path_policy import AbstractExtractionPathPolicy
+
+
+class _PathModel(object):
+    """ A running model of the time taken by one path at one distance, as a\
+        latency plus a time per byte. This is a least squares fit over the\
+        observed reads, in which older reads are exponentially forgotten,\
+        and which is anchored by a fixed prior so that it is always defined.\
+        Each read is clipped to within a factor of the time predicted for\
+        it, so that one slow read cannot move the model far.
+    """
+
+    __slots__ = [
+        # factor by which older observations are discounted on each new one
+        "_decay",
+
+        # prior weighted sums of 1, x, y, x * x and x * y
+        "_prior",
+
+        # observed weighted sums of 1, x, y, x * x and x * y
+        "_observed",
+
+        # the number of reads observed
+        "_n_observations",
+
+        # the most times more or less than predicted a read can count as
+        "_max_outlier_factor"
+    ]
+
+    def __init__(self, latency, throughput, prior_sizes, prior_weight, decay,
+                 max_outlier_factor):
+        # pylint: disable=too-many-arguments
+        self._decay = decay
+        self._max_outlier_factor = max_outlier_factor
+        self._prior = [0.0] * 5
+        for size in prior_sizes:
+            self.__add(self._prior, size, latency + size / throughput,
+                       prior_weight)
+        self._observed = [0.0] * 5
+        self._n_observations = 0
+
+    @staticmethod
+    def __add(sums, x, y, weight):
+        sums[0] += weight
+        sums[1] += weight * x
+        sums[2] += weight * y
+        sums[3] += weight * x * x
+        sums[4] += weight * x * y
+
+    def add(self, length_in_bytes, time_taken):
+        predicted = self.predict(length_in_bytes)
+        if predicted > 0:
+            time_taken = min(max(
+                time_taken, predicted / self._max_outlier_factor),
+                predicted * self._max_outlier_factor)
+        self.relax()
+        self.__add(self._observed, float(length_in_bytes), time_taken, 1.0)
+        self._n_observations += 1
+
+    def relax(self):
+        """ Forget a little of what has been observed, moving the model\
+            back towards the prior
+        """
+        self._observed = [value * self._decay for value in self._observed]
+
+    def fit(self):
+        """ Get the latency and time per byte of the model
+
+        :rtype: tuple(float, float)
+        """
+        w, x, y, xx, xy = [
+            p + o for p, o in zip(self._prior, self._observed)]
+        denominator = w * xx - x * x
+        time_per_byte = 0.0
+        if denominator > 0:
+            time_per_byte = max(0.0, (w * xy - x * y) / denominator)
+        latency = max(0.0, (y - time_per_byte * x) / w)
+        return latency, time_per_byte
+
+    def predict(self, length_in_bytes):
+        latency, time_per_byte = self.fit()
+        return latency + time_per_byte * length_in_bytes
+
+    @property
+    def n_observations(self):
+        return self._n_observations
+
+
+class AdaptiveExtractionPathPolicy(AbstractExtractionPathPolicy):
+    """ Uses the data speed up path for reads of at least a crossover size\
+        for each distance, where the crossover is the size at which models\
+        of the two paths predict the same time. The models are updated from\
+        the time taken by each read, and start from a prior under which the\
+        crossover is at the given threshold, so until something has been\
+        observed this behaves like the fixed threshold.
+
+        So that one bad read cannot lock the policy onto one path:
+
+        * each read can only count as a bounded factor of its predicted time;
+        * the model of the path not used relaxes back towards its prior;
+        * the crossover is kept within a factor of the threshold, so small\
+          reads always use SCP and large reads always use the fast path;
+        * now and then, a read close to the crossover uses the other path,\
+          so that both models keep being observed.
+    """
+
+    __slots__ = [
+        # dict of (used fast path, n hops) to model
+        "_models",
+
+        # the sizes and weight of the prior observations of each model
+        "_prior_sizes",
+        "_prior_weight",
+
+        # the decay of older observations
+        "_decay",
+
+        # the prior (latency, throughput) of the SCP path
+        "_scp_prior",
+
+        # the prior (latency, throughput) of the data speed up path
+        "_fast_prior",
+
+        # the most times more or less than predicted a read can count as
+        "_max_outlier_factor",
+
+        # the smallest and largest crossover that can be used
+        "_min_crossover",
+        "_max_crossover",
+
+        # how many reads at a distance there are between each read using
+        # the other path, or 0 to never do so
+        "_explore_interval",
+
+        # the most times larger or smaller than the crossover that a read
+        # using the other path can be
+        "_explore_range",
+
+        # dict of n hops to the number of reads at that distance since one
+        # last used the other path
+        "_n_since_explored"
+    ]
+
+    #: default prior latency of an SCP read in seconds
+    DEFAULT_SCP_LATENCY = 0.002
+
+    #: default prior throughput of SCP reads in bytes per second
+    DEFAULT_SCP_THROUGHPUT = 1000000.0
+
+    #: default prior throughput of the data speed up path in bytes per second
+    DEFAULT_FAST_THROUGHPUT = 10000000.0
+
+    #: default most times more or less than predicted a read can count as
+    DEFAULT_MAX_OUTLIER_FACTOR = 4.0
+
+    #: default most times larger or smaller than the threshold the\
+    #: crossover can be
+    DEFAULT_MAX_CROSSOVER_SHIFT = 8.0
+
+    #: default number of reads between each read using the other path
+    DEFAULT_EXPLORE_INTERVAL = 16
+
+    #: default most times larger or smaller than the crossover that a read\
+    #: using the other path can be
+    DEFAULT_EXPLORE_RANGE = 2.0
+
+    def __init__(
+            self, threshold, scp_latency=DEFAULT_SCP_LATENCY,
+            scp_throughput=DEFAULT_SCP_THROUGHPUT,
+            fast_throughput=DEFAULT_FAST_THROUGHPUT, prior_weight=1.0,
+            decay=0.95, max_outlier_factor=DEFAULT_MAX_OUTLIER_FACTOR,
+            max_crossover_shift=DEFAULT_MAX_CROSSOVER_SHIFT,
+            explore_interval=DEFAULT_EXPLORE_INTERVAL,
+            explore_range=DEFAULT_EXPLORE_RANGE):
+        """
+        :param threshold: the read size in bytes at which the paths are\
+            initially assumed to take the same time
+        :type threshold: int
+        :param scp_latency: the prior fixed cost of an SCP read in seconds
+        :type scp_latency: float
+        :param scp_throughput: the prior throughput of SCP in bytes/second
+        :type scp_throughput: float
+        :param fast_throughput: the prior throughput of the data speed up\
+            path in bytes per second
+        :type fast_throughput: float
+        :param prior_weight: how many reads the prior is worth at each of\
+            its two sizes
+        :type prior_weight: float
+        :param decay: the factor by which the weight of older reads is\
+            reduced each time a new read is recorded
+        :type decay: float
+        :param max_outlier_factor: the most times more or less than its\
+            predicted time that a read can count as
+        :type max_outlier_factor: float
+        :param max_crossover_shift: the most times larger or smaller than\
+            the threshold that the crossover can be
+        :type max_crossover_shift: float
+        :param explore_interval: how many reads at a distance there are\
+            between each read close to the crossover using the other path,\
+            or 0 to never do so
+        :type explore_interval: int
+        :param explore_range: the most times larger or smaller than the\
+            crossover that a read using the other path can be
+        :type explore_range: float
+        """
+        # pylint: disable=too-many-arguments
+        fast_latency = max(
+            0.0, scp_latency + threshold / scp_throughput -
+            threshold / fast_throughput)
+        self._scp_prior = (scp_latency, scp_throughput)
+        self._fast_prior = (fast_latency, fast_throughput)
+        self._prior_sizes = (0.0, 2.0 * threshold)
+        self._prior_weight = prior_weight
+        self._decay = decay
+        self._max_outlier_factor = max(1.0, max_outlier_factor)
+        max_crossover_shift = max(1.0, max_crossover_shift)
+        self._min_crossover = threshold / max_crossover_shift
+        self._max_crossover = threshold * max_crossover_shift
+        self._explore_interval = explore_interval
+        self._explore_range = max(1.0, explore_range)
+        self._models = dict()
+        self._n_since_explored = dict()
+
+    def _model(self, fast, n_hops):
+        key = (fast, n_hops)
+        if key not in self._models:
+            latency, throughput = self._fast_prior if fast else self._scp_prior
+            self._models[key] = _PathModel(
+                latency, throughput, self._prior_sizes, self._prior_weight,
+                self._decay, self._max_outlier_factor)
+        return self._models[key]
+
+    def predict(self, fast, length_in_bytes, n_hops):
+        """ Get the predicted time of a read
+
+        :param fast: whether the data speed up path is to be used
+        :type fast: bool
+        :param length_in_bytes: the number of bytes to be read
+        :type length_in_bytes: int
+        :param n_hops: the number of routers between the chip to be read\
+            and the Ethernet-connected chip
+        :type n_hops: int
+        :return: the predicted time in seconds
+        :rtype: float
+        """
+        return self._model(fast, n_hops).predict(length_in_bytes)
+
+    def n_observations(self, fast, n_hops):
+        """ Get the number of reads recorded for a path at a distance
+
+        :rtype: int
+        """
+        return self._model(fast, n_hops).n_observations
+
+    def crossover(self, n_hops):
+        """ Get the smallest read that uses the data speed up path at a\
+            distance, other than to explore
+
+        :param n_hops: the number of routers between the chip to be read\
+            and the Ethernet-connected chip
+        :type n_hops: int
+        :return: the size of the read in bytes
+        :rtype: float
+        """
+        fast_latency, fast_time_per_byte = self._model(True, n_hops).fit()
+        scp_latency, scp_time_per_byte = self._model(False, n_hops).fit()
+        if scp_time_per_byte > fast_time_per_byte:
+            crossover = (fast_latency - scp_latency) / (
+                scp_time_per_byte - fast_time_per_byte)
+        else:
+            crossover = self._max_crossover
+        return min(max(crossover, self._min_crossover), self._max_crossover)
+
+    @overrides(AbstractExtractionPathPolicy.use_fast_path)
+    def use_fast_path(self, length_in_bytes, n_hops):
+        crossover = self.crossover(n_hops)
+        use_fast = length_in_bytes >= crossover
+
+        # Now and then, try the other path with a read close enough to the
+        # crossover that it cannot cost much
+        n_since_explored = self._n_since_explored.get(n_hops, 0) + 1
+        if (self._explore_interval and
+                n_since_explored >= self._explore_interval and
+                crossover / self._explore_range <= length_in_bytes <=
+                crossover * self._explore_range):
+            use_fast = not use_fast
+            n_since_explored = 0
+        self._n_since_explored[n_hops] = n_since_explored
+        return use_fast
+
+    @overrides(AbstractExtractionPathPolicy.record)
+    def record(self, used_fast_path, length_in_bytes, n_hops, time_taken):
+        self._model(used_fast_path, n_hops).add(length_in_bytes, time_taken)
+        self._model(not used_fast_path, n_hops).relax()
@@ -0,0 +1,210 @@
+from data_specification.data_specification_generator \
+    import DataSpecificationGenerator
+
+from collections import OrderedDict
+import io
+import os
+import tempfile
+import threading
+
+#: default number of bytes of data specifications to keep in memory
+DEFAULT_MEMORY_LIMIT = 256 * 1024 * 1024
+
+
+class _DataSpecificationWriter(object):
+    """ Collects a data specification in memory, storing it when closed
+    """
+
+    __slots__ = [
+        # the storage to put the data specification in
+        "_targets",
+
+        # the (x, y, p) of the core of the data specification
+        "_core",
+
+        # the data written so far
+        "_buffer"
+    ]
+
+    def __init__(self, targets, core):
+        self._targets = targets
+        self._core = core
+        self._buffer = io.BytesIO()
+
+    def write(self, data):
+        self._buffer.write(data)
+
+    def tell(self):
+        return self._buffer.tell()
+
+    def close(self):
+        if self._buffer is not None:
+            self._targets[self._core] = self._buffer.getvalue()
+            self._buffer = None
+
+
+class DataSpecificationTargets(object):
+    """ Storage of the data specification of each core, keyed by (x, y, p).\
+        Data specifications are kept in memory until their total size\
+        reaches a limit, after which any more are appended to a single\
+        archive file, so that no file is needed per core.
+    """
+
+    __slots__ = [
+        # folder in which to create the archive file
+        "_folder",
+
+        # the number of bytes of data specifications to keep in memory
+        "_memory_limit",
+
+        # dict of (x, y, p) to the bytes of the data specification held in
+        # memory
+        "_in_memory",
+
+        # the total size of the data specifications held in memory
+        "_memory_used",
+
+        # dict of (x, y, p) to (offset, size) in the archive file
+        "_in_archive",
+
+        # the archive file, opened when first needed
+        "_archive",
+
+        # lock for the data structures and the archive file, as data
+        # specifications might be stored by several threads at once
+        "_lock",
+
+        # the cores in the order their data specifications were first stored
+        "_cores"
+    ]
+
+    def __init__(self, folder, memory_limit=DEFAULT_MEMORY_LIMIT):
+        """
+        :param folder: the folder in which to create the archive of data\
+            specifications that do not fit in memory
+        :type folder: str
+        :param memory_limit: the number of bytes of data specifications to\
+            keep in memory
+        :type memory_limit: int
+        """
+        self._folder = folder
+        self._memory_limit = memory_limit
+        self._in_memory = dict()
+        self._memory_used = 0
+        self._in_archive = dict()
+        self._archive = None
+        self._lock = threading.Lock()
+        self._cores = OrderedDict()
+
+    def create_data_spec(self, x, y, p, report_writer=None):
+        """ Create a data specification generator which stores the data\
+            specification of a core here when it ends
+
+        :param x: the x-coordinate of the chip
+        :param y: the y-coordinate of the chip
+        :param p: the ID of the core
+        :param report_writer: where to write a text version of the data\
+            specification, or None if this is not wanted
+        :rtype: :py:class:`data_specification.DataSpecificationGenerator`
+        """
+        return DataSpecificationGenerator(
+            _DataSpecificationWriter(self, (x, y, p)), report_writer)
+
+    def __setitem__(self, core, data):
+        with self._lock:
+            self.__remove(core)
+            self._cores[core] = True
+            if self._memory_used + len(data) <= self._memory_limit:
+                self._in_memory[core] = data
+                self._memory_used += len(data)
+            else:
+                if self._archive is None:
+                    self._archive = tempfile.TemporaryFile(
+                        prefix="data_specs_", suffix=".dat",
+                        dir=self._folder)
+                self._archive.seek(0, os.SEEK_END)
+                self._in_archive[core] = (self._archive.tell(), len(data))
+                self._archive.write(data)
+
+    def __remove(self, core):
+        data = self._in_memory.pop(core, None)
+        if data is not None:
+            self._memory_used -= len(data)
+        self._in_archive.pop(core, None)
+
+    def __getitem__(self, core):
+        """ Get the data specification of a core
+
+        :param core: the (x, y, p) of the core
+        :rtype: bytes
+        """
+        with self._lock:
+            if core in self._in_memory:
+                return self._in_memory[core]
+            offset, size = self._in_archive[core]
+            self._archive.seek(offset)
+            return self._archive.read(size)
+
+    def __delitem__(self, core):
+        with self._lock:
+            if core not in self._cores:
+                raise KeyError(core)
+            self.__remove(core)
+            del self._cores[core]
+
+    def get_reader(self, core):
+        """ Get a reader of the data specification of a core, as needed by\
+            the data specification executor
+
+        :param core: the (x, y, p) of the core
+        """
+        return io.BytesIO(self[core])
+
+    def __contains__(self, core):
+        return core in self._cores
+
+    def __iter__(self):
+        return iter(list(self._cores))
+
+    def __len__(self):
+        return len(self._cores)
+
+    def keys(self):
+        return list(self._cores)
+
+    def items(self):
+        """ Get the (x, y, p) and data specification of each core, reading\
+            each data specification only when it is reached
+        """
+        for core in self.keys():
+            yield core, self[core]
+
+    iteritems = items
+
+    @property
+    def memory_used(self):
+        """ The number of bytes of data specifications held in memory
+
+        :rtype: int
+        """
+        return self._memory_used
+
+    @property
+    def n_in_archive(self):
+        """ The number of data specifications held in the archive file
+
+        :rtype: int
+        """
+        return len(self._in_archive)
+
+    def close(self):
+        """ Release the data specifications, deleting the archive file
+        """
+        with self._lock:
+            self._in_memory = dict()
+            self._memory_used = 0
+            self._in_archive = dict()
+            self._cores = OrderedDict()
+            if self._archive is not None:
+                self._archive.close()
+                self._archive = None
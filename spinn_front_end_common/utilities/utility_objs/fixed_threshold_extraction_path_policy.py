@@ -0,0 +1,30 @@
+from spinn_utilities.overrides import overrides
+
+from .abstract_extraction_path_policy import AbstractExtractionPathPolicy
+
+
+class FixedThresholdExtractionPathPolicy(AbstractExtractionPathPolicy):
+    """ Uses the data speed up path for any read of at least a fixed size,\
+        whatever the distance and whatever has been observed
+    """
+
+    __slots__ = [
+        # the smallest read that uses the data speed up path
+        "_threshold"
+    ]
+
+    def __init__(self, threshold):
+        """
+        :param threshold: the smallest read in bytes that uses the data\
+            speed up path
+        :type threshold: int
+        """
+        self._threshold = threshold
+
+    @overrides(AbstractExtractionPathPolicy.use_fast_path)
+    def use_fast_path(self, length_in_bytes, n_hops):
+        return length_in_bytes >= self._threshold
+
+    @overrides(AbstractExtractionPathPolicy.record)
+    def record(self, used_fast_path, length_in_bytes, n_hops, time_taken):
+        pass
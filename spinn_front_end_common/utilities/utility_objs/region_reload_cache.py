@@ -0,0 +1,129 @@
+import numpy
+
+from .region_table_cache import RegionTableCache
+
+#: default size of the gap between changed bytes below which the changes\
+#: are written as a single span; one SCP write carries 256 bytes
+DEFAULT_MERGE_GAP = 256
+
+
+class RegionReloadCache(object):
+    """ What was last written to the memory regions of each core when data\
+        was reloaded, so that the next reload need only write what has\
+        changed and need not read the region table of the core again
+    """
+
+    __slots__ = [
+        # the cache of the addresses of the regions of each core
+        "_region_table_cache",
+
+        # dict of (x, y, p) to dict of region ID to the bytes last written
+        # to the region
+        "_region_data",
+
+        # the size of the gap between changed bytes below which the changes
+        # are merged into one span
+        "_merge_gap",
+
+        # True if the data of the regions is to be cached, False if only the
+        # region addresses are to be cached
+        "_cache_data"
+    ]
+
+    def __init__(self, cache_data=True, merge_gap=DEFAULT_MERGE_GAP,
+                 region_table_cache=None):
+        """
+        :param cache_data: True if the data written to regions is to be\
+            cached, so that only changes are written; this assumes that\
+            the application does not itself modify the regions that are\
+            reloaded
+        :type cache_data: bool
+        :param merge_gap: the number of unchanged bytes between two\
+            changes below which the changes are written together
+        :type merge_gap: int
+        :param region_table_cache: the cache of region addresses to share,\
+            or None to keep the addresses only in this cache
+        :type region_table_cache: RegionTableCache
+        """
+        if region_table_cache is None:
+            region_table_cache = RegionTableCache()
+        self._region_table_cache = region_table_cache
+        self._region_data = dict()
+        self._merge_gap = merge_gap
+        self._cache_data = cache_data
+
+    def get_region_addresses(self, x, y, p):
+        """ Get the cached addresses of the regions of a core
+
+        :return: the address of each region, or None if not cached
+        :rtype: tuple(int) or None
+        """
+        return self._region_table_cache.get_region_addresses(x, y, p)
+
+    def set_region_addresses(self, x, y, p, addresses):
+        """ Cache the addresses of the regions of a core, as read from its\
+            region table
+        """
+        self._region_table_cache.set_region_addresses(x, y, p, addresses)
+
+    def get_changed_spans(self, x, y, p, region, data):
+        """ Get the parts of the data of a region that differ from what was\
+            last written to it, and remember the data as now written
+
+        :param region: the ID of the region
+        :param data: the data now to be in the region
+        :type data: bytes or bytearray
+        :return: list of (offset into the region, data to write there)
+        :rtype: list(tuple(int, bytes))
+        """
+        data = bytes(data)
+        if not self._cache_data:
+            return [(0, data)]
+        regions = self._region_data.setdefault((x, y, p), dict())
+        last = regions.get(region)
+        regions[region] = data
+        if last is None:
+            return [(0, data)]
+
+        # Anything beyond what was written last time has changed
+        n_common = min(len(last), len(data))
+        new = numpy.frombuffer(data, dtype="uint8", count=n_common)
+        old = numpy.frombuffer(last, dtype="uint8", count=n_common)
+        changed = numpy.flatnonzero(new != old)
+        if len(data) > n_common:
+            changed = numpy.append(changed, n_common)
+            end_of_last_span = len(data)
+        elif len(changed):
+            end_of_last_span = changed[-1] + 1
+        else:
+            return []
+
+        # Split into spans wherever the gap between changes is big enough
+        breaks = numpy.flatnonzero(numpy.diff(changed) > self._merge_gap)
+        starts = numpy.concatenate(([changed[0]], changed[breaks + 1]))
+        ends = numpy.concatenate((changed[breaks] + 1, [end_of_last_span]))
+        return [(int(start), data[start:end])
+                for start, end in zip(starts, ends)]
+
+    def clear_data(self):
+        """ Forget what was written to the regions, keeping their addresses;\
+            to be used when the machine might no longer hold what was\
+            written
+        """
+        self._region_data = dict()
+
+    @property
+    def region_table_cache(self):
+        """ The cache of the addresses of the regions of each core
+
+        :rtype: RegionTableCache
+        """
+        return self._region_table_cache
+
+    @property
+    def cache_data(self):
+        """ True if the data written to regions is cached
+
+        :rtype: bool
+        """
+        return self._cache_data
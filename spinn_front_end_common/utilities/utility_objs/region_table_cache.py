@@ -0,0 +1,157 @@
+from threading import Lock
+import struct
+
+from data_specification.constants import MAX_MEM_REGIONS
+from data_specification.utility_calls import get_region_base_address_offset
+
+_ONE_WORD = struct.Struct("<I")
+_REGION_TABLE = struct.Struct("<{}I".format(MAX_MEM_REGIONS))
+
+
+class RegionTableCache(object):
+    """ The addresses of the memory regions of each core, and of other words\
+        which do not change between loading and resetting, so that they are\
+        read from the machine at most once per run.
+
+    The addresses are either given by whatever loaded the data, or read\
+    from the user 0 register and then the region table of each core in one\
+    read each the first time they are needed.
+    """
+
+    __slots__ = [
+        # dict of (x, y, p) to the tuple of addresses of the regions of the
+        # core, from its region table
+        "_region_addresses",
+
+        # dict of (x, y, address) to the value of a word that does not change
+        # until the cache is cleared
+        "_words",
+
+        # the number of lookups answered from the cache
+        "_n_hits",
+
+        # the number of lookups that had to read the machine
+        "_n_misses",
+
+        # lock so that the cache can be used by several threads at once
+        "_lock"
+    ]
+
+    def __init__(self):
+        self._region_addresses = dict()
+        self._words = dict()
+        self._n_hits = 0
+        self._n_misses = 0
+        self._lock = Lock()
+
+    def get_region_addresses(self, x, y, p):
+        """ Get the cached addresses of the regions of a core, without\
+            reading the machine
+
+        :return: the address of each region, or None if not cached
+        :rtype: tuple(int) or None
+        """
+        return self._region_addresses.get((x, y, p))
+
+    def set_region_addresses(self, x, y, p, addresses):
+        """ Cache the addresses of the regions of a core, as in its region\
+            table
+        """
+        self._region_addresses[x, y, p] = tuple(
+            int(address) for address in addresses)
+
+    def read_region_addresses(self, transceiver, x, y, p, base_address=None):
+        """ Get the addresses of the regions of a core, reading its region\
+            table if they are not cached
+
+        :param transceiver: the transceiver to read the machine with
+        :param base_address: the address of the data of the core if known,\
+            or None to read it from the user 0 register of the core
+        :return: the address of each region
+        :rtype: tuple(int)
+        """
+        # pylint: disable=too-many-arguments
+        with self._lock:
+            addresses = self._region_addresses.get((x, y, p))
+            if addresses is not None:
+                self._n_hits += 1
+                return addresses
+            self._n_misses += 1
+
+        if base_address is None:
+            base_address = transceiver.get_cpu_information_from_core(
+                x, y, p).user[0]
+        addresses = _REGION_TABLE.unpack_from(transceiver.read_memory(
+            x, y, get_region_base_address_offset(base_address, 0),
+            _REGION_TABLE.size))
+        self.set_region_addresses(x, y, p, addresses)
+        return addresses
+
+    def read_region_address(self, transceiver, x, y, p, region):
+        """ Get the address of a region of a core, reading its region table\
+            if it is not cached
+
+        :param transceiver: the transceiver to read the machine with
+        :param region: the ID of the region
+        :rtype: int
+        """
+        # pylint: disable=too-many-arguments
+        return self.read_region_addresses(transceiver, x, y, p)[region]
+
+    def read_word(self, transceiver, x, y, address):
+        """ Get a word of memory that does not change between loading and\
+            resetting, such as a pointer written by a core as it starts,\
+            reading it if it is not cached; a value of 0 is not cached, as\
+            the word might not have been written yet
+
+        :param transceiver: the transceiver to read the machine with
+        :rtype: int
+        """
+        with self._lock:
+            value = self._words.get((x, y, address))
+            if value is not None:
+                self._n_hits += 1
+                return value
+            self._n_misses += 1
+        value, = _ONE_WORD.unpack_from(
+            transceiver.read_memory(x, y, address, _ONE_WORD.size))
+        if value != 0:
+            self._words[x, y, address] = value
+        return value
+
+    def invalidate(self, x, y, p):
+        """ Forget the region addresses of a core, as it is being loaded\
+            again
+        """
+        self._region_addresses.pop((x, y, p), None)
+
+    def clear_words(self):
+        """ Forget the words other than the region addresses, keeping the\
+            region addresses; to be used when the cores are started again,\
+            and so might write the words again differently
+        """
+        with self._lock:
+            self._words = dict()
+
+    def clear(self):
+        """ Forget everything, as the machine has been loaded again or reset
+        """
+        with self._lock:
+            self._region_addresses = dict()
+            self._words = dict()
+
+    @property
+    def n_hits(self):
+        """ The number of lookups answered without reading the machine
+
+        :rtype: int
+        """
+        return self._n_hits
+
+    @property
+    def n_misses(self):
+        """ The number of lookups which read the machine
+
+        :rtype: int
+        """
+        return self._n_misses
@@ -0,0 +1,253 @@
+from six import itervalues
+
+#: The most times longer than the segment before that a segment can be
+DEFAULT_MAX_GROWTH = 2.0
+
+#: The fraction of the time that the recording buffers are predicted to take\
+#: to fill up which a segment is allowed to run for
+DEFAULT_SAFETY_FACTOR = 0.8
+
+
+class SegmentTimings(object):
+    """ The time taken by a segment of a run, and the recorded data read\
+        during and after it
+    """
+
+    __slots__ = [
+        # The number of machine time steps run
+        "_n_steps",
+
+        # The time in milliseconds that the simulation ran for
+        "_run_time_ms",
+
+        # The time in milliseconds spent extracting recorded data after the
+        # simulation stopped
+        "_extraction_time_ms",
+
+        # The rest of the time in milliseconds taken by the segment
+        "_other_time_ms",
+
+        # The number of bytes of recorded data read while running
+        "_n_bytes_read_during_run",
+
+        # The time in milliseconds spent reading recorded data while running
+        "_read_time_during_run_ms",
+
+        # The number of bytes of recorded data extracted after the
+        # simulation stopped
+        "_n_bytes_extracted",
+
+        # dict of (x, y, p) of each core to the number of bytes of recorded
+        # data read from it while running and extracted from it after
+        "_core_bytes"
+    ]
+
+    def __init__(
+            self, n_steps, run_time_ms, extraction_time_ms, other_time_ms,
+            n_bytes_read_during_run=0, read_time_during_run_ms=0.0,
+            n_bytes_extracted=0, core_bytes=None):
+        """
+        :param n_steps: The number of machine time steps run
+        :type n_steps: int
+        :param run_time_ms: The time that the simulation ran for
+        :type run_time_ms: float
+        :param extraction_time_ms: The time spent extracting recorded data\
+            after the simulation stopped
+        :type extraction_time_ms: float
+        :param other_time_ms: The rest of the time taken by the segment
+        :type other_time_ms: float
+        :param n_bytes_read_during_run: The number of bytes of recorded\
+            data read while running
+        :type n_bytes_read_during_run: int
+        :param read_time_during_run_ms: The time spent reading recorded\
+            data while running
+        :type read_time_during_run_ms: float
+        :param n_bytes_extracted: The number of bytes of recorded data\
+            extracted after the simulation stopped
+        :type n_bytes_extracted: int
+        :param core_bytes: The number of bytes of recorded data read from\
+            each core while running and extracted from it after the\
+            simulation stopped
+        :type core_bytes: dict(tuple(int, int, int), tuple(int, int))
+        """
+        # pylint: disable=too-many-arguments
+        self._n_steps = n_steps
+        self._run_time_ms = run_time_ms
+        self._extraction_time_ms = extraction_time_ms
+        self._other_time_ms = other_time_ms
+        self._n_bytes_read_during_run = n_bytes_read_during_run
+        self._read_time_during_run_ms = read_time_during_run_ms
+        self._n_bytes_extracted = n_bytes_extracted
+        self._core_bytes = dict(core_bytes) if core_bytes else dict()
+
+    @property
+    def n_steps(self):
+        """ The number of machine time steps run
+        """
+        return self._n_steps
+
+    @property
+    def run_time_ms(self):
+        """ The time in milliseconds that the simulation ran for
+        """
+        return self._run_time_ms
+
+    @property
+    def extraction_time_ms(self):
+        """ The time in milliseconds spent extracting recorded data after the\
+            simulation stopped
+        """
+        return self._extraction_time_ms
+
+    @property
+    def other_time_ms(self):
+        """ The rest of the time in milliseconds taken by the segment
+        """
+        return self._other_time_ms
+
+    @property
+    def n_bytes_read_during_run(self):
+        """ The number of bytes of recorded data read while running
+        """
+        return self._n_bytes_read_during_run
+
+    @property
+    def read_time_during_run_ms(self):
+        """ The time in milliseconds spent reading recorded data while running
+        """
+        return self._read_time_during_run_ms
+
+    @property
+    def n_bytes_extracted(self):
+        """ The number of bytes of recorded data extracted after the\
+            simulation stopped
+        """
+        return self._n_bytes_extracted
+
+    @property
+    def core_bytes(self):
+        """ The number of bytes of recorded data read from each core while\
+            running and extracted from it after the simulation stopped
+
+        :rtype: dict(tuple(int, int, int), tuple(int, int))
+        """
+        return self._core_bytes
+
+    @property
+    def machine_idle_time_ms(self):
+        """ The time in milliseconds that the simulation was stopped for\
+            during the segment
+        """
+        return self._extraction_time_ms + self._other_time_ms
+
+    def __repr__(self):
+        return (
+            "SegmentTimings(n_steps={}, run_time_ms={}, "
+            "extraction_time_ms={}, other_time_ms={})".format(
+                self._n_steps, self._run_time_ms, self._extraction_time_ms,
+                self._other_time_ms))
+
+
+class SegmentPlanner(object):
+    """ Chooses the number of machine time steps of each segment of a run\
+        which is split up by auto pause and resume, while the recorded data\
+        is also read during the run.  The first segment is as long as the\
+        recording buffers can hold without being read; after that, the rate\
+        at which each core's buffers were drained by reading while running\
+        is weighed against the rate at which the core filled them, both over\
+        the run time of the segment, and segments are made longer for as\
+        long as the reading can keep the buffers of every core from\
+        filling, so that the simulation stops less often.
+    """
+
+    __slots__ = [
+        # The number of machine time steps that the recording buffers can
+        # hold without being read
+        "_n_steps_in_buffers",
+
+        # The most times longer than the segment before that a segment can be
+        "_max_growth",
+
+        # The fraction of the predicted time for the buffers to fill that a
+        # segment can run for
+        "_safety_factor",
+
+        # list of SegmentTimings of the segments run so far
+        "_segments"
+    ]
+
+    def __init__(self, n_steps_in_buffers, max_growth=DEFAULT_MAX_GROWTH,
+                 safety_factor=DEFAULT_SAFETY_FACTOR):
+        """
+        :param n_steps_in_buffers: The number of machine time steps that the\
+            recording buffers can hold without being read
+        :type n_steps_in_buffers: int
+        :param max_growth: The most times longer than the segment before\
+            that a segment can be
+        :type max_growth: float
+        :param safety_factor: The fraction of the predicted time for the\
+            buffers to fill that a segment can run for
+        :type safety_factor: float
+        """
+        self._n_steps_in_buffers = max(1, int(n_steps_in_buffers))
+        self._max_growth = max(1.0, max_growth)
+        self._safety_factor = safety_factor
+        self._segments = list()
+
+    def add_segment(self, segment):
+        """ Record how a segment went, to plan the next one
+
+        :type segment: :py:class:`SegmentTimings`
+        """
+        self._segments.append(segment)
+
+    @property
+    def segments(self):
+        """ The timings of the segments run so far
+
+        :rtype: list(:py:class:`SegmentTimings`)
+        """
+        return self._segments
+
+    def next_segment(self, n_steps_remaining):
+        """ Get the number of machine time steps of the next segment
+
+        :param n_steps_remaining: The number of machine time steps still\
+            to be run
+        :type n_steps_remaining: int
+        :rtype: int
+        """
+        n_steps = self._n_steps_in_buffers
+        if self._segments:
+            n_steps = max(n_steps, self._n_steps_kept_up(self._segments[-1]))
+        return int(min(n_steps_remaining, n_steps))
+
+    def _n_steps_kept_up(self, segment):
+        """ Get the most machine time steps that the recording buffers of\
+            every core are predicted to last for, given how fast each core\
+            filled them and how fast reading drained them in a segment
+        """
+        if segment.run_time_ms <= 0 or not segment.core_bytes:
+            # Nothing is known of how fast the buffers fill
+            return self._n_steps_in_buffers
+        n_steps = segment.n_steps * self._max_growth
+        for n_bytes_read, n_bytes_extracted in itervalues(
+                segment.core_bytes):
+            if not n_bytes_extracted:
+                # Everything recorded was read while running
+                continue
+            if not n_bytes_read:
+                # Nothing was read while running, so the buffers fill as
+                # fast as if they were not read at all
+                return self._n_steps_in_buffers
+            fill_rate = (
+                (n_bytes_read + n_bytes_extracted) /
+                float(segment.run_time_ms))
+            drain_rate = n_bytes_read / float(segment.run_time_ms)
+
+            # The buffers fill at the rate that the recording outpaces the
+            # reading
+            n_steps = min(n_steps, (
+                self._safety_factor * self._n_steps_in_buffers /
+                (1.0 - drain_rate / fill_rate)))
+        return n_steps
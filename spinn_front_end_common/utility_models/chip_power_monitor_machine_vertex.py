@@ -15,7 +15,7 @@ from spinn_front_end_common.abstract_models import \
 from spinn_front_end_common.interface.buffer_management import \
     recording_utilities
 from spinn_front_end_common.interface.buffer_management.buffer_models import \
-    AbstractReceiveBuffersToHost
+    AbstractReceiveBuffersToHost, AbstractSupportsExtractionDuringRun
 from spinn_front_end_common.utilities import globals_variables
 from spinn_front_end_common.utilities import constants
 from spinn_front_end_common.utilities.utility_objs import ExecutableType
@@ -34,7 +34,8 @@ BINARY_FILE_NAME = "chip_power_monitor.aplx"
 @supports_injection
 class ChipPowerMonitorMachineVertex(
         MachineVertex, AbstractHasAssociatedBinary,
-        AbstractGeneratesDataSpecification, AbstractReceiveBuffersToHost):
+        AbstractGeneratesDataSpecification, AbstractReceiveBuffersToHost,
+        AbstractSupportsExtractionDuringRun):
     """ Machine vertex for C code representing functionality to record\
         idle times in a machine graph.
     """
@@ -249,11 +250,17 @@ class ChipPowerMonitorMachineVertex(
             [self._deduce_sdram_requirements_per_timer_tick(
                 machine_time_step, time_scale_factor) * n_machine_time_steps],
             [self.MAX_BUFFER_SIZE])
+        config = globals_variables.get_simulator().config
+        buffer_size_before_request = None
+        if config.getboolean("Buffers", "extract_recording_during_run"):
+            buffer_size_before_request = \
+                recording_utilities.get_buffer_size_before_request(
+                    recorded_region_sizes, config.getfloat(
+                        "Buffers", "recording_buffer_fill_before_request"))
         spec.write_array(recording_utilities.get_recording_header_array(
             recorded_region_sizes,
-            globals_variables.get_simulator().config.getint(
-                "Buffers", "time_between_requests"),
-            None, ip_tags))
+            config.getint("Buffers", "time_between_requests"),
+            buffer_size_before_request, ip_tags))
 
     def _reserve_memory_regions(self, spec):
         """ Reserve the DSG memory regions as required
@@ -297,6 +304,12 @@ class ChipPowerMonitorMachineVertex(
     def get_recorded_region_ids(self):
         return [0]
 
+    @property
+    @overrides(AbstractSupportsExtractionDuringRun.is_extracting_during_run)
+    def is_extracting_during_run(self):
+        return globals_variables.get_simulator().config.getboolean(
+            "Buffers", "extract_recording_during_run")
+
     @inject_items({"time_scale_factor": "TimeScaleFactor"})
     @overrides(AbstractReceiveBuffersToHost.get_n_timesteps_in_buffer_space,
                additional_arguments={"time_scale_factor"})
@@ -12,7 +12,7 @@ from spinn_front_end_common.abstract_models \
 from spinn_front_end_common.interface.provenance import \
     AbstractProvidesLocalProvenanceData
 from spinn_front_end_common.utilities.utility_objs import ExecutableType, \
-    ProvenanceDataItem
+    ProvenanceDataItem, FixedThresholdExtractionPathPolicy
 from spinn_front_end_common.utilities.constants \
     import SDP_PORTS, SYSTEM_BYTES_REQUIREMENT
 from spinn_front_end_common.utilities.exceptions import SpinnFrontEndException
@@ -27,6 +27,7 @@ from collections import defaultdict
 import os
 import logging
 import math
+import numpy
 import time
 import struct
 from enum import Enum
@@ -44,6 +45,7 @@ _DATA_REGIONS = Enum(
 
 # precompiled structures
 _ONE_WORD = struct.Struct("<I")
+_TWO_WORDS = struct.Struct("<II")
 _THREE_WORDS = struct.Struct("<III")
 
 
@@ -52,8 +54,14 @@ class DataSpeedUpPacketGatherMachineVertex(
         AbstractHasAssociatedBinary, AbstractProvidesLocalProvenanceData):
     __slots__ = [
         "_connection",
+        "_data_in_provenance_data_items",
+        "_extraction_path_policy",
         "_last_status",
+        "_machine",
         "_max_seq_num",
+        "_n_hops_by_chip",
+        "_n_duplicate_packets",
+        "_n_packets_received",
         "_output",
         "_provenance_data_items",
         "_report_path",
@@ -95,9 +103,16 @@ class DataSpeedUpPacketGatherMachineVertex(
 
     # command IDs for the SDP packets
     SDP_PACKET_START_SENDING_COMMAND_ID = 100
+    SDP_PACKET_START_SENDING_READS_COMMAND_ID = 101
     SDP_PACKET_START_MISSING_SEQ_COMMAND_ID = 1000
     SDP_PACKET_MISSING_SEQ_COMMAND_ID = 1001
 
+    # command IDs for the SDP packets writing data into SDRAM (data in)
+    SDP_PACKET_START_DATA_IN_COMMAND_ID = 200
+    SDP_PACKET_DATA_IN_COMMAND_ID = 201
+    SDP_PACKET_CHECK_DATA_IN_COMMAND_ID = 202
+    SDP_PACKET_MISSING_DATA_IN_COMMAND_ID = 203
+
     # number of items used up by the re transmit code for its header
     SDP_RETRANSMISSION_HEADER_SIZE = 2
 
@@ -126,9 +141,53 @@ class DataSpeedUpPacketGatherMachineVertex(
 
     THRESHOLD_WHERE_SDP_BETTER_THAN_DATA_EXTRACTOR_IN_BYTES = 40000
 
+    # number of items used by the command and sequence number of data in
+    DATA_IN_HEADER_SIZE = 2
+
+    # bytes of data carried by each data in packet
+    DATA_IN_BYTES_PER_PACKET = \
+        (DATA_PER_FULL_PACKET - DATA_IN_HEADER_SIZE) * WORD_TO_BYTE_CONVERTER
+
+    # the missing count given by a core that has no data in stream
+    DATA_IN_FAILED = 0xFFFFFFFF
+
+    THRESHOLD_WHERE_SDP_BETTER_THAN_DATA_IN_IN_BYTES = 40000
+
+    # the data in packets sent between pauses, so that the extra monitor
+    # can keep up with them
+    DATA_IN_PACKETS_PER_BURST = 16
+
+    # the first pause after each burst of data in packets; this doubles
+    # after each round which loses packets, up to the sending time out
+    DATA_IN_PAUSE_IN_SECONDS = 0.0005
+
+    # the rounds of sending data in packets again that can go without any
+    # fewer packets being missing before the data is written with SCP
+    DATA_IN_ROUNDS_WITHOUT_PROGRESS = 3
+
+    # the most reads whose data an extra monitor can send in one stream
+    MAX_READS_PER_STREAM = 128
+
+    # number of items used by the command, the number of reads and the index
+    # of the first read in each packet listing the reads of a stream
+    READS_HEADER_SIZE = 3
+
+    # the reads listed in each packet, each as an address and a length
+    READS_PER_PACKET = (DATA_PER_FULL_PACKET - READS_HEADER_SIZE) // 2
+
     def __init__(
             self, x, y, ip_address, report_default_directory,
-            write_data_speed_up_report, constraints=None):
+            write_data_speed_up_report, constraints=None,
+            extraction_path_policy=None):
+        """
+        :param extraction_path_policy: the policy deciding whether each read\
+            uses SCP or the data speed up path; by default reads of at\
+            least THRESHOLD_WHERE_SDP_BETTER_THAN_DATA_EXTRACTOR_IN_BYTES\
+            use the data speed up path
+        :type extraction_path_policy: \
+            :py:class:`spinn_front_end_common.utilities.utility_objs.AbstractExtractionPathPolicy`
+        """
+        # pylint: disable=too-many-arguments
         super(DataSpeedUpPacketGatherMachineVertex, self).__init__(
             label="mc_data_speed_up_packet_gatherer_on_{}_{}".format(x, y),
             constraints=constraints)
@@ -138,12 +197,17 @@ class DataSpeedUpPacketGatherMachineVertex(
         self._max_seq_num = None
         self._output = None
 
+        # statistics of the packets received for the current read
+        self._n_packets_received = 0
+        self._n_duplicate_packets = 0
+
         # Create a connection to be used
         self._connection = SCAMPConnection(
             chip_x=x, chip_y=y, remote_host=ip_address)
 
         # local provenance storage
         self._provenance_data_items = defaultdict(list)
+        self._data_in_provenance_data_items = defaultdict(list)
 
         # create report if it doesn't already exist
         self._report_path = \
@@ -153,6 +217,17 @@ class DataSpeedUpPacketGatherMachineVertex(
         # Stored reinjection status for resetting timeouts
         self._last_status = None
 
+        # how to decide between SCP and the fast path
+        if extraction_path_policy is None:
+            extraction_path_policy = FixedThresholdExtractionPathPolicy(
+                self.THRESHOLD_WHERE_SDP_BETTER_THAN_DATA_EXTRACTOR_IN_BYTES)
+        self._extraction_path_policy = extraction_path_policy
+
+        # the number of routers between each chip and this one, and the
+        # machine used to work that out
+        self._n_hops_by_chip = dict()
+        self._machine = None
+
     @property
     @overrides(MachineVertex.resources_required)
     def resources_required(self):
@@ -161,6 +236,20 @@ class DataSpeedUpPacketGatherMachineVertex(
     def close_connection(self):
         self._connection.close()
 
+    @property
+    def extraction_path_policy(self):
+        """ The policy deciding whether each read uses SCP or the data speed\
+            up path
+
+        :rtype: \
+            :py:class:`spinn_front_end_common.utilities.utility_objs.AbstractExtractionPathPolicy`
+        """
+        return self._extraction_path_policy
+
+    @extraction_path_policy.setter
+    def extraction_path_policy(self, extraction_path_policy):
+        self._extraction_path_policy = extraction_path_policy
+
     @staticmethod
     def static_resources_required():
         return ResourceContainer(
@@ -262,8 +351,9 @@ class DataSpeedUpPacketGatherMachineVertex(
             # handle duplicates of the same calls
             times_extracted_the_same_thing = 0
             top_level_name = "Provenance_for_{}".format(self._label)
-            for time_taken, lost_seq_nums in self._provenance_data_items[
-                    placement, memory_address, length_in_bytes]:
+            for time_taken, lost_seq_nums, n_packets, n_duplicates in \
+                    self._provenance_data_items[
+                        placement, memory_address, length_in_bytes]:
                 # handle time
                 chip_name = "chip{}:{}".format(placement.x, placement.y)
                 last_name = "Memory_address:{}:Length_in_bytes:{}"\
@@ -276,6 +366,21 @@ class DataSpeedUpPacketGatherMachineVertex(
                     time_taken, report=False, message=None))
                 times_extracted_the_same_thing += 1
 
+                # handle packet statistics
+                prov_items.append(ProvenanceDataItem(
+                    [top_level_name, "n_packets_received", chip_name,
+                     last_name, iteration_name],
+                    n_packets, report=False, message=None))
+                prov_items.append(ProvenanceDataItem(
+                    [top_level_name, "n_duplicate_packets", chip_name,
+                     last_name, iteration_name],
+                    n_duplicates, report=False, message=None))
+                prov_items.append(ProvenanceDataItem(
+                    [top_level_name, "n_retransmission_rounds", chip_name,
+                     last_name, iteration_name],
+                    sum(1 for n_lost in lost_seq_nums if n_lost),
+                    report=False, message=None))
+
                 # handle lost sequence numbers
                 for i, n_lost_seq_nums in enumerate(lost_seq_nums):
                     prov_items.append(ProvenanceDataItem(
@@ -293,6 +398,23 @@ class DataSpeedUpPacketGatherMachineVertex(
                             "of this occurring."
                             .format(length_in_bytes, memory_address, i,
                                     n_lost_seq_nums))))
+
+        for (placement, base_address, length_in_bytes), writes in \
+                self._data_in_provenance_data_items.items():
+            top_level_name = "Provenance_for_{}".format(self._label)
+            chip_name = "chip{}:{}".format(placement.x, placement.y)
+            last_name = "Memory_address:{}:Length_in_bytes:{}".format(
+                base_address, length_in_bytes)
+            for iteration, (time_taken, lost_seq_nums) in enumerate(writes):
+                iteration_name = "iteration{}".format(iteration)
+                prov_items.append(ProvenanceDataItem(
+                    [top_level_name, "data_in_time", chip_name, last_name,
+                     iteration_name],
+                    time_taken, report=False, message=None))
+                prov_items.append(ProvenanceDataItem(
+                    [top_level_name, "data_in_lost_seq_nums", chip_name,
+                     last_name, iteration_name],
+                    sum(lost_seq_nums), report=False, message=None))
         return prov_items
 
     def set_cores_for_data_extraction(
@@ -385,58 +507,393 @@ class DataSpeedUpPacketGatherMachineVertex(
             end = float(time.time())
             self._provenance_data_items[
                 placement, memory_address,
-                length_in_bytes].append((end - start, [0]))
+                length_in_bytes].append((end - start, [0], 0, 0))
             return data
 
-        if (length_in_bytes <
-                self.THRESHOLD_WHERE_SDP_BETTER_THAN_DATA_EXTRACTOR_IN_BYTES):
+        n_hops = self._n_hops(placement, fixed_routes, transceiver)
+        if not self._extraction_path_policy.use_fast_path(
+                length_in_bytes, n_hops):
             data = transceiver.read_memory(
                 placement.x, placement.y, memory_address, length_in_bytes)
             end = float(time.time())
+            self._extraction_path_policy.record(
+                False, length_in_bytes, n_hops, end - start)
             self._provenance_data_items[
                 placement, memory_address,
-                length_in_bytes].append((end - start, [0]))
+                length_in_bytes].append((end - start, [0], 0, 0))
+            return data
+
+        lost_seq_nums = self._receive_stream(
+            transceiver, placement, [_THREE_WORDS.pack(
+                self.SDP_PACKET_START_SENDING_COMMAND_ID,
+                memory_address, length_in_bytes)],
+            length_in_bytes)
+
+        end = float(time.time())
+        self._extraction_path_policy.record(
+            True, length_in_bytes, n_hops, end - start)
+        self._provenance_data_items[
+            placement, memory_address, length_in_bytes].append(
+                (end - start, lost_seq_nums, self._n_packets_received,
+                 self._n_duplicate_packets))
+
+        # create report elements
+        if self._write_data_speed_up_report:
+            routers_been_in_use = self._determine_which_routers_were_used(
+                placement, fixed_routes, self._get_machine(transceiver))
+            self._write_routers_used_into_report(
+                self._report_path, routers_been_in_use, placement)
+
+        return self._output
+
+    def get_data_for_reads(self, transceiver, reads, fixed_routes):
+        """ Gets data for several reads, streaming all of the reads through\
+            each extra monitor in one session.  The extra monitor sends the\
+            data of each read in turn, starting each at a new sequence\
+            number, so that the reads share the start handshake and a\
+            single missing sequence number retransmission pass, and are\
+            then split back out into separate buffers.  The data on each\
+            chip can only be read by the extra monitor on that chip, so the\
+            reads of a board are streamed one chip at a time.
+
+        :param transceiver: spinnman instance
+        :param reads: iterable of (placement, memory_address,\
+            length_in_bytes), where the placement is that of the extra\
+            monitor on the chip to read from
+        :param fixed_routes: the fixed routes, used in the report of which\
+            chips were used by the speed up process
+        :return: list of byte arrays, one for each read in the order given
+        """
+        reads = list(reads)
+        results = [bytearray(0) for _ in reads]
+
+        # Group the reads by the core which will do the reading
+        reads_by_core = defaultdict(list)
+        for index, (placement, memory_address, length_in_bytes) in \
+                enumerate(reads):
+            if length_in_bytes:
+                reads_by_core[placement.x, placement.y, placement.p].append(
+                    (memory_address, length_in_bytes, index))
+
+        for core_reads in reads_by_core.values():
+            placement = reads[core_reads[0][2]][0]
+            merged = self._merge_reads(sorted(core_reads))
+            for first in xrange(0, len(merged), self.MAX_READS_PER_STREAM):
+                stream = merged[first:first + self.MAX_READS_PER_STREAM]
+                data = self._get_data_for_stream(
+                    transceiver, placement, stream, fixed_routes)
+                for (start, _, indices), block in zip(stream, data):
+                    block = memoryview(block)
+                    for index in indices:
+                        _, memory_address, length_in_bytes = reads[index]
+                        offset = memory_address - start
+                        results[index] = bytearray(
+                            block[offset:offset + length_in_bytes])
+        return results
+
+    def _merge_reads(self, sorted_reads):
+        """ Merge reads which overlap or share a word of SDRAM, as the\
+            extra monitor reads whole words.
+
+        :param sorted_reads: list of (memory_address, length_in_bytes,\
+            index) sorted by address
+        :return: list of (start_address, end_address, list of indices),\
+            with the addresses aligned to words
+        """
+        merged = list()
+        for memory_address, length_in_bytes, index in sorted_reads:
+            start_address = memory_address - (
+                memory_address % self.WORD_TO_BYTE_CONVERTER)
+            end_address = memory_address + length_in_bytes
+            end_address += -end_address % self.WORD_TO_BYTE_CONVERTER
+            if merged and start_address <= merged[-1][1]:
+                start, end, indices = merged[-1]
+                indices.append(index)
+                merged[-1] = (start, max(end, end_address), indices)
+            else:
+                merged.append((start_address, end_address, [index]))
+        return merged
+
+    def _get_data_for_stream(
+            self, transceiver, placement, stream, fixed_routes):
+        """ Gets the data of several reads through one extra monitor in a\
+            single stream
+
+        :param transceiver: spinnman instance
+        :param placement: placement of the extra monitor
+        :param stream: list of (start_address, end_address, indices) of\
+            the word aligned reads
+        :param fixed_routes: the fixed routes, used in the report of which\
+            chips were used by the speed up process
+        :return: list of byte arrays, one for each read of the stream
+        """
+        start = float(time.time())
+        length_in_bytes = sum(last - first for first, last, _ in stream)
+        n_hops = self._n_hops(placement, fixed_routes, transceiver)
+        if not self._extraction_path_policy.use_fast_path(
+                length_in_bytes, n_hops):
+            data = [
+                transceiver.read_memory(
+                    placement.x, placement.y, first, last - first)
+                for first, last, _ in stream]
+            end = float(time.time())
+            self._extraction_path_policy.record(
+                False, length_in_bytes, n_hops, end - start)
+            self._provenance_data_items[
+                placement, stream[0][0], length_in_bytes].append(
+                    (end - start, [0], 0, 0))
             return data
 
-        data = _THREE_WORDS.pack(
-            self.SDP_PACKET_START_SENDING_COMMAND_ID,
-            memory_address, length_in_bytes)
+        # each read starts at a new sequence number, so is given whole
+        # packets of the output
+        bytes_per_packet = (
+            self.DATA_PER_FULL_PACKET_WITH_SEQUENCE_NUM *
+            self.WORD_TO_BYTE_CONVERTER)
+        offsets = list()
+        output_length = 0
+        for first, last, _ in stream:
+            offsets.append(output_length)
+            output_length += int(math.ceil(
+                float(last - first) / bytes_per_packet)) * bytes_per_packet
+
+        lost_seq_nums = self._receive_stream(
+            transceiver, placement,
+            self._start_stream_messages(stream), output_length)
+        end = float(time.time())
+        self._extraction_path_policy.record(
+            True, length_in_bytes, n_hops, end - start)
+        self._provenance_data_items[
+            placement, stream[0][0], length_in_bytes].append(
+                (end - start, lost_seq_nums, self._n_packets_received,
+                 self._n_duplicate_packets))
 
+        # create report elements
+        if self._write_data_speed_up_report:
+            routers_been_in_use = self._determine_which_routers_were_used(
+                placement, fixed_routes, self._get_machine(transceiver))
+            self._write_routers_used_into_report(
+                self._report_path, routers_been_in_use, placement)
+
+        return [
+            self._view[offset:offset + last - first]
+            for offset, (first, last, _) in zip(offsets, stream)]
+
+    def _start_stream_messages(self, stream):
+        """ Get the data of the messages listing the reads of a stream
+
+        :param stream: list of (start_address, end_address, indices) of\
+            the word aligned reads
+        :rtype: list(bytes)
+        """
+        messages = list()
+        for first in xrange(0, len(stream), self.READS_PER_PACKET):
+            stream_reads = stream[first:first + self.READS_PER_PACKET]
+            words = [self.SDP_PACKET_START_SENDING_READS_COMMAND_ID,
+                     len(stream), first]
+            for start_address, end_address, _ in stream_reads:
+                words.extend((start_address, end_address - start_address))
+            messages.append(struct.pack("<{}I".format(len(words)), *words))
+        return messages
+
+    def _receive_stream(
+            self, transceiver, placement, start_messages, length_in_bytes):
+        """ Start a stream of data from an extra monitor, and receive all\
+            of it into the output
+
+        :param transceiver: spinnman instance
+        :param placement: placement of the extra monitor
+        :param start_messages: the data of the messages which start the\
+            stream
+        :param length_in_bytes: the size of the output
+        :return: the number of sequence numbers missing after each pass
+        :rtype: list(int)
+        """
         # logger.debug("sending to core %d:%d:%d",
         #              placement.x, placement.y, placement.p)
 
         # send
-        self._connection.send_sdp_message(SDPMessage(
-            sdp_header=SDPHeader(
-                destination_chip_x=placement.x,
-                destination_chip_y=placement.y,
-                destination_cpu=placement.p,
-                destination_port=self.SDP_PORT,
-                flags=SDPFlag.REPLY_NOT_EXPECTED),
-            data=data))
+        header = SDPHeader(
+            destination_chip_x=placement.x,
+            destination_chip_y=placement.y,
+            destination_cpu=placement.p,
+            destination_port=self.SDP_PORT,
+            flags=SDPFlag.REPLY_NOT_EXPECTED)
+        for index, data in enumerate(start_messages):
+            if index:
+                # sleep for ensuring core doesn't lose packets
+                time.sleep(self.TIME_OUT_FOR_SENDING_IN_SECONDS)
+            self._connection.send_sdp_message(SDPMessage(
+                sdp_header=header, data=data))
 
         # receive
         self._output = bytearray(length_in_bytes)
         self._view = memoryview(self._output)
         self._max_seq_num = self.calculate_max_seq_num()
-        lost_seq_nums = self._receive_data(transceiver, placement)
+        self._n_packets_received = 0
+        self._n_duplicate_packets = 0
+        return self._receive_data(transceiver, placement)
+
+    def send_data_into_spinnaker(
+            self, transceiver, placement, base_address, data):
+        """ Writes data into SDRAM on a chip. Data of at least the data in\
+            threshold is streamed to the extra monitor on the chip without\
+            waiting for each packet to be acknowledged, and the packets that\
+            the extra monitor reports as missing are then sent again;\
+            smaller data, or data that the extra monitor cannot receive, is\
+            written with SCP.
 
+        :param transceiver: spinnman instance
+        :param placement: placement of the extra monitor on the chip to\
+            write to
+        :param base_address: the address in SDRAM to start writing at
+        :param data: the data to write
+        :type data: bytes or bytearray
+        :rtype: None
+        """
+        start = float(time.time())
+        lost_seq_nums = list()
+        if (len(data) < self.THRESHOLD_WHERE_SDP_BETTER_THAN_DATA_IN_IN_BYTES
+                or not self._send_data_in(
+                    placement, base_address, data, lost_seq_nums)):
+            transceiver.write_memory(
+                placement.x, placement.y, base_address, data)
         end = float(time.time())
-        self._provenance_data_items[
-            placement, memory_address, length_in_bytes].append(
+        self._data_in_provenance_data_items[
+            placement, base_address, len(data)].append(
                 (end - start, lost_seq_nums))
 
-        # create report elements
-        if self._write_data_speed_up_report:
-            routers_been_in_use = self._determine_which_routers_were_used(
-                placement, fixed_routes, transceiver.get_machine_details())
-            self._write_routers_used_into_report(
-                self._report_path, routers_been_in_use, placement)
+    def _send_data_in(self, placement, base_address, data, lost_seq_nums):
+        """ Stream data to an extra monitor until it has all been received
 
-        return self._output
+        :param placement: placement of the extra monitor
+        :param base_address: the address in SDRAM to start writing at
+        :param data: the data to write
+        :param lost_seq_nums: list to add the number of sequence numbers\
+            missing after each round of sending to
+        :return: False if the extra monitor could not receive the data, or\
+            stopped receiving any more of it
+        :rtype: bool
+        """
+        n_seq_nums = int(math.ceil(
+            float(len(data)) / self.DATA_IN_BYTES_PER_PACKET))
+        n_missing, missing = self._send_data_in_command(
+            placement, _THREE_WORDS.pack(
+                self.SDP_PACKET_START_DATA_IN_COMMAND_ID, base_address,
+                len(data)),
+            n_seq_nums)
+        first_round = True
+        pause = self.DATA_IN_PAUSE_IN_SECONDS
+        fewest_missing = n_missing
+        n_rounds_without_progress = 0
+        while n_missing:
+            if n_missing == self.DATA_IN_FAILED:
+                log.warning(
+                    "The extra monitor on {}, {}, {} could not receive data;"
+                    " writing with SCP instead",
+                    placement.x, placement.y, placement.p)
+                return False
+            if not first_round:
+                lost_seq_nums.append(n_missing)
+
+                # slow down while packets are being lost, and give up if
+                # that does not help
+                pause = min(pause * 2, self.TIME_OUT_FOR_SENDING_IN_SECONDS)
+                if n_missing < fewest_missing:
+                    fewest_missing = n_missing
+                    n_rounds_without_progress = 0
+                else:
+                    n_rounds_without_progress += 1
+                    if n_rounds_without_progress >= \
+                            self.DATA_IN_ROUNDS_WITHOUT_PROGRESS:
+                        log.warning(
+                            "The extra monitor on {}, {}, {} is still "
+                            "missing {} of {} packets after {} rounds; "
+                            "writing with SCP instead",
+                            placement.x, placement.y, placement.p,
+                            n_missing, n_seq_nums, len(lost_seq_nums))
+                        return False
+            first_round = False
+
+            # If not all of the missing sequence numbers fit in the reply,
+            # send everything from the first of them
+            if n_missing > len(missing):
+                missing = xrange(missing[0], n_seq_nums)
+            self._send_data_in_packets(placement, data, missing, pause)
+            n_missing, missing = self._send_data_in_command(
+                placement, _ONE_WORD.pack(
+                    self.SDP_PACKET_CHECK_DATA_IN_COMMAND_ID),
+                n_seq_nums)
+        return True
+
+    def _send_data_in_packets(self, placement, data, seq_nums, pause):
+        """ Send the packets of data in with the given sequence numbers,\
+            without waiting for replies, pausing after each burst of packets
+        """
+        header = SDPHeader(
+            destination_chip_x=placement.x,
+            destination_chip_y=placement.y,
+            destination_cpu=placement.p,
+            destination_port=self.SDP_PORT,
+            flags=SDPFlag.REPLY_NOT_EXPECTED)
+        for index, seq_num in enumerate(seq_nums):
+            if index and not index % self.DATA_IN_PACKETS_PER_BURST:
+                time.sleep(pause)
+            offset = seq_num * self.DATA_IN_BYTES_PER_PACKET
+            self._connection.send_sdp_message(SDPMessage(
+                sdp_header=header,
+                data=_TWO_WORDS.pack(
+                    self.SDP_PACKET_DATA_IN_COMMAND_ID, seq_num) +
+                bytes(data[offset:offset + self.DATA_IN_BYTES_PER_PACKET])))
+
+    def _send_data_in_command(self, placement, data, n_seq_nums):
+        """ Send a data in command to an extra monitor, and get its reply\
+            of which sequence numbers it has not yet received
+
+        :param placement: placement of the extra monitor
+        :param data: the command to send
+        :param n_seq_nums: the number of sequence numbers in the stream
+        :return: the number of sequence numbers missing, and a list of the\
+            first of them
+        :rtype: tuple(int, list(int))
+        """
+        message = SDPMessage(
+            sdp_header=SDPHeader(
+                destination_chip_x=placement.x,
+                destination_chip_y=placement.y,
+                destination_cpu=placement.p,
+                destination_port=self.SDP_PORT,
+                flags=SDPFlag.REPLY_EXPECTED),
+            data=data)
+        for _ in xrange(TIMEOUT_RETRY_LIMIT):
+            self._connection.send_sdp_message(message)
+            try:
+                while True:
+                    reply = self._connection.receive_sdp_message(
+                        timeout=self.TIMEOUT_PER_RECEIVE_IN_SECONDS)
+                    n_words = (len(reply.data) - reply.offset) // \
+                        self.WORD_TO_BYTE_CONVERTER
+                    if n_words < self.DATA_IN_HEADER_SIZE:
+                        continue
+                    values = struct.unpack_from(
+                        "<{}I".format(n_words), reply.data, reply.offset)
+                    command, n_missing = values[:self.DATA_IN_HEADER_SIZE]
+
+                    # ignore anything which is not a reply about this stream
+                    if (command ==
+                            self.SDP_PACKET_MISSING_DATA_IN_COMMAND_ID and
+                            (n_missing <= n_seq_nums or
+                             n_missing == self.DATA_IN_FAILED)):
+                        return n_missing, list(
+                            values[self.DATA_IN_HEADER_SIZE:])
+            except SpinnmanTimeoutException:
+                pass
+        raise SpinnFrontEndException(
+            "Failed to hear from the machine during {} attempts. "
+            "Please try removing firewalls".format(TIMEOUT_RETRY_LIMIT))
 
     def _receive_data(self, transceiver, placement):
-        seq_nums = set()
+        # one flag per sequence number, including the final end flag packet
+        seq_nums = numpy.zeros(self._max_seq_num + 1, dtype=bool)
         lost_seq_nums = list()
         timeoutcount = 0
         finished = False
@@ -461,6 +918,33 @@ class DataSpeedUpPacketGatherMachineVertex(
                         seq_nums, transceiver, placement, lost_seq_nums)
         return lost_seq_nums
 
+    def _get_machine(self, transceiver):
+        """ Get the machine, reading it from the transceiver only once
+        """
+        if self._machine is None:
+            self._machine = transceiver.get_machine_details()
+        return self._machine
+
+    def _n_hops(self, placement, fixed_routes, transceiver):
+        """ Get the number of routers that data from a chip passes through\
+            on its way to this gatherer, as a measure of distance
+
+        :param placement: the placement of the extra monitor on the chip
+        :param fixed_routes: the fixed routes, or None if not known
+        :param transceiver: spinnman instance
+        :return: the number of hops, or 0 if the routes are not known
+        :rtype: int
+        """
+        if fixed_routes is None:
+            return 0
+        key = (placement.x, placement.y)
+        if key not in self._n_hops_by_chip:
+            self._n_hops_by_chip[key] = len(
+                self._determine_which_routers_were_used(
+                    placement, fixed_routes,
+                    self._get_machine(transceiver))) - 1
+        return self._n_hops_by_chip[key]
+
     def __reset_connection(self):
         remote_port = self._connection.remote_port
         local_port = self._connection.local_port
@@ -518,11 +1002,12 @@ class DataSpeedUpPacketGatherMachineVertex(
     def _calculate_missing_seq_nums(self, seq_nums):
         """ Determine which sequence numbers we've missed
 
-        :param seq_nums: the set already acquired
+        :param seq_nums: the flags of which sequence numbers were received
+        :type seq_nums: numpy.ndarray(bool)
         :return: list of missing sequence numbers
         """
-        return [sn for sn in xrange(0, self._max_seq_num)
-                if sn not in seq_nums]
+        return numpy.flatnonzero(
+            ~seq_nums[:self._max_seq_num]).tolist()
 
     def _determine_and_retransmit_missing_seq_nums(
             self, seq_nums, transceiver, placement, lost_seq_nums):
@@ -530,7 +1015,7 @@ class DataSpeedUpPacketGatherMachineVertex(
             retransmits the missing sequence numbers back to the core for\
             retransmission.
 
-        :param seq_nums: the sequence numbers already received
+        :param seq_nums: the flags of which sequence numbers were received
         :param transceiver: spinnman instance
         :param placement: placement instance
         :return: whether all packets are transmitted
@@ -631,7 +1116,7 @@ class DataSpeedUpPacketGatherMachineVertex(
         """ Take a packet and processes it see if we're finished yet
 
         :param data: the packet data
-        :param seq_nums: the list of sequence numbers received so far
+        :param seq_nums: the flags of which sequence numbers were received
         :param finished: bool which states if finished or not
         :param placement: placement object for location on machine
         :param transceiver: spinnman instance
@@ -667,8 +1152,11 @@ class DataSpeedUpPacketGatherMachineVertex(
                 offset, true_data_length, data, self.SEQUENCE_NUMBER_SIZE,
                 length_of_data, seq_num, length_of_data, False)
 
-        # add seq num to list
-        seq_nums.add(seq_num)
+        # mark seq num as received
+        self._n_packets_received += 1
+        if seq_nums[seq_num]:
+            self._n_duplicate_packets += 1
+        seq_nums[seq_num] = True
 
         # if received a last flag on its own, its during retransmission.
         #  check and try again if required
@@ -714,16 +1202,13 @@ class DataSpeedUpPacketGatherMachineVertex(
     def _check(self, seq_nums):
         """ Verify if the sequence numbers are correct.
 
-        :param seq_nums: the received sequence numbers
+        :param seq_nums: the flags of which sequence numbers were received
+        :type seq_nums: numpy.ndarray(bool)
         :return: Whether all the sequence numbers have been received
         :rtype: bool
         """
         # hand back
-        seq_nums = sorted(seq_nums)
-        max_needed = self.calculate_max_seq_num()
-        if len(seq_nums) > max_needed + 1:
-            raise Exception("I've received more data than I was expecting!!")
-        return len(seq_nums) == max_needed + 1
+        return bool(seq_nums.all())
 
     def calculate_max_seq_num(self):
         """ Deduce the max sequence number expected to be received
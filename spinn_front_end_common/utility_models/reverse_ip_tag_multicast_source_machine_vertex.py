@@ -40,9 +40,9 @@ from spinnman.messages.eieio import EIEIOPrefix
 
 from enum import Enum
 import math
+import numpy
 import sys
 import struct
-from six.moves import xrange
 
 _DEFAULT_MALLOC_REGIONS = 2
 _ONE_WORD = struct.Struct("<I")
@@ -176,6 +176,7 @@ class ReverseIPTagMulticastSourceMachineVertex(
 
         # Work out if buffers are being sent
         self._send_buffer = None
+        self._send_buffer_filled_with = None
         self._send_buffer_partition_id = send_buffer_partition_id
         self._send_buffer_max_space = send_buffer_max_space
         if send_buffer_times is None:
@@ -234,6 +235,7 @@ class ReverseIPTagMulticastSourceMachineVertex(
                     "expected length of {}".format(send_buffer_times, n_keys))
 
         self._send_buffer = BufferedSendingRegion(self._send_buffer_max_space)
+        self._send_buffer_filled_with = None
         self._send_buffer_times = send_buffer_times
 
         (ip_address, port, tag, board_address) = target_address
@@ -351,56 +353,89 @@ class ReverseIPTagMulticastSourceMachineVertex(
     @send_buffer_times.setter
     def send_buffer_times(self, send_buffer_times):
         self._send_buffer_times = send_buffer_times
-
-    def _is_in_range(
-            self, time_stamp_in_ticks,
-            first_machine_time_step, n_machine_time_steps):
-        return (n_machine_time_steps is None) or (
-            first_machine_time_step <= time_stamp_in_ticks <
-            n_machine_time_steps)
+        self._send_buffer_filled_with = None
 
     def _fill_send_buffer(
             self, machine_time_step, first_machine_time_step,
             n_machine_time_steps):
-        """ Fill the send buffer with keys to send
+        """ Fill the send buffer with keys to send, and select the keys of\
+            the time steps to be run
         """
 
         key_to_send = self._virtual_key
         if self._virtual_key is None:
             key_to_send = 0
 
-        if self._send_buffer is not None:
+        if self._send_buffer is None:
+            return
+
+        # The keys of all the times are only worked out again if the times or
+        # what they are worked out from have changed since the last run,
+        # including if the times have been changed in place
+        filled_with = (
+            key_to_send, machine_time_step,
+            self.__times_signature(self._send_buffer_times))
+        if self._send_buffer_filled_with != filled_with:
             self._send_buffer.clear()
-        if (self._send_buffer_times is not None and
-                len(self._send_buffer_times)):
-            if hasattr(self._send_buffer_times[0], "__len__"):
-                # Works with a list-of-lists
-                self.__fill_send_buffer_2d(
-                    key_to_send, machine_time_step, first_machine_time_step,
-                    n_machine_time_steps)
-            else:
-                # Work with a single list
-                self.__fill_send_buffer_1d(
-                    key_to_send, machine_time_step, first_machine_time_step,
-                    n_machine_time_steps)
-
-    def __fill_send_buffer_2d(
-            self, key_base, time_step, first_time_step, n_time_steps):
-        for key in range(self._n_keys):
-            for time_stamp in sorted(self._send_buffer_times[key]):
-                tick = int(math.ceil(
-                    float(int(time_stamp * 1000.0)) / time_step))
-                if self._is_in_range(tick, first_time_step, n_time_steps):
-                    self._send_buffer.add_key(tick, key_base + key)
-
-    def __fill_send_buffer_1d(
-            self, key_base, time_step, first_time_step, n_time_steps):
-        key_list = [key + key_base for key in xrange(self._n_keys)]
-        for time_stamp in sorted(self._send_buffer_times):
-            tick = int(math.ceil(
-                float(int(time_stamp * 1000.0)) / time_step))
-            if self._is_in_range(tick, first_time_step, n_time_steps):
-                self._send_buffer.add_keys(tick, key_list)
+            if (self._send_buffer_times is not None and
+                    len(self._send_buffer_times)):
+                if hasattr(self._send_buffer_times[0], "__len__"):
+                    # Works with a list-of-lists
+                    self.__fill_send_buffer_2d(key_to_send, machine_time_step)
+                else:
+                    # Work with a single list
+                    self.__fill_send_buffer_1d(key_to_send, machine_time_step)
+            self._send_buffer_filled_with = filled_with
+
+        # All the keys are sent if the run is not limited in time
+        if n_machine_time_steps is None:
+            first_machine_time_step = None
+        self._send_buffer.set_window(
+            first_machine_time_step, n_machine_time_steps)
+
+    @staticmethod
+    def __times_signature(times):
+        """ Get something which changes when the send buffer times do, which\
+            is cheaper to work out than the keys of the times
+        """
+        if times is None or not len(times):
+            return None
+        if hasattr(times[0], "__len__"):
+            lengths = numpy.array(
+                [len(key_times) for key_times in times], dtype="int64")
+            times = numpy.concatenate([
+                numpy.asarray(key_times, dtype="float64")
+                for key_times in times])
+        else:
+            lengths = numpy.array([len(times)], dtype="int64")
+            times = numpy.asarray(times, dtype="float64")
+        return hash(lengths.tobytes()), hash(times.tobytes())
+
+    @staticmethod
+    def __times_to_ticks(times, time_step):
+        """ Convert times in milliseconds to the time steps in which they\
+            are to be sent, rounding up to whole microseconds and time steps
+        """
+        return numpy.ceil(
+            numpy.trunc(numpy.asarray(times, dtype="float64") * 1000.0) /
+            time_step).astype("int64")
+
+    def __fill_send_buffer_2d(self, key_base, time_step):
+        ticks = [self.__times_to_ticks(self._send_buffer_times[key], time_step)
+                 for key in range(self._n_keys)]
+        keys = numpy.repeat(
+            numpy.arange(key_base, key_base + self._n_keys, dtype="int64"),
+            [len(key_ticks) for key_ticks in ticks])
+        self._send_buffer.add_timestamps_and_keys(
+            numpy.concatenate(ticks), keys)
+
+    def __fill_send_buffer_1d(self, key_base, time_step):
+        ticks = numpy.sort(
+            self.__times_to_ticks(self._send_buffer_times, time_step))
+        self._send_buffer.add_timestamps_and_keys(
+            numpy.repeat(ticks, self._n_keys), numpy.tile(
+                numpy.arange(key_base, key_base + self._n_keys,
+                             dtype="int64"), len(ticks)))
 
     @staticmethod
     def _generate_prefix(virtual_key, prefix_type):
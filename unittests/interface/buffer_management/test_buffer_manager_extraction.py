@@ -0,0 +1,238 @@
+import struct
+import threading
+import unittest
+
+from pacman.model.placements import Placement, Placements
+
+from spinn_front_end_common.interface.buffer_management import BufferManager
+from spinn_front_end_common.utilities import globals_variables
+
+# The recording header of each core is at this address plus 4K per core
+_RECORDING_BASE = 0x60000000
+
+# The channel states of the regions of a core follow its recording header
+_STATE_OFFSET = 0x100
+_STATE_SIZE = 0x40
+
+# The recorded data of each region
+_DATA_BASE = 0x70000000
+_REGION_SIZE = 0x1000
+
+_N_REGIONS = 2
+
+_CHANNEL_STATE = struct.Struct("<IIIIIBBBx")
+
+
+def _recorded_data(x, y, p, region):
+    return bytearray(
+        (x * 7 + y * 5 + p * 3 + region + i) % 256
+        for i in range(100 + 10 * p + region))
+
+
+class _Memory(object):
+    """ Pretend transceiver which reads from blocks of memory, and notes\
+        which threads read it
+    """
+
+    def __init__(self):
+        self._blocks = dict()
+        self.reading_threads = set()
+
+    def write(self, x, y, address, data):
+        self._blocks.setdefault((x, y), list()).append(
+            (address, bytes(data)))
+
+    def read_memory(self, x, y, base_address, length, cpu=0):
+        self.reading_threads.add(threading.current_thread().name)
+        for address, data in self._blocks.get((x, y), ()):
+            offset = base_address - address
+            if 0 <= offset and offset + length <= len(data):
+                return bytearray(data[offset:offset + length])
+        raise Exception("No memory at {}, {}: {}".format(
+            x, y, hex(base_address)))
+
+
+class _RecordingVertex(object):
+
+    def __init__(self, label):
+        self._label = label
+
+    def get_recording_region_base_address(self, txrx, placement):
+        return _RECORDING_BASE + placement.p * 0x1000
+
+    def get_recorded_region_ids(self):
+        return list(range(_N_REGIONS))
+
+    def __repr__(self):
+        return self._label
+
+
+class _Chip(object):
+
+    def __init__(self, x, y):
+        # Boards of 8 by 8 chips
+        self.nearest_ethernet_x = x - x % 8
+        self.nearest_ethernet_y = y - y % 8
+
+
+class _Machine(object):
+
+    def get_chip_at(self, x, y):
+        return _Chip(x, y)
+
+
+class _Receiver(object):
+    """ Pretend data speed up gatherer, which notes the chips it reads
+    """
+
+    def __init__(self, label):
+        self._label = label
+        self.chips_read = set()
+
+    def set_cores_for_data_extraction(self, **kwargs):
+        pass
+
+    def unset_cores_for_data_extraction(self, **kwargs):
+        pass
+
+    def get_data(self, transceiver, placement, address, length,
+                 fixed_routes):
+        self.chips_read.add((placement.x, placement.y))
+        return transceiver.read_memory(
+            placement.x, placement.y, address, length)
+
+    def get_data_for_reads(self, transceiver, reads, fixed_routes):
+        return [
+            self.get_data(transceiver, placement, address, length,
+                          fixed_routes)
+            for placement, address, length in reads]
+
+    def __repr__(self):
+        return self._label
+
+
+# Cores on three boards, listed out of board order
+_CORES = [(0, 0, 1), (9, 1, 2), (1, 2, 3), (17, 0, 1), (8, 0, 4), (2, 2, 5)]
+
+
+class TestBufferManagerExtraction(unittest.TestCase):
+
+    def setUp(self):
+        globals_variables.region_table_cache().clear()
+        self._memory = _Memory()
+        self._placements = Placements()
+        self._vertices = list()
+        for x, y, p in _CORES:
+            vertex = _RecordingVertex("v{}_{}_{}".format(x, y, p))
+            self._vertices.append(vertex)
+            self._placements.add_placement(Placement(vertex, x, y, p))
+            self._write_recording(x, y, p)
+
+    def _write_recording(self, x, y, p):
+        base = _RECORDING_BASE + p * 0x1000
+        header = [0] * (7 + _N_REGIONS)
+        for region in range(_N_REGIONS):
+            state_address = base + _STATE_OFFSET + region * _STATE_SIZE
+            header[7 + region] = state_address
+            data = _recorded_data(x, y, p, region)
+            start = _DATA_BASE + (p * _N_REGIONS + region) * _REGION_SIZE
+            self._memory.write(x, y, start, data)
+            self._memory.write(x, y, state_address, _CHANNEL_STATE.pack(
+                start, start + len(data), start + len(data), start,
+                start + _REGION_SIZE, region, 0, 1))
+        self._memory.write(
+            x, y, base, struct.pack("<{}I".format(len(header)), *header))
+
+    def _buffer_manager(self, max_concurrent_extractions,
+                        receivers=None):
+        extra_monitor_to_chip = None
+        if receivers is not None:
+            extra_monitor_to_chip = dict()
+            for x, y, _ in _CORES:
+                monitor = _RecordingVertex("monitor{}_{}".format(x, y))
+                extra_monitor_to_chip[x, y] = monitor
+                self._placements.add_placement(Placement(monitor, x, y, 0))
+            for (x, y), receiver in receivers.items():
+                self._placements.add_placement(Placement(receiver, x, y, 17))
+        buffer_manager = BufferManager(
+            self._placements, None, self._memory, None, receivers,
+            extra_monitor_to_chip, _Machine(), None, receivers is not None,
+            max_concurrent_extractions=max_concurrent_extractions)
+        self.addCleanup(buffer_manager.close)
+        return buffer_manager
+
+    def _check_data(self, buffer_manager):
+        for x, y, p in _CORES:
+            for region in range(_N_REGIONS):
+                data, missing = buffer_manager._received_data.get_region_data(
+                    x, y, p, region)
+                self.assertFalse(missing)
+                self.assertEqual(
+                    bytes(data), bytes(_recorded_data(x, y, p, region)))
+
+    def test_group_by_board(self):
+        buffer_manager = self._buffer_manager(1)
+        boards = buffer_manager._group_vertices_by_board(self._vertices)
+        self.assertEqual(list(boards), [(0, 0), (8, 0), (16, 0)])
+        self.assertEqual(
+            [(p.x, p.y, p.p) for p in boards[0, 0]],
+            [(0, 0, 1), (1, 2, 3), (2, 2, 5)])
+        self.assertEqual(
+            [(p.x, p.y, p.p) for p in boards[8, 0]],
+            [(9, 1, 2), (8, 0, 4)])
+        self.assertEqual(
+            [(p.x, p.y, p.p) for p in boards[16, 0]], [(17, 0, 1)])
+
+    def test_sequential_and_concurrent_agree(self):
+        for max_concurrent_extractions in (1, 4):
+            self.setUp()
+            buffer_manager = self._buffer_manager(max_concurrent_extractions)
+            buffer_manager.get_data_for_vertices(self._vertices)
+            self._check_data(buffer_manager)
+
+            # Concurrent extraction reads only on the worker threads
+            main_thread = threading.current_thread().name
+            if max_concurrent_extractions > 1:
+                self.assertNotIn(main_thread, self._memory.reading_threads)
+            else:
+                self.assertEqual(
+                    self._memory.reading_threads, {main_thread})
+
+            statistics = buffer_manager.board_extraction_statistics
+            self.assertEqual(
+                sorted((chip, n_regions) for chip, n_regions, _, _ in
+                       statistics),
+                [((0, 0), 6), ((8, 0), 4), ((16, 0), 2)])
+            self.assertEqual(
+                sum(n_bytes for _, _, n_bytes, _ in statistics),
+                sum(len(_recorded_data(x, y, p, region))
+                    for x, y, p in _CORES for region in range(_N_REGIONS)))
+            self.assertEqual(buffer_manager.core_bytes_read, {
+                (x, y, p): (0, sum(
+                    len(_recorded_data(x, y, p, region))
+                    for region in range(_N_REGIONS)))
+                for x, y, p in _CORES})
+
+    def test_receivers_read_their_own_boards(self):
+        for max_concurrent_extractions in (1, 3):
+            self.setUp()
+            receivers = {
+                (0, 0): _Receiver("r0"), (8, 0): _Receiver("r8"),
+                (16, 0): _Receiver("r16")}
+            buffer_manager = self._buffer_manager(
+                max_concurrent_extractions, receivers)
+            buffer_manager.get_data_for_vertices(self._vertices)
+            self._check_data(buffer_manager)
+            for (x, y), receiver in receivers.items():
+                self.assertTrue(receiver.chips_read)
+                for chip_x, chip_y in receiver.chips_read:
+                    self.assertEqual(
+                        (chip_x - chip_x % 8, chip_y - chip_y % 8), (x, y))
+            self.assertEqual(
+                sorted(chip for chip, _, _, _ in
+                       buffer_manager.board_extraction_statistics),
+                [(0, 0), (8, 0), (16, 0)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+
+from spinn_front_end_common.interface.buffer_management.storage_objects \
+    import BufferedSendingRegion
+
+
+def _read_all(region):
+    sent = list()
+    while region.is_next_timestamp:
+        timestamp = region.next_timestamp
+        while region.is_next_key(timestamp):
+            sent.append((timestamp, region.next_key))
+    return sent
+
+
+class TestBufferedSendingRegion(unittest.TestCase):
+
+    def test_add_out_of_order(self):
+        region = BufferedSendingRegion(10000)
+        region.add_keys(5, [1, 2])
+        region.add_key(1, 3)
+        region.add_key(5, 4)
+        self.assertEqual(list(region.timestamps), [1, 5])
+        self.assertEqual(region.get_n_keys(5), 3)
+        self.assertEqual(region.get_n_keys(2), 0)
+        self.assertEqual(region.max_packets_in_timestamp, 3)
+        self.assertEqual(
+            _read_all(region), [(1, 3), (5, 1), (5, 2), (5, 4)])
+        self.assertIsNone(region.next_timestamp)
+
+    def test_rewind(self):
+        region = BufferedSendingRegion(10000)
+        region.add_timestamps_and_keys([3, 1, 3, 2], [10, 11, 12, 13])
+        expected = [(1, 11), (2, 13), (3, 10), (3, 12)]
+        self.assertEqual(_read_all(region), expected)
+        self.assertFalse(region.is_next_timestamp)
+        region.rewind()
+        self.assertEqual(_read_all(region), expected)
+
+    def test_window(self):
+        region = BufferedSendingRegion(10000)
+        region.add_timestamps_and_keys(range(10), range(100, 110))
+        region.set_window(3, 6)
+        self.assertEqual(region.n_timestamps, 3)
+        self.assertEqual(list(region.keys), [103, 104, 105])
+        self.assertEqual(_read_all(region), [(3, 103), (4, 104), (5, 105)])
+        region.set_window(8, None)
+        self.assertEqual(_read_all(region), [(8, 108), (9, 109)])
+        region.set_window(20, 30)
+        self.assertFalse(region.is_next_timestamp)
+        self.assertEqual(len(region.timestamps), 0)
+
+    def test_sizes(self):
+        region = BufferedSendingRegion(10000)
+        empty_size = region.total_region_size
+        n_keys = BufferedSendingRegion._N_KEYS_PER_MESSAGE + 1
+        region.add_keys(1, range(n_keys))
+        region.add_key(2, 0)
+        self.assertEqual(
+            region.total_region_size,
+            empty_size + region.get_n_bytes(n_keys) + region.get_n_bytes(1))
+        self.assertEqual(
+            region.get_n_bytes(n_keys),
+            2 * BufferedSendingRegion._HEADER_SIZE +
+            n_keys * BufferedSendingRegion._N_BYTES_PER_KEY)
+        region.set_window(2, None)
+        self.assertEqual(
+            region.total_region_size, empty_size + region.get_n_bytes(1))
+
+    def test_clear(self):
+        region = BufferedSendingRegion(10000)
+        region.add_keys(1, [1, 2, 3])
+        region.clear()
+        self.assertEqual(region.n_timestamps, 0)
+        self.assertEqual(region.max_packets_in_timestamp, 0)
+        self.assertFalse(region.is_next_key(1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import threading
+import time
+import unittest
+
+from spinn_front_end_common.interface.buffer_management.core_work_queues \
+    import CoreWorkQueues, LATENCY_BUCKETS_MS
+
+
+class TestCoreWorkQueues(unittest.TestCase):
+
+    def test_order_per_core(self):
+        queues = CoreWorkQueues(4)
+        done = {core: list() for core in [(0, 0, 1), (0, 0, 2), (1, 0, 1)]}
+
+        def work(core, item):
+            time.sleep(0.001)
+            done[core].append(item)
+
+        for item in range(20):
+            for core in done:
+                queues.add_work(core, work, core, item)
+        self.assertTrue(queues.wait_until_idle(10))
+        for core in done:
+            self.assertEqual(done[core], list(range(20)))
+        self.assertEqual(queues.n_done, 60)
+        self.assertEqual(queues.queue_depth, 0)
+        self.assertGreater(queues.max_queue_depth, 1)
+        self.assertEqual(
+            sum(count for _, count in queues.latency_histogram), 60)
+        queues.close()
+
+    def test_cores_at_same_time(self):
+        queues = CoreWorkQueues(2)
+        barrier = threading.Event()
+        waited = list()
+
+        # The first core can only finish if the second core's work is done
+        # at the same time
+        def wait():
+            waited.append(barrier.wait(5))
+
+        queues.add_work((0, 0, 1), wait)
+        queues.add_work((0, 0, 2), barrier.set)
+        self.assertTrue(queues.wait_until_idle(10))
+        self.assertEqual(waited, [True])
+        queues.close()
+
+    def test_core_lock_and_errors(self):
+        queues = CoreWorkQueues(1)
+        done = list()
+
+        def fail():
+            raise Exception("failed on purpose")
+
+        with queues.core_lock((0, 0, 1)):
+            queues.add_work((0, 0, 1), fail)
+            queues.add_work((0, 0, 1), done.append, 1)
+            self.assertFalse(queues.wait_until_idle(0.1))
+            self.assertEqual(queues.queue_depth, 2)
+        self.assertTrue(queues.wait_until_idle(10))
+        self.assertEqual(done, [1])
+
+        # The work waited for the lock for at least 100ms
+        histogram = queues.latency_histogram
+        self.assertEqual(len(histogram), len(LATENCY_BUCKETS_MS) + 1)
+        self.assertEqual(
+            sum(count for bound, count in histogram
+                if bound is not None and bound < 100), 0)
+        queues.reset_statistics()
+        self.assertEqual(queues.n_done, 0)
+        self.assertEqual(queues.max_queue_depth, 0)
+        queues.close()
+
+    def test_close(self):
+        queues = CoreWorkQueues(3)
+        done = list()
+        for item in range(5):
+            queues.add_work((0, 0, 1), done.append, item)
+        n_threads = threading.active_count()
+        queues.close()
+
+        # The work added is done first, and the threads are stopped
+        self.assertEqual(done, list(range(5)))
+        self.assertLess(threading.active_count(), n_threads)
+        queues.add_work((0, 0, 1), done.append, 5)
+        self.assertEqual(queues.queue_depth, 0)
+        self.assertTrue(queues.wait_until_idle(0))
+        self.assertEqual(done, list(range(5)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+
+import numpy
+
+from spinnman.messages.eieio import EIEIOType
+from spinnman.messages.eieio.data_messages import EIEIODataMessage
+
+from spinn_front_end_common.interface.buffer_management.storage_objects \
+    import BufferedSendingRegion, EncodedKeysMessage
+
+
+def _spinnman_message(timestamp, keys):
+    message = EIEIODataMessage.create(
+        EIEIOType.KEY_32_BIT, timestamp=timestamp)
+    for key in keys:
+        message.add_key(key)
+    return message
+
+
+class TestEncodedKeysMessage(unittest.TestCase):
+
+    def test_same_as_spinnman(self):
+        keys = [0, 1, 0x12345678, 0xFFFFFFFF]
+        message = EncodedKeysMessage(1000, numpy.array(keys))
+        expected = _spinnman_message(1000, keys)
+        self.assertEqual(bytes(message.bytestring), expected.bytestring)
+        self.assertEqual(message.size, expected.size)
+        self.assertEqual(message.n_keys, 4)
+        self.assertEqual(
+            bytes(EncodedKeysMessage(3, keys).bytestring),
+            _spinnman_message(3, keys).bytestring)
+
+    def test_write_several(self):
+        region = BufferedSendingRegion(10000)
+        region.add_timestamps_and_keys(
+            numpy.repeat(numpy.arange(5), 30), numpy.arange(150))
+        buffer = bytearray(1000)
+        offset = 0
+        expected = b""
+        max_n_keys = EncodedKeysMessage.get_max_n_keys(100)
+        self.assertEqual(max_n_keys, (100 - 6) // 4)
+        while region.is_next_timestamp:
+            timestamp, keys = region.get_next_keys(max_n_keys)
+            self.assertLessEqual(len(keys), max_n_keys)
+            offset = EncodedKeysMessage.write(buffer, offset, timestamp, keys)
+            expected += _spinnman_message(timestamp, keys).bytestring
+        self.assertEqual(bytes(buffer[:offset]), expected)
+
+        # Each timestamp is split into a full message and the rest
+        self.assertEqual(
+            offset, 5 * (2 * EncodedKeysMessage.HEADER_SIZE + 30 * 4))
+
+    def test_max_n_keys(self):
+        self.assertEqual(EncodedKeysMessage.get_max_n_keys(9), 0)
+        self.assertEqual(EncodedKeysMessage.get_max_n_keys(10), 1)
+        self.assertEqual(EncodedKeysMessage.get_max_n_keys(100000), 255)
+
+
+if __name__ == "__main__":
+    unittest.main()
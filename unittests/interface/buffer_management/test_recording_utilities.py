@@ -0,0 +1,42 @@
+import unittest
+
+from spinn_front_end_common.interface.buffer_management \
+    import recording_utilities
+
+# The position of the buffer size before request in the header
+_BUFFER_SIZE_BEFORE_REQUEST = 4
+
+
+class TestRecordingUtilities(unittest.TestCase):
+
+    def test_buffer_size_before_request(self):
+        self.assertEqual(
+            recording_utilities.get_buffer_size_before_request(
+                [4000, 0, 1000]), 500)
+        self.assertEqual(
+            recording_utilities.get_buffer_size_before_request(
+                [1000], 0.25), 248)
+        self.assertEqual(
+            recording_utilities.get_buffer_size_before_request(
+                [1000], 0.0), 4)
+        self.assertEqual(
+            recording_utilities.get_buffer_size_before_request(
+                [1000], 2.0), 1000)
+        self.assertIsNone(
+            recording_utilities.get_buffer_size_before_request([0, 0]))
+
+    def test_header_buffer_size_before_request(self):
+        sizes = [4000, 1000]
+        header = recording_utilities.get_recording_header_array(sizes)
+        self.assertEqual(header[_BUFFER_SIZE_BEFORE_REQUEST], 4256)
+        header = recording_utilities.get_recording_header_array(
+            sizes, buffer_size_before_request=(
+                recording_utilities.get_buffer_size_before_request(sizes)),
+            buffering_tag=1)
+        self.assertEqual(header[_BUFFER_SIZE_BEFORE_REQUEST], 500)
+        self.assertEqual(
+            len(header) * 4, recording_utilities.get_recording_header_size(2))
+
+
+if __name__ == "__main__":
+    unittest.main()
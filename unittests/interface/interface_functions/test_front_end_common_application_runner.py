@@ -0,0 +1,85 @@
+import time
+import unittest
+
+from spinn_front_end_common.interface.interface_functions \
+    import application_runner
+from spinn_front_end_common.interface.interface_functions \
+    import ApplicationRunner
+
+
+class _MockBufferManager(object):
+    """ Pretend buffer manager whose buffer requests waiting go through a\
+        list of depths, one for each time they are checked
+    """
+
+    def __init__(self, queue_depths):
+        self._queue_depths = list(queue_depths)
+        self.n_checks = 0
+        self.n_bytes_read_during_run = 0
+
+    @property
+    def request_queue_depth(self):
+        depth = self._queue_depths[
+            min(self.n_checks, len(self._queue_depths) - 1)]
+        self.n_checks += 1
+        self.n_bytes_read_during_run += 100
+        return depth
+
+
+class _MockLogger(object):
+    """ Pretend logger which keeps the warnings
+    """
+
+    def __init__(self):
+        self.warnings = list()
+
+    def warning(self, message, *args):
+        self.warnings.append(message.format(*args))
+
+    def debug(self, message, *args):
+        pass
+
+
+class TestApplicationRunner(unittest.TestCase):
+
+    def setUp(self):
+        self._interval = application_runner._EXTRACTION_CHECK_INTERVAL
+        self._logger = application_runner.logger
+        application_runner._EXTRACTION_CHECK_INTERVAL = 0.01
+        application_runner.logger = _MockLogger()
+
+    def tearDown(self):
+        application_runner._EXTRACTION_CHECK_INTERVAL = self._interval
+        application_runner.logger = self._logger
+
+    def _wait(self, queue_depths, time_to_wait):
+        buffer_manager = _MockBufferManager(queue_depths)
+        start = time.time()
+        ApplicationRunner._wait_while_extracting(buffer_manager, time_to_wait)
+        return buffer_manager, time.time() - start
+
+    def test_waits_in_slices(self):
+        buffer_manager, taken = self._wait([0], 0.1)
+        self.assertGreaterEqual(taken, 0.1)
+        self.assertGreater(buffer_manager.n_checks, 1)
+        self.assertEqual(application_runner.logger.warnings, [])
+
+    def test_warns_once_when_falling_behind(self):
+        n_checks = application_runner._N_GROWING_CHECKS_BEFORE_WARNING
+        self._wait(range(1, 100), 0.01 * (n_checks + 5))
+        warnings = application_runner.logger.warnings
+        self.assertEqual(len(warnings), 1)
+        self.assertIn(
+            "{} buffer requests waiting".format(n_checks), warnings[0])
+
+    def test_no_warning_when_keeping_up(self):
+        # The requests waiting grow, but are handled before they grow for
+        # long enough to be a worry
+        n_checks = application_runner._N_GROWING_CHECKS_BEFORE_WARNING
+        queue_depths = (list(range(1, n_checks)) + [0]) * 4
+        self._wait(queue_depths, 0.01 * (len(queue_depths) - 1))
+        self.assertEqual(application_runner.logger.warnings, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -16,6 +16,7 @@ from spinn_front_end_common.abstract_models \
     import AbstractRewritesDataSpecification
 from spinn_front_end_common.interface.interface_functions \
     import DSGRegionReloader
+from spinn_front_end_common.utilities.utility_objs import RegionReloadCache
 
 
 class _TestMachineVertex(MachineVertex):
@@ -67,6 +68,10 @@ class _TestApplicationVertex(
     def mark_regions_reloaded(self):
         self._requires_regions_to_be_reloaded = False
 
+    def set_reload_region_data(self, reload_region_data):
+        self._reload_region_data = reload_region_data
+        self._requires_regions_to_be_reloaded = True
+
     def regenerate_data_specification(self, spec, placement):
         for region_id, data in self._reload_region_data:
             spec.reserve_memory_region(region_id, len(data) * 4)
@@ -103,6 +108,7 @@ class _MockTransceiver(object):
         self._regions_rewritten = list()
         self._user_0_addresses = user_0_addresses
         self._region_addresses = region_addresses
+        self._n_region_table_reads = 0
 
     @property
     def regions_rewritten(self):
@@ -110,10 +116,17 @@ class _MockTransceiver(object):
         """
         return self._regions_rewritten
 
+    @property
+    def n_region_table_reads(self):
+        """ The number of times a region table has been read
+        """
+        return self._n_region_table_reads
+
     def get_cpu_information_from_core(self, x, y, p):
         return _MockCPUInfo(self._user_0_addresses[(x, y, p)])
 
     def read_memory(self, x, y, base_address, length, cpu=0):
+        self._n_region_table_reads += 1
         addresses = [i + base_address for i in self._region_addresses]
         return struct.pack(
             "<{}I".format(constants.MAX_MEM_REGIONS), *addresses)
@@ -188,6 +201,44 @@ class TestFrontEndCommonDSGRegionReloader(unittest.TestCase):
         # Delete data files
         shutil.rmtree("test")
 
+    def test_with_cache_writes_only_changes(self):
+        """ Test that a reload with a cache only writes what has changed\
+            and does not read the region table again
+        """
+        vertex = _TestApplicationVertex(5, [(0, [0] * 100), (1, [1] * 20)])
+        m_slice = Slice(0, 4)
+        m_vertex = vertex.create_machine_vertex(m_slice, None, None, None)
+        graph_mapper = GraphMapper()
+        graph_mapper.add_vertex_mapping(m_vertex, m_slice, vertex)
+        placements = Placements([Placement(m_vertex, 0, 0, 1)])
+        region_addresses = [
+            i * 1000 for i in range(constants.MAX_MEM_REGIONS)]
+        transceiver = _MockTransceiver({(0, 0, 1): 0}, region_addresses)
+        table_address = utility_calls.get_region_base_address_offset(0, 0)
+        cache = RegionReloadCache()
+
+        reloader = DSGRegionReloader()
+        reloader(
+            transceiver, placements, "localhost", "test", False, "test",
+            graph_mapper, cache)
+        self.assertEqual(len(transceiver.regions_rewritten), 2)
+        self.assertEqual(transceiver.n_region_table_reads, 1)
+
+        # Change a single word of the first region only
+        data = [0] * 100
+        data[50] = 7
+        vertex.set_reload_region_data([(0, data), (1, [1] * 20)])
+        reloader(
+            transceiver, placements, "localhost", "test", False, "test",
+            graph_mapper, cache)
+        self.assertEqual(transceiver.n_region_table_reads, 1)
+        self.assertEqual(
+            transceiver.regions_rewritten[2:],
+            [(table_address + region_addresses[0] + 200,
+              struct.pack("<I", 7))])
+
+        shutil.rmtree("test")
+
 
 if __name__ == "__main__":
     unittest.main()
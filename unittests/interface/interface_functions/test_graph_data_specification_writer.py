@@ -0,0 +1,73 @@
+import tempfile
+import unittest
+
+from spinn_machine.virtual_machine import VirtualMachine
+
+from pacman.model.graphs.machine import MachineVertex
+from pacman.model.placements import Placement, Placements
+from pacman.model.resources import ResourceContainer, SDRAMResource
+
+from spinn_front_end_common.abstract_models \
+    import AbstractGeneratesDataSpecification
+from spinn_front_end_common.interface.interface_functions \
+    import GraphDataSpecificationWriter
+from spinn_front_end_common.utilities.exceptions import ConfigurationException
+
+
+class _TestVertex(MachineVertex, AbstractGeneratesDataSpecification):
+    """ Vertex which reserves regions of given sizes
+    """
+
+    def __init__(self, region_sizes):
+        super(_TestVertex, self).__init__()
+        self._test_region_sizes = region_sizes
+
+    @property
+    def resources_required(self):
+        return ResourceContainer(
+            sdram=SDRAMResource(sum(self._test_region_sizes)))
+
+    def generate_data_specification(self, spec, placement):
+        for region, size in enumerate(self._test_region_sizes):
+            spec.reserve_memory_region(region, size)
+        spec.end_specification()
+
+
+class TestGraphDataSpecificationWriter(unittest.TestCase):
+
+    def _write(self, placements, n_threads):
+        writer = GraphDataSpecificationWriter()
+        folder = tempfile.mkdtemp()
+        try:
+            dsg_targets = writer(
+                placements, "localhost", folder, False, folder,
+                VirtualMachine(2, 2), n_threads=n_threads)
+            return dsg_targets, None
+        except ConfigurationException as e:
+            return None, str(e)
+
+    def test_threads_match_serial(self):
+        placements = Placements([
+            Placement(_TestVertex([100 * (p + 1), 8]), x, y, p)
+            for x in range(2) for y in range(2) for p in range(1, 5)])
+
+        serial_targets, _ = self._write(placements, 1)
+        threaded_targets, _ = self._write(placements, 4)
+        self.assertEqual(len(serial_targets), 16)
+        self.assertEqual(
+            set(serial_targets.keys()), set(threaded_targets.keys()))
+
+    def test_threads_report_over_allocation_identically(self):
+        size = VirtualMachine(2, 2).get_chip_at(0, 0).sdram.size // 3
+        placements = Placements([
+            Placement(_TestVertex([size, size // 2]), 0, 0, p)
+            for p in range(1, 4)])
+
+        _, serial_error = self._write(placements, 1)
+        _, threaded_error = self._write(placements, 4)
+        self.assertIsNotNone(serial_error)
+        self.assertEqual(serial_error, threaded_error)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,16 +1,17 @@
+import struct
 import unittest
-from tempfile import mktemp
+from tempfile import mkdtemp
 
 from spinn_machine.virtual_machine import VirtualMachine
 
-from spinn_storage_handlers.file_data_writer import FileDataWriter
+from pacman.model.placements import Placement, Placements
+
 from data_specification import constants
 
 from spinn_front_end_common.interface.interface_functions \
     import HostExecuteDataSpecification
-
-from data_specification.data_specification_generator \
-    import DataSpecificationGenerator
+from spinn_front_end_common.utilities.utility_objs \
+    import DataSpecificationTargets
 
 
 class _MockCPUInfo(object):
@@ -60,6 +61,35 @@ class _MockTransceiver(object):
             cpu=0, is_filename=False):
         self._regions_written.append((base_address, data))
 
+    def execute_flood(
+            self, core_subsets, executable, app_id, n_bytes=None, wait=False,
+            is_filename=False):
+        self.flooded = (core_subsets, executable, wait)
+
+    def wait_for_cores_to_be_in_state(
+            self, all_core_subsets, app_id, cpu_states):
+        pass
+
+
+class _MockGatherer(object):
+    """ Pretend data speed up packet gatherer
+    """
+
+    def __init__(self):
+        self.regions_written = list()
+
+    def send_data_into_spinnaker(
+            self, transceiver, placement, base_address, data):
+        self.regions_written.append((placement, base_address, data))
+
+
+class _MockExecutableFinder(object):
+    """ Pretend executable finder
+    """
+
+    def get_executable_path(self, executable_name):
+        return executable_name
+
 
 class TestHostExecuteDataSpecification(unittest.TestCase):
 
@@ -69,9 +99,8 @@ class TestHostExecuteDataSpecification(unittest.TestCase):
         machine = VirtualMachine(2, 2)
 
         # Write a data spec to execute
-        temp_spec = mktemp()
-        spec_writer = FileDataWriter(temp_spec)
-        spec = DataSpecificationGenerator(spec_writer)
+        dsg_targets = DataSpecificationTargets(mkdtemp())
+        spec = dsg_targets.create_data_spec(0, 0, 0)
         spec.reserve_memory_region(0, 100)
         spec.reserve_memory_region(1, 100, empty=True)
         spec.reserve_memory_region(2, 100)
@@ -84,40 +113,159 @@ class TestHostExecuteDataSpecification(unittest.TestCase):
         spec.end_specification()
 
         # Execute the spec
-        dsg_targets = {(0, 0, 0): temp_spec}
-        executor.__call__(transceiver, machine, 30, dsg_targets)
+        _, started_core_subsets = executor.__call__(
+            transceiver, machine, 30, dsg_targets)
+
+        # No cores are started
+        self.assertEqual(len(started_core_subsets), 0)
 
         # Test regions - although 3 are created, only 2 should be uploaded
         # (0 and 2), and only the data written should be uploaded
         # The space between regions should be as allocated regardless of
-        # how much data is written
+        # how much data is written; as the gaps are small, the header and
+        # table and both regions should be written together
         header_and_table_size = (constants.MAX_MEM_REGIONS + 2) * 4
         regions = transceiver.regions_written
-        self.assertEqual(len(regions), 4)
+        self.assertEqual(len(regions), 2)
 
         # Base address for header and table
         self.assertEqual(regions[0][0], 0)
 
-        # Base address for region 0 (after header and table)
-        self.assertEqual(regions[1][0], header_and_table_size)
-
-        # Base address for region 2
-        self.assertEqual(regions[2][0], header_and_table_size + 200)
-
         # User 0 write address
-        self.assertEqual(regions[3][0], 1000)
+        self.assertEqual(regions[1][0], 1000)
 
-        # Size of header and table
-        self.assertEqual(len(regions[0][1]), header_and_table_size)
+        # Size of header and table, region 0 and 1 and region 2 data
+        self.assertEqual(len(regions[0][1]), header_and_table_size + 204)
 
-        # Size of region 0
-        self.assertEqual(len(regions[1][1]), 12)
+        # Data of region 0 (after header and table)
+        self.assertEqual(
+            regions[0][1][header_and_table_size:header_and_table_size + 12],
+            struct.pack("<3I", 0, 1, 2))
 
-        # Size of region 2
-        self.assertEqual(len(regions[2][1]), 4)
+        # Data of region 2
+        self.assertEqual(
+            regions[0][1][header_and_table_size + 200:],
+            struct.pack("<I", 3))
 
         # Size of user 0
-        self.assertEqual(len(regions[3][1]), 4)
+        self.assertEqual(len(regions[1][1]), 4)
+
+    def test_call_with_large_gap(self):
+        executor = HostExecuteDataSpecification()
+        transceiver = _MockTransceiver(user_0_addresses={0: 1000})
+        machine = VirtualMachine(2, 2)
+
+        # Write a data spec with a large unfilled region between two others
+        dsg_targets = DataSpecificationTargets(mkdtemp())
+        spec = dsg_targets.create_data_spec(0, 0, 0)
+        spec.reserve_memory_region(0, 100)
+        spec.reserve_memory_region(1, 10000, empty=True)
+        spec.reserve_memory_region(2, 100)
+        spec.switch_write_focus(0)
+        spec.write_value(0)
+        spec.switch_write_focus(2)
+        spec.write_value(3)
+        spec.end_specification()
+
+        # Execute the spec
+        result, _ = executor.__call__(transceiver, machine, 30, dsg_targets)
+
+        # Region 2 is too far away to be written with the rest
+        header_and_table_size = (constants.MAX_MEM_REGIONS + 2) * 4
+        regions = transceiver.regions_written
+        self.assertEqual(len(regions), 3)
+        self.assertEqual(regions[0][0], 0)
+        self.assertEqual(len(regions[0][1]), header_and_table_size + 4)
+        self.assertEqual(regions[1][0], header_and_table_size + 10100)
+        self.assertEqual(len(regions[1][1]), 4)
+        self.assertEqual(regions[2][0], 1000)
+        self.assertEqual(result[0, 0, 0]['n_writes'], 2)
+        self.assertEqual(result[0, 0, 0]['n_writes_saved'], 1)
+
+    def test_call_pipelined(self):
+        executor = HostExecuteDataSpecification()
+        transceiver = _MockTransceiver(
+            user_0_addresses={0: 1000, 1: 1004})
+        machine = VirtualMachine(2, 2)
+
+        # Write a data spec to execute for each of two cores
+        dsg_targets = DataSpecificationTargets(mkdtemp())
+        for p in range(2):
+            spec = dsg_targets.create_data_spec(0, 0, p)
+            spec.reserve_memory_region(0, 100)
+            spec.switch_write_focus(0)
+            spec.write_value(p)
+            spec.end_specification()
+
+        # Execute the specs in more than one process
+        result, _ = executor.__call__(
+            transceiver, machine, 30, dsg_targets, n_processes=2)
+
+        # Each core should have a single write of the header, table and
+        # region, and a write of user 0
+        header_and_table_size = (constants.MAX_MEM_REGIONS + 2) * 4
+        self.assertEqual(len(transceiver.regions_written), 4)
+        self.assertEqual(set(result.keys()), {(0, 0, 0), (0, 0, 1)})
+        written = dict(transceiver.regions_written)
+        for p in range(2):
+            start_address = result[0, 0, p]['start_address']
+            self.assertEqual(
+                result[0, 0, p]['memory_used'], header_and_table_size + 100)
+            self.assertEqual(
+                result[0, 0, p]['memory_written'], header_and_table_size + 4)
+            self.assertEqual(
+                written[start_address][header_and_table_size:],
+                struct.pack("<I", p))
+
+    def test_call_with_fast_data_in(self):
+        executor = HostExecuteDataSpecification()
+        transceiver = _MockTransceiver(
+            user_0_addresses={1: 1000, 2: 1004})
+        machine = VirtualMachine(2, 2)
+
+        # The extra monitor of chip 0, 0 is on core 1, and an application
+        # vertex on core 2
+        monitor = object()
+        placements = Placements([
+            Placement(monitor, 0, 0, 1), Placement(object(), 0, 0, 2)])
+        gatherer = _MockGatherer()
+        dsg_targets = DataSpecificationTargets(mkdtemp())
+        for p in (1, 2):
+            spec = dsg_targets.create_data_spec(0, 0, p)
+            spec.reserve_memory_region(0, 100)
+            spec.switch_write_focus(0)
+            spec.write_value(p)
+            spec.end_specification()
+
+        _, started_core_subsets = executor.__call__(
+            transceiver, machine, 30, dsg_targets, use_fast_data_in=True,
+            placements=placements,
+            extra_monitor_to_chip_mapping={(0, 0): monitor},
+            extra_monitor_cores_to_ethernet_connection_map={
+                (0, 0): gatherer},
+            executable_finder=_MockExecutableFinder())
+
+        # The extra monitor is written with SCP and then started
+        core_subsets, executable, wait = transceiver.flooded
+        self.assertEqual(executable, "extra_monitor_support.aplx")
+        self.assertFalse(wait)
+        self.assertTrue(core_subsets.is_core(0, 0, 1))
+        self.assertFalse(core_subsets.is_core(0, 0, 2))
+
+        # The extra monitor is left running, so is not loaded again
+        self.assertEqual(len(started_core_subsets), 1)
+        self.assertTrue(started_core_subsets.is_core(0, 0, 1))
+
+        # The application data is written through the extra monitor, with
+        # only the user 0 writes done with SCP
+        self.assertEqual(len(gatherer.regions_written), 1)
+        placement, _, data = gatherer.regions_written[0]
+        self.assertEqual((placement.x, placement.y, placement.p), (0, 0, 1))
+        header_and_table_size = (constants.MAX_MEM_REGIONS + 2) * 4
+        self.assertEqual(data[header_and_table_size:], struct.pack("<I", 2))
+        self.assertEqual(
+            [address for address, _ in transceiver.regions_written],
+            [0, 1000, 1004])
 
 
 if __name__ == "__main__":
@@ -0,0 +1,147 @@
+import struct
+import unittest
+
+from data_specification import constants
+from data_specification import utility_calls
+
+from pacman.model.resources import ResourceContainer
+from pacman.model.placements import Placements, Placement
+from pacman.model.graphs.machine import MachineVertex
+
+from spinn_front_end_common.interface.provenance \
+    import ProvidesProvenanceDataFromMachineImpl
+from spinn_front_end_common.interface.interface_functions \
+    import PlacementsProvenanceGatherer
+from spinn_front_end_common.utilities import globals_variables
+
+_PROVENANCE_REGION = 3
+_USER_0_ADDRESS = 0xE5007000
+
+
+class _TestMachineVertex(
+        MachineVertex, ProvidesProvenanceDataFromMachineImpl):
+    """ A machine vertex with a provenance region
+    """
+
+    @property
+    def resources_required(self):
+        return ResourceContainer()
+
+    @property
+    def _provenance_region_id(self):
+        return _PROVENANCE_REGION
+
+    @property
+    def _n_additional_data_items(self):
+        return 0
+
+
+class _MockCPUInfo(object):
+    """ Pretend CPU information
+    """
+
+
+class _MockTransceiver(object):
+    """ Pretend transceiver which holds the memory of some chips and\
+        counts the reads made of it
+    """
+
+    def __init__(self):
+        self._memory = dict()
+        self.n_reads = 0
+
+    def write(self, x, y, address, data):
+        self._memory[x, y, address] = bytes(data)
+
+    def get_user_0_register_address_from_core(self, p):
+        return _USER_0_ADDRESS + p * 4
+
+    def get_cpu_information_from_core(self, x, y, p):
+        cpu_info = _MockCPUInfo()
+        cpu_info.user = list(struct.unpack("<I", self.read_memory(
+            x, y, self.get_user_0_register_address_from_core(p), 4)))
+        return cpu_info
+
+    def read_memory(self, x, y, base_address, length, cpu=0):
+        self.n_reads += 1
+        result = bytearray(length)
+        for (mx, my, address), data in self._memory.items():
+            if (mx, my) != (x, y):
+                continue
+            for i, byte in enumerate(bytearray(data)):
+                if base_address <= address + i < base_address + length:
+                    result[address + i - base_address] = byte
+        return result
+
+
+class TestPlacementsProvenanceGatherer(unittest.TestCase):
+
+    def setUp(self):
+        globals_variables.region_table_cache().clear()
+
+    def tearDown(self):
+        globals_variables.region_table_cache().clear()
+
+    def test_provenance_is_read_in_bulk(self):
+        transceiver = _MockTransceiver()
+        placements = Placements()
+        app_data_base_addresses = dict()
+        n_words = ProvidesProvenanceDataFromMachineImpl.\
+            NUM_PROVENANCE_DATA_ENTRIES
+        for x, y, n_cores in ((0, 0, 4), (1, 1, 2)):
+            for p in range(1, n_cores + 1):
+                placements.add_placement(Placement(
+                    _TestMachineVertex(label="V{}{}{}".format(x, y, p)),
+                    x, y, p))
+
+                # Each core has a region table and a provenance region
+                base_address = 0x60000000 + p * 0x1000
+                provenance_address = 0x70000000 + p * n_words * 4
+                transceiver.write(
+                    x, y, _USER_0_ADDRESS + p * 4,
+                    struct.pack("<I", base_address))
+                transceiver.write(
+                    x, y, utility_calls.get_region_base_address_offset(
+                        base_address, 0),
+                    struct.pack("<{}I".format(constants.MAX_MEM_REGIONS), *[
+                        provenance_address
+                        if region == _PROVENANCE_REGION else 0
+                        for region in range(constants.MAX_MEM_REGIONS)]))
+                transceiver.write(
+                    x, y, provenance_address, struct.pack(
+                        "<{}I".format(n_words), x, y, p, 0, 0))
+                app_data_base_addresses[x, y, p] = {
+                    "start_address": base_address}
+
+        # The region tables are read once for each core, and then the
+        # provenance of each chip in one read
+        items = PlacementsProvenanceGatherer()(
+            transceiver, placements,
+            processor_to_app_data_base_address=app_data_base_addresses)
+        self.assertEqual(transceiver.n_reads, 6 + 2)
+        self.assertEqual(len(items), 6 * n_words)
+        overflows = sorted(
+            (item.names[0], item.value) for item in items
+            if item.names[-1] == "Times_the_transmission_of_spikes_overran")
+        self.assertEqual(overflows, sorted(
+            ("{}_{}_{}_V{}{}{}".format(x, y, p, x, y, p), x)
+            for x, y, n_cores in ((0, 0, 4), (1, 1, 2))
+            for p in range(1, n_cores + 1)))
+
+        # Once the regions are known, only the provenance is read
+        transceiver.n_reads = 0
+        PlacementsProvenanceGatherer()(
+            transceiver, placements,
+            processor_to_app_data_base_address=app_data_base_addresses)
+        self.assertEqual(transceiver.n_reads, 2)
+
+        # Without anything known, each core still needs two reads
+        globals_variables.region_table_cache().clear()
+        transceiver.n_reads = 0
+        items = PlacementsProvenanceGatherer()(transceiver, placements)
+        self.assertEqual(transceiver.n_reads, 6 * 2 + 2)
+        self.assertEqual(len(items), 6 * n_words)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -66,6 +66,59 @@ class Test(unittest.TestCase):
         self.assertAlmostEqual(
             profile_data.get_mean_ms_per_ts("Test2", 0, 1.0), 0.3)
 
+    def test_segments(self):
+        profile_data = ProfileData({3: "Test"})
+        samples = [
+            _get_clock(0, 0.1), _ENTER_TAG | 3,
+            _get_clock(0, 0.3), _EXIT_TAG | 3,
+            _get_clock(1, 0.5), _ENTER_TAG | 3,
+            _get_clock(1, 0.9), _EXIT_TAG | 3,
+        ]
+        data = bytearray(struct.pack("<{}I".format(len(samples)), *samples))
+
+        # Add the same data as three segments, the last after a gap
+        profile_data.add_data(data)
+        profile_data.add_data(data)
+        profile_data.add_data(data, start_time_ms=4.0)
+
+        self.assertEqual(profile_data.get_n_calls("Test"), 6)
+        self.assertAlmostEqual(profile_data.get_mean_ms("Test"), 0.3)
+        starts = profile_data.get_samples("Test")[ProfileData.START_TIME]
+        for start, expected in zip(starts, [0, 1.4, 1.8, 3.2, 4, 5.4]):
+            self.assertAlmostEqual(start, expected)
+
+        # 6 calls over 6 time steps of 1ms (the last one being 5.0 - 5.8)
+        self.assertAlmostEqual(
+            profile_data.get_mean_n_calls_per_ts("Test", 0, 1.0), 1)
+
+    def test_summarise(self):
+        def profile(duration_ms):
+            samples = [
+                _get_clock(0, 0), _ENTER_TAG | 3,
+                _get_clock(0, duration_ms), _EXIT_TAG | 3,
+                _get_clock(1, 0), _ENTER_TAG | 4,
+                _get_clock(1, 0.5), _EXIT_TAG | 4,
+            ]
+            profile_data = ProfileData({3: "Test", 4: "Test2"})
+            profile_data.add_data(bytearray(
+                struct.pack("<{}I".format(len(samples)), *samples)))
+            return profile_data
+
+        profiles = {
+            (0, 0, 1): profile(0.1), (0, 0, 2): profile(0.2),
+            (1, 0, 1): profile(0.4)}
+        summary = ProfileData.summarise(profiles, 1.0)
+        self.assertEqual(set(summary), {"Test", "Test2"})
+        self.assertEqual(summary["Test"]["n_cores"], 3)
+        self.assertEqual(summary["Test"]["n_calls"], 3)
+        self.assertAlmostEqual(summary["Test"]["mean_ms"], 0.7 / 3)
+        self.assertEqual(summary["Test"]["hottest"], (1, 0, 1))
+        percentiles = summary["Test"]["ms_per_ts_percentiles"]
+        self.assertEqual(set(percentiles), {50, 90, 100})
+        self.assertAlmostEqual(percentiles[50], 0.1)
+        self.assertAlmostEqual(percentiles[100], 0.2)
+        self.assertAlmostEqual(summary["Test2"]["mean_ms"], 0.5)
+
 
 if __name__ == "__main__":
     unittest.main()
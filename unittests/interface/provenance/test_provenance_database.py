@@ -0,0 +1,112 @@
+import os
+import shutil
+import tempfile
+import unittest
+from lxml import etree
+
+from spinn_front_end_common.interface.interface_functions \
+    import ProvenanceXMLWriter, ProvenanceJSONWriter
+from spinn_front_end_common.interface.provenance import ProvenanceDatabase
+from spinn_front_end_common.utilities.utility_objs import ProvenanceDataItem
+
+
+def _items():
+    for core in range(10):
+        core_name = "0_0_{}_core".format(core)
+        yield ProvenanceDataItem(
+            [core_name, "Times_the_timer_tic_over_ran"], core,
+            report=core == 3, message="Overran on {}".format(core))
+        yield ProvenanceDataItem(
+            [core_name, "routing", "dropped_packets"], core * 2)
+    yield ProvenanceDataItem(["version_data", "numpy_version"], "1.2.3")
+
+
+class TestProvenanceDatabase(unittest.TestCase):
+
+    def setUp(self):
+        self._folder = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self._folder)
+
+    def _database(self):
+        return ProvenanceDatabase(
+            os.path.join(self._folder, "provenance.sqlite3"), batch_size=4)
+
+    def test_items_written_in_batches(self):
+        with self._database() as database:
+            database.extend(_items())
+
+            # The items come back as they were added
+            items = list(database)
+            self.assertEqual(len(database), 21)
+            self.assertEqual(
+                [item.names for item in items],
+                [item.names for item in _items()])
+            self.assertEqual(
+                [item.value for item in items],
+                [item.value for item in _items()])
+
+            # The database can be queried
+            self.assertEqual(
+                [item.message for item in database.get_warnings()],
+                ["Overran on 3"])
+            self.assertEqual(database.get_totals(), {
+                "Times_the_timer_tic_over_ran": 45, "dropped_packets": 90})
+            self.assertEqual(
+                database.get_totals("0_0_2_core")["dropped_packets"], 4)
+            self.assertEqual(
+                [item.value for item in database.get_items("version_data")],
+                ["1.2.3"])
+
+    def test_reopened_after_close(self):
+        database = self._database()
+        database.extend(_items())
+        database.close()
+        self.assertIsNone(database._connection)
+
+        # More runs add to the same database, opening it again
+        database.append(ProvenanceDataItem(["0_0_3_core", "late"], 1, True))
+        database.close()
+        self.assertEqual(len(database), 22)
+        self.assertEqual(len(list(database.get_warnings())), 2)
+        database.close()
+        self.assertIsNone(database._connection)
+
+    def test_writers_read_the_database(self):
+        with self._database() as database:
+            database.extend(_items())
+            ProvenanceXMLWriter()(database, self._folder)
+            ProvenanceJSONWriter()(database, self._folder)
+        files = os.listdir(self._folder)
+        self.assertIn("0_0_5_core.xml", files)
+
+        root = etree.parse(
+            os.path.join(self._folder, "0_0_5_core.xml")).getroot()
+        self.assertEqual(root.get("name"), "0_0_5_core")
+        self.assertEqual(
+            [(element.get("name"), element.text)
+             for element in root.iter("provenance_data_item")],
+            [("Times_the_timer_tic_over_ran", "5"),
+             ("dropped_packets", "10")])
+        self.assertEqual(
+            root.find("provenance_data_items").get("name"), "routing")
+
+    def test_writers_are_the_same_for_lists_and_databases(self):
+        list_folder = os.path.join(self._folder, "list")
+        database_folder = os.path.join(self._folder, "database")
+        os.makedirs(list_folder)
+        os.makedirs(database_folder)
+        ProvenanceXMLWriter()(list(_items()), list_folder)
+        with self._database() as database:
+            database.extend(_items())
+            ProvenanceXMLWriter()(database, database_folder)
+        for name in os.listdir(list_folder):
+            with open(os.path.join(list_folder, name)) as f:
+                from_list = f.read()
+            with open(os.path.join(database_folder, name)) as f:
+                self.assertEqual(from_list, f.read())
+
+
+if __name__ == "__main__":
+    unittest.main()
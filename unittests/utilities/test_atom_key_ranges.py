@@ -0,0 +1,50 @@
+import unittest
+
+from spinn_front_end_common.utilities.database import AtomKeyRanges
+
+
+class TestAtomKeyRanges(unittest.TestCase):
+
+    def test_compress(self):
+        mapping = [(i, 0x1000 + i) for i in range(10)]
+        mapping += [(i, 0x2000 + i - 10) for i in range(10, 15)]
+        mapping += [(15, 0x3005), (16, 0x3001)]
+        self.assertEqual(list(AtomKeyRanges.compress(mapping)), [
+            (0x1000, 0, 10), (0x2000, 10, 5), (0x3005, 15, 1),
+            (0x3001, 16, 1)])
+        self.assertEqual(list(AtomKeyRanges.compress([])), [])
+
+    def test_lookup(self):
+        mapping = [(i, 0x2000 + i) for i in range(20)]
+        mapping += [(i, 0x1000 + i - 20) for i in range(20, 30)]
+        mapping += [(30, 0x1800)]
+        ranges = AtomKeyRanges(AtomKeyRanges.compress(mapping))
+        self.assertEqual(ranges.n_ranges, 3)
+        self.assertEqual(ranges.n_atoms, len(mapping))
+        for atom_id, key in mapping:
+            self.assertEqual(ranges.get_atom_id(key), atom_id)
+            self.assertEqual(ranges.get_key(atom_id), key)
+        self.assertEqual(
+            sorted(ranges.iter_atom_ids_and_keys()), sorted(mapping))
+
+        # Keys in the gaps between ranges, and atoms outside, are not found
+        for key in (0, 0x100A, 0x17FF, 0x1801, 0x2014):
+            self.assertIsNone(ranges.get_atom_id(key))
+        for atom_id in (-1, 31):
+            with self.assertRaises(KeyError):
+                ranges.get_key(atom_id)
+
+    def test_get_keys(self):
+        ranges = AtomKeyRanges([(0x2000, 0, 20), (0x1000, 20, 10)])
+        self.assertEqual(
+            list(ranges.get_keys([25, 0, 19, 20])),
+            [0x1005, 0x2000, 0x2013, 0x1000])
+        self.assertEqual(len(ranges.get_keys([])), 0)
+        with self.assertRaises(KeyError):
+            ranges.get_keys([0, 30])
+        with self.assertRaises(KeyError):
+            AtomKeyRanges([]).get_keys([0])
+
+
+if __name__ == "__main__":
+    unittest.main()
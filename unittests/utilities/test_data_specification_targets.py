@@ -0,0 +1,54 @@
+import shutil
+import tempfile
+import unittest
+
+from spinn_front_end_common.utilities.utility_objs \
+    import DataSpecificationTargets
+
+
+class TestDataSpecificationTargets(unittest.TestCase):
+
+    def setUp(self):
+        self._folder = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self._folder)
+
+    def test_in_memory(self):
+        targets = DataSpecificationTargets(self._folder)
+        targets[0, 0, 1] = b"abc"
+        targets[0, 0, 2] = b"defg"
+        self.assertEqual(len(targets), 2)
+        self.assertEqual(targets[0, 0, 2], b"defg")
+        self.assertEqual(targets.get_reader((0, 0, 1)).read(), b"abc")
+        self.assertEqual(targets.memory_used, 7)
+        self.assertEqual(targets.n_in_archive, 0)
+        targets.close()
+
+    def test_spills_to_archive(self):
+        targets = DataSpecificationTargets(self._folder, memory_limit=10)
+        data = dict()
+        for p in range(1, 6):
+            data[0, 0, p] = bytes(bytearray([p] * 4))
+            targets[0, 0, p] = data[0, 0, p]
+
+        # Only two fit in memory, and the rest are in the archive
+        self.assertEqual(targets.memory_used, 8)
+        self.assertEqual(targets.n_in_archive, 3)
+        self.assertEqual(list(targets), sorted(data))
+        self.assertEqual(dict(targets.items()), data)
+
+        # Replacing a data spec held in memory frees its space
+        targets[0, 0, 1] = b"x"
+        self.assertEqual(targets[0, 0, 1], b"x")
+        self.assertEqual(targets.memory_used, 5)
+        del targets[0, 0, 2]
+        self.assertNotIn((0, 0, 2), targets)
+        self.assertEqual(targets.memory_used, 1)
+        self.assertEqual(targets[0, 0, 5], data[0, 0, 5])
+        targets.close()
+        self.assertEqual(len(targets), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+from spinn_machine.virtual_machine import VirtualMachine
+
+from pacman.model.graphs.machine \
+    import MachineEdge, MachineGraph, MachineVertex
+from pacman.model.placements import Placement, Placements
+from pacman.model.resources import ResourceContainer
+from pacman.model.tags import Tags
+
+from spinn_front_end_common.abstract_models \
+    import AbstractProvidesKeyToAtomMapping
+from spinn_front_end_common.utilities.database import DatabaseWriter
+
+
+class _TestMachineVertex(MachineVertex):
+    """ A simple machine vertex for testing
+    """
+
+    @property
+    def resources_required(self):
+        return ResourceContainer()
+
+
+class _TestKeyToAtomVertex(
+        _TestMachineVertex, AbstractProvidesKeyToAtomMapping):
+    """ A machine vertex with some regular and some irregular keys
+    """
+
+    MAPPING = [(i, 0x1000 + i) for i in range(100)] + [
+        (100, 0x2000), (101, 0x2002)]
+
+    def routing_key_partition_atom_mapping(self, routing_info, partition):
+        return self.MAPPING
+
+
+class _TestIrregularKeyToAtomVertex(
+        _TestMachineVertex, AbstractProvidesKeyToAtomMapping):
+    """ A machine vertex whose keys do not form ranges
+    """
+
+    MAPPING = [(i, 0x3000 + 2 * i) for i in range(10)]
+
+    def routing_key_partition_atom_mapping(self, routing_info, partition):
+        return self.MAPPING
+
+
+class _TestRoutingInfos(object):
+    """ Pretend routing information
+    """
+
+    def get_routing_info_from_partition(self, partition):
+        return None
+
+
+class TestDatabaseWriter(unittest.TestCase):
+
+    def setUp(self):
+        self._folder = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self._folder)
+
+    def test_bulk_insert(self):
+        machine = VirtualMachine(2, 2)
+        n_processors = sum(
+            len(list(chip.processors)) for chip in machine.chips)
+        graph = MachineGraph("Test")
+        vertices = [_TestMachineVertex(label="V{}".format(i))
+                    for i in range(10)]
+        for vertex in vertices:
+            graph.add_vertex(vertex)
+        placements = Placements([
+            Placement(vertex, 0, 0, i + 1)
+            for i, vertex in enumerate(vertices)])
+
+        writer = DatabaseWriter(self._folder)
+        with writer as w:
+            w.add_system_params(1, 1000, None)
+            w.add_machine_objects(machine)
+            w.add_vertices(graph, None, None)
+            w.add_placements(placements)
+            w.add_tags(graph, Tags())
+
+        with sqlite3.connect(writer.database_path) as db:
+            self.assertEqual(db.execute(
+                "SELECT COUNT(*) FROM Processor").fetchone()[0], n_processors)
+            self.assertEqual(db.execute(
+                "SELECT v.label FROM Placements AS p"
+                " JOIN Machine_vertices AS v ON p.vertex_id = v.vertex_id"
+                " WHERE p.chip_p = 3").fetchone()[0], "V2")
+
+            # The indexes are created once everything is written
+            indexes = {row[0] for row in db.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index'")}
+            self.assertIn("machine_vertex_label", indexes)
+
+        statistics = writer.table_statistics
+        self.assertEqual(statistics["Processor"][0], n_processors)
+        self.assertEqual(statistics["Placements"][0], len(vertices))
+        self.assertEqual(statistics["Machine_vertices"][0], len(vertices))
+        self.assertEqual(statistics["IP_tags"][0], 0)
+
+    def _write_atom_to_event_id_mapping(self, **kwargs):
+        graph = MachineGraph("Test")
+        regular = _TestKeyToAtomVertex(label="Source")
+        irregular = _TestIrregularKeyToAtomVertex(label="Irregular")
+        target = _TestMachineVertex(label="Target")
+        graph.add_vertex(regular)
+        graph.add_vertex(irregular)
+        graph.add_vertex(target)
+        graph.add_edge(MachineEdge(regular, target), "Spikes")
+        graph.add_edge(MachineEdge(irregular, target), "Spikes")
+
+        writer = DatabaseWriter(self._folder, **kwargs)
+        with writer as w:
+            w.add_vertices(graph, None, None)
+            w.create_atom_to_event_id_mapping(
+                None, graph, _TestRoutingInfos(), None)
+        with sqlite3.connect(writer.database_path) as db:
+            return writer, sorted(db.execute(
+                "SELECT atom_id, event_id FROM event_to_atom_mapping"))
+
+    def test_atom_to_event_id_ranges(self):
+        writer, mapping = self._write_atom_to_event_id_mapping()
+
+        # The regular keys are stored as one range; only the vertex whose
+        # keys do not form ranges is also written atom by atom
+        self.assertEqual(
+            writer.table_statistics["event_to_atom_ranges"][0],
+            3 + len(_TestIrregularKeyToAtomVertex.MAPPING))
+        self.assertEqual(mapping, _TestIrregularKeyToAtomVertex.MAPPING)
+
+    def test_atom_to_event_id_mapping_of_every_vertex(self):
+        _, mapping = self._write_atom_to_event_id_mapping(
+            write_atom_to_event_mapping=True)
+        self.assertEqual(mapping, sorted(
+            _TestKeyToAtomVertex.MAPPING +
+            _TestIrregularKeyToAtomVertex.MAPPING))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,161 @@
+import random
+import unittest
+
+from spinn_front_end_common.utilities.utility_objs import \
+    AdaptiveExtractionPathPolicy, FixedThresholdExtractionPathPolicy
+
+_THRESHOLD = 40000
+
+
+class _SimulatedTransceiver(object):
+    """ Pretend transceiver which only models how long reads take, as a\
+        latency plus a time per byte for each path, with each router hop\
+        adding to the latency of the fast path
+    """
+
+    def __init__(self, scp_latency, scp_throughput, fast_latency,
+                 fast_throughput, fast_latency_per_hop, noise=0.1, seed=0):
+        self._scp = (scp_latency, scp_throughput)
+        self._fast = (fast_latency, fast_throughput)
+        self._fast_latency_per_hop = fast_latency_per_hop
+        self._noise = noise
+        self._random = random.Random(seed)
+
+    def expected_time(self, fast, length_in_bytes, n_hops):
+        if fast:
+            latency, throughput = self._fast
+            latency += self._fast_latency_per_hop * n_hops
+        else:
+            latency, throughput = self._scp
+        return latency + length_in_bytes / float(throughput)
+
+    def read(self, fast, length_in_bytes, n_hops):
+        return self.expected_time(fast, length_in_bytes, n_hops) * \
+            self._random.uniform(1.0 - self._noise, 1.0 + self._noise)
+
+
+def _benchmark(policy, transceiver, n_reads=2000, seed=1):
+    """ Run a series of reads of random sizes and distances through a\
+        policy, returning the total time taken
+    """
+    rng = random.Random(seed)
+    total = 0.0
+    for _ in range(n_reads):
+        length_in_bytes = rng.randint(1000, 200000)
+        n_hops = rng.randint(0, 6)
+        fast = policy.use_fast_path(length_in_bytes, n_hops)
+        time_taken = transceiver.read(fast, length_in_bytes, n_hops)
+        policy.record(fast, length_in_bytes, n_hops, time_taken)
+        total += time_taken
+    return total
+
+
+def _best_possible(transceiver, n_reads=2000, seed=1):
+    rng = random.Random(seed)
+    total = 0.0
+    for _ in range(n_reads):
+        length_in_bytes = rng.randint(1000, 200000)
+        n_hops = rng.randint(0, 6)
+        total += min(
+            transceiver.expected_time(True, length_in_bytes, n_hops),
+            transceiver.expected_time(False, length_in_bytes, n_hops))
+    return total
+
+
+class TestExtractionPathPolicy(unittest.TestCase):
+
+    def test_fixed_threshold(self):
+        policy = FixedThresholdExtractionPathPolicy(_THRESHOLD)
+        self.assertFalse(policy.use_fast_path(_THRESHOLD - 1, 0))
+        self.assertTrue(policy.use_fast_path(_THRESHOLD, 0))
+        policy.record(True, _THRESHOLD, 0, 100.0)
+        self.assertTrue(policy.use_fast_path(_THRESHOLD, 0))
+
+    def test_adaptive_starts_at_threshold(self):
+        policy = AdaptiveExtractionPathPolicy(_THRESHOLD)
+        for n_hops in range(4):
+            self.assertFalse(policy.use_fast_path(_THRESHOLD // 2, n_hops))
+            self.assertTrue(policy.use_fast_path(_THRESHOLD * 2, n_hops))
+            self.assertEqual(policy.n_observations(True, n_hops), 0)
+
+    def test_adaptive_learns_crossover(self):
+        # The fast path has a crossover of about 20000 bytes next to the
+        # Ethernet chip and further away with more hops
+        transceiver = _SimulatedTransceiver(
+            scp_latency=0.001, scp_throughput=2e6, fast_latency=0.01,
+            fast_throughput=2e7, fast_latency_per_hop=0.01)
+        policy = AdaptiveExtractionPathPolicy(_THRESHOLD)
+        _benchmark(policy, transceiver)
+        self.assertLess(10000, policy.crossover(0))
+        self.assertLess(policy.crossover(0), 30000)
+        self.assertLess(100000, policy.crossover(6))
+        self.assertLess(policy.crossover(6), 190000)
+        self.assertFalse(policy.use_fast_path(5000, 0))
+        self.assertTrue(policy.use_fast_path(500000, 6))
+
+    def test_adaptive_beats_fixed_threshold(self):
+        transceiver = _SimulatedTransceiver(
+            scp_latency=0.001, scp_throughput=2e6, fast_latency=0.01,
+            fast_throughput=2e7, fast_latency_per_hop=0.01)
+        fixed = _benchmark(
+            FixedThresholdExtractionPathPolicy(_THRESHOLD), transceiver)
+        adaptive = _benchmark(
+            AdaptiveExtractionPathPolicy(_THRESHOLD), transceiver)
+        best = _best_possible(transceiver)
+        self.assertLess(adaptive, fixed)
+        self.assertLess(adaptive, best * 1.1)
+
+    def test_one_outlier_does_not_invert(self):
+        sizes = [1000, 50000, 1000000, 100000000]
+        policy = AdaptiveExtractionPathPolicy(_THRESHOLD, explore_interval=0)
+        before = [policy.use_fast_path(size, 0) for size in sizes]
+        self.assertEqual(before, [False, True, True, True])
+
+        # One very slow read through the fast path, e.g. a retransmission
+        policy.record(True, 1000000, 0, 2.0)
+        self.assertEqual(
+            [policy.use_fast_path(size, 0) for size in sizes], before)
+
+    def test_crossover_is_bounded(self):
+        policy = AdaptiveExtractionPathPolicy(
+            _THRESHOLD, max_crossover_shift=8.0, explore_interval=0)
+        for _ in range(100):
+            policy.record(True, 1000000, 0, 100.0)
+        self.assertEqual(policy.crossover(0), _THRESHOLD * 8.0)
+        self.assertFalse(policy.use_fast_path(_THRESHOLD, 0))
+        self.assertTrue(policy.use_fast_path(_THRESHOLD * 8, 0))
+        self.assertTrue(policy.use_fast_path(100000000, 0))
+        for _ in range(100):
+            policy.record(False, 1000000, 0, 100.0)
+        self.assertEqual(policy.crossover(0), _THRESHOLD / 8.0)
+        self.assertFalse(policy.use_fast_path(_THRESHOLD / 8 - 1, 0))
+
+    def test_recovers_from_slow_reads(self):
+        # The fast path is slow for a while, then back to normal
+        transceiver = _SimulatedTransceiver(
+            scp_latency=0.001, scp_throughput=2e6, fast_latency=0.01,
+            fast_throughput=2e7, fast_latency_per_hop=0.0)
+        policy = AdaptiveExtractionPathPolicy(_THRESHOLD)
+        for _ in range(20):
+            policy.record(True, 100000, 0, 10.0)
+        self.assertFalse(policy.use_fast_path(100000, 0))
+        _benchmark(policy, transceiver)
+        self.assertLess(10000, policy.crossover(0))
+        self.assertLess(policy.crossover(0), 30000)
+
+    def test_explores_near_crossover(self):
+        policy = AdaptiveExtractionPathPolicy(
+            _THRESHOLD, explore_interval=4, explore_range=2.0)
+        decisions = [
+            policy.use_fast_path(_THRESHOLD * 3 // 2, 0) for _ in range(8)]
+        self.assertEqual(decisions, [True, True, True, False] * 2)
+
+        # Reads far from the crossover are never sent the other way
+        self.assertTrue(all(
+            policy.use_fast_path(_THRESHOLD * 100, 0) for _ in range(8)))
+        self.assertFalse(any(
+            policy.use_fast_path(_THRESHOLD // 100, 0) for _ in range(8)))
+
+
+if __name__ == "__main__":
+    unittest.main()
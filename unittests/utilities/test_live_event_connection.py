@@ -0,0 +1,117 @@
+import numpy
+import unittest
+
+from spinnman.messages.eieio import EIEIOPrefix, EIEIOType
+from spinnman.messages.eieio.data_messages \
+    import EIEIODataHeader, EIEIODataMessage
+
+from spinn_front_end_common.utilities.connections.live_event_connection \
+    import _decode_eieio_data, _encode_eieio_data, _KeyToAtomLookup
+from spinn_front_end_common.utilities.database import AtomKeyRanges
+
+
+def _encode_by_message(eieio_type, keys, max_keys):
+    """ Encode keys one by one into messages, as events used to be sent
+    """
+    packets = list()
+    for start in range(0, len(keys), max_keys):
+        message = EIEIODataMessage.create(eieio_type)
+        for key in keys[start:start + max_keys]:
+            message.add_key(key)
+        packets.append(message.bytestring)
+    return packets
+
+
+class TestLiveEventConnection(unittest.TestCase):
+
+    def test_decode_keys(self):
+        message = EIEIODataMessage.create(EIEIOType.KEY_32_BIT)
+        for key in (0x1000, 0x1001, 0x2005):
+            message.add_key(key)
+        keys, payloads, is_time = _decode_eieio_data(message.bytestring)
+        self.assertEqual(list(keys), [0x1000, 0x1001, 0x2005])
+        self.assertIsNone(payloads)
+        self.assertFalse(is_time)
+
+    def test_decode_prefixed_half_keys(self):
+        message = EIEIODataMessage.create(
+            EIEIOType.KEY_16_BIT, key_prefix=0x12,
+            prefix_type=EIEIOPrefix.UPPER_HALF_WORD)
+        for key in (1, 2, 3):
+            message.add_key(key)
+        keys, _, _ = _decode_eieio_data(message.bytestring)
+        self.assertEqual(list(keys), [0x120001, 0x120002, 0x120003])
+
+    def test_decode_timed_payloads(self):
+        message = EIEIODataMessage(EIEIODataHeader(
+            EIEIOType.KEY_PAYLOAD_32_BIT, is_time=True))
+        message.add_key_and_payload(0x1000, 10)
+        message.add_key_and_payload(0x1003, 11)
+        keys, payloads, is_time = _decode_eieio_data(message.bytestring)
+        self.assertEqual(list(keys), [0x1000, 0x1003])
+        self.assertEqual(list(payloads), [10, 11])
+        self.assertTrue(is_time)
+
+    def test_decode_timestamp(self):
+        message = EIEIODataMessage.create(
+            EIEIOType.KEY_32_BIT, timestamp=100)
+        message.add_key(0x1000)
+        message.add_key(0x1001)
+        keys, payloads, is_time = _decode_eieio_data(message.bytestring)
+        self.assertEqual(list(keys), [0x1000, 0x1001])
+        self.assertEqual(list(payloads), [100, 100])
+        self.assertTrue(is_time)
+
+    def test_encode_keys(self):
+        keys = numpy.arange(0x10000, 0x10000 + 200)
+        packets = _encode_eieio_data(EIEIOType.KEY_32_BIT, keys)
+        self.assertEqual([len(data) for data in packets],
+                         [2 + 63 * 4] * 3 + [2 + 11 * 4])
+        self.assertEqual(
+            list(bytes(packets[-1])),
+            list(_encode_by_message(
+                EIEIOType.KEY_32_BIT, keys[189:].tolist(), 63)[0]))
+        decoded = numpy.concatenate([
+            _decode_eieio_data(bytes(data))[0] for data in packets])
+        self.assertEqual(decoded.tolist(), keys.tolist())
+
+    def test_encode_keys_and_payloads(self):
+        keys = list(range(100))
+        payloads = [key * 2 for key in keys]
+        packets = _encode_eieio_data(
+            EIEIOType.KEY_PAYLOAD_16_BIT, keys, payloads)
+        self.assertEqual(len(packets), 2)
+        decoded = [_decode_eieio_data(bytes(data)) for data in packets]
+        self.assertEqual(
+            numpy.concatenate([d[0] for d in decoded]).tolist(), keys)
+        self.assertEqual(
+            numpy.concatenate([d[1] for d in decoded]).tolist(), payloads)
+        self.assertEqual(_encode_eieio_data(EIEIOType.KEY_16_BIT, []), [])
+        with self.assertRaises(ValueError):
+            _encode_eieio_data(EIEIOType.KEY_16_BIT, [0x10000])
+
+    def test_key_to_atom_lookup(self):
+        lookup = _KeyToAtomLookup([
+            (AtomKeyRanges([(0x1000, 0, 10)]), 0),
+            (AtomKeyRanges([(0x2000, 0, 5), (0x2010, 5, 5)]), 1)])
+        self.assertEqual(lookup.get(0x1003), (3, 0))
+        self.assertEqual(lookup.get(0x2012), (7, 1))
+        self.assertIsNone(lookup.get(0x200A))
+        self.assertIsNone(lookup.get(0x10))
+
+        keys = [0x10, 0x1009, 0x2004, 0x2005, 0x2010]
+        atom_ids, label_ids, found = lookup.lookup(
+            numpy.array(keys, dtype="uint32"))
+        self.assertEqual(list(found), [False, True, True, False, True])
+        self.assertEqual(list(atom_ids[found]), [9, 4, 5])
+        self.assertEqual(list(label_ids[found]), [0, 1, 1])
+
+    def test_empty_lookup(self):
+        lookup = _KeyToAtomLookup([])
+        self.assertIsNone(lookup.get(1))
+        _, _, found = lookup.lookup(numpy.array([1, 2], dtype="uint32"))
+        self.assertFalse(found.any())
+
+
+if __name__ == "__main__":
+    unittest.main()
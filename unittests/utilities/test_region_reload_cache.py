@@ -0,0 +1,69 @@
+import unittest
+
+from spinn_front_end_common.utilities.utility_objs import RegionReloadCache
+
+
+class TestRegionReloadCache(unittest.TestCase):
+
+    def test_first_write_is_whole_region(self):
+        cache = RegionReloadCache()
+        data = bytes(bytearray(range(100)))
+        self.assertEqual(cache.get_changed_spans(0, 0, 1, 2, data),
+                         [(0, data)])
+
+    def test_unchanged_region_is_not_written(self):
+        cache = RegionReloadCache()
+        data = bytes(bytearray(range(100)))
+        cache.get_changed_spans(0, 0, 1, 2, data)
+        self.assertEqual(cache.get_changed_spans(0, 0, 1, 2, data), [])
+
+        # Other cores and regions are separate
+        self.assertEqual(cache.get_changed_spans(0, 0, 2, 2, data),
+                         [(0, data)])
+        self.assertEqual(cache.get_changed_spans(0, 0, 1, 3, data),
+                         [(0, data)])
+
+    def test_changed_spans(self):
+        cache = RegionReloadCache(merge_gap=8)
+        data = bytearray(1000)
+        cache.get_changed_spans(0, 0, 1, 0, data)
+        data[10] = 1
+        data[14] = 2
+        data[500:504] = b"abcd"
+        self.assertEqual(cache.get_changed_spans(0, 0, 1, 0, data), [
+            (10, b"\x01\x00\x00\x00\x02"), (500, b"abcd")])
+
+    def test_growing_region(self):
+        cache = RegionReloadCache(merge_gap=4)
+        cache.get_changed_spans(0, 0, 1, 0, b"abcdefgh" * 4)
+        self.assertEqual(
+            cache.get_changed_spans(0, 0, 1, 0, b"abcdefgh" * 4 + b"ij"),
+            [(32, b"ij")])
+        self.assertEqual(
+            cache.get_changed_spans(0, 0, 1, 0, b"Abcdefgh" * 4 + b"ij"),
+            [(0, b"A"), (8, b"A"), (16, b"A"), (24, b"A")])
+        cache = RegionReloadCache(merge_gap=8)
+        cache.get_changed_spans(0, 0, 1, 0, b"abcdefgh" * 2)
+        self.assertEqual(
+            cache.get_changed_spans(0, 0, 1, 0, b"Abcdefgh" * 2),
+            [(0, b"AbcdefghA")])
+
+    def test_without_data_cache(self):
+        cache = RegionReloadCache(cache_data=False)
+        cache.get_changed_spans(0, 0, 1, 0, b"abcd")
+        self.assertEqual(cache.get_changed_spans(0, 0, 1, 0, b"abcd"),
+                         [(0, b"abcd")])
+
+    def test_clear_data_keeps_addresses(self):
+        cache = RegionReloadCache()
+        self.assertIsNone(cache.get_region_addresses(0, 0, 1))
+        cache.set_region_addresses(0, 0, 1, [100, 200])
+        cache.get_changed_spans(0, 0, 1, 0, b"abcd")
+        cache.clear_data()
+        self.assertEqual(cache.get_region_addresses(0, 0, 1), (100, 200))
+        self.assertEqual(cache.get_changed_spans(0, 0, 1, 0, b"abcd"),
+                         [(0, b"abcd")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+import struct
+import unittest
+
+from data_specification.constants import MAX_MEM_REGIONS
+from data_specification.utility_calls import get_region_base_address_offset
+
+from pacman.model.placements import Placement
+
+from spinn_front_end_common.utilities import globals_variables
+from spinn_front_end_common.utilities.helpful_functions \
+    import locate_memory_region_for_placement
+from spinn_front_end_common.utilities.utility_objs \
+    import RegionReloadCache, RegionTableCache
+
+
+class _MockCPUInfo(object):
+    """ Pretend CPU information
+    """
+
+    def __init__(self, user_0):
+        self.user = [user_0]
+
+
+class _MockTransceiver(object):
+    """ Pretend transceiver where each core has a region table at an\
+        address given by its core ID
+    """
+
+    def __init__(self):
+        self.n_user_0_reads = 0
+        self.n_reads = 0
+
+    def get_cpu_information_from_core(self, x, y, p):
+        self.n_user_0_reads += 1
+        return _MockCPUInfo(p * 0x10000)
+
+    def read_memory(self, x, y, base_address, length, cpu=0):
+        self.n_reads += 1
+        if length == 4:
+            return struct.pack("<I", base_address)
+        return struct.pack("<{}I".format(MAX_MEM_REGIONS), *[
+            base_address + 0x100 * region
+            for region in range(MAX_MEM_REGIONS)])
+
+
+class TestRegionTableCache(unittest.TestCase):
+
+    def test_region_table_read_once(self):
+        transceiver = _MockTransceiver()
+        cache = RegionTableCache()
+        table = get_region_base_address_offset(3 * 0x10000, 0)
+        for region in range(MAX_MEM_REGIONS):
+            self.assertEqual(
+                cache.read_region_address(transceiver, 0, 0, 3, region),
+                table + 0x100 * region)
+        self.assertEqual(transceiver.n_user_0_reads, 1)
+        self.assertEqual(transceiver.n_reads, 1)
+        self.assertEqual(cache.n_misses, 1)
+        self.assertEqual(cache.n_hits, MAX_MEM_REGIONS - 1)
+
+        # Once invalidated, the table is read again
+        cache.invalidate(0, 0, 3)
+        cache.read_region_address(transceiver, 0, 0, 3, 0)
+        self.assertEqual(transceiver.n_reads, 2)
+
+    def test_known_base_address_and_table(self):
+        transceiver = _MockTransceiver()
+        cache = RegionTableCache()
+        addresses = cache.read_region_addresses(
+            transceiver, 0, 0, 1, base_address=0x60000000)
+        self.assertEqual(
+            addresses[0], get_region_base_address_offset(0x60000000, 0))
+        self.assertEqual(transceiver.n_user_0_reads, 0)
+
+        # A table given by the loader needs no reading at all
+        cache.set_region_addresses(0, 0, 2, range(MAX_MEM_REGIONS))
+        self.assertEqual(
+            cache.read_region_address(transceiver, 0, 0, 2, 5), 5)
+        self.assertEqual(transceiver.n_reads, 1)
+
+    def test_words(self):
+        transceiver = _MockTransceiver()
+        cache = RegionTableCache()
+        cache.read_region_addresses(transceiver, 0, 0, 1)
+        self.assertEqual(cache.read_word(transceiver, 0, 0, 0x1234), 0x1234)
+        self.assertEqual(cache.read_word(transceiver, 0, 0, 0x1234), 0x1234)
+        self.assertEqual(transceiver.n_reads, 2)
+
+        # Zero is not yet written, so is read again
+        cache.read_word(transceiver, 0, 0, 0)
+        cache.read_word(transceiver, 0, 0, 0)
+        self.assertEqual(transceiver.n_reads, 4)
+
+        # Clearing the words keeps the region tables
+        cache.clear_words()
+        cache.read_word(transceiver, 0, 0, 0x1234)
+        cache.read_region_addresses(transceiver, 0, 0, 1)
+        self.assertEqual(transceiver.n_reads, 5)
+        cache.clear()
+        cache.read_region_addresses(transceiver, 0, 0, 1)
+        self.assertEqual(transceiver.n_reads, 6)
+
+    def test_shared_by_reload_cache_and_helpers(self):
+        transceiver = _MockTransceiver()
+        shared = globals_variables.region_table_cache()
+        shared.clear()
+        reload_cache = RegionReloadCache(region_table_cache=shared)
+        reload_cache.set_region_addresses(0, 0, 4, range(MAX_MEM_REGIONS))
+        self.assertEqual(locate_memory_region_for_placement(
+            Placement(None, 0, 0, 4), 7, transceiver), 7)
+        self.assertEqual(transceiver.n_reads, 0)
+        shared.clear()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+
+from spinn_front_end_common.utilities.utility_objs import \
+    SegmentPlanner, SegmentTimings
+
+_N_STEPS_IN_BUFFERS = 100
+
+
+def _segment(core_bytes, read_time_during_run_ms=10.0):
+    # 100 time steps of 1ms each
+    return SegmentTimings(
+        100, 100.0, 10.0, 5.0,
+        sum(n_bytes_read for n_bytes_read, _ in core_bytes.values()),
+        read_time_during_run_ms,
+        sum(n_bytes_extracted for _, n_bytes_extracted in core_bytes.values()),
+        core_bytes)
+
+
+class TestSegmentPlanner(unittest.TestCase):
+
+    def test_first_segment(self):
+        planner = SegmentPlanner(_N_STEPS_IN_BUFFERS)
+        self.assertEqual(planner.next_segment(1000), 100)
+        self.assertEqual(planner.next_segment(30), 30)
+
+    def test_reading_keeps_up(self):
+        planner = SegmentPlanner(_N_STEPS_IN_BUFFERS)
+        planner.add_segment(_segment({(0, 0, 1): (1000, 100)}))
+        self.assertEqual(planner.next_segment(1000), 200)
+        self.assertEqual(planner.next_segment(150), 150)
+        self.assertEqual(len(planner.segments), 1)
+
+        # How long the reads took does not matter, only how much of what
+        # was recorded during the run was read during the run
+        planner.add_segment(_segment({(0, 0, 1): (1000, 0)}, 100000.0))
+        self.assertEqual(planner.next_segment(1000), 200)
+
+    def test_reading_falls_behind(self):
+        # One core records 1100 bytes in 100ms, but only 500 are read while
+        # running, so its buffers fill at 6 bytes per ms rather than 11; the
+        # other core keeps up, but does not make up for it
+        planner = SegmentPlanner(_N_STEPS_IN_BUFFERS, safety_factor=0.8)
+        planner.add_segment(_segment({
+            (0, 0, 1): (1000, 100), (0, 0, 2): (500, 600)}))
+        self.assertEqual(planner.next_segment(1000), 146)
+
+        # Reading far too slowly to help leaves the buffer size
+        planner.add_segment(_segment({(0, 0, 1): (10, 1000)}))
+        self.assertEqual(planner.next_segment(1000), 100)
+
+    def test_nothing_read_during_run(self):
+        planner = SegmentPlanner(_N_STEPS_IN_BUFFERS)
+        planner.add_segment(_segment({(0, 0, 1): (0, 1000)}))
+        self.assertEqual(planner.next_segment(1000), 100)
+
+        # A core which is not read while running keeps the buffer size
+        planner.add_segment(_segment({
+            (0, 0, 1): (1000, 0), (0, 0, 2): (0, 100)}))
+        self.assertEqual(planner.next_segment(1000), 100)
+
+        planner.add_segment(_segment({}))
+        self.assertEqual(planner.next_segment(1000), 100)
+
+    def test_idle_time(self):
+        segment = _segment({(0, 0, 1): (1000, 100)})
+        self.assertEqual(segment.machine_idle_time_ms, 15.0)
+        self.assertEqual(segment.n_bytes_read_during_run, 1000)
+        self.assertEqual(segment.n_bytes_extracted, 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
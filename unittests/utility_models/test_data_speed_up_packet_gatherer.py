@@ -0,0 +1,535 @@
+import numpy
+import struct
+import tempfile
+import unittest
+from collections import Counter
+
+from pacman.model.placements import Placement
+
+from spinnman.exceptions import SpinnmanTimeoutException
+from spinnman.messages.sdp import SDPMessage, SDPHeader
+
+from spinn_front_end_common.utility_models import \
+    DataSpeedUpPacketGatherMachineVertex
+from spinn_front_end_common.utilities.utility_objs import \
+    FixedThresholdExtractionPathPolicy
+
+_VERTEX = DataSpeedUpPacketGatherMachineVertex
+
+# words of data in each packet of a stream, after the sequence number
+_WORDS_PER_PACKET = _VERTEX.DATA_PER_FULL_PACKET_WITH_SEQUENCE_NUM
+
+_END_FLAG = 0xFFFFFFFF
+
+# where the pretend SDRAM of the chip starts
+_SDRAM_BASE = 0x60000000
+
+# a read which takes 4 sequence numbers, the last of which is not full
+_READ_LENGTH = 1000
+_N_SEQ_NUMS = 4
+
+
+def _sdram_data(length):
+    return bytearray((i * 7 + i // 256) % 256 for i in range(length))
+
+
+class _Gatherer(object):
+    """ Pretend data speed up packet gatherer, which packs the fixed route\
+        packets it receives into packets for the host in the same way as\
+        the real one
+    """
+
+    def __init__(self):
+        self.packets = list()
+        self._data = [0] * _VERTEX.DATA_PER_FULL_PACKET
+        self._position = 1
+        self._seq_num = 0
+
+    def _send(self):
+        self.packets.append(struct.pack(
+            "<{}I".format(self._position), *self._data[:self._position]))
+        self._position = 1
+        self._seq_num += 1
+        self._data[0] = self._seq_num
+
+    def receive(self, key, payload):
+        if key == _VERTEX.NEW_SEQ_KEY:
+            if self._position != 1:
+                self._send()
+            self._data[0] = payload
+            self._seq_num = payload
+            self._position = 1
+            return
+        self._data[self._position] = payload
+        self._position += 1
+        if key == _VERTEX.FIRST_DATA_KEY:
+            self._seq_num = 0
+            self._data[0] = 0
+            self._position = 1
+        if key == _VERTEX.END_FLAG_KEY:
+            self._data[0] += _VERTEX.LAST_MESSAGE_FLAG_BIT_MASK
+            self._position -= 1
+            self._send()
+        elif self._position == _VERTEX.DATA_PER_FULL_PACKET:
+            self._send()
+
+
+class _ExtraMonitor(object):
+    """ Pretend extra monitor, which streams the data of reads of its\
+        SDRAM, and writes data sent to it into its SDRAM, in the same way as\
+        the real one
+    """
+
+    def __init__(self, sdram):
+        self._sdram = sdram
+        self._gatherer = _Gatherer()
+        self._reads = list()
+        self._pending_reads = list()
+        self._missing = list()
+        self._n_missing_packets = 0
+        self.n_streams = 0
+        self.replies = list()
+        self.can_receive_data_in = True
+        self._data_in_offset = None
+        self._data_in_received = None
+
+    @property
+    def packets(self):
+        return self._gatherer.packets
+
+    def _words(self, address, n_words):
+        offset = address - _SDRAM_BASE
+        return struct.unpack_from("<{}I".format(n_words), self._sdram, offset)
+
+    def _n_seq_nums(self, n_words):
+        return (n_words + _WORDS_PER_PACKET - 1) // _WORDS_PER_PACKET
+
+    def _start_stream(self, reads):
+        self.n_streams += 1
+        self._reads = list()
+        max_seq_num = 0
+        for address, n_words in reads:
+            self._reads.append((address, n_words, max_seq_num))
+            max_seq_num += self._n_seq_nums(n_words)
+        send = self._gatherer.receive
+        for index, (address, n_words, first_seq_num) in enumerate(
+                self._reads):
+            if index:
+                send(_VERTEX.NEW_SEQ_KEY, first_seq_num)
+            else:
+                send(_VERTEX.FIRST_DATA_KEY, max_seq_num)
+            for word in self._words(address, n_words):
+                send(_VERTEX.BASE_KEY, word)
+        send(_VERTEX.END_FLAG_KEY, _END_FLAG)
+
+    def _retransmit(self):
+        send = self._gatherer.receive
+        for seq_num in self._missing:
+            for address, n_words, first_seq_num in reversed(self._reads):
+                if first_seq_num <= seq_num:
+                    break
+            position = (seq_num - first_seq_num) * _WORDS_PER_PACKET
+            send(_VERTEX.NEW_SEQ_KEY, seq_num)
+            for word in self._words(
+                    address + position * 4,
+                    min(_WORDS_PER_PACKET, n_words - position)):
+                send(_VERTEX.BASE_KEY, word)
+        send(_VERTEX.END_FLAG_KEY, _END_FLAG)
+        self._missing = list()
+
+    def receive_sdp(self, data):
+        words = struct.unpack("<{}I".format(len(data) // 4), bytes(data))
+        command = words[0]
+        if command == _VERTEX.SDP_PACKET_START_SENDING_COMMAND_ID:
+            self._start_stream([(words[1], words[2] // 4)])
+        elif command == _VERTEX.SDP_PACKET_START_SENDING_READS_COMMAND_ID:
+            n_reads, first_read = words[1:3]
+            if not first_read:
+                self._pending_reads = list()
+            self._pending_reads.extend(
+                (words[i], words[i + 1] // 4)
+                for i in range(3, len(words), 2))
+            if len(self._pending_reads) == n_reads:
+                self._start_stream(self._pending_reads)
+        elif command == _VERTEX.SDP_PACKET_START_MISSING_SEQ_COMMAND_ID:
+            self._n_missing_packets = words[1] - 1
+            self._missing = list(words[2:])
+            if not self._n_missing_packets:
+                self._retransmit()
+        elif command == _VERTEX.SDP_PACKET_MISSING_SEQ_COMMAND_ID:
+            self._n_missing_packets -= 1
+            self._missing.extend(words[1:])
+            if not self._n_missing_packets:
+                self._retransmit()
+        elif command == _VERTEX.SDP_PACKET_START_DATA_IN_COMMAND_ID:
+            if self.can_receive_data_in:
+                self._data_in_offset = words[1] - _SDRAM_BASE
+                self._data_in_received = [False] * (
+                    (words[2] + _VERTEX.DATA_IN_BYTES_PER_PACKET - 1) //
+                    _VERTEX.DATA_IN_BYTES_PER_PACKET)
+            self._reply_missing_data_in()
+        elif command == _VERTEX.SDP_PACKET_DATA_IN_COMMAND_ID:
+            offset = self._data_in_offset + (
+                words[1] * _VERTEX.DATA_IN_BYTES_PER_PACKET)
+            self._sdram[offset:offset + len(data) - 8] = data[8:]
+            self._data_in_received[words[1]] = True
+        elif command == _VERTEX.SDP_PACKET_CHECK_DATA_IN_COMMAND_ID:
+            self._reply_missing_data_in()
+
+    def _reply_missing_data_in(self):
+        if self._data_in_received is None:
+            words = [_VERTEX.DATA_IN_FAILED]
+        else:
+            missing = [seq_num for seq_num, received in enumerate(
+                self._data_in_received) if not received]
+            words = [len(missing)] + missing[
+                :_VERTEX.DATA_PER_FULL_PACKET - _VERTEX.DATA_IN_HEADER_SIZE]
+        self.replies.append(SDPMessage(SDPHeader(), data=struct.pack(
+            "<{}I".format(len(words) + 1),
+            _VERTEX.SDP_PACKET_MISSING_DATA_IN_COMMAND_ID, *words)))
+
+
+class _Connection(object):
+    """ Pretend connection to the gatherer, which loses chosen packets of\
+        the first pass of a stream, and can deliver the last packet of the\
+        first pass first
+    """
+
+    def __init__(self, monitor, lose_seq_nums=(), last_first=False,
+                 lose_data_in=None):
+        self._monitor = monitor
+        self._lose_seq_nums = set(lose_seq_nums)
+        self._last_first = last_first
+        self._lose_data_in = Counter(lose_data_in or {})
+        self.n_data_in_packets = 0
+
+    def send_sdp_message(self, message):
+        command, seq_num = struct.unpack_from("<II", message.data + b"\0" * 8)
+        if command == _VERTEX.SDP_PACKET_DATA_IN_COMMAND_ID:
+            self.n_data_in_packets += 1
+            if self._lose_data_in[seq_num]:
+                self._lose_data_in[seq_num] -= 1
+                return
+        self._monitor.receive_sdp(message.data)
+
+    def receive_sdp_message(self, timeout=None):
+        if self._monitor.replies:
+            return self._monitor.replies.pop(0)
+        raise SpinnmanTimeoutException("receive", timeout)
+
+    def receive(self, timeout=None):
+        packets = self._monitor.packets
+        if self._last_first and packets:
+            self._last_first = False
+            packets.insert(0, packets.pop())
+        while packets:
+            packet = packets.pop(0)
+            seq_num, = struct.unpack_from("<I", packet)
+            seq_num &= _VERTEX.SEQUENCE_NUMBER_MASK
+            if seq_num in self._lose_seq_nums:
+                self._lose_seq_nums.remove(seq_num)
+                continue
+            return packet
+        raise SpinnmanTimeoutException("receive", timeout)
+
+
+class _Transceiver(object):
+
+    def __init__(self, monitor, sdram):
+        self._monitor = monitor
+        self._sdram = sdram
+        self.n_scp_reads = 0
+        self.n_scp_writes = 0
+
+    def send_sdp_message(self, message):
+        self._monitor.receive_sdp(message.data)
+
+    def read_memory(self, x, y, base_address, length):
+        self.n_scp_reads += 1
+        offset = base_address - _SDRAM_BASE
+        return bytearray(self._sdram[offset:offset + length])
+
+    def write_memory(self, x, y, base_address, data):
+        self.n_scp_writes += 1
+        offset = base_address - _SDRAM_BASE
+        self._sdram[offset:offset + len(data)] = data
+
+
+class _QuietGatherMachineVertex(DataSpeedUpPacketGatherMachineVertex):
+    """ Gatherer which keeps its pretend connection when a receive times out
+    """
+
+    def _DataSpeedUpPacketGatherMachineVertex__reset_connection(self):
+        pass
+
+
+class TestDataSpeedUpPacketGatherer(unittest.TestCase):
+
+    def setUp(self):
+        self._sdram = _sdram_data(0x10000)
+        self._monitor = _ExtraMonitor(self._sdram)
+        self._transceiver = _Transceiver(self._monitor, self._sdram)
+        self._placement = Placement(None, 0, 0, 0)
+
+    def _gatherer(self, lose_seq_nums=(), threshold=0, last_first=False,
+                  lose_data_in=None):
+        gatherer = _QuietGatherMachineVertex(
+            0, 0, "127.0.0.1", tempfile.mkdtemp(), False,
+            extraction_path_policy=FixedThresholdExtractionPathPolicy(
+                threshold))
+        gatherer._connection.close()
+        gatherer._connection = _Connection(
+            self._monitor, lose_seq_nums, last_first, lose_data_in)
+        return gatherer
+
+    def _send_data_in(self, gatherer):
+        """ Write more than the data in threshold into the SDRAM, and check\
+            that it was written
+        """
+        length = _VERTEX.THRESHOLD_WHERE_SDP_BETTER_THAN_DATA_IN_IN_BYTES + 100
+        data = bytearray((i * 3) % 251 for i in range(length))
+        gatherer.send_data_into_spinnaker(
+            self._transceiver, self._placement, _SDRAM_BASE + 0x100, data)
+        self.assertEqual(
+            bytes(self._sdram[0x100:0x100 + len(data)]), bytes(data))
+        (_, lost_seq_nums), = [
+            write for writes in
+            gatherer._data_in_provenance_data_items.values()
+            for write in writes]
+        return lost_seq_nums
+
+    def _get_data(self, gatherer, length=_READ_LENGTH):
+        data = gatherer.get_data(
+            self._transceiver, self._placement, _SDRAM_BASE + 0x400, length,
+            None)
+        self.assertEqual(
+            bytes(data), bytes(self._sdram[0x400:0x400 + length]))
+
+    def _provenance(self, gatherer):
+        """ Get the packet statistics of the only read as a dictionary
+        """
+        values = dict()
+        lost = list()
+        for item in gatherer.get_local_provenance_data():
+            if item.names[1] == "lost_seq_nums":
+                lost.append(item.value)
+            else:
+                values[item.names[1]] = item.value
+        values["lost_seq_nums"] = lost
+        del values["extraction_time"]
+        return values
+
+    def _read(self, gatherer, reads):
+        return gatherer.get_data_for_reads(self._transceiver, [
+            (self._placement, _SDRAM_BASE + offset, length)
+            for offset, length in reads], None)
+
+    def _check_reads(self, reads, results):
+        self.assertEqual(len(results), len(reads))
+        for (offset, length), data in zip(reads, results):
+            self.assertEqual(
+                bytes(data), bytes(self._sdram[offset:offset + length]))
+
+    def test_merge_overlapping_reads(self):
+        gatherer = self._gatherer()
+        merged = gatherer._merge_reads(sorted([
+            (0x1000, 100, 0), (0x1010, 20, 1), (0x1050, 100, 2)]))
+        self.assertEqual(merged, [(0x1000, 0x1050 + 100, [0, 1, 2])])
+
+    def test_merge_adjacent_reads(self):
+        gatherer = self._gatherer()
+        merged = gatherer._merge_reads(sorted([
+            (0x1000, 0x100, 0), (0x1100, 0x100, 1)]))
+        self.assertEqual(merged, [(0x1000, 0x1200, [0, 1])])
+
+        # Reads which share a word are merged, as whole words are read
+        merged = gatherer._merge_reads(sorted([
+            (0x1000, 0x102, 0), (0x1103, 5, 1)]))
+        self.assertEqual(merged, [(0x1000, 0x1108, [0, 1])])
+
+    def test_gapped_reads_are_not_merged(self):
+        gatherer = self._gatherer()
+        merged = gatherer._merge_reads(sorted([
+            (0x1000, 0x100, 0), (0x1104, 0x100, 1), (0x8000, 8, 2)]))
+        self.assertEqual(merged, [
+            (0x1000, 0x1100, [0]), (0x1104, 0x1204, [1]),
+            (0x8000, 0x8008, [2])])
+
+    def test_overlapping_reads(self):
+        reads = [(0x100, 1000), (0x200, 100), (0x300, 2000)]
+        results = self._read(self._gatherer(), reads)
+        self._check_reads(reads, results)
+        self.assertEqual(self._monitor.n_streams, 1)
+
+    def test_adjacent_reads(self):
+        reads = [(0x100, 0x100), (0x200, 0x100), (0x300, 0x1000)]
+        results = self._read(self._gatherer(), reads)
+        self._check_reads(reads, results)
+        self.assertEqual(self._monitor.n_streams, 1)
+
+    def test_gapped_and_unsorted_reads(self):
+        # Reads far apart, not word aligned and out of order all share one
+        # stream, whatever the gaps between them
+        reads = [
+            (0x9000, 5000), (0x100, 3), (0x4001, 1000), (0x2000, 268),
+            (0x3000, 0), (0x7002, 2000)]
+        results = self._read(self._gatherer(), reads)
+        self._check_reads(reads, results)
+        self.assertEqual(self._monitor.n_streams, 1)
+        self.assertEqual(self._transceiver.n_scp_reads, 0)
+
+    def test_many_reads(self):
+        # More reads than fit in the packet listing them, and more than can
+        # be streamed at once
+        reads = [(i * 64, 32) for i in range(
+            _VERTEX.MAX_READS_PER_STREAM + 10)]
+        results = self._read(self._gatherer(), reads)
+        self._check_reads(reads, results)
+        self.assertEqual(self._monitor.n_streams, 2)
+
+    def test_lost_packets_of_several_reads(self):
+        # The first read takes 4 sequence numbers, so this loses packets of
+        # each of the reads, which are then sent again together
+        reads = [(0x100, 1000), (0x2000, 2000), (0x5000, 100)]
+        gatherer = self._gatherer(lose_seq_nums=[1, 4, 11])
+        results = self._read(gatherer, reads)
+        self._check_reads(reads, results)
+        self.assertEqual(self._monitor.n_streams, 1)
+        lost_seq_nums, = [
+            lost for items in gatherer._provenance_data_items.values()
+            for _, lost, _, _ in items]
+        self.assertEqual(lost_seq_nums, [3, 0])
+
+    def test_small_reads_use_scp(self):
+        reads = [(0x100, 100), (0x1000, 100)]
+        results = self._read(self._gatherer(threshold=1000), reads)
+        self._check_reads(reads, results)
+        self.assertEqual(self._monitor.n_streams, 0)
+        self.assertEqual(self._transceiver.n_scp_reads, 2)
+
+    def test_single_read(self):
+        gatherer = self._gatherer(lose_seq_nums=[0, 2])
+        data = gatherer.get_data(
+            self._transceiver, self._placement, _SDRAM_BASE + 0x400, 1072,
+            None)
+        self.assertEqual(bytes(data), bytes(self._sdram[0x400:0x400 + 1072]))
+
+    def test_calculate_missing_seq_nums(self):
+        gatherer = self._gatherer()
+        gatherer._max_seq_num = 5
+
+        # the flag after the last sequence number is for the end flag packet
+        seq_nums = numpy.ones(6, dtype=bool)
+        self.assertEqual(gatherer._calculate_missing_seq_nums(seq_nums), [])
+        self.assertTrue(gatherer._check(seq_nums))
+        seq_nums[5] = False
+        self.assertEqual(gatherer._calculate_missing_seq_nums(seq_nums), [])
+        self.assertFalse(gatherer._check(seq_nums))
+
+        for missing in ([0], [2, 3], [4], [0, 4], [0, 1, 2, 3, 4]):
+            seq_nums = numpy.ones(6, dtype=bool)
+            seq_nums[missing] = False
+            self.assertEqual(
+                gatherer._calculate_missing_seq_nums(seq_nums), missing)
+            self.assertFalse(gatherer._check(seq_nums))
+
+    def test_no_missing_seq_nums(self):
+        gatherer = self._gatherer()
+        self._get_data(gatherer)
+        self.assertEqual(self._provenance(gatherer), {
+            "n_packets_received": _N_SEQ_NUMS,
+            "n_duplicate_packets": 0,
+            "n_retransmission_rounds": 0,
+            "lost_seq_nums": [0]})
+
+    def test_missing_first_seq_num(self):
+        # The end flag sent after the packet sent again comes in a packet of
+        # its own, with the sequence number after that packet
+        gatherer = self._gatherer(lose_seq_nums=[0])
+        self._get_data(gatherer)
+        self.assertEqual(self._provenance(gatherer), {
+            "n_packets_received": _N_SEQ_NUMS + 1,
+            "n_duplicate_packets": 1,
+            "n_retransmission_rounds": 1,
+            "lost_seq_nums": [1, 0]})
+
+    def test_missing_middle_seq_nums(self):
+        gatherer = self._gatherer(lose_seq_nums=[1, 2])
+        self._get_data(gatherer)
+        self.assertEqual(self._provenance(gatherer), {
+            "n_packets_received": _N_SEQ_NUMS + 1,
+            "n_duplicate_packets": 1,
+            "n_retransmission_rounds": 1,
+            "lost_seq_nums": [2, 0]})
+
+    def test_missing_last_seq_num(self):
+        # Losing the packet with the end flag leaves the receive to time out
+        # before the missing sequence numbers are asked for
+        gatherer = self._gatherer(lose_seq_nums=[_N_SEQ_NUMS - 1])
+        self._get_data(gatherer)
+        self.assertEqual(self._provenance(gatherer), {
+            "n_packets_received": _N_SEQ_NUMS,
+            "n_duplicate_packets": 0,
+            "n_retransmission_rounds": 1,
+            "lost_seq_nums": [1, 0]})
+
+    def test_last_packet_first(self):
+        # The end flag arriving first makes the rest look lost, so they are
+        # all asked for again, and arrive twice
+        gatherer = self._gatherer(last_first=True)
+        self._get_data(gatherer)
+        self.assertEqual(self._provenance(gatherer), {
+            "n_packets_received": 2 * _N_SEQ_NUMS,
+            "n_duplicate_packets": _N_SEQ_NUMS,
+            "n_retransmission_rounds": 1,
+            "lost_seq_nums": [_N_SEQ_NUMS - 1, 0]})
+
+    def test_duplicate_packets(self):
+        gatherer = self._gatherer()
+        self._monitor.receive_sdp(struct.pack(
+            "<III", _VERTEX.SDP_PACKET_START_SENDING_COMMAND_ID,
+            _SDRAM_BASE, _READ_LENGTH))
+        packets = list(self._monitor.packets)
+        self._monitor.packets[:] = packets[:2] + packets[:2] + packets[2:]
+
+        # receive the stream started above without starting another
+        gatherer._output = bytearray(_READ_LENGTH)
+        gatherer._view = memoryview(gatherer._output)
+        gatherer._max_seq_num = gatherer.calculate_max_seq_num()
+        lost_seq_nums = gatherer._receive_data(
+            self._transceiver, self._placement)
+        self.assertEqual(lost_seq_nums, [0])
+        self.assertEqual(gatherer._n_packets_received, _N_SEQ_NUMS + 2)
+        self.assertEqual(gatherer._n_duplicate_packets, 2)
+        self.assertEqual(
+            bytes(gatherer._output), bytes(self._sdram[:_READ_LENGTH]))
+
+    def test_data_in(self):
+        gatherer = self._gatherer()
+        self.assertEqual(self._send_data_in(gatherer), [])
+        self.assertEqual(self._transceiver.n_scp_writes, 0)
+
+    def test_data_in_lost_packets(self):
+        # Packets lost once are sent again in the next round
+        gatherer = self._gatherer(lose_data_in={0: 1, 70: 1, 100: 2})
+        self.assertEqual(self._send_data_in(gatherer), [3, 1])
+        self.assertEqual(self._transceiver.n_scp_writes, 0)
+
+    def test_data_in_without_progress_uses_scp(self):
+        # A packet that is always lost stops the rounds of sending again
+        gatherer = self._gatherer(lose_data_in={5: 1000})
+        self.assertEqual(
+            self._send_data_in(gatherer),
+            [1] * (_VERTEX.DATA_IN_ROUNDS_WITHOUT_PROGRESS + 1))
+        self.assertEqual(self._transceiver.n_scp_writes, 1)
+
+    def test_data_in_not_received_uses_scp(self):
+        self._monitor.can_receive_data_in = False
+        gatherer = self._gatherer()
+        self.assertEqual(self._send_data_in(gatherer), [])
+        self.assertEqual(self._transceiver.n_scp_writes, 1)
+        self.assertEqual(gatherer._connection.n_data_in_packets, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+
+from spinn_front_end_common.utility_models import \
+    ReverseIPTagMulticastSourceMachineVertex
+
+# 1ms time steps
+_TIME_STEP = 1000
+
+
+def _sent(vertex):
+    """ The time steps and keys in the send buffer of a vertex
+    """
+    vertex._fill_send_buffer(_TIME_STEP, 0, 100)
+    send_buffer = vertex._send_buffer
+    return list(send_buffer.timestamps), list(send_buffer.keys)
+
+
+class TestReverseIPTagMulticastSource(unittest.TestCase):
+
+    def test_times_changed_in_place_2d(self):
+        times = [[1.0, 2.0], [3.0]]
+        vertex = ReverseIPTagMulticastSourceMachineVertex(
+            2, "source", send_buffer_times=times)
+        self.assertEqual(_sent(vertex), ([1, 2, 3], [0, 0, 1]))
+
+        times[1].append(5.0)
+        self.assertEqual(_sent(vertex), ([1, 2, 3, 5], [0, 0, 1, 1]))
+
+    def test_times_changed_in_place_1d(self):
+        times = [1.0, 2.0]
+        vertex = ReverseIPTagMulticastSourceMachineVertex(
+            2, "source", send_buffer_times=times)
+        self.assertEqual(_sent(vertex), ([1, 2], [0, 1, 0, 1]))
+
+        times[0] = 7.0
+        self.assertEqual(_sent(vertex), ([2, 7], [0, 1, 0, 1]))
+
+    def test_times_reassigned(self):
+        vertex = ReverseIPTagMulticastSourceMachineVertex(
+            1, "source", send_buffer_times=[1.0])
+        self.assertEqual(_sent(vertex), ([1], [0]))
+        vertex.send_buffer_times = [4.0]
+        self.assertEqual(_sent(vertex), ([4], [0]))
+
+
+if __name__ == "__main__":
+    unittest.main()